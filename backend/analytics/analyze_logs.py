@@ -1,115 +1,295 @@
+"""
+Chat Telemetry Analyzer
+Incrementally rolls new rows from the telemetry store (monitoring/telemetry.py,
+table chat_requests) into daily aggregates, then reports over a window:
+latency percentiles (request, retrieval, generate), outcome and intent mix,
+cache hit rate, tier usage and per-model tokens/costs.
+
+Each run only reads rows with id > the stored cursor; the rollups (counts,
+token sums and log-bucketed latency histograms) merge exactly, so weekly
+reviews never rescan history.
+
+Usage (from repo root):
+    python -m backend.analytics.analyze_logs                         # last 7 days
+    python -m backend.analytics.analyze_logs --days 30 --prices prices.json
+    python -m backend.analytics.analyze_logs --import-log backend/logs/chatbot.log   # backfill old JSON log lines
+
+Prices file: {"openrouter:<model>": {"input": usd_per_1M, "output": usd_per_1M}}.
+Models ending in ":free" cost 0; others without a price show as n/a.
+"""
+import argparse
 import json
-import logging
+import math
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from collections import defaultdict, Counter
-import statistics
-
-# Configuration
-ROOT_DIR = Path(__file__).parent.parent.parent
-LOG_FILE = ROOT_DIR / 'backend' / 'logs' / 'chatbot.log'
-
-def analyze_logs():
-    print(f"🔍 Analyzing logs from: {LOG_FILE}")
-    
-    if not LOG_FILE.exists():
-        print("❌ Log file not found.")
-        return
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from backend.monitoring.telemetry import COLUMN_NAMES, TELEMETRY_DB_PATH, build_record, connect
+except ImportError:
+    from monitoring.telemetry import COLUMN_NAMES, TELEMETRY_DB_PATH, build_record, connect
+
+# Latency histogram buckets grow 5% each: percentiles are accurate to ~2.5%
+BUCKET_GROWTH = 1.05
+LATENCY_METRICS = ("latency_ms", "retrieval_ms", "generate_ms")
+GROUP_KEYS = ("day", "intent", "outcome", "tier", "model")
+SUM_COLUMNS = ("cache_hit", "llm_calls", "llm_errors", "input_tokens", "output_tokens", "latency_ms")
+BATCH_ROWS = 50_000
+
+ROLLUP_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS rollup_requests (day TEXT, intent TEXT, outcome TEXT, tier TEXT, model TEXT, "
+    "requests INTEGER, cache_hits INTEGER, llm_calls INTEGER, llm_errors INTEGER, input_tokens INTEGER, "
+    "output_tokens INTEGER, latency_ms_sum REAL, PRIMARY KEY (day, intent, outcome, tier, model))",
+    "CREATE TABLE IF NOT EXISTS rollup_latency (day TEXT, metric TEXT, bucket INTEGER, count INTEGER, "
+    "PRIMARY KEY (day, metric, bucket))",
+    "CREATE TABLE IF NOT EXISTS analytics_state (key TEXT PRIMARY KEY, value TEXT)",
+)
+
+
+def ensure_schema(conn: sqlite3.Connection):
+    for statement in ROLLUP_SCHEMA:
+        conn.execute(statement)
+
+
+def _state(conn: sqlite3.Connection, key: str, default=None):
+    row = conn.execute("SELECT value FROM analytics_state WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def _set_state(conn: sqlite3.Connection, key: str, value):
+    conn.execute("INSERT INTO analytics_state (key, value) VALUES (?, ?) "
+                 "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, str(value)))
+
+
+def latency_bucket(values: np.ndarray) -> np.ndarray:
+    return np.floor(np.log(np.maximum(values, 0.1)) / math.log(BUCKET_GROWTH)).astype(np.int64)
+
+
+def bucket_value(buckets: np.ndarray) -> np.ndarray:
+    """Geometric midpoint of each bucket in ms"""
+    return np.power(BUCKET_GROWTH, buckets + 0.5)
+
+
+def _rollup_batch(conn: sqlite3.Connection, rows: pd.DataFrame):
+    keys = list(GROUP_KEYS)
+    rows[keys[1:]] = rows[keys[1:]].fillna("")
+    sums = rows[list(SUM_COLUMNS)].apply(pd.to_numeric, errors="coerce").fillna(0)
+    grouped = pd.concat([rows[keys], sums], axis=1).groupby(keys, sort=False)
+    totals = grouped.sum().join(grouped.size().rename("requests")).reset_index()
+    conn.executemany(
+        "INSERT INTO rollup_requests VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(day, intent, outcome, tier, model) DO UPDATE SET "
+        "requests = requests + excluded.requests, cache_hits = cache_hits + excluded.cache_hits, "
+        "llm_calls = llm_calls + excluded.llm_calls, llm_errors = llm_errors + excluded.llm_errors, "
+        "input_tokens = input_tokens + excluded.input_tokens, output_tokens = output_tokens + excluded.output_tokens, "
+        "latency_ms_sum = latency_ms_sum + excluded.latency_ms_sum",
+        [(r.day, r.intent, r.outcome, r.tier, r.model, int(r.requests), int(r.cache_hit), int(r.llm_calls),
+          int(r.llm_errors), int(r.input_tokens), int(r.output_tokens), float(r.latency_ms))
+         for r in totals.itertuples(index=False)],
+    )
+
+    frames = []
+    for metric in LATENCY_METRICS:
+        values = pd.to_numeric(rows[metric], errors="coerce")
+        mask = values.notna().to_numpy()
+        if not mask.any():
+            continue
+        # Request latency is split by outcome: cache hits and 429s would drown the real path
+        name = ("request:" + rows["outcome"][mask]) if metric == "latency_ms" else metric
+        frames.append(pd.DataFrame({
+            "day": rows["day"][mask].to_numpy(),
+            "metric": np.asarray(name) if metric == "latency_ms" else metric,
+            "bucket": latency_bucket(values[mask].to_numpy()),
+        }))
+    if frames:
+        counts = pd.concat(frames).groupby(["day", "metric", "bucket"]).size().reset_index(name="count")
+        conn.executemany(
+            "INSERT INTO rollup_latency VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(day, metric, bucket) DO UPDATE SET count = count + excluded.count",
+            [(r.day, r.metric, int(r.bucket), int(r.count)) for r in counts.itertuples(index=False)],
+        )
+
+
+def refresh_rollups(conn: sqlite3.Connection, batch_rows: int = BATCH_ROWS) -> int:
+    """Fold rows added since the last run into the rollups; returns how many were processed"""
+    ensure_schema(conn)
+    processed = 0
+    while True:
+        cursor = int(_state(conn, "last_id", 0))
+        rows = pd.read_sql_query(
+            f"SELECT id, {', '.join(COLUMN_NAMES)} FROM chat_requests WHERE id > ? ORDER BY id LIMIT ?",
+            conn, params=(cursor, batch_rows))
+        if rows.empty:
+            break
+        # Rollup + cursor move commit together, so an interrupted run never double counts
+        with conn:
+            _rollup_batch(conn, rows)
+            _set_state(conn, "last_id", int(rows["id"].iloc[-1]))
+        processed += len(rows)
+    return processed
 
-    sessions = set()
-    intents = Counter()
-    states = Counter()
-    latencies = []
-    rag_usage = 0
-    total_requests = 0
-    exits = 0
-    
-    low_confidence_queries = []
-
-    with open(LOG_FILE, 'r', encoding='utf-8') as f:
-        for line in f:
+
+def import_log_file(conn: sqlite3.Connection, log_path: Path) -> int:
+    """Backfill chat_requests from telemetry JSON lines in a chatbot.log (resumes at the last offset)"""
+    ensure_schema(conn)
+    key = f"log_offset:{log_path.resolve()}"
+    offset = int(_state(conn, key, 0))
+    if log_path.stat().st_size < offset:
+        offset = 0  # file was rotated/truncated
+    records = []
+    with open(log_path, "rb") as f:
+        f.seek(offset)
+        for raw in f:
+            line = raw.decode("utf-8", errors="replace")
+            start = line.find("{")
+            if start < 0 or '"latency_ms"' not in line:
+                continue
             try:
-                # Extract JSON part if mixed with standard logging
-                json_part = line.strip()
-                if "PortfolioBackend" in line and "{" in line:
-                    json_part = line.split(" - ")[-1]
-                
-                if not json_part.startswith("{"):
-                    continue
-                    
-                data = json.loads(json_part)
-                
-                # Check if it's a telemetry log
-                if "intent_scores" not in data:
-                    continue
-                    
-                total_requests += 1
-                sessions.add(data.get("session_id"))
-                
-                # Aggregation
-                final_state = data.get("final_state")
-                states[final_state] += 1
-                
-                if final_state == "EXIT":
-                    exits += 1
-                    
-                if data.get("rag_used"):
-                    rag_usage += 1
-                    
-                # Intent Analysis
-                scores = data.get("intent_scores", {})
-                # Find winner
-                if scores:
-                    winner = max(scores, key=scores.get)
-                    score = scores[winner]
-                    intents[winner] += 1
-                    
-                    if score < 5 and winner != "conversation":
-                        low_confidence_queries.append((data.get("normalized_input"), winner, score))
-
-                # Latency
-                lat = data.get("latency_ms", 0)
-                if lat > 0:
-                    latencies.append(lat)
-                    
-            except Exception:
+                data = json.loads(line[start:])
+                ts = datetime.fromisoformat(data["timestamp"]).replace(tzinfo=timezone.utc).timestamp()
+            except (ValueError, KeyError):
                 continue
+            records.append(build_record(
+                ts=ts, session_id=data.get("session_id"), trace_id=data.get("trace_id"), intent=data.get("intent"),
+                outcome="success", cache_hit=0, input_tokens=data.get("input_tokens"),
+                output_tokens=data.get("output_tokens"), latency_ms=data.get("latency_ms")))
+        end = f.tell()
+    with conn:
+        conn.executemany(
+            f"INSERT INTO chat_requests ({', '.join(COLUMN_NAMES)}) VALUES ({', '.join('?' for _ in COLUMN_NAMES)})",
+            [tuple(r[c] for c in COLUMN_NAMES) for r in records])
+        _set_state(conn, key, end)
+    return len(records)
+
+
+def histogram_percentiles(buckets: pd.DataFrame, quantiles=(0.5, 0.95, 0.99)) -> Dict[str, float]:
+    """Percentiles (ms) from merged (bucket, count) rows"""
+    if buckets.empty:
+        return {}
+    merged = buckets.groupby("bucket")["count"].sum().sort_index()
+    cumulative = np.cumsum(merged.to_numpy())
+    values = bucket_value(merged.index.to_numpy())
+    out = {"count": int(cumulative[-1])}
+    for q in quantiles:
+        idx = int(np.searchsorted(cumulative, q * cumulative[-1], side="left"))
+        out[f"p{int(q * 100)}"] = round(float(values[min(idx, len(values) - 1)]), 1)
+    return out
+
+
+def model_cost(model: str, input_tokens: int, output_tokens: int, prices: Dict) -> Optional[float]:
+    if model in prices:
+        p = prices[model]
+        return (input_tokens * p.get("input", 0) + output_tokens * p.get("output", 0)) / 1_000_000
+    if model.endswith(":free"):
+        return 0.0
+    return None
+
+
+def build_report(conn: sqlite3.Connection, days: int = 7, prices: Optional[Dict] = None,
+                 today: Optional[str] = None) -> Dict:
+    end = datetime.fromisoformat(today) if today else datetime.now(timezone.utc)
+    since = (end - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    requests = pd.read_sql_query("SELECT * FROM rollup_requests WHERE day >= ?", conn, params=(since,))
+    latency = pd.read_sql_query("SELECT * FROM rollup_latency WHERE day >= ?", conn, params=(since,))
+    report = {"since": since, "days": days, "requests": int(requests["requests"].sum()) if not requests.empty else 0}
+    if requests.empty:
+        return report
+
+    total = requests["requests"].sum()
+    served = requests.loc[requests["outcome"] != "rate_limited", "requests"].sum()
+    report["outcomes"] = requests.groupby("outcome")["requests"].sum().sort_values(ascending=False).to_dict()
+    report["cache_hit_rate"] = round(float(requests["cache_hits"].sum() / served), 4) if served else 0.0
+    answered = requests[requests["outcome"] == "success"]
+    report["intents"] = answered.groupby("intent")["requests"].sum().sort_values(ascending=False).to_dict()
+    report["tiers"] = answered.groupby("tier")["requests"].sum().sort_values(ascending=False).to_dict()
+    report["llm_error_rate"] = round(float(requests["llm_errors"].sum() / max(requests["llm_calls"].sum(), 1)), 4)
+
+    report["latency_ms"] = {
+        metric: histogram_percentiles(group) for metric, group in latency.groupby("metric")
+    }
+
+    by_model = answered[answered["model"] != ""].groupby("model")[["requests", "input_tokens", "output_tokens"]].sum()
+    report["models"] = {
+        model: {**{k: int(v) for k, v in row.items()},
+                "cost_usd": model_cost(model, row["input_tokens"], row["output_tokens"], prices or {})}
+        for model, row in by_model.sort_values("requests", ascending=False).iterrows()
+    }
 
-    # --- REPORT GENERATION ---
-    print("\n📊 --- CHATBOT INTELLIGENCE REPORT --- 📊")
-    print(f"Total Requests: {total_requests}")
-    print(f"Unique Sessions: {len(sessions)}")
-    
-    if total_requests == 0:
+    success_latency = latency[latency["metric"] == "request:success"]
+    daily = requests.groupby("day")["requests"].sum()
+    report["daily"] = {
+        day: {"requests": int(daily[day]), **histogram_percentiles(success_latency[success_latency["day"] == day],
+                                                                   (0.5, 0.95))}
+        for day in sorted(daily.index)
+    }
+    report["share"] = {k: round(v / total, 4) for k, v in report["outcomes"].items()}
+    return report
+
+
+def print_report(report: Dict):
+    print(f"\n📊 --- CHAT PERFORMANCE REPORT ({report['since']} +{report['days']}d) --- 📊")
+    print(f"Total Requests: {report['requests']}")
+    if not report["requests"]:
         print("No data available.")
         return
 
-    print("\n🔹 State Distribution:")
-    for state, count in states.most_common():
-        print(f"  - {state}: {count} ({count/total_requests*100:.1f}%)")
-        
-    print(f"\n🔹 RAG Utilization: {rag_usage/total_requests*100:.1f}%")
-    print(f"🔹 Exit Rate: {exits/total_requests*100:.1f}%")
-    
-    if latencies:
-        print(f"\n🔹 Latency (ms):")
-        print(f"  - Avg: {statistics.mean(latencies):.0f}ms")
-        print(f"  - P95: {statistics.quantiles(latencies, n=20)[-1]:.0f}ms")
+    print("\n🔹 Outcomes: " + ", ".join(f"{k} {v} ({report['share'][k]:.1%})" for k, v in report["outcomes"].items()))
+    print(f"🔹 Response cache hit rate: {report['cache_hit_rate']:.1%}")
+    print(f"🔹 LLM call error rate: {report['llm_error_rate']:.1%}")
+
+    print(f"\n🔹 Latency (ms):      {'count':>7} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for metric, p in sorted(report["latency_ms"].items()):
+        print(f"  {metric:<20} {p['count']:>7} {p['p50']:>9} {p['p95']:>9} {p['p99']:>9}")
 
     print("\n🔹 Intent Distribution:")
-    for intent, count in intents.most_common():
-        print(f"  - {intent}: {count}")
-
-    print("\n💡 --- RULE SUGGESTIONS --- 💡")
-    if exits > 0:
-        print(f"⚠️ High Exit Rate detected ({exits} exits). Check if users are frustrated.")
-        
-    if low_confidence_queries:
-        print("⚠️ Low Confidence Matches (Potential Gaps):")
-        for q, i, s in low_confidence_queries[:5]:
-            print(f"  - '{q}' mapped to '{i}' with score {s}")
-            
-    if states["START"] == 0 and total_requests > 10:
-        print("ℹ️ 'START' state low. Check session tracking.")
+    for intent, count in report["intents"].items():
+        print(f"  - {intent or 'unknown'}: {count}")
+    print("\n🔹 Answering Tier:")
+    for tier, count in report["tiers"].items():
+        print(f"  - {tier or 'unknown'}: {count}")
+
+    print("\n🔹 Models (answered requests):")
+    for model, m in report["models"].items():
+        cost = "n/a" if m["cost_usd"] is None else f"${m['cost_usd']:.4f}"
+        print(f"  - {model}: {m['requests']} req, {m['input_tokens']} in / {m['output_tokens']} out tokens, {cost}")
+
+    print("\n🔹 Daily: " + "  ".join(f"{d} {v['requests']} req p95 {v.get('p95', '-')}ms"
+                                     for d, v in report["daily"].items()))
+
+
+def analyze_logs(db_path: Path = TELEMETRY_DB_PATH, days: int = 7, prices: Optional[Dict] = None,
+                 import_log: Optional[Path] = None) -> Dict:
+    conn = connect(db_path)
+    try:
+        if import_log:
+            print(f"📥 Imported {import_log_file(conn, import_log)} telemetry lines from {import_log}")
+        print(f"🔍 Rolled up {refresh_rollups(conn)} new requests from {db_path}")
+        return build_report(conn, days, prices)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chat telemetry report")
+    parser.add_argument("--db", default=str(TELEMETRY_DB_PATH), help="Telemetry SQLite path")
+    parser.add_argument("--days", type=int, default=7, help="Report window ending today")
+    parser.add_argument("--prices", help="JSON file of per-model USD prices per 1M tokens")
+    parser.add_argument("--import-log", help="Backfill from telemetry JSON lines in a chatbot.log")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    prices = json.loads(Path(args.prices).read_text(encoding="utf-8")) if args.prices else None
+    report = analyze_logs(Path(args.db), args.days, prices, Path(args.import_log) if args.import_log else None)
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        print_report(report)
+
 
 if __name__ == "__main__":
-    analyze_logs()
+    sys.exit(main())
@@ -11,6 +11,13 @@ import chromadb
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+try:
+    from backend.blog_catalog import invalidate_blog_catalog
+    from backend.blog_listing import materialize_active_listing
+except ImportError:
+    from blog_catalog import invalidate_blog_catalog
+    from blog_listing import materialize_active_listing
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("BlogCleanup")
@@ -89,6 +96,10 @@ class BlogCleanup:
                                 
                                 # Verify it's a blog before deletion (safety check)
                                 try:
+                                    # Passage chunks are keyed by parent_id; drop them with the blog
+                                    collection.delete(where={"$and": [{"parent_id": blog_id}, {"category": "blog"}]})
+                                    
+                                    # Legacy whole-blog record stored under the blog id itself
                                     results = collection.get(ids=[blog_id])
                                     if results and results['metadatas'] and len(results['metadatas']) > 0:
                                         if results['metadatas'][0].get('category') == 'blog':
@@ -111,12 +122,29 @@ class BlogCleanup:
                 logger.error(f"Error checking file {filename}: {e}")
 
         logger.info(f"Cleanup complete. Deleted {deleted_count} files.")
+        active_count = self.refresh_active_listing()
         return {
             "status": "success",
             "deleted_count": deleted_count,
-            "deleted_files": deleted_files
+            "deleted_files": deleted_files,
+            "active_blogs": active_count
         }
 
+    def refresh_active_listing(self):
+        """Re-apply retention to blogs/active.json (runs daily, so blogs age out on time)"""
+        try:
+            try:
+                from backend.auto_blogger.publisher import S3BlogStorage
+            except ImportError:
+                from auto_blogger.publisher import S3BlogStorage
+            storage = S3BlogStorage(bucket_name=os.getenv("S3_BLOG_BUCKET", "althaf-blogs-storage"))
+            listing = materialize_active_listing(storage)
+            invalidate_blog_catalog()
+            return len(listing["blogs"])
+        except Exception as e:
+            logger.error(f"Active listing refresh failed: {e}")
+            return None
+
 if __name__ == "__main__":
     cleanup = BlogCleanup()
     res = cleanup.run_cleanup()
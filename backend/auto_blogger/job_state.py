@@ -143,9 +143,10 @@ class JobStateManager:
             {
                 "$set": {
                     f"sections.{section_index}": content,
-                    "current_section": section_index + 1,
                     "metadata.last_updated": now_ist
-                }
+                },
+                # Sections may finish out of order (parallel drafting): progress only moves forward
+                "$max": {"current_section": section_index + 1}
             }
         )
         logger.info(f"Job {job_id} section {section_index} saved ({len(content)} chars)")
@@ -8,10 +8,6 @@ import json
 import logging
 import time
 import uuid
-import boto3
-from google import genai
-from google.genai import types
-import chromadb
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from dotenv import load_dotenv
@@ -25,6 +21,34 @@ except ImportError:
     chromadb_monitor = None
     HAS_MONITORING = False
 
+try:
+    from backend.chunking import chunk_markdown
+    from backend.lazy_imports import lazy_import
+    from backend.s3_access import get_s3_client, json_object, read_body, read_json_body
+    from backend.blog_catalog import invalidate_blog_catalog
+    from backend.blog_post_cache import invalidate_blog_post
+    from backend.blog_listing import LISTING_KEY, materialize_active_listing
+    from backend.search_index import index_blog
+    from backend.blog_render import render_post
+    from backend.blog_index import ShardedBlogIndex
+    from backend.sitemap_service import invalidate_sitemap_blogs
+except ImportError:
+    from chunking import chunk_markdown
+    from lazy_imports import lazy_import
+    from s3_access import get_s3_client, json_object, read_body, read_json_body
+    from blog_catalog import invalidate_blog_catalog
+    from blog_post_cache import invalidate_blog_post
+    from blog_listing import LISTING_KEY, materialize_active_listing
+    from search_index import index_blog
+    from blog_render import render_post
+    from blog_index import ShardedBlogIndex
+    from sitemap_service import invalidate_sitemap_blogs
+
+# Only BlogPublisher needs these; S3BlogStorage readers (the API) never load them
+genai = lazy_import("google.genai")
+types = lazy_import("google.genai.types")
+chromadb = lazy_import("chromadb")
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("BlogPublisher")
@@ -85,29 +109,122 @@ class S3BlogStorage:
     
     def __init__(self, bucket_name: str = "althaf-blogs-storage"):
         self.bucket = bucket_name
-        self.s3 = boto3.client("s3")  # Auto-uses IAM role credentials
+        self.s3 = get_s3_client()  # Shared pooled client (IAM role credentials)
         self.index_key = "blogs/index.json"
+        self.listing_key = LISTING_KEY
         self.posts_prefix = "blogs/posts/"
         logger.info(f"S3BlogStorage initialized: s3://{bucket_name}")
     
+    @property
+    def index(self) -> ShardedBlogIndex:
+        """Month-sharded index (blogs/index/manifest.json + shards), see blog_index.py"""
+        return ShardedBlogIndex(self.s3, self.bucket)
+    
     def read_index(self) -> Dict:
-        """Read blogs/index.json from S3"""
+        """Read the whole blog index (all shards; legacy blogs/index.json before migration)"""
         try:
-            response = self.s3.get_object(Bucket=self.bucket, Key=self.index_key)
-            return json.loads(response['Body'].read().decode('utf-8'))
-        except self.s3.exceptions.NoSuchKey:
-            logger.warning("index.json not found, returning empty")
-            return {"blogs": []}
+            data, _ = self.read_index_if_changed()
+            return data
         except Exception as e:
             logger.error(f"Error reading S3 index: {e}")
             return {"blogs": []}
 
+    def _read_if_changed(self, key: str, etag: Optional[str] = None):
+        """Conditional GET: (decoded bytes, stored gzip bytes or None, etag); bytes are None on 304.
+        NoSuchKey and other errors propagate."""
+        kwargs = {"Bucket": self.bucket, "Key": key}
+        if etag:
+            kwargs["IfNoneMatch"] = etag
+        try:
+            response = self.s3.get_object(**kwargs)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("304", "NotModified"):
+                return None, None, etag
+            raise
+        raw, gz = read_body(response)
+        return raw, gz, response.get('ETag')
+
+    def _read_json_if_changed(self, key: str, etag: Optional[str] = None):
+        """Conditional GET: (data, etag), data is None on 304 Not Modified.
+        Plain and gzip-encoded objects both decode. NoSuchKey and other errors propagate."""
+        raw, _, etag = self._read_if_changed(key, etag)
+        return (json.loads(raw.decode('utf-8')) if raw is not None else None), etag
+
+    def read_index_if_changed(self, etag: Optional[str] = None):
+        """Conditional read of the whole index, keyed on the manifest's ETag.
+
+        Returns (data, etag); data is None when S3 answers 304 Not Modified.
+        A missing index reads as empty; other errors propagate so cached
+        callers can keep serving their last good copy.
+        """
+        manifest, manifest_etag = self.index.read_manifest_if_changed(etag)
+        if manifest is not None:
+            return {"blogs": self.index.read_all(manifest), "total": manifest.get("total")}, manifest_etag
+        if manifest_etag is not None:
+            return None, manifest_etag
+        return self._read_legacy_index(etag)
+
+    def _read_legacy_index(self, etag: Optional[str] = None):
+        try:
+            return self._read_json_if_changed(self.index_key, etag)
+        except self.s3.exceptions.NoSuchKey:
+            logger.warning("index.json not found, returning empty")
+            return {"blogs": []}, None
+
+    def read_recent_index(self, since: datetime, min_count: int = 0):
+        """Index entries created since `since` (plus older ones up to `min_count`), and the index total.
+
+        Only the manifest and the shards covering that window are read.
+        """
+        manifest, _ = self.index.read_manifest_if_changed()
+        if manifest is None:
+            blogs = self._read_legacy_index()[0].get('blogs', [])
+            return blogs, len(blogs)
+        return self.index.read_recent(manifest, since.strftime('%Y-%m'), min_count), manifest.get("total", 0)
+
+    def read_active_listing_if_changed(self, etag: Optional[str] = None):
+        """Conditional GET of the materialized active listing (blogs/active.json).
+
+        Same contract as read_index_if_changed, except a listing that was
+        never written returns (None, None) so the caller can build it.
+        """
+        try:
+            return self._read_json_if_changed(self.listing_key, etag)
+        except self.s3.exceptions.NoSuchKey:
+            logger.warning(f"{self.listing_key} not found")
+            return None, None
+
+    def write_active_listing(self, listing: Dict) -> Optional[str]:
+        """Write blogs/active.json; returns the new ETag"""
+        response = self.s3.put_object(Bucket=self.bucket, Key=self.listing_key, **json_object(listing))
+        logger.info(f"✅ Updated S3: {self.listing_key} ({len(listing.get('blogs', []))} active blogs)")
+        return response.get('ETag')
+
+    def read_blog_if_changed(self, blog_id: str, etag: Optional[str] = None):
+        """Conditional GET of blogs/posts/{id}.json.
+
+        Returns (data, etag): data is None with the etag on 304, and
+        (None, None) when the post does not exist. Other errors propagate.
+        """
+        try:
+            return self._read_json_if_changed(f"{self.posts_prefix}{blog_id}.json", etag)
+        except self.s3.exceptions.NoSuchKey:
+            return None, None
+
+    def read_blog_bytes_if_changed(self, blog_id: str, etag: Optional[str] = None):
+        """Like read_blog_if_changed, but returns the post undecoded:
+        (JSON bytes, stored gzip bytes or None, etag), for pass-through serving."""
+        try:
+            return self._read_if_changed(f"{self.posts_prefix}{blog_id}.json", etag)
+        except self.s3.exceptions.NoSuchKey:
+            return None, None, None
+
     def read_blog(self, blog_id: str) -> Optional[Dict]:
         """Read individual blog post from blogs/posts/{id}.json"""
         key = f"{self.posts_prefix}{blog_id}.json"
         try:
             response = self.s3.get_object(Bucket=self.bucket, Key=key)
-            return json.loads(response['Body'].read().decode('utf-8'))
+            return read_json_body(response)
         except self.s3.exceptions.NoSuchKey:
             logger.info(f"Blog post {key} not found in S3.")
             return None
@@ -116,14 +233,12 @@ class S3BlogStorage:
             return None
     
     def write_index(self, data: Dict[str, List]):
-        """Write blogs/index.json to S3"""
-        content = json.dumps(data, indent=2)
-        self.s3.put_object(
-            Bucket=self.bucket,
-            Key=self.index_key,
-            Body=content.encode('utf-8'),
-            ContentType='application/json'
-        )
+        """Write the blogs/index.json mirror (derived from the shards; read by maintenance scripts).
+
+        Minified but left uncompressed: the scripts read it with a plain json.loads.
+        """
+        mirror = dict(data, total=len(data.get('blogs', [])), last_updated=datetime.now().isoformat())
+        self.s3.put_object(Bucket=self.bucket, Key=self.index_key, **json_object(mirror, compress=False))
         logger.info(f"✅ Updated S3: {self.index_key}")
     
     def upload_post(self, blog_id: str, blog_data: Dict):
@@ -141,21 +256,16 @@ class S3BlogStorage:
             )
         
         key = f"{self.posts_prefix}{blog_id}.json"
-        content = json.dumps(blog_data, indent=2)
-        self.s3.put_object(
-            Bucket=self.bucket,
-            Key=key,
-            Body=content.encode('utf-8'),
-            ContentType='application/json'
-        )
+        # Minified + gzip: the API passes these bytes straight to gzip-capable clients
+        self.s3.put_object(Bucket=self.bucket, Key=key, **json_object(blog_data))
         logger.info(f"✅ Uploaded full post: {key}")
+        invalidate_blog_post(blog_id)
     
-    def add_blog_to_index(self, blog: Dict):
-        """Insert new blog at top of index.json (newest first)"""
-        index_data = self.read_index()
-        
+    def index_entry(self, blog: Dict) -> Dict:
+        """The lightweight index entry for a full post (validated for the frontend)"""
         # Prepare metadata entry (lightweight)
-        excerpt = create_clean_excerpt(blog['content'])  # ✅ Clean excerpt without markdown
+        # Rendered once at publish (blog_render); older callers may not have it
+        excerpt = blog.get('excerpt') or create_clean_excerpt(blog['content'])  # ✅ Clean excerpt without markdown
         
         metadata = {
             "id": blog['id'],
@@ -178,12 +288,65 @@ class S3BlogStorage:
         # VALIDATION: Ensure excerpt is substantial for 3-line frontend display
         if len(excerpt) < 100:
             logger.warning(f"⚠️  Excerpt too short ({len(excerpt)} chars). Minimum 100 recommended for 3-line display.")
-        
-        # Insert at position 0 (top of list)
-        index_data['blogs'].insert(0, metadata)
-        
-        self.write_index(index_data)
-        logger.info(f"✅ Added {blog['id']} to index (total: {len(index_data['blogs'])}, excerpt: {len(excerpt)} chars)")
+        return metadata
+    
+    def _writable_index(self) -> ShardedBlogIndex:
+        index = self.index
+        if index.read_manifest_if_changed()[0] is None:
+            # First sharded write: carry the single-file index over (merge-safe)
+            legacy = self._read_legacy_index()[0].get('blogs', [])
+            if legacy:
+                index.merge([b for b in legacy if b.get('id')])
+                logger.info(f"Migrated {len(legacy)} entries from {self.index_key} to sharded index")
+        return index
+    
+    def add_blog_to_index(self, blog: Dict):
+        """Add a blog to its month shard (conditional writes, safe against concurrent writers).
+
+        Returns the updated manifest.
+        """
+        metadata = self.index_entry(blog)
+        index = self._writable_index()
+        manifest = index.upsert(metadata)
+        logger.info(f"✅ Added {blog['id']} to index (total: {manifest['total']}, excerpt: {len(metadata['excerpt'])} chars)")
+        self._index_changed(index, manifest)
+        return manifest
+    
+    def update_index_entry(self, blog: Dict, old_id: Optional[str] = None) -> Dict:
+        """Re-derive an edited post's index entry (maintenance scripts).
+
+        Replaces the entry wherever it was, including under `old_id` when the
+        post was renamed, and refreshes the active listing.
+        """
+        index = self._writable_index()
+        manifest = index.replace(self.index_entry(blog), old_id=old_id)
+        logger.info(f"✅ Updated {blog['id']} in index (total: {manifest['total']})")
+        self._index_changed(index, manifest, refresh_listing=True)
+        return manifest
+    
+    def remove_from_index(self, blog_ids: List[str]) -> Optional[Dict]:
+        """Drop entries from the index (maintenance scripts) and refresh the active listing"""
+        index = self._writable_index()
+        manifest = index.remove(blog_ids)
+        if manifest is None:
+            return None
+        logger.info(f"✅ Removed {len(blog_ids)} entries from index (total: {manifest['total']})")
+        self._index_changed(index, manifest, refresh_listing=True)
+        return manifest
+    
+    def _index_changed(self, index: ShardedBlogIndex, manifest: Dict, refresh_listing: bool = False):
+        invalidate_sitemap_blogs()  # same process as the API when the scheduler runs in server.py
+        try:
+            self.write_index({"blogs": index.read_all(manifest)})
+        except Exception as e:
+            logger.warning(f"{self.index_key} mirror not updated (the sharded index is): {e}")
+        if refresh_listing:
+            # publish() rebuilds the listing itself, after the post and local backup are saved
+            try:
+                materialize_active_listing(self)
+            except Exception as e:
+                logger.error(f"Active listing refresh failed (API serves the previous one): {e}")
+            invalidate_blog_catalog()
 
 # ═══════════════════════════════════════════════════════════
 
@@ -257,6 +420,25 @@ class BlogPublisher:
             logger.error(f"Embedding generation failed: {e}")
             return []
 
+    def _get_embeddings(self, texts: List[str]) -> List[list]:
+        """Generate embeddings for a batch of passages in one Gemini call"""
+        try:
+            if not self.gemini_client or not texts:
+                return []
+
+            result = self.gemini_client.models.embed_content(
+                model="gemini-embedding-001",
+                contents=texts,
+                config=types.EmbedContentConfig(
+                    task_type="RETRIEVAL_DOCUMENT",
+                    output_dimensionality=768
+                )
+            )
+            return [emb.values for emb in result.embeddings]
+        except Exception as e:
+            logger.error(f"Batch embedding generation failed: {e}")
+            return []
+
     def publish(self, blog: Dict[str, Any]) -> str:
         """Save blog and embed"""
         logger.info(f"Publishing blog: {blog.get('title')}")
@@ -314,6 +496,9 @@ class BlogPublisher:
         blog['published'] = True
         blog['created_at'] = datetime.now().isoformat()
         
+        # HTML, TOC, word count/reading time and excerpt, stored with the post
+        blog.update(render_post(content))
+        
         logger.info(f"✅ Generated URL-safe blog ID: {blog_id}")
         
         # 2. Save to S3 (Phase A: Persistent Storage)
@@ -321,7 +506,7 @@ class BlogPublisher:
             # Upload full post to S3 posts/
             self.s3_storage.upload_post(blog_id, blog)
             
-            # Add metadata to index.json
+            # Add metadata to the sharded index
             self.s3_storage.add_blog_to_index(blog)
             
             logger.info(f"✅ Saved to S3: {blog_id}")
@@ -339,73 +524,101 @@ class BlogPublisher:
         except Exception as e:
             logger.warning(f"Local save failed (non-critical): {e}")
 
+        # 2c. Rebuild the retention-filtered listing served by /api/blogs
+        try:
+            materialize_active_listing(self.s3_storage)
+        except Exception as e:
+            logger.error(f"Active listing refresh failed (API serves the previous one): {e}")
+
+        # The API's in-process blog listing (same process when the scheduler runs in server.py)
+        invalidate_blog_catalog()
+
+        # Keyword search (/api/search): index the full post, body included
+        index_blog(blog)
+
         # 3. Save to ChromaDB (portfolio_master collection with retry logic)
         # Task 21 COMPLETE: Migration to single collection finished Jan 3, 2026
         if self.chroma_client:
             max_retries = 3
             retry_delay = 5
             
-            # Generate embedding
-            embedding = self._get_embedding(blog['content'])
-            if not embedding:
+            # Prepare metadata for portfolio_master collection
+            metadata = {
+                "title": blog['title'],
+                "category": "blog",  # Main category for filtering
+                "subcategory": blog['category'],  # DevOps, Cloud Computing, etc.
+                "url": f"https://althafportfolio.site/blogs/{blog_id}",
+                "timestamp": str(int(time.time())),
+                "published_date": blog.get('created_at', '')[:10] if 'created_at' in blog else datetime.now().strftime('%Y-%m-%d')  # Fixed: Use snake_case
+            }
+            
+            # Heading-aware passages with parent_id so retrieval can regroup them
+            chunks = chunk_markdown(blog['content'], blog_id, base_metadata=metadata)
+            chunk_texts = [
+                f"Blog Title: {blog['title']}. Section: {c['metadata']['section']}.\n{c['text']}"
+                if c['metadata']['section'] else f"Blog Title: {blog['title']}.\n{c['text']}"
+                for c in chunks
+            ]
+            
+            # Generate embeddings (one batched call for all passages)
+            embeddings = self._get_embeddings(chunk_texts)
+            if not embeddings or len(embeddings) != len(chunks):
                 logger.error("Embedding generation failed - cannot save to ChromaDB")
             else:
-                # Prepare metadata for portfolio_master collection
-                metadata = {
-                    "title": blog['title'],
-                    "category": "blog",  # Main category for filtering
-                    "subcategory": blog['category'],  # DevOps, Cloud Computing, etc.
-                    "url": f"https://althafportfolio.site/blogs/{blog_id}",
-                    "timestamp": str(int(time.time())),
-                    "published_date": blog.get('created_at', '')[:10] if 'created_at' in blog else datetime.now().strftime('%Y-%m-%d')  # Fixed: Use snake_case
-                }
-                
                 # Write to portfolio_master collection
                 collection_name = "portfolio_master"
-                collection_metadata = metadata
                 
                 for attempt in range(max_retries):
-                    for attempt in range(max_retries):
-                        try:
-                            collection = self.chroma_client.get_or_create_collection(collection_name)
-                            
-                            # Check if embedding exists (rare collision)
-                            existing = collection.get(ids=[blog_id])
-                            if existing and existing['ids']:
-                                logger.warning(f"Blog {blog_id} already in {collection_name}. Updating...")
-                            
-                            collection.upsert(
-                                ids=[blog_id],
-                                documents=[blog['content']],
-                                metadatas=[collection_metadata],
-                                embeddings=[embedding]
+                    try:
+                        collection = self.chroma_client.get_or_create_collection(collection_name)
+                        
+                        # Check if chunks exist (rare collision)
+                        existing = collection.get(where={"parent_id": blog_id})
+                        if existing and existing['ids']:
+                            logger.warning(f"Blog {blog_id} already in {collection_name}. Updating...")
+                        
+                        collection.upsert(
+                            ids=[c['id'] for c in chunks],
+                            documents=chunk_texts,
+                            metadatas=[c['metadata'] for c in chunks],
+                            embeddings=embeddings
+                        )
+                        logger.info(f"✅ Successfully embedded {len(chunks)} chunks into {collection_name}")
+                        
+                        # Same pruning as populate_vector_db.write_chunks_to_portfolio_master: passages
+                        # left over from an earlier, longer version and the legacy whole-post record
+                        current_ids = {c['id'] for c in chunks}
+                        stale = [uid for uid in (existing.get('ids') if existing else None) or [] if uid not in current_ids]
+                        legacy = collection.get(ids=[blog_id])
+                        if legacy and legacy['ids']:
+                            stale.append(blog_id)
+                        if stale:
+                            collection.delete(ids=stale)
+                            logger.info(f"Pruned {len(stale)} stale/legacy records for {blog_id}")
+                        break  # Success - exit retry loop
+                        
+                    except Exception as e:
+                        logger.warning(f"{collection_name} sync attempt {attempt + 1}/{max_retries} failed: {e}")
+                        
+                        # Log to monitoring system
+                        if chromadb_monitor and attempt == max_retries - 1:
+                            chromadb_monitor.log_error(
+                                operation="add",
+                                collection=collection_name,
+                                error_type="EmbeddingFailed",
+                                error_message=str(e),
+                                severity="HIGH",
+                                context={
+                                    "blog_id": blog_id,
+                                    "category": blog.get('category', 'unknown'),
+                                    "attempts": max_retries
+                                }
                             )
-                            logger.info(f"✅ Successfully embedded into {collection_name}")
-                            break  # Success - exit retry loop
-                            
-                        except Exception as e:
-                            logger.warning(f"{collection_name} sync attempt {attempt + 1}/{max_retries} failed: {e}")
-                            
-                            # Log to monitoring system
-                            if chromadb_monitor and attempt == max_retries - 1:
-                                chromadb_monitor.log_error(
-                                    operation="add",
-                                    collection=collection_name,
-                                    error_type="EmbeddingFailed",
-                                    error_message=str(e),
-                                    severity="HIGH",
-                                    context={
-                                        "blog_id": blog_id,
-                                        "category": blog.get('category', 'unknown'),
-                                        "attempts": max_retries
-                                    }
-                                )
-                            
-                            if attempt < max_retries - 1:
-                                time.sleep(retry_delay)
-                            else:
-                                logger.error(f"❌ {collection_name} sync FAILED after {max_retries} attempts for blog {blog_id}")
-                                # Continue to next collection - partial success is acceptable during dual-write phase
+                        
+                        if attempt < max_retries - 1:
+                            time.sleep(retry_delay)
+                        else:
+                            logger.error(f"❌ {collection_name} sync FAILED after {max_retries} attempts for blog {blog_id}")
         
         return f"https://althafportfolio.site/blogs/{blog_id}"
 
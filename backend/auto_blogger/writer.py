@@ -9,7 +9,9 @@ import logging
 import os
 import json
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from openai import OpenAI
 from backend.auto_blogger.models.model_config import AGENT_ROLES, BLOG_SPECS, run_agent_completion
@@ -29,6 +31,66 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("BlogWriterAgent")
 
+# Section drafting: parallel drafter calls, and the shared gap between call starts
+DRAFT_CONCURRENCY = max(1, int(os.getenv("BLOG_DRAFT_CONCURRENCY", "1")))
+DRAFT_MIN_INTERVAL = float(os.getenv("BLOG_DRAFT_MIN_INTERVAL", "3"))
+
+
+class RequestPacer:
+    """
+    Rate budget shared by the drafter threads: call starts are spaced at
+    least `min_interval` seconds apart, however many calls are in flight.
+    """
+
+    def __init__(self, min_interval: float, clock=time.monotonic, sleep=time.sleep):
+        self.min_interval = min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot = None
+
+    def wait(self):
+        """Block until this caller's slot (slots are handed out in arrival order)"""
+        with self._lock:
+            now = self._clock()
+            slot = now if self._next_slot is None else max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            self._sleep(slot - now)
+
+
+def section_summary(formatted_section: str, limit: int = 400) -> str:
+    """Opening and closing sentence of a drafted section (headings dropped)"""
+    text = " ".join(line.strip() for line in formatted_section.splitlines()
+                    if line.strip() and not line.lstrip().startswith("#"))
+    sentences = re.split(r"(?<=[.!?])\s+", text)
+    if len(sentences) > 1:
+        summary = f"{sentences[0]} ... {sentences[-1]}"
+    else:
+        summary = text
+    return summary if len(summary) <= limit else summary[:limit].rsplit(" ", 1)[0] + "..."
+
+
+def section_flow_context(sections: List[str], index: int, drafted: Dict[int, str]) -> str:
+    """
+    Where a section sits in the blog: the full outline plus what its
+    neighbours cover (a summary once drafted, the outline heading until then).
+    Unlike the previous section's tail, this does not require drafting in order.
+    """
+    lines = [f"Blog outline (you are writing section {index + 1} of {len(sections)}):"]
+    for i, heading in enumerate(sections):
+        marker = ">>" if i == index else "  "
+        lines.append(f"{marker} {i + 1}. {heading}")
+    for label, neighbour in (("Previous", index - 1), ("Next", index + 1)):
+        if 0 <= neighbour < len(sections):
+            if neighbour in drafted:
+                covers = section_summary(drafted[neighbour])
+            else:
+                covers = f"(not drafted yet) {sections[neighbour]}"
+            lines.append(f'{label} section "{sections[neighbour]}" covers: {covers}')
+    return "\n".join(lines)
+
+
 def strip_leaked_instructions(content: str) -> str:
     """Remove leaked prompt instructions from generated content"""
     import re
@@ -496,14 +558,19 @@ class BlogWriter:
         Agent 2: The Builder (Loop)
         Uses Llama 8B to write each section individually to maintain context and depth.
         
+        Sections are independent calls: with BLOG_DRAFT_CONCURRENCY > 1 up to
+        that many are drafted in parallel, all sharing one RequestPacer
+        (BLOG_DRAFT_MIN_INTERVAL seconds between call starts). Flow comes from
+        the outline and neighbour summaries (section_flow_context), each
+        section is checkpointed to MongoDB as soon as it is done, and the blog
+        is assembled in outline order.
+        
         Args:
             category: Blog category
             sections: List of section headings (NOT outline dict)
             research_data: Research context
             job_id: Job identifier for state management
         """
-        model_cfg = AGENT_ROLES["drafter"]
-        model_id = model_cfg["primary"]
         job_mgr = get_job_state_manager()
         
         # Validate input
@@ -511,96 +578,113 @@ class BlogWriter:
             raise TypeError(f"Expected sections to be list, got {type(sections)}")
         
         # Load existing sections from MongoDB
-        job = job_mgr.load_job(job_id)
-        completed_sections = job_mgr.get_completed_sections(job_id)
-        
-        full_draft = []
-        
-        for index, section in enumerate(sections):
-            # CHECK: Skip if already completed
-            if index in completed_sections:
-                logger.info(f"⏭️ Section {index + 1}/{len(sections)} already completed, skipping: {section}")
-                full_draft.append(completed_sections[index])
-                continue
-            
-            # Setup section logger
-            section_logger = setup_section_logger(job_id, index, section)
-            section_logger.info(f"Starting Section {index + 1}/{len(sections)}: {section}")
-            logger.info(f"✍️ Drafting Section {index + 1}/{len(sections)}: {section}")
-            
-            # Context Chunking: Send strict context to avoid 8k limit
-            # Send: Research summary + Current Section Goal + Previous 200 words (for flow)
-            prev_context = full_draft[-1][-500:] if full_draft else "Start of blog."
-            
-            prompt = f"""
-            You are a technical writer drafting ONE section of a blog.
-            Blog Topic: {category}
-            Current Section: "{section}"
-            
-            Global Context (Research):
-            {research_data.get("summarized_insights_text", "No research context available.")}
-            
-            Previous Paragraph (Connect to this):
-            "...{prev_context}"
-            
-            TASK:
-            Write the full content for the section "{section}".
-            - Length: Approx 300-400 words.
-            - Style: Authoritative, technical, engaging.
-            - If this is a code section, provide valid code snippets.
-            - Don't write "Here is the section". Just write the content.
-            """
-
-            try:
-                logger.info(f"Trying model configuration for section: {section}")
-                messages = [{"role": "user", "content": prompt}]
-                content = run_agent_completion(
-                    client=self.client,
-                    agent_key="drafter",
-                    messages=messages,
-                    max_tokens=model_cfg["max_tokens"]
-                ).strip()
-                
-                # ATOMIC VALIDATION: Is this section complete?
-                if self._validate_section(content):
-                    # Success! Format and Append
-                    if not content.startswith("#"):
-                        formatted_section = f"\n\n## {section}\n\n{content}"
-                    else:
-                        formatted_section = f"\n\n{content}"
-                    
-                    # SAVE TO MONGODB IMMEDIATELY
-                    job_mgr.save_section(job_id, index, formatted_section)
-                    section_logger.info(f"✅ Section {index} saved to MongoDB")
-                    
-                    # Log metrics
-                    word_count = len(content.split())
-                    char_count = len(content)
-                    log_section_completion(section_logger, index, word_count, char_count)
-                    
-                    full_draft.append(formatted_section)
-                    success = True
-                    time.sleep(3)  # Rate limit sleep
-                else:
-                    logger.warning(f"⚠️ Generated section incomplete/cut-off. Discarding entirely.")
-                    # Do NOT append partial content. Fail completely to trigger skip logic below.
-                    
-            except Exception as e:
-                logger.warning(f"Drafting error: {e}")
-                time.sleep(3)
-            
-            if not success:
-                 logger.error(f"❌ Failed to draft section: {section}. Skipping.")
-                 # ATOMIC FAIL: Do not append header. Do not append error token. Just SKIP.
-                 # The blog will be shorter, but 100% clean.
+        drafted = dict(job_mgr.get_completed_sections(job_id))
+        for index in sorted(drafted):
+            if index < len(sections):
+                logger.info(f"⏭️ Section {index + 1}/{len(sections)} already completed, skipping: {sections[index]}")
+        pending = [index for index in range(len(sections)) if index not in drafted]
+        
+        pacer = RequestPacer(DRAFT_MIN_INTERVAL)
+        workers = min(DRAFT_CONCURRENCY, len(pending))
+        if workers > 1:
+            logger.info(f"✍️ Drafting {len(pending)} sections with {workers} parallel drafters")
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="blog-drafter") as pool:
+                list(pool.map(
+                    lambda index: self._draft_section(category, sections, index, research_data, job_id, drafted, pacer),
+                    pending
+                ))
+        else:
+            for index in pending:
+                self._draft_section(category, sections, index, research_data, job_id, drafted, pacer)
         
         # Assemble and return the complete blog
         # No more post-processing trim needed because we validated atomic sections upstream
+        # ATOMIC FAIL: failed sections are simply absent. The blog will be shorter, but 100% clean.
+        full_draft = [drafted[index] for index in range(len(sections)) if index in drafted]
         complete_blog = "\n".join(full_draft)
         
         logger.info(f"✅ Blog assembly complete: {len(complete_blog)} characters (Atomic Verified)")
         return complete_blog
 
+    def _draft_section(self, category: str, sections: List[str], index: int, research_data: Dict,
+                       job_id: str, drafted: Dict[int, str], pacer: RequestPacer) -> Optional[str]:
+        """
+        Draft, validate and checkpoint one section (safe to run on a drafter thread).
+        Stores the formatted section in `drafted` and returns it, or None on failure.
+        """
+        section = sections[index]
+        model_cfg = AGENT_ROLES["drafter"]
+        job_mgr = get_job_state_manager()
+        
+        # Setup section logger
+        section_logger = setup_section_logger(job_id, index, section)
+        section_logger.info(f"Starting Section {index + 1}/{len(sections)}: {section}")
+        logger.info(f"✍️ Drafting Section {index + 1}/{len(sections)}: {section}")
+        
+        # Context Chunking: Send strict context to avoid 8k limit
+        # Send: Research summary + Current Section Goal + Outline position and neighbours (for flow)
+        flow_context = section_flow_context(sections, index, drafted)
+        
+        prompt = f"""
+        You are a technical writer drafting ONE section of a blog.
+        Blog Topic: {category}
+        Current Section: "{section}"
+        
+        Global Context (Research):
+        {research_data.get("summarized_insights_text", "No research context available.")}
+        
+        Blog Flow (connect to the neighbouring sections, do not repeat what they cover):
+        {flow_context}
+        
+        TASK:
+        Write the full content for the section "{section}".
+        - Length: Approx 300-400 words.
+        - Style: Authoritative, technical, engaging.
+        - If this is a code section, provide valid code snippets.
+        - Don't write "Here is the section". Just write the content.
+        """
+
+        try:
+            pacer.wait()  # Rate limit: shared across drafter threads
+            logger.info(f"Trying model configuration for section: {section}")
+            messages = [{"role": "user", "content": prompt}]
+            content = run_agent_completion(
+                client=self.client,
+                agent_key="drafter",
+                messages=messages,
+                max_tokens=model_cfg["max_tokens"]
+            ).strip()
+            
+            # ATOMIC VALIDATION: Is this section complete?
+            if self._validate_section(content):
+                # Success! Format and Append
+                if not content.startswith("#"):
+                    formatted_section = f"\n\n## {section}\n\n{content}"
+                else:
+                    formatted_section = f"\n\n{content}"
+                
+                # SAVE TO MONGODB IMMEDIATELY
+                job_mgr.save_section(job_id, index, formatted_section)
+                section_logger.info(f"✅ Section {index} saved to MongoDB")
+                
+                # Log metrics
+                word_count = len(content.split())
+                char_count = len(content)
+                log_section_completion(section_logger, index, word_count, char_count)
+                
+                drafted[index] = formatted_section
+                return formatted_section
+            
+            logger.warning(f"⚠️ Generated section incomplete/cut-off. Discarding entirely.")
+            # Do NOT append partial content. Fail completely to trigger skip logic below.
+                
+        except Exception as e:
+            logger.warning(f"Drafting error: {e}")
+        
+        logger.error(f"❌ Failed to draft section: {section}. Skipping.")
+        # ATOMIC FAIL: Do not append header. Do not append error token. Just SKIP.
+        return None
+
     def _validate_section(self, content: str) -> bool:
         """
         Atomic Section Validator:
@@ -0,0 +1,6 @@
+"""
+Benchmarks Module
+Offline load testing and retrieval evaluation for the chat path, using local
+stand-ins (stub LLM, stub embeddings, local Chroma snapshot) instead of
+OpenRouter, Gemini and Chroma Cloud.
+"""
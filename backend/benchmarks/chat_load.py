@@ -0,0 +1,274 @@
+"""
+Chat Load Test / Benchmark
+Drives /api/ask-all-u-bot at a fixed concurrency against local stand-ins:
+a stub OpenAI-compatible LLM, a stub embedding endpoint and a local Chroma
+snapshot seeded from portfolio_data.json. No OpenRouter/Gemini/Chroma Cloud
+quota is used.
+
+Reports throughput, end-to-end p50/p95/p99, error rates, and per-stage
+percentiles taken from the server's /metrics?format=json.
+
+Usage (from repo root):
+    python -m backend.benchmarks.chat_load                         # 200 synthetic requests, concurrency 8
+    python -m backend.benchmarks.chat_load --requests 500 --concurrency 32 --llm-latency-ms 400 --llm-p95-ms 2000
+    python -m backend.benchmarks.chat_load --queries traffic.jsonl --llm-error-rate 0.05 --json result.json
+    python -m backend.benchmarks.chat_load --url http://localhost:8000   # existing server (configure its stubs yourself)
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from typing import Dict, List, Optional
+
+try:
+    from backend.benchmarks.stubs import LatencyProfile, StubEmbeddingServer, StubLLMServer
+    from backend.benchmarks.local_index import build_default_snapshot
+except ImportError:
+    from benchmarks.stubs import LatencyProfile, StubEmbeddingServer, StubLLMServer
+    from benchmarks.local_index import build_default_snapshot
+
+CHAT_PATH = "/api/ask-all-u-bot"
+# Canned replies that mean the pipeline degraded even though HTTP said 200
+DEGRADED_REPLIES = ("connection issues", "technical difficulties", "couldn't find specific details")
+
+SYNTHETIC_QUERIES = [
+    "What projects has Althaf built?",
+    "Tell me about his AWS projects",
+    "What are his skills in CI/CD?",
+    "Where did he study?",
+    "What certifications does he have?",
+    "What is his current role?",
+    "Show me the latest blog",
+    "What did he post today?",
+    "Explain his Terraform experience in detail",
+    "How can I contact him?",
+    "Compare his Kubernetes and Docker experience",
+    "What achievements does he have?",
+    "hi",
+    "Does he know monitoring tools like Prometheus?",
+    "List his cloud platforms",
+]
+
+
+def load_queries(path: Optional[str]) -> List[str]:
+    """Queries from a JSONL file (message/query/question field, or a plain string per line)"""
+    if not path:
+        return list(SYNTHETIC_QUERIES)
+    queries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                queries.append(line)
+                continue
+            if isinstance(record, str):
+                queries.append(record)
+            else:
+                text = record.get("message") or record.get("query") or record.get("question")
+                if text:
+                    queries.append(text)
+    if not queries:
+        raise SystemExit(f"No queries found in {path}")
+    return queries
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def configure_local_environment(workdir: str, llm_url: str, embed_endpoint: str, index_dir: str):
+    """Point backend.server at the stand-ins; must run before backend.server is imported"""
+    os.environ.update({
+        "CHATBOT_NEW_KEY": "benchmark-stub-key",
+        "OPENROUTER_BASE_URL": llm_url,
+        "EMBEDDING_ENDPOINT": embed_endpoint,
+        "CHROMA_PERSIST_DIR": index_dir,
+        "WARM_START": "false",
+        "TRACE_LOG_PATH": os.path.join(workdir, "traces", "chat_traces.jsonl"),
+        "TELEMETRY_DB_PATH": os.path.join(workdir, "telemetry", "chat_telemetry.db"),
+        # Empty (not unset) so .env.local cannot re-enable real fallback providers
+        "CHATBOT": "",
+        "CHATBOT_GEMINI_KEY": "",
+    })
+
+
+async def run_load(client, queries: List[str], total: int, concurrency: int,
+                   sessions: Optional[int], seed: int) -> Dict:
+    rng = random.Random(seed)
+    plan = [rng.choice(queries) for _ in range(total)]
+    session_pool = [f"bench-{uuid.uuid4().hex[:8]}" for _ in range(sessions)] if sessions else None
+    results = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for i, message in enumerate(plan):
+        queue.put_nowait((i, message))
+
+    async def worker():
+        while True:
+            try:
+                i, message = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            session_id = session_pool[i % len(session_pool)] if session_pool else f"bench-{i}"
+            start = time.perf_counter()
+            status, degraded, error = 0, False, None
+            try:
+                response = await client.post(CHAT_PATH, json={"message": message, "session_id": session_id})
+                status = response.status_code
+                reply = response.json().get("reply", "") if status == 200 else ""
+                degraded = any(marker in reply for marker in DEGRADED_REPLIES)
+            except Exception as e:
+                error = type(e).__name__
+            results.append({
+                "latency_s": time.perf_counter() - start,
+                "status": status,
+                "degraded": degraded,
+                "error": error,
+            })
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [r["latency_s"] * 1000 for r in results]
+    statuses: Dict[str, int] = {}
+    for r in results:
+        key = r["error"] or str(r["status"])
+        statuses[key] = statuses.get(key, 0) + 1
+    ok = sum(1 for r in results if r["status"] == 200 and not r["degraded"])
+    return {
+        "requests": len(results),
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(results) / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 1),
+            "p95": round(percentile(latencies, 0.95), 1),
+            "p99": round(percentile(latencies, 0.99), 1),
+            "mean": round(statistics.fmean(latencies), 1),
+            "max": round(max(latencies), 1),
+        } if latencies else {},
+        "statuses": statuses,
+        "degraded": sum(1 for r in results if r["degraded"]),
+        "error_rate": round(1 - ok / len(results), 4) if results else None,
+    }
+
+
+def print_report(report: Dict):
+    load = report["load"]
+    print(f"\n🏁 Chat benchmark: {load['requests']} requests @ concurrency {load['concurrency']}")
+    print(f"   Throughput: {load['rps']} req/s over {load['elapsed_s']}s")
+    lat = load["latency_ms"]
+    if lat:
+        print(f"   Latency:    p50 {lat['p50']}ms | p95 {lat['p95']}ms | p99 {lat['p99']}ms | max {lat['max']}ms")
+    print(f"   Statuses:   {load['statuses']}  degraded={load['degraded']}  error_rate={load['error_rate']:.2%}")
+
+    server = report.get("server_metrics") or {}
+    if server.get("stages"):
+        print(f"\n{'stage':<16} {'count':>7} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for stage, s in server["stages"].items():
+            print(f"{stage:<16} {s['count']:>7} {s['p50']:>7}ms {s['p95']:>7}ms {s['p99']:>7}ms")
+    if server.get("llm_calls"):
+        print("\nLLM calls by outcome:")
+        for model, outcomes in server["llm_calls"].items():
+            print(f"   {model}: {outcomes}")
+    if server.get("tiers"):
+        print(f"Answering tier: {server['tiers']}")
+    if report.get("stubs"):
+        print(f"Stub traffic: {report['stubs']}")
+
+
+async def _run(args) -> Dict:
+    import httpx
+
+    queries = load_queries(args.queries)
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+            load = await run_load(client, queries, args.requests, args.concurrency, args.sessions, args.seed)
+            metrics = (await client.get("/metrics", params={"format": "json"})).json()
+        return {"load": load, "server_metrics": metrics}
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="chat-bench-")
+    llm = StubLLMServer(LatencyProfile(args.llm_latency_ms, args.llm_p95_ms), args.llm_error_rate,
+                        [int(s) for s in args.llm_error_status.split(",")], seed=args.seed).start()
+    embedder = StubEmbeddingServer(LatencyProfile(args.embed_latency_ms, args.embed_p95_ms), seed=args.seed).start()
+    try:
+        index_dir = args.index or os.path.join(workdir, "chroma")
+        if not args.index:
+            count = build_default_snapshot(index_dir)
+            print(f"📦 Seeded local index with {count} records at {index_dir}")
+        configure_local_environment(workdir, llm.url, embedder.endpoint, index_dir)
+
+        from backend.server import app
+        if not args.verbose:
+            logging.getLogger().setLevel(logging.WARNING)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+            # One warm-up request so lazy imports and client creation don't skew the first sample
+            # (server-side stage counts still include it)
+            await client.post(CHAT_PATH, json={"message": "hi", "session_id": "bench-warmup"})
+            load = await run_load(client, queries, args.requests, args.concurrency, args.sessions, args.seed)
+            server_metrics = (await client.get("/metrics", params={"format": "json"})).json()
+    finally:
+        llm.stop()
+        embedder.stop()
+
+    return {
+        "load": load,
+        "server_metrics": server_metrics,
+        "stubs": {
+            "llm": {"requests": llm.stats.requests, "injected_errors": llm.stats.errors},
+            "embedding": {"requests": embedder.stats.requests},
+        },
+        "config": {k: v for k, v in vars(args).items() if k != "json"},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the chat endpoint against local stand-ins")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--queries", help="JSONL file of queries to replay (default: synthetic mix)")
+    parser.add_argument("--sessions", type=int, default=None,
+                        help="Reuse this many session ids (default: one per request; small pools hit the rate limiter)")
+    parser.add_argument("--url", help="Benchmark an already running server instead of in-process")
+    parser.add_argument("--index", help="Existing local Chroma snapshot directory (default: seed a fresh one)")
+    parser.add_argument("--workdir", help="Directory for the seeded index and traces (default: temp dir)")
+    parser.add_argument("--llm-latency-ms", type=float, default=600)
+    parser.add_argument("--llm-p95-ms", type=float, default=1500)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-error-status", default="429", help="Comma-separated statuses for injected errors")
+    parser.add_argument("--embed-latency-ms", type=float, default=80)
+    parser.add_argument("--embed-p95-ms", type=float, default=200)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Write the full report to this file")
+    parser.add_argument("--verbose", action="store_true", help="Keep server INFO logging")
+    args = parser.parse_args()
+
+    report = asyncio.run(_run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""
+Local Index Snapshot
+Builds a `portfolio_master` collection in a local Chroma PersistentClient
+from portfolio_data.json, the resume and (optionally) blog JSON files, using
+the same ids, texts and metadata as populate_vector_db.py.
+
+Embeddings default to a deterministic feature-hashing embedder so snapshots
+can be built offline; the benchmark embedding stub serves the same vectors.
+
+Usage (from repo root):
+    python -m backend.benchmarks.local_index --out /tmp/portfolio_index
+    python -m backend.benchmarks.local_index --out /tmp/idx --blogs-dir backend/generated_blogs
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+try:
+    from backend.chunking import chunk_markdown, chunk_resume
+except ImportError:
+    from chunking import chunk_markdown, chunk_resume
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DATA_PATH = os.path.join(BACKEND_DIR, "portfolio_data.json")
+DEFAULT_RESUME_PATH = os.path.join(BACKEND_DIR, "Resume Details.txt")
+COLLECTION_NAME = "portfolio_master"
+EMBEDDING_DIM = 768
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have he his in is it of on or that the this to was were what "
+    "which who with about does did can tell me you your i".split()
+)
+
+# Blog topics used when no blog files are supplied (dates are relative to the seed day)
+SYNTHETIC_BLOG_TOPICS = [
+    ("DevOps", "Blue-Green Deployments on Kubernetes", "kubernetes deployment rollout service traffic switch"),
+    ("Cloud Computing", "Cutting AWS Costs with Graviton and Spot", "aws ec2 spot graviton savings plans cost"),
+    ("AI and Machine Learning", "Serving LLMs Behind an API Gateway", "llm inference gateway latency tokens"),
+    ("DevOps", "Terraform State Locking in Teams", "terraform state dynamodb locking backend s3"),
+    ("Cybersecurity", "Scanning Container Images with Trivy", "trivy container vulnerability scanning pipeline"),
+    ("Cloud Computing", "Multi-Region Failover with Route 53", "route53 failover health checks region"),
+]
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def hashed_embedding(text: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    """Deterministic bag-of-words (+ bigrams) feature-hashing embedding, L2 normalized"""
+    vec = [0.0] * dim
+    tokens = _tokens(text)
+    features = tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+    for feature in features:
+        digest = hashlib.md5(feature.encode()).digest()
+        index = int.from_bytes(digest[:4], "little") % dim
+        vec[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
+
+
+def _clean(text) -> str:
+    return re.sub(r'\s+', ' ', str(text or "")).strip()
+
+
+def _meta(val) -> str:
+    return "Unknown" if val is None else str(val)
+
+
+def build_portfolio_documents(data_path: str = DEFAULT_DATA_PATH,
+                              resume_path: Optional[str] = DEFAULT_RESUME_PATH) -> List[Dict]:
+    """Profile/project records as populate_vector_db.py writes them: [{"id", "text", "metadata"}]"""
+    with open(data_path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    docs = []
+
+    def add(uid, text, metadata, category):
+        metadata = dict(metadata, category=category)
+        docs.append({"id": uid, "text": _clean(text), "metadata": metadata})
+
+    for i, exp in enumerate(data.get("experience", [])):
+        text = f"Role: {exp.get('role')} at {exp.get('company')}. Duration: {exp.get('duration')}. " \
+               f"Description: {exp.get('description')} Key Achievements: {', '.join(exp.get('achievements', []))}"
+        add(f"exp_{i}", text, {"type": "experience", "company": _meta(exp.get('company'))}, "profile")
+
+    for cat, skills in data.get("skills", {}).items():
+        skill_str = ", ".join(s['name'] if isinstance(s, dict) else s for s in skills)
+        add(f"skill_{cat}", f"Skill Category: {cat}. Skills: {skill_str}.",
+            {"type": "skill", "metadata_category": "personal"}, "profile")
+
+    for i, edu in enumerate(data.get("education", [])):
+        year = edu.get('year') or edu.get('duration') or 'Unknown'
+        add(f"edu_{i}", f"Education: {edu.get('degree', 'Unknown')} at {edu.get('institution', 'Unknown')}. Year: {year}.",
+            {"type": "education", "metadata_category": "education"}, "profile")
+
+    for i, cert in enumerate(data.get("certifications", [])):
+        add(f"cert_{i}", f"Certification: {cert.get('name', 'Unknown')} from {cert.get('issuer', 'Unknown')}.",
+            {"type": "certification", "metadata_category": "certifications"}, "profile")
+
+    for i, ach in enumerate(data.get("achievements", [])):
+        add(f"ach_{i}", f"Achievement: {ach.get('title', 'Unknown')}. Details: {ach.get('description', '')}",
+            {"type": "achievement", "title": _meta(ach.get('title')), "metadata_category": "achievements"}, "profile")
+
+    info = data.get("personal_info")
+    if info:
+        add("personal_info",
+            f"Personal Profile: {info.get('name')}. Title: {info.get('title')}. "
+            f"Summary: {info.get('summary', '')}. Location: {info.get('location', '')}.",
+            {"type": "personal_info", "metadata_category": "personal"}, "profile")
+        add("contacts_info",
+            f"Email: {info.get('email', '')}. Phone: {info.get('phone', '')}. LinkedIn: {info.get('linkedin', '')}. "
+            f"GitHub: {info.get('github', '')}. Website: https://www.althafportfolio.site. Location: {info.get('location', '')}.",
+            {"type": "contacts", "metadata_category": "contact"}, "profile")
+
+    for project in data.get("projects", []):
+        name = _meta(project.get('name') or project.get('title'))
+        text = f"Project: {name}. Tech Stack: {', '.join(project.get('technologies', []))}. " \
+               f"Summary: {_meta(project.get('summary'))}. Implementation Details: {_meta(project.get('details'))}"
+        add(str(project.get('id')), text, {"name": name, "metadata_category": "projects"}, "project")
+
+    if resume_path and os.path.exists(resume_path):
+        with open(resume_path, encoding="utf-8") as f:
+            resume = f.read()
+        for chunk in chunk_resume(resume, "resume_full", base_metadata={"type": "resume", "title": "Full Resume"}):
+            chunk['metadata']['title'] = f"Resume: {chunk['metadata']['section'] or 'Overview'}"
+            chunk['metadata']['category'] = "profile"
+            docs.append({"id": chunk['id'], "text": _clean(chunk['text']), "metadata": chunk['metadata']})
+
+    return docs
+
+
+def synthetic_blogs(today: Optional[date] = None) -> List[Dict]:
+    """Small dated blog set (newest published today) so date-anchored queries have answers"""
+    today = today or date.today()
+    blogs = []
+    for i, (category, title, keywords) in enumerate(SYNTHETIC_BLOG_TOPICS):
+        published = (today - timedelta(days=i * 3)).isoformat()
+        body = "\n\n".join(
+            f"## Part {n}\n\n" + f"{title} covers {keywords}. " * 6 for n in range(1, 4)
+        )
+        blogs.append({
+            "id": f"synthetic-blog-{i}",
+            "title": title,
+            "category": category,
+            "created_at": f"{published}T07:00:00",
+            "content": f"# {title}\n\n{body}",
+        })
+    return blogs
+
+
+def load_blog_files(blogs_dir: str) -> List[Dict]:
+    blogs = []
+    for name in sorted(os.listdir(blogs_dir)):
+        if name.endswith(".json") and name != "index.json":
+            with open(os.path.join(blogs_dir, name), encoding="utf-8") as f:
+                blog = json.load(f)
+            blog.setdefault("id", os.path.splitext(name)[0])
+            blogs.append(blog)
+    return blogs
+
+
+def build_blog_documents(blogs: List[Dict]) -> List[Dict]:
+    """Blog passages as populate_vector_db.sync_blogs_from_s3 writes them"""
+    docs = []
+    for blog in blogs:
+        content = blog.get('content') or blog.get('description') or ''
+        if len(content) < 50:
+            continue
+        title = _meta(blog.get('title', 'Untitled'))
+        timestamp = _meta(blog.get('created_at', blog.get('timestamp', '')))
+        metadata = {
+            "title": title,
+            "url": f"https://althafportfolio.site/blogs/{blog['id']}",
+            "timestamp": timestamp,
+            "published_date": timestamp[:10] if len(timestamp) >= 10 else '',
+            "metadata_category": "blogs",
+        }
+        for chunk in chunk_markdown(content, blog['id'], base_metadata=metadata):
+            section = chunk['metadata']['section']
+            prefix = f"Blog Title: {title}. Section: {section}. " if section else f"Blog Title: {title}. "
+            chunk['metadata'].update(category="blog", subcategory=_meta(blog.get('category', 'General')))
+            docs.append({"id": chunk['id'], "text": _clean(prefix + chunk['text']), "metadata": chunk['metadata']})
+    return docs
+
+
+def seed_local_index(persist_dir: str, documents: List[Dict], embed=hashed_embedding,
+                     batch_size: int = 100) -> int:
+    """(Re)create portfolio_master under persist_dir with the given documents"""
+    import chromadb
+
+    client = chromadb.PersistentClient(path=persist_dir)
+    try:
+        client.delete_collection(COLLECTION_NAME)
+    except Exception:
+        pass
+    collection = client.create_collection(COLLECTION_NAME, embedding_function=None)
+    for i in range(0, len(documents), batch_size):
+        batch = documents[i:i + batch_size]
+        collection.add(
+            ids=[d["id"] for d in batch],
+            documents=[d["text"] for d in batch],
+            metadatas=[d["metadata"] for d in batch],
+            embeddings=[embed(d["text"]) for d in batch],
+        )
+    return collection.count()
+
+
+def build_default_snapshot(persist_dir: str, blogs_dir: Optional[str] = None,
+                           today: Optional[date] = None) -> int:
+    """Portfolio + resume + blogs (files, or the synthetic set) into persist_dir"""
+    blogs = load_blog_files(blogs_dir) if blogs_dir else synthetic_blogs(today)
+    documents = build_portfolio_documents() + build_blog_documents(blogs)
+    return seed_local_index(persist_dir, documents)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a local portfolio_master snapshot")
+    parser.add_argument("--out", required=True, help="PersistentClient directory")
+    parser.add_argument("--blogs-dir", help="Directory of blog JSON files (default: synthetic dated blogs)")
+    args = parser.parse_args()
+
+    count = build_default_snapshot(args.out, args.blogs_dir)
+    print(f"✅ Seeded {count} records into {args.out}/{COLLECTION_NAME}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Retrieval Evaluation
+Runs a labeled query set through the same plan/select logic as
+get_portfolio_context (backend/retrieval.py) against a local index snapshot
+and scores each retrieval configuration:
+
+- recall@k (capped: relevant found in top k / min(k, #relevant)), hit rate, MRR
+- candidate recall (relevant anywhere in the fetched candidates, before clamping)
+- injected context size in tokens (~4 chars/token, before LLM summarization)
+- embedding and Chroma query latency p50/p95
+
+Labels live in retrieval_queries.jsonl: {"question", "relevant": [source ids],
+"intent"?}. Source ids are what get_portfolio_context injects after passage
+grouping (blog id, "resume_full", project id, exp_0, cert_3, ...). Without an
+"intent" the production router (detect_intent_priority) decides.
+
+Usage (from repo root):
+    python -m backend.benchmarks.retrieval_eval                       # all presets on a fresh synthetic snapshot
+    python -m backend.benchmarks.retrieval_eval --config default --config lean --show-misses
+    python -m backend.benchmarks.retrieval_eval --config "try:cand=4,inj=2,blog_cand=10,blog_inj=2,hybrid=1"
+    python -m backend.benchmarks.retrieval_eval --index /tmp/portfolio_index --today 2026-01-16 --json eval.json
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, replace
+from datetime import date
+from typing import Callable, Dict, List, Optional
+
+try:
+    from backend.retrieval import RetrievalConfig, format_passage, plan_query, select_hits
+    from backend.benchmarks.local_index import COLLECTION_NAME, build_default_snapshot, hashed_embedding
+except ImportError:
+    from retrieval import RetrievalConfig, format_passage, plan_query, select_hits
+    from benchmarks.local_index import COLLECTION_NAME, build_default_snapshot, hashed_embedding
+
+DEFAULT_QUERIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "retrieval_queries.jsonl")
+CHARS_PER_TOKEN = 4
+DEFAULT_KS = (1, 3, 6)
+
+PRESETS = {
+    "default": RetrievalConfig(name="default"),
+    "lean": RetrievalConfig(name="lean", candidate_limit=4, injection_limit=3,
+                            blog_candidate_limit=12, blog_injection_limit=3),
+    "tight": RetrievalConfig(name="tight", candidate_limit=3, injection_limit=2,
+                             blog_candidate_limit=8, blog_injection_limit=2),
+    "no_filters": RetrievalConfig(name="no_filters", use_filters=False),
+    "hybrid": RetrievalConfig(name="hybrid", hybrid=True),
+    "lean_hybrid": RetrievalConfig(name="lean_hybrid", candidate_limit=4, injection_limit=3,
+                                   blog_candidate_limit=12, blog_injection_limit=3, hybrid=True),
+}
+
+_CONFIG_KEYS = {
+    "cand": "candidate_limit", "inj": "injection_limit",
+    "blog_cand": "blog_candidate_limit", "blog_inj": "blog_injection_limit",
+    "filters": "use_filters", "hybrid": "hybrid", "chunks": "max_chunks_per_source",
+}
+
+
+def parse_config(spec: str) -> RetrievalConfig:
+    """Preset name, or "name:key=val,..." (keys: cand, inj, blog_cand, blog_inj, filters, hybrid, chunks)"""
+    if spec in PRESETS:
+        return PRESETS[spec]
+    name, _, body = spec.partition(":")
+    base = PRESETS["default"]
+    overrides = {"name": name}
+    for pair in filter(None, body.split(",")):
+        key, _, value = pair.partition("=")
+        field_name = _CONFIG_KEYS.get(key.strip())
+        if not field_name:
+            raise SystemExit(f"Unknown config key '{key}' in '{spec}' (expected one of {sorted(_CONFIG_KEYS)})")
+        is_bool = isinstance(getattr(base, field_name), bool)
+        overrides[field_name] = value.strip().lower() in ("1", "true", "yes") if is_bool else int(value)
+    return replace(base, **overrides)
+
+
+def load_labeled_queries(path: str = DEFAULT_QUERIES_PATH) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _router() -> Callable[[str], str]:
+    """Production intent router, mapped the way ask_agent maps it for retrieval"""
+    try:
+        from backend.server import detect_intent_priority
+    except ImportError:
+        from server import detect_intent_priority
+    logging.getLogger().setLevel(logging.WARNING)
+
+    def route(question: str) -> str:
+        intent, _, _ = detect_intent_priority(question)
+        return "profile" if intent == "conversation" else intent
+    return route
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def score_ranking(retrieved: List[str], relevant: List[str], ks=DEFAULT_KS) -> Dict:
+    relevant_set = set(relevant)
+    scores = {}
+    for k in ks:
+        found = len(relevant_set.intersection(retrieved[:k]))
+        scores[f"recall@{k}"] = found / min(k, len(relevant_set)) if relevant_set else 0.0
+    first = next((rank for rank, rid in enumerate(retrieved, 1) if rid in relevant_set), None)
+    scores["mrr"] = 1 / first if first else 0.0
+    scores["hit"] = 1.0 if first else 0.0
+    return scores
+
+
+def evaluate_config(collection, labeled: List[Dict], config: RetrievalConfig, route: Callable[[str], str],
+                    embed: Callable[[str], List[float]] = hashed_embedding,
+                    today: Optional[date] = None, ks=DEFAULT_KS) -> Dict:
+    per_query = []
+    for item in labeled:
+        question = item["question"]
+        intent = item.get("intent") or route(question)
+        plan = plan_query(question, intent, config)
+
+        started = time.perf_counter()
+        vector = embed(plan.search_query)
+        embed_ms = (time.perf_counter() - started) * 1000
+
+        query_kwargs = {"query_embeddings": [vector], "n_results": plan.n_results}
+        if plan.where:
+            query_kwargs["where"] = plan.where
+        started = time.perf_counter()
+        results = collection.query(**query_kwargs)
+        query_ms = (time.perf_counter() - started) * 1000
+
+        candidate_sources = {m.get("parent_id") or i for i, m in zip(results["ids"][0], results["metadatas"][0])}
+        docs, metas, ids = select_hits(question, results, plan.injection_limit, intent == "blogs", config, today)
+        context = "\n\n".join(
+            format_passage(d, m, COLLECTION_NAME) or f"[Source: {m.get('title', COLLECTION_NAME)}]\n{d}"
+            for d, m in zip(docs, metas)
+        )
+
+        scores = score_ranking(ids, item["relevant"], ks)
+        relevant = set(item["relevant"])
+        scores["candidate_recall"] = len(relevant & candidate_sources) / len(relevant) if relevant else 0.0
+        per_query.append({
+            "question": question,
+            "intent": intent,
+            "retrieved": ids,
+            "relevant": item["relevant"],
+            "tokens": len(context) // CHARS_PER_TOKEN,
+            "embed_ms": embed_ms,
+            "query_ms": query_ms,
+            **scores,
+        })
+
+    def mean(key):
+        return round(statistics.fmean(q[key] for q in per_query), 4) if per_query else 0.0
+
+    tokens = [q["tokens"] for q in per_query]
+    query_ms = [q["query_ms"] for q in per_query]
+    embed_ms = [q["embed_ms"] for q in per_query]
+    summary = {f"recall@{k}": mean(f"recall@{k}") for k in ks}
+    summary.update({
+        "hit_rate": mean("hit"),
+        "mrr": mean("mrr"),
+        "candidate_recall": mean("candidate_recall"),
+        "tokens_mean": round(statistics.fmean(tokens), 1) if tokens else 0,
+        "tokens_p95": _percentile(tokens, 0.95),
+        "query_ms_p50": round(_percentile(query_ms, 0.50), 2),
+        "query_ms_p95": round(_percentile(query_ms, 0.95), 2),
+        "embed_ms_p50": round(_percentile(embed_ms, 0.50), 2),
+    })
+    return {"config": asdict(config), "summary": summary, "queries": per_query}
+
+
+def print_report(reports: List[Dict], ks=DEFAULT_KS, show_misses: bool = False):
+    recall_cols = "".join(f"{'R@' + str(k):>7}" for k in ks)
+    print(f"\n{'config':<14} {'cand/inj':>9} {'blog':>7}{recall_cols} {'hit':>6} {'MRR':>6} {'candR':>6} "
+          f"{'tok':>6} {'tok95':>6} {'q p50':>8} {'q p95':>8}")
+    for report in reports:
+        c, s = report["config"], report["summary"]
+        flags = ("" if c["use_filters"] else " nf") + (" hy" if c["hybrid"] else "")
+        recalls = "".join(f"{s[f'recall@{k}']:>7.3f}" for k in ks)
+        print(f"{c['name'] + flags:<14} {c['candidate_limit']:>4}/{c['injection_limit']:<4} "
+              f"{c['blog_candidate_limit']:>3}/{c['blog_injection_limit']:<3}{recalls} {s['hit_rate']:>6.3f} "
+              f"{s['mrr']:>6.3f} {s['candidate_recall']:>6.3f} {s['tokens_mean']:>6.0f} {s['tokens_p95']:>6} "
+              f"{s['query_ms_p50']:>6.1f}ms {s['query_ms_p95']:>6.1f}ms")
+
+    if show_misses:
+        for report in reports:
+            misses = [q for q in report["queries"] if not q["hit"]]
+            if misses:
+                print(f"\n❌ Misses for {report['config']['name']}:")
+                for q in misses:
+                    print(f"   [{q['intent']}] {q['question']}\n      got {q['retrieved']} | want {q['relevant']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline retrieval quality/latency evaluation")
+    parser.add_argument("--queries", default=DEFAULT_QUERIES_PATH, help="Labeled JSONL query set")
+    parser.add_argument("--index", help="Existing local snapshot (default: seed a fresh synthetic one)")
+    parser.add_argument("--blogs-dir", help="Blog JSON files for the fresh snapshot (default: synthetic dated blogs)")
+    parser.add_argument("--today", help="Date for 'today' anchoring, YYYY-MM-DD (default: today)")
+    parser.add_argument("--config", action="append",
+                        help=f"Preset ({', '.join(PRESETS)}) or 'name:cand=..,inj=..,blog_cand=..,blog_inj=..,"
+                             f"filters=0|1,hybrid=0|1,chunks=..'; repeatable (default: all presets)")
+    parser.add_argument("--k", type=int, action="append", help="Recall cut-offs (default: 1, 3, 6)")
+    parser.add_argument("--embedding-endpoint",
+                        help="Embed queries via this HTTP endpoint (must match how --index was embedded)")
+    parser.add_argument("--show-misses", action="store_true")
+    parser.add_argument("--json", help="Write summaries and per-query results to this file")
+    args = parser.parse_args()
+
+    import chromadb
+
+    today = date.fromisoformat(args.today) if args.today else None
+    index_dir = args.index
+    if not index_dir:
+        index_dir = os.path.join(tempfile.mkdtemp(prefix="retrieval-eval-"), "chroma")
+        count = build_default_snapshot(index_dir, args.blogs_dir, today)
+        print(f"📦 Seeded local index with {count} records at {index_dir}")
+
+    embed = hashed_embedding
+    if args.embedding_endpoint:
+        try:
+            from backend.gemini_embeddings import HttpEmbeddingFunction
+        except ImportError:
+            from gemini_embeddings import HttpEmbeddingFunction
+        http_embed = HttpEmbeddingFunction(args.embedding_endpoint)
+        embed = lambda text: list(http_embed([text])[0])
+
+    collection = chromadb.PersistentClient(path=index_dir).get_collection(COLLECTION_NAME, embedding_function=None)
+    labeled = load_labeled_queries(args.queries)
+    configs = [parse_config(spec) for spec in args.config] if args.config else list(PRESETS.values())
+    ks = tuple(args.k) if args.k else DEFAULT_KS
+    route = _router()
+
+    reports = [evaluate_config(collection, labeled, config, route, embed, today, ks) for config in configs]
+    print(f"📊 {len(labeled)} labeled queries")
+    print_report(reports, ks, args.show_misses)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2, default=str)
+        print(f"\n📝 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Local Stand-In Servers for Benchmarks
+- StubLLMServer: OpenAI-compatible POST /chat/completions with configurable
+  latency (log-normal from a median and p95) and error injection
+- StubEmbeddingServer: POST /embed {"texts": [...]} -> {"embeddings": [...]}
+  serving the same hashed vectors used to build the local index snapshot
+
+Both run on 127.0.0.1 in daemon threads (ThreadingHTTPServer).
+"""
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional
+
+try:
+    from backend.benchmarks.local_index import hashed_embedding
+except ImportError:
+    from benchmarks.local_index import hashed_embedding
+
+_Z95 = 1.6449  # standard normal 95th percentile
+
+
+@dataclass
+class LatencyProfile:
+    """Log-normal latency defined by its median and p95 (milliseconds)"""
+    median_ms: float = 0.0
+    p95_ms: Optional[float] = None
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        p95 = self.p95_ms if self.p95_ms and self.p95_ms > self.median_ms else self.median_ms
+        sigma = math.log(p95 / self.median_ms) / _Z95
+        return rng.lognormvariate(math.log(self.median_ms), sigma) / 1000.0
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    errors: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, error: bool):
+        with self.lock:
+            self.requests += 1
+            self.errors += int(error)
+
+
+class _StubServer:
+    """Base: owns the HTTP server thread and exposes `url`"""
+
+    def __init__(self):
+        self.stats = StubStats()
+        self._server = None
+        self._thread = None
+
+    def _handler(self) -> type:
+        raise NotImplementedError
+
+    def start(self) -> "_StubServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _make_handler(respond: Callable[[str, dict], tuple]) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                payload = {}
+            status, body = respond(self.path, payload)
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # keep benchmark output clean
+
+    return Handler
+
+
+class StubLLMServer(_StubServer):
+    """OpenAI-compatible chat completions stub"""
+
+    def __init__(self, latency: LatencyProfile = None, error_rate: float = 0.0,
+                 error_statuses: List[int] = None, seed: int = 7):
+        super().__init__()
+        self.latency = latency or LatencyProfile(600, 1500)
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses or [429]
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def _handler(self) -> type:
+        return _make_handler(self._respond)
+
+    def _respond(self, path: str, payload: dict) -> tuple:
+        if not path.rstrip("/").endswith("/chat/completions"):
+            return 404, {"error": "not found"}
+        with self._rng_lock:
+            delay = self.latency.sample(self._rng)
+            fail = self._rng.random() < self.error_rate
+            status = self._rng.choice(self.error_statuses)
+        time.sleep(delay)
+        self.stats.record(fail)
+        if fail:
+            return status, {"error": {"message": "stub injected error", "code": status}}
+
+        messages = payload.get("messages") or [{}]
+        question = str(messages[-1].get("content", ""))[-200:]
+        words = max(20, min(int(payload.get("max_tokens", 300)) // 3, 120))
+        text = ("Althaf has hands-on experience with AWS, Terraform, Kubernetes and CI/CD pipelines. " * 12)
+        reply = " ".join(text.split()[:words]) + f" (stub answer to: {question[:60]})"
+        return 200, {
+            "id": "stub-completion",
+            "object": "chat.completion",
+            "model": payload.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": sum(len(str(m.get("content", ""))) for m in messages) // 4,
+                      "completion_tokens": words},
+        }
+
+
+class StubEmbeddingServer(_StubServer):
+    """Embedding stub returning hashed_embedding vectors"""
+
+    def __init__(self, latency: LatencyProfile = None, seed: int = 11):
+        super().__init__()
+        self.latency = latency or LatencyProfile(80, 200)
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def _handler(self) -> type:
+        return _make_handler(self._respond)
+
+    def _respond(self, path: str, payload: dict) -> tuple:
+        with self._rng_lock:
+            delay = self.latency.sample(self._rng)
+        time.sleep(delay)
+        self.stats.record(False)
+        texts = payload.get("texts") or []
+        return 200, {"embeddings": [hashed_embedding(t) for t in texts]}
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.url}/embed"
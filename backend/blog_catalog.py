@@ -0,0 +1,244 @@
+"""
+Blog Catalog
+In-process cache of the active blog listing served by GET /api/blogs.
+
+The listing itself is materialized in S3 (blogs/active.json, see
+blog_listing.py): already merged, deduplicated, sorted and
+retention-filtered, with per-category counts. This module only keeps the
+current copy in memory:
+- it is revalidated with a conditional GET (If-None-Match) once older than
+  BLOG_CATALOG_TTL seconds. Stale copies keep being served while a single
+  background refresh runs; only a cold or invalidated catalog makes the
+  caller wait, and concurrent callers share that one fetch.
+- a listing that was never written is materialized on first use.
+- generated_blogs/*.json is watched by name/mtime/size signature; a change
+  made outside the publisher rebuilds the listing in the background.
+
+BlogPublisher.publish calls invalidate_blog_catalog() so a new post shows up
+on the next request.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from backend.blog_listing import ListingIndex, build_active_listing, materialize_active_listing
+    from backend.read_local_blogs import BLOG_DIR, get_local_blogs
+except ImportError:
+    from blog_listing import ListingIndex, build_active_listing, materialize_active_listing
+    from read_local_blogs import BLOG_DIR, get_local_blogs
+
+logger = logging.getLogger("BlogCatalog")
+
+DEFAULT_TTL_SECONDS = float(os.getenv("BLOG_CATALOG_TTL", "60"))
+# Past this age a stale S3 copy is no longer served while revalidating
+DEFAULT_MAX_STALE_SECONDS = float(os.getenv("BLOG_CATALOG_MAX_STALE", "3600"))
+
+EMPTY_LISTING: Dict = {"blogs": [], "category_counts": {}, "total_blogs": 0}
+
+
+def local_signature(blog_dir: str) -> Tuple:
+    """Cheap change detector for the local blog directory"""
+    try:
+        with os.scandir(blog_dir) as entries:
+            return tuple(sorted(
+                (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                for entry in entries if entry.name.endswith('.json')
+            ))
+    except FileNotFoundError:
+        return ()
+
+
+class BlogCatalog:
+    """Thread-safe cached active listing (see module docstring)"""
+
+    def __init__(self, storage_factory: Optional[Callable] = None, blog_dir: str = BLOG_DIR,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_stale_seconds: float = DEFAULT_MAX_STALE_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self._storage_factory = storage_factory
+        self.blog_dir = blog_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._s3_lock = threading.Lock()  # single-flight for S3 fetches and rebuilds
+        self._refreshing = False
+        self._generation = 0  # bumped by invalidate()
+
+        self._listing: Dict = EMPTY_LISTING
+        self._etag: Optional[str] = None
+        self._fetched_at: Optional[float] = None  # None = cold or invalidated
+        self._local_sig: Optional[Tuple] = None
+        self._index: Optional[ListingIndex] = None
+        self._index_of: Optional[Dict] = None  # listing the index was built from
+
+    # ── public API ────────────────────────────────────────
+    def get_listing(self) -> Dict:
+        """Active listing document; shared, callers must not mutate it"""
+        if self._storage_factory is None:
+            self._check_local_only()
+        else:
+            self._check_local()
+            self._check_s3()
+        with self._lock:
+            return self._listing
+
+    def get_blogs(self) -> List[Dict]:
+        return self.get_listing()["blogs"]
+
+    def would_block(self) -> bool:
+        """True when the next read must wait on S3 (cold, invalidated or too stale);
+        async callers offload those reads to the S3 thread pool"""
+        if self._storage_factory is None:
+            return False
+        with self._lock:
+            return self._fetched_at is None or self._clock() - self._fetched_at >= self.max_stale_seconds
+
+    def get_index(self) -> Tuple[Dict, ListingIndex]:
+        """Current listing plus its category/tag orderings (rebuilt only when the listing changes)"""
+        listing = self.get_listing()
+        with self._lock:
+            if self._index_of is not listing:
+                self._index = ListingIndex(listing)
+                self._index_of = listing
+            return listing, self._index
+
+    def invalidate(self):
+        """Force the next read to revalidate S3 (conditional GET).
+
+        Callers that invalidate have just rebuilt the listing themselves, so
+        their local file changes become the new baseline instead of
+        triggering a second rebuild.
+        """
+        with self._lock:
+            self._fetched_at = None
+            self._generation += 1
+            self._local_sig = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            age = None if self._fetched_at is None else round(self._clock() - self._fetched_at, 1)
+            return {
+                "blogs": len(self._listing["blogs"]),
+                "generated_at": self._listing.get("generated_at"),
+                "etag": self._etag,
+                "age_s": age,
+                "refreshing": self._refreshing,
+            }
+
+    # ── S3 ────────────────────────────────────────────────
+    def _check_s3(self):
+        with self._lock:
+            fetched_at = self._fetched_at
+            age = None if fetched_at is None else self._clock() - fetched_at
+            if age is not None and age < self.ttl_seconds:
+                return
+            serve_stale = age is not None and age < self.max_stale_seconds
+            if serve_stale:
+                if self._refreshing:
+                    return
+                self._refreshing = True
+        if serve_stale:
+            threading.Thread(target=self._background_refresh, daemon=True,
+                             name="BlogCatalogRefresh").start()
+        else:
+            self._refresh_s3(fetched_at)
+
+    def _background_refresh(self, rebuild: bool = False):
+        try:
+            self._refresh_s3(None, rebuild=rebuild)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _refresh_s3(self, seen_fetched_at: Optional[float], rebuild: bool = False):
+        with self._s3_lock:
+            with self._lock:
+                # Another caller finished a fetch while we waited on the lock
+                if not rebuild and self._fetched_at is not None and self._fetched_at != seen_fetched_at \
+                        and self._clock() - self._fetched_at < self.ttl_seconds:
+                    return
+                etag = self._etag
+                generation = self._generation
+            started = self._clock()
+            try:
+                storage = self._storage_factory()
+                if rebuild:
+                    data, new_etag = self._materialize(storage), None
+                else:
+                    data, new_etag = storage.read_active_listing_if_changed(etag)
+                    if data is None and new_etag is None:
+                        logger.info("No active listing in S3 yet, materializing it")
+                        data = self._materialize(storage)
+            except Exception as e:
+                # Keep serving the last good copy; retry after another TTL
+                logger.warning(f"Blog catalog S3 refresh failed: {e}")
+                with self._lock:
+                    if generation == self._generation:
+                        self._fetched_at = started
+                return
+            with self._lock:
+                if data is not None:
+                    self._listing = data
+                    self._etag = new_etag
+                    logger.info(f"Blog catalog loaded {len(data.get('blogs', []))} active blogs "
+                                f"(generated {data.get('generated_at')})")
+                # An invalidation that raced this fetch still forces the next read to revalidate
+                if generation == self._generation:
+                    self._fetched_at = started
+
+    def _materialize(self, storage) -> Dict:
+        return materialize_active_listing(storage, local_blogs=get_local_blogs(self.blog_dir))
+
+    # ── local directory ───────────────────────────────────
+    def _check_local(self):
+        signature = local_signature(self.blog_dir)
+        with self._lock:
+            previous, self._local_sig = self._local_sig, signature
+        # The first scan only records a baseline; the listing already includes local blogs
+        if previous is None or signature == previous:
+            return
+        logger.info("Local blogs changed, rebuilding the active listing in the background")
+        with self._lock:
+            if self._refreshing:
+                # Lost to a running refresh: forget the new baseline so the next read retries
+                self._local_sig = previous
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, args=(True,), daemon=True,
+                         name="BlogCatalogRebuild").start()
+
+    def _check_local_only(self):
+        """No S3 configured: build the listing from disk alone"""
+        signature = local_signature(self.blog_dir)
+        with self._lock:
+            if signature == self._local_sig:
+                return
+        listing = build_active_listing(get_local_blogs(self.blog_dir)) if signature else EMPTY_LISTING
+        with self._lock:
+            self._listing = listing
+            self._local_sig = signature
+
+
+_catalog: Optional[BlogCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_blog_catalog(storage_factory: Optional[Callable] = None) -> BlogCatalog:
+    """Shared process-wide catalog, created on first use"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = BlogCatalog(storage_factory)
+    return _catalog
+
+
+def invalidate_blog_catalog():
+    """Called after a publish or cleanup; a no-op in processes that never served blogs"""
+    if _catalog is not None:
+        _catalog.invalidate()
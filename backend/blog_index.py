@@ -0,0 +1,296 @@
+"""
+Sharded Blog Index
+The S3 blog index, split by creation month so it stays small to read and
+safe to write concurrently:
+
+    blogs/index/manifest.json   {"version": 1, "updated_at": ..., "total": N,
+                                 "shards": [{"month": "2026-10", "key": ...,
+                                             "count": n, "newest": ...}]}
+    blogs/index/2026-10.json    {"month": "2026-10", "blogs": [<index entries, newest first>]}
+
+- Every write is a conditional PUT: If-Match on the ETag that was read, or
+  If-None-Match: * when creating. A 412/409 means another writer got there
+  first, so the object is re-read, the change re-applied and the PUT retried
+  with backoff. Concurrent publishes and fix-up scripts cannot drop entries.
+- Objects are minified, gzip-encoded JSON (s3_access.json_object).
+- Readers fetch the manifest, then only the shards they need (read_recent
+  for the retention window); shard reads run in parallel.
+- Entries are removed or swapped the same way (remove/replace), so
+  fix-up scripts never rewrite a whole document another writer may own.
+- blogs/index.json (the old single document) is still written as a derived
+  mirror for the maintenance scripts that read it; nothing in the app reads
+  it once the manifest exists.
+"""
+import logging
+import random
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from botocore.exceptions import ClientError
+
+try:
+    from backend.s3_access import json_object, read_json_body
+except ImportError:
+    from s3_access import json_object, read_json_body
+
+logger = logging.getLogger("BlogIndex")
+
+INDEX_PREFIX = "blogs/index/"
+MANIFEST_KEY = f"{INDEX_PREFIX}manifest.json"
+MANIFEST_VERSION = 1
+UNDATED = "undated"
+MAX_WRITE_ATTEMPTS = 6
+MAX_PARALLEL_SHARD_READS = 8
+CONFLICT_CODES = ("PreconditionFailed", "ConditionalRequestConflict", "412", "409")
+
+
+class IndexWriteConflict(Exception):
+    """A conditional write kept losing to other writers"""
+
+
+def shard_month(created_at) -> str:
+    value = str(created_at or "")
+    return value[:7] if re.match(r"\d{4}-\d{2}", value) else UNDATED
+
+
+def shard_key(month: str) -> str:
+    return f"{INDEX_PREFIX}{month}.json"
+
+
+def _created_at(entry: Dict) -> str:
+    return str(entry.get('created_at') or '')
+
+
+def _error_code(error: ClientError) -> str:
+    return str(error.response.get("Error", {}).get("Code", ""))
+
+
+def _month_order(shard: Dict):
+    # Newest month first, undated shards last
+    return (shard["month"] != UNDATED, shard["month"])
+
+
+class ShardedBlogIndex:
+    def __init__(self, s3, bucket: str, sleep: Callable[[float], None] = time.sleep):
+        self.s3 = s3
+        self.bucket = bucket
+        self._sleep = sleep
+
+    # --- raw conditional I/O ------------------------------------------------
+
+    def _get(self, key: str, etag: Optional[str] = None) -> Tuple[Optional[Dict], Optional[str]]:
+        """(data, etag); (None, etag) on 304, (None, None) when the object is missing"""
+        kwargs = {"Bucket": self.bucket, "Key": key}
+        if etag:
+            kwargs["IfNoneMatch"] = etag
+        try:
+            response = self.s3.get_object(**kwargs)
+        except self.s3.exceptions.NoSuchKey:
+            return None, None
+        except ClientError as e:
+            code = _error_code(e)
+            if code in ("304", "NotModified"):
+                return None, etag
+            if code in ("404", "NoSuchKey"):
+                return None, None
+            raise
+        return read_json_body(response), response.get('ETag')
+
+    def _put(self, key: str, data: Dict, if_match: Optional[str] = None,
+             create_only: bool = False) -> Optional[str]:
+        kwargs = {"Bucket": self.bucket, "Key": key, **json_object(data)}
+        if if_match:
+            kwargs["IfMatch"] = if_match
+        elif create_only:
+            kwargs["IfNoneMatch"] = "*"
+        return self.s3.put_object(**kwargs).get('ETag')
+
+    def update(self, key: str, mutate: Callable[[Optional[Dict]], Optional[Dict]]) -> Optional[Dict]:
+        """Conditional read-modify-write of one object, retried on conflicts.
+
+        When `mutate` returns None nothing is written and the current object is returned.
+        """
+        for attempt in range(MAX_WRITE_ATTEMPTS):
+            current, etag = self._get(key)
+            data = mutate(current)
+            if data is None:
+                return current
+            try:
+                self._put(key, data, if_match=etag, create_only=etag is None)
+                return data
+            except ClientError as e:
+                if _error_code(e) not in CONFLICT_CODES:
+                    raise
+                logger.info(f"Write conflict on {key} (attempt {attempt + 1}), retrying")
+                self._sleep(min(2.0, 0.05 * 2 ** attempt) * random.uniform(0.5, 1.5))
+        raise IndexWriteConflict(f"Gave up writing {key} after {MAX_WRITE_ATTEMPTS} conflicts")
+
+    # --- readers ------------------------------------------------------------
+
+    def read_manifest_if_changed(self, etag: Optional[str] = None):
+        return self._get(MANIFEST_KEY, etag)
+
+    def read_shards(self, shards: List[Dict]) -> List[Dict]:
+        """Entries of the given shards, newest first and deduplicated by id.
+
+        A listed shard that cannot be read is an error (never a silently
+        shorter index).
+        """
+        def read(shard):
+            data, _ = self._get(shard["key"])
+            if data is None:
+                raise KeyError(f"Index shard missing: {shard['key']}")
+            return data.get("blogs", [])
+
+        if len(shards) <= 1:
+            chunks = [read(shard) for shard in shards]
+        else:
+            with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_SHARD_READS, len(shards)),
+                                    thread_name_prefix="index-shards") as pool:
+                chunks = list(pool.map(read, shards))
+        seen = set()
+        entries = []
+        for entry in sorted((e for chunk in chunks for e in chunk), key=_created_at, reverse=True):
+            if entry.get('id') not in seen:
+                seen.add(entry.get('id'))
+                entries.append(entry)
+        return entries
+
+    def read_all(self, manifest: Dict) -> List[Dict]:
+        return self.read_shards(manifest.get("shards", []))
+
+    def read_recent(self, manifest: Dict, since_month: str, min_count: int = 0) -> List[Dict]:
+        """Shards from `since_month` onwards, plus older ones until `min_count` entries are covered.
+
+        Undated entries count as recent under the retention rule, so their shard is always read.
+        """
+        wanted = []
+        covered = 0
+        for shard in sorted(manifest.get("shards", []), key=_month_order, reverse=True):
+            if shard["month"] == UNDATED or shard["month"] >= since_month or covered < min_count:
+                wanted.append(shard)
+                covered += shard.get("count", 0)
+        return self.read_shards(wanted)
+
+    # --- writers ------------------------------------------------------------
+
+    def upsert(self, entry: Dict) -> Dict:
+        """Add (or replace) one entry; returns the updated manifest"""
+        return self.merge([entry])
+
+    def merge(self, entries: List[Dict]) -> Dict:
+        """Conditionally merge entries into their shards, then into the manifest"""
+        by_month: Dict[str, List[Dict]] = defaultdict(list)
+        for entry in entries:
+            by_month[shard_month(entry.get('created_at'))].append(entry)
+
+        written = {}
+        for month, new_entries in by_month.items():
+            new_ids = {e['id'] for e in new_entries}
+
+            def add(shard, month=month, new_entries=new_entries, new_ids=new_ids):
+                kept = [b for b in (shard or {}).get("blogs", []) if b.get('id') not in new_ids]
+                return {"month": month, "blogs": sorted(new_entries + kept, key=_created_at, reverse=True)}
+
+            written[month] = self.update(shard_key(month), add)
+
+        def record(manifest):
+            manifest = manifest or {"version": MANIFEST_VERSION, "shards": []}
+            shards = {s["month"]: s for s in manifest.get("shards", [])}
+            for month, shard in written.items():
+                old = shards.get(month, {})
+                blogs = shard["blogs"]
+                # Merges only add, so a larger count/newer date already recorded
+                # came from a concurrent writer and must not be rolled back
+                shards[month] = {
+                    "month": month,
+                    "key": shard_key(month),
+                    "count": max(old.get("count", 0), len(blogs)),
+                    "newest": max(old.get("newest", ""), _created_at(blogs[0]) if blogs else ""),
+                }
+            return self._manifest(manifest, shards.values())
+
+        return self.update(MANIFEST_KEY, record)
+
+    def remove(self, ids: Iterable[str]) -> Optional[Dict]:
+        """Conditionally drop entries by id from their shards and the manifest counts.
+
+        Returns the updated manifest (None when there is no sharded index yet).
+        """
+        ids = set(ids)
+        return self._drop(lambda month: ids)
+
+    def replace(self, entry: Dict, old_id: Optional[str] = None) -> Dict:
+        """Write `entry` in place of its previous version, which may sit in
+        another month shard (created_at changed) or under `old_id` (renamed)"""
+        month = shard_month(entry.get('created_at'))
+        manifest = self.merge([entry])
+        stale = {old_id} - {None, entry['id']}
+        return self._drop(lambda m: stale if m == month else stale | {entry['id']}) or manifest
+
+    def _drop(self, ids_for: Callable[[str], Set[str]]) -> Optional[Dict]:
+        manifest, _ = self.read_manifest_if_changed()
+        if manifest is None:
+            return None
+
+        written = {}
+        for shard in manifest.get("shards", []):
+            month, ids = shard["month"], ids_for(shard["month"])
+            if not ids:
+                continue
+
+            def drop(current, month=month, ids=ids):
+                blogs = (current or {}).get("blogs", [])
+                kept = [b for b in blogs if b.get('id') not in ids]
+                if len(kept) == len(blogs):
+                    written.pop(month, None)
+                    return None
+                written[month] = (len(blogs) - len(kept), kept)
+                return {"month": month, "blogs": kept}
+
+            self.update(shard_key(month), drop)
+        if not written:
+            return manifest
+
+        def record(manifest):
+            manifest = manifest or {"version": MANIFEST_VERSION, "shards": []}
+            shards = {s["month"]: s for s in manifest.get("shards", [])}
+            for month, (dropped, blogs) in written.items():
+                old = shards.get(month)
+                if old is None:
+                    continue
+                # Decrement rather than recount: entries a concurrent merge added
+                # after our shard write are already in the recorded count
+                count = max(0, old.get("count", 0) - dropped)
+                if count == 0 and not blogs:
+                    del shards[month]
+                else:
+                    shards[month] = dict(old, count=count,
+                                         newest=_created_at(blogs[0]) if blogs else old.get("newest", ""))
+            return self._manifest(manifest, shards.values())
+
+        return self.update(MANIFEST_KEY, record)
+
+    def rebuild(self, entries: List[Dict]) -> Dict:
+        """Replace the whole index with `entries` (maintenance scripts only: not merge-safe)"""
+        by_month: Dict[str, List[Dict]] = defaultdict(list)
+        for entry in sorted(entries, key=_created_at, reverse=True):
+            by_month[shard_month(entry.get('created_at'))].append(entry)
+        shards = []
+        for month, blogs in by_month.items():
+            self._put(shard_key(month), {"month": month, "blogs": blogs})
+            shards.append({"month": month, "key": shard_key(month), "count": len(blogs),
+                           "newest": _created_at(blogs[0])})
+        manifest = self._manifest({"version": MANIFEST_VERSION}, shards)
+        self._put(MANIFEST_KEY, manifest)
+        return manifest
+
+    @staticmethod
+    def _manifest(manifest: Dict, shards) -> Dict:
+        shards = sorted(shards, key=_month_order, reverse=True)
+        return dict(manifest, shards=shards, total=sum(s["count"] for s in shards),
+                    updated_at=datetime.now().isoformat())
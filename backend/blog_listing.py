@@ -0,0 +1,231 @@
+"""
+Active Blog Listing
+The retention policy (every blog from the last 60 days, and never fewer than
+the latest 30) applied once and stored as blogs/active.json in S3:
+
+    {"generated_at": ..., "retention_days": 60, "min_blogs": 30,
+     "total_blogs": <before retention>, "category_counts": {...},
+     "blogs": [<lightweight entries, newest first>]}
+
+The publisher, the daily cleanup job and populate_vector_db.py rebuild it;
+GET /api/blogs serves it (see blog_catalog.py; filtered, paged and projected
+by query_listing) and the vector sync indexes exactly its ids, so the site
+and the chatbot see the same blogs.
+"""
+import base64
+import json
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from backend.read_local_blogs import get_local_blogs
+except ImportError:
+    from read_local_blogs import get_local_blogs
+
+logger = logging.getLogger("BlogListing")
+
+RETENTION_DAYS = 60
+MIN_ACTIVE_BLOGS = 30
+LISTING_KEY = "blogs/active.json"
+# Same shape as the blogs/index.json entries written by S3BlogStorage.add_blog_to_index
+LISTING_FIELDS = ("id", "title", "category", "slug", "created_at", "excerpt", "tags", "author", "author_title")
+
+
+def _created_at(blog: Dict) -> str:
+    return blog.get('created_at', blog.get('timestamp', ''))
+
+
+def merge_blogs(*sources: List[Dict]) -> List[Dict]:
+    """Deduplicate by id (first source wins) and sort newest first"""
+    seen_ids = set()
+    unique_blogs = []
+    for blogs in sources:
+        for blog in blogs:
+            blog_id = blog.get('id') or blog.get('_id')
+            if blog_id and blog_id not in seen_ids:
+                seen_ids.add(blog_id)
+                unique_blogs.append(blog)
+    unique_blogs.sort(key=_created_at, reverse=True)
+    return unique_blogs
+
+
+def filter_active_blogs(blogs: List[Dict], now: Optional[datetime] = None) -> List[Dict]:
+    """
+    Filters blogs: keeps all blogs newer than 60 days.
+    If the count of such blogs is less than 30, it keeps the latest 30 blogs overall
+    to guarantee a minimum of 30 blogs are always displayed and indexed.
+    """
+    blogs_sorted = sorted(blogs, key=_created_at, reverse=True)
+    cutoff_date = (now or datetime.now(timezone.utc)) - timedelta(days=RETENTION_DAYS)
+
+    active_blogs = []
+    for blog in blogs_sorted:
+        created_at_str = _created_at(blog)
+        is_new = True
+        if created_at_str:
+            try:
+                blog_date = datetime.strptime(created_at_str[:10], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+                if blog_date < cutoff_date:
+                    is_new = False
+            except Exception:
+                pass
+
+        if is_new:
+            active_blogs.append(blog)
+        elif len(active_blogs) < MIN_ACTIVE_BLOGS:
+            active_blogs.append(blog)
+        else:
+            break
+
+    if len(active_blogs) < MIN_ACTIVE_BLOGS and len(blogs_sorted) > len(active_blogs):
+        active_blogs = blogs_sorted[:MIN_ACTIVE_BLOGS]
+
+    return active_blogs
+
+
+def listing_entry(blog: Dict) -> Dict:
+    """Lightweight listing fields; local blogs carry full content, index entries don't"""
+    entry = {field: blog[field] for field in LISTING_FIELDS if field in blog}
+    entry['id'] = blog.get('id') or blog.get('_id')
+    if not entry.get('excerpt') and blog.get('content'):
+        try:
+            from backend.auto_blogger.publisher import create_clean_excerpt
+        except ImportError:
+            from auto_blogger.publisher import create_clean_excerpt
+        entry['excerpt'] = create_clean_excerpt(blog['content'])
+    return entry
+
+
+def build_active_listing(blogs: List[Dict], now: Optional[datetime] = None,
+                         total_blogs: Optional[int] = None) -> Dict:
+    """Apply retention to a merged blog list and shape the active.json document.
+
+    `total_blogs` overrides len(blogs) when only part of the index was read.
+    """
+    now = now or datetime.now(timezone.utc)
+    active = [listing_entry(blog) for blog in filter_active_blogs(blogs, now=now)]
+    counts = Counter(blog.get('category') or 'Uncategorized' for blog in active)
+    return {
+        "generated_at": now.isoformat(),
+        "retention_days": RETENTION_DAYS,
+        "min_blogs": MIN_ACTIVE_BLOGS,
+        "total_blogs": max(total_blogs or 0, len(blogs)),
+        "category_counts": dict(counts.most_common()),
+        "blogs": active,
+    }
+
+
+def materialize_active_listing(storage, index_blogs: Optional[List[Dict]] = None,
+                               local_blogs: Optional[List[Dict]] = None,
+                               now: Optional[datetime] = None) -> Dict:
+    """Rebuild blogs/active.json from the S3 index plus local blogs and upload it.
+
+    Only the index shards inside the retention window are read. A failed
+    index read propagates rather than publishing an empty listing.
+    """
+    now = now or datetime.now(timezone.utc)
+    index_total = None
+    if index_blogs is None:
+        index_blogs, index_total = storage.read_recent_index(now - timedelta(days=RETENTION_DAYS), MIN_ACTIVE_BLOGS)
+    if local_blogs is None:
+        local_blogs = get_local_blogs()
+    listing = build_active_listing(merge_blogs(local_blogs, index_blogs), now=now, total_blogs=index_total)
+    storage.write_active_listing(listing)
+    logger.info(f"Materialized active listing: {len(listing['blogs'])} of {listing['total_blogs']} blogs")
+    return listing
+
+
+# ── Query side (GET /api/blogs) ───────────────────────────
+DEFAULT_FIELDS = ("id", "title", "category", "excerpt", "created_at", "tags")
+MAX_PAGE_SIZE = 100
+
+
+def _facet_key(value: str) -> str:
+    """'Cloud_Computing', 'cloud computing' and ' Cloud Computing ' match"""
+    return " ".join(str(value).replace('_', ' ').lower().split())
+
+
+class ListingIndex:
+    """Per-category and per-tag orderings of one listing, built once per listing version"""
+
+    def __init__(self, listing: Dict):
+        self.blogs: List[Dict] = listing.get("blogs", [])
+        self.by_category: Dict[str, List[int]] = {}
+        self.by_tag: Dict[str, List[int]] = {}
+        self.position = {}
+        for i, blog in enumerate(self.blogs):
+            self.position[blog.get('id')] = i
+            if blog.get('category'):
+                self.by_category.setdefault(_facet_key(blog['category']), []).append(i)
+            for tag in blog.get('tags') or []:
+                self.by_tag.setdefault(_facet_key(tag), []).append(i)
+
+    def positions(self, category: Optional[str] = None, tag: Optional[str] = None) -> List[int]:
+        if category is None and tag is None:
+            return list(range(len(self.blogs)))
+        result = None
+        if category is not None:
+            result = self.by_category.get(_facet_key(category), [])
+        if tag is not None:
+            tagged = self.by_tag.get(_facet_key(tag), [])
+            result = tagged if result is None else sorted(set(result) & set(tagged))
+        return result
+
+
+def encode_cursor(blog: Dict) -> str:
+    raw = json.dumps([blog.get('created_at', ''), blog.get('id')]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """(created_at, id) of the last item on the previous page; ValueError if malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, blog_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return str(created_at), str(blog_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """Comma-separated projection; 'all' keeps every listing field"""
+    if not fields:
+        return DEFAULT_FIELDS
+    if fields.strip().lower() == "all":
+        return LISTING_FIELDS
+    requested = tuple(f.strip() for f in fields.split(',') if f.strip())
+    unknown = [f for f in requested if f not in LISTING_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields {unknown}; choose from {', '.join(LISTING_FIELDS)}")
+    return requested if 'id' in requested else ('id',) + requested
+
+
+def query_listing(index: ListingIndex, category: Optional[str] = None, tag: Optional[str] = None,
+                  cursor: Optional[str] = None, limit: Optional[int] = None,
+                  fields: Tuple[str, ...] = DEFAULT_FIELDS) -> Dict:
+    """Filter, page and project the active listing.
+
+    Pages are keyed by the last (created_at, id) served, so a publish between
+    requests does not shift or repeat items. Without a limit every match is
+    returned (the listing is bounded by retention).
+    """
+    positions = index.positions(category, tag)
+    start = 0
+    if cursor:
+        after_created, after_id = decode_cursor(cursor)
+        last = index.position.get(after_id)
+        if last is not None:
+            start = next((n for n, pos in enumerate(positions) if pos > last), len(positions))
+        else:
+            # Item left the listing since: resume at the first older entry
+            start = next((n for n, pos in enumerate(positions)
+                          if index.blogs[pos].get('created_at', '') < after_created), len(positions))
+    end = len(positions) if limit is None else start + max(1, min(limit, MAX_PAGE_SIZE))
+    page = [index.blogs[pos] for pos in positions[start:end]]
+    return {
+        "blogs": [{field: blog[field] for field in fields if field in blog} for blog in page],
+        "total": len(positions),
+        "next_cursor": encode_cursor(page[-1]) if page and end < len(positions) else None,
+    }
@@ -0,0 +1,203 @@
+"""
+Blog Post Cache
+Read-through LRU of parsed, pre-serialized blog posts for GET /api/blogs/{id}.
+
+- Bounded by entry count and by total serialized bytes (least recently used
+  posts are evicted first).
+- Unknown ids are remembered for BLOG_POST_NEGATIVE_TTL seconds (bounded
+  too), so scraping random ids costs one S3 miss per id, not one per request.
+- Entries older than BLOG_POST_CACHE_TTL are revalidated with a conditional
+  GET on the post's S3 ETag; unchanged posts cost a 304, and rewrites made by
+  out-of-process fix scripts show up within the TTL.
+- S3BlogStorage.upload_post (the publisher and any in-process writer) calls
+  invalidate_blog_post() so republished posts are re-read immediately.
+- Posts stored gzip-encoded (minified by upload_post) keep their S3 bytes:
+  the decoded JSON is the response body as-is and the gzip bytes go straight
+  to clients that accept gzip, with no re-serializing or recompressing.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("BlogPostCache")
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("BLOG_POST_CACHE_ENTRIES", "256"))
+DEFAULT_MAX_BYTES = int(os.getenv("BLOG_POST_CACHE_BYTES", str(32 * 1024 * 1024)))
+DEFAULT_TTL_SECONDS = float(os.getenv("BLOG_POST_CACHE_TTL", "300"))
+DEFAULT_NEGATIVE_TTL_SECONDS = float(os.getenv("BLOG_POST_NEGATIVE_TTL", "600"))
+MAX_NEGATIVE_ENTRIES = 4096
+MAX_ID_LENGTH = 200
+
+
+@dataclass
+class CachedPost:
+    blog: Dict
+    body: bytes          # compact JSON, served as-is
+    etag: str            # HTTP ETag (hash of body)
+    s3_etag: Optional[str]
+    fetched_at: float
+    gzip_body: Optional[bytes] = None  # the S3 object's own gzip encoding of body
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body or b"")
+
+
+def is_plausible_blog_id(blog_id: str) -> bool:
+    """Publisher ids are flat slugs; anything else cannot exist in S3"""
+    return bool(blog_id) and len(blog_id) <= MAX_ID_LENGTH and '/' not in blog_id and '\\' not in blog_id
+
+
+class BlogPostCache:
+    def __init__(self, storage_factory: Callable, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 negative_ttl_seconds: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self._storage_factory = storage_factory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CachedPost]" = OrderedDict()
+        self._missing: "OrderedDict[str, float]" = OrderedDict()  # id -> expiry
+        self._bytes = 0
+        self._generation = 0  # bumped by invalidate(); a fetch that raced one is not stored
+        self.hits = self.misses = self.negative_hits = 0
+
+    def cached(self, blog_id: str) -> Tuple[bool, Optional[CachedPost]]:
+        """(answered, post) without any I/O: answered is False when S3 must be consulted"""
+        if not is_plausible_blog_id(blog_id):
+            return True, None
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(blog_id)
+            if entry is not None and now - entry.fetched_at < self.ttl_seconds:
+                self._entries.move_to_end(blog_id)
+                self.hits += 1
+                return True, entry
+            expires = self._missing.get(blog_id)
+            if entry is None and expires is not None and expires > now:
+                self.negative_hits += 1
+                return True, None
+        return False, None
+
+    def get(self, blog_id: str) -> Optional[CachedPost]:
+        """Cached post, loading (or revalidating) it from S3; None if it does not exist.
+
+        S3 errors propagate unless a previous copy can be served instead.
+        """
+        if not is_plausible_blog_id(blog_id):
+            return None
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(blog_id)
+            if entry is not None:
+                self._entries.move_to_end(blog_id)
+                if now - entry.fetched_at < self.ttl_seconds:
+                    self.hits += 1
+                    return entry
+            else:
+                expires = self._missing.get(blog_id)
+                if expires is not None:
+                    if expires > now:
+                        self.negative_hits += 1
+                        return None
+                    del self._missing[blog_id]
+            self.misses += 1
+            generation = self._generation
+
+        try:
+            raw, gz, s3_etag = self._storage_factory().read_blog_bytes_if_changed(
+                blog_id, entry.s3_etag if entry else None)
+        except Exception as e:
+            if entry is None:
+                raise
+            logger.warning(f"Revalidating blog {blog_id} failed, serving cached copy: {e}")
+            return entry
+
+        with self._lock:
+            if raw is None and s3_etag is not None and entry is not None:
+                # 304: unchanged, restart the TTL
+                if generation == self._generation:
+                    entry.fetched_at = now
+                return entry
+            if generation != self._generation:
+                return self._build(raw, gz, s3_etag, now) if raw is not None else None
+            self._drop(blog_id)
+            if raw is None:
+                self._missing[blog_id] = now + self.negative_ttl_seconds
+                while len(self._missing) > MAX_NEGATIVE_ENTRIES:
+                    self._missing.popitem(last=False)
+                return None
+            fresh = self._build(raw, gz, s3_etag, now)
+            if fresh.size <= self.max_bytes:
+                self._entries[blog_id] = fresh
+                self._bytes += fresh.size
+                self._evict()
+            return fresh
+
+    def invalidate(self, blog_id: Optional[str] = None):
+        """Forget one post (or everything), including a remembered 'not found'"""
+        with self._lock:
+            self._generation += 1
+            if blog_id is None:
+                self._entries.clear()
+                self._missing.clear()
+                self._bytes = 0
+            else:
+                self._drop(blog_id)
+                self._missing.pop(blog_id, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "negative": len(self._missing),
+                    "hits": self.hits, "misses": self.misses, "negative_hits": self.negative_hits}
+
+    @staticmethod
+    def _build(raw: bytes, gz: Optional[bytes], s3_etag: Optional[str], now: float) -> CachedPost:
+        blog = json.loads(raw.decode("utf-8"))
+        if gz is not None:
+            # Written by upload_post: already minified, serve the stored bytes
+            body = raw
+        else:
+            # Legacy pretty-printed object: minify once
+            body = json.dumps(blog, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return CachedPost(blog, body, f'"{hashlib.sha1(body).hexdigest()[:20]}"', s3_etag, now, gz)
+
+    def _drop(self, blog_id: str):
+        entry = self._entries.pop(blog_id, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+
+
+_cache: Optional[BlogPostCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_blog_post_cache(storage_factory: Optional[Callable] = None) -> BlogPostCache:
+    """Shared process-wide cache, created on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = BlogPostCache(storage_factory)
+    return _cache
+
+
+def invalidate_blog_post(blog_id: Optional[str] = None):
+    """Called when a post is (re)written; a no-op in processes that never served posts"""
+    if _cache is not None:
+        _cache.invalidate(blog_id)
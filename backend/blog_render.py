@@ -0,0 +1,229 @@
+"""
+Blog Rendering
+Derived fields for a blog post, computed once from its markdown `content`
+when it is published (and by `--backfill` for existing posts):
+
+    content_html    sanitized HTML, styled like the frontend's old renderer
+    toc             [{"id", "text", "level"}] for the h2/h3 headings (ids are
+                    set on the headings, so "#id" links work)
+    word_count      prose words (code blocks excluded)
+    reading_time    minutes at WORDS_PER_MINUTE, at least 1
+    excerpt         first two text blocks, same shape as create_clean_excerpt
+    render_version  bump RENDER_VERSION to make --backfill redo every post
+
+Everything comes out of a single line-by-line pass over the markdown, so the
+API and the frontend never re-parse the body.
+"""
+import html
+import re
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from backend.security_utils import sanitize_html
+except ImportError:
+    from security_utils import sanitize_html
+
+RENDER_VERSION = 1
+WORDS_PER_MINUTE = 200
+EXCERPT_LENGTH = 350
+
+# Tailwind classes the frontend's renderMarkdown used, kept so the page looks the same
+CLASSES = {
+    "h1": "text-3xl font-bold my-6 text-gray-900 dark:text-gray-100",
+    "h2": "text-2xl font-bold my-4 text-gray-900 dark:text-gray-100",
+    "h3": "text-xl font-bold my-3 text-gray-900 dark:text-gray-100",
+    "p": "my-3 leading-relaxed text-gray-800 dark:text-gray-300",
+    "ul": "list-disc pl-5 my-3 text-gray-800 dark:text-gray-200",
+    "ol": "list-decimal pl-5 my-3 text-gray-800 dark:text-gray-200",
+    "li": "ml-4",
+    "pre": "bg-gray-100 dark:bg-gray-900 p-4 rounded-lg overflow-x-auto my-4",
+    "code": "bg-gray-100 dark:bg-gray-800 text-cyan-600 dark:text-cyan-400 px-1.5 py-0.5 rounded text-sm",
+    "strong": "font-semibold text-gray-900 dark:text-gray-100",
+    "a": "text-cyan-600 dark:text-cyan-400 hover:underline",
+}
+
+_FENCE_RE = re.compile(r"^\s*```")
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_BULLET_RE = re.compile(r"^\s*[-*+]\s+(.+)$")
+_NUMBERED_RE = re.compile(r"^\s*\d+[.)]\s+(.+)$")
+# Stray separators / empty heading markers the generator sometimes leaves behind
+_ARTIFACT_RE = re.compile(r"^\s*(~+|-{3,}|\*{3,}|_{3,}|#{1,6})\s*$")
+
+_CODE_SPAN_RE = re.compile(r"`([^`]+)`")
+_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*|__(.+?)__")
+_ITALIC_RE = re.compile(r"(?<![*\w])\*(?![\s*])(.+?)(?<![\s*])\*(?![*\w])")
+_WORD_RE = re.compile(r"[A-Za-z0-9][\w'’-]*")
+
+
+def _inline_html(text: str) -> str:
+    """Escape, then convert code spans, links, bold and italics"""
+    codes: List[str] = []
+
+    def stash(match):
+        codes.append(f'<code class="{CLASSES["code"]}">{html.escape(match.group(1))}</code>')
+        return f"\x00{len(codes) - 1}\x00"
+
+    out = html.escape(_CODE_SPAN_RE.sub(stash, text))
+    out = _LINK_RE.sub(lambda m: f'<a href="{m.group(2)}" class="{CLASSES["a"]}" target="_blank" '
+                                 f'rel="noopener noreferrer">{m.group(1)}</a>', out)
+    out = _BOLD_RE.sub(lambda m: f'<span class="{CLASSES["strong"]}">{m.group(1) or m.group(2)}</span>', out)
+    out = _ITALIC_RE.sub(r"<em>\1</em>", out)
+    return re.sub("\x00(\\d+)\x00", lambda m: codes[int(m.group(1))], out)
+
+
+def _plain(text: str) -> str:
+    """Inline markdown stripped to readable text"""
+    text = _LINK_RE.sub(r"\1", text)
+    text = _CODE_SPAN_RE.sub(r"\1", text)
+    text = _BOLD_RE.sub(lambda m: m.group(1) or m.group(2), text)
+    return _ITALIC_RE.sub(r"\1", text)
+
+
+def _slug(text: str, used: Dict[str, int]) -> str:
+    base = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "section"
+    used[base] = used.get(base, 0) + 1
+    return base if used[base] == 1 else f"{base}-{used[base]}"
+
+
+def _excerpt(blocks: List[str], max_length: int = EXCERPT_LENGTH) -> str:
+    excerpt = " ".join(blocks[:2])
+    if len(excerpt) > max_length:
+        excerpt = excerpt[:max_length].rsplit(' ', 1)[0] + '...'
+    return excerpt
+
+
+def render_markdown(content: str) -> Tuple[str, List[Dict], List[str]]:
+    """(html, toc, plain-text blocks) in one pass over the markdown"""
+    parts: List[str] = []
+    toc: List[Dict] = []
+    blocks: List[str] = []
+    used_ids: Dict[str, int] = {}
+    paragraph: List[str] = []
+    items: List[str] = []
+    list_tag: Optional[str] = None
+    code: Optional[List[str]] = None
+
+    def flush():
+        nonlocal list_tag
+        if paragraph:
+            parts.append(f'<p class="{CLASSES["p"]}">{_inline_html(chr(10).join(paragraph))}</p>')
+            blocks.append(" ".join(_plain(line) for line in paragraph))
+            paragraph.clear()
+        if items:
+            lis = "".join(f'<li class="{CLASSES["li"]}">{_inline_html(item)}</li>' for item in items)
+            parts.append(f'<{list_tag} class="{CLASSES[list_tag]}">{lis}</{list_tag}>')
+            blocks.append(" ".join(_plain(item) for item in items))
+            items.clear()
+            list_tag = None
+
+    for line in (content or "").replace("\r\n", "\n").split("\n"):
+        if code is not None:
+            if _FENCE_RE.match(line):
+                parts.append(f'<pre class="{CLASSES["pre"]}"><code class="text-sm">'
+                             f'{html.escape(chr(10).join(code).strip())}</code></pre>')
+                code = None
+            else:
+                code.append(line)
+            continue
+        if _FENCE_RE.match(line):
+            flush()
+            code = []
+            continue
+        if not line.strip() or _ARTIFACT_RE.match(line):
+            flush()
+            continue
+        heading = _HEADING_RE.match(line)
+        if heading:
+            flush()
+            level = min(len(heading.group(1)), 3)
+            text = heading.group(2)
+            plain = _plain(text)
+            anchor = _slug(plain, used_ids)
+            parts.append(f'<h{level} id="{anchor}" class="{CLASSES[f"h{level}"]}">{_inline_html(text)}</h{level}>')
+            if level > 1:
+                toc.append({"id": anchor, "text": plain, "level": level})
+            blocks.append(plain)
+            continue
+        bullet = _BULLET_RE.match(line)
+        numbered = None if bullet else _NUMBERED_RE.match(line)
+        if bullet or numbered:
+            tag = "ul" if bullet else "ol"
+            if paragraph or (list_tag and list_tag != tag):
+                flush()
+            list_tag = tag
+            items.append((bullet or numbered).group(1))
+            continue
+        if items:
+            flush()
+        paragraph.append(line.strip())
+
+    if code is not None:  # unterminated fence: keep the code
+        parts.append(f'<pre class="{CLASSES["pre"]}"><code class="text-sm">'
+                     f'{html.escape(chr(10).join(code).strip())}</code></pre>')
+    flush()
+    return "\n".join(parts), toc, blocks
+
+
+def render_post(content: str) -> Dict:
+    """Derived fields to merge into the post JSON"""
+    body_html, toc, blocks = render_markdown(content)
+    word_count = sum(len(_WORD_RE.findall(block)) for block in blocks)
+    return {
+        "content_html": sanitize_html(body_html),
+        "toc": toc,
+        "word_count": word_count,
+        "reading_time": max(1, round(word_count / WORDS_PER_MINUTE)),
+        "excerpt": _excerpt(blocks),
+        "render_version": RENDER_VERSION,
+    }
+
+
+def needs_render(blog: Dict) -> bool:
+    return bool(blog.get("content")) and blog.get("render_version") != RENDER_VERSION
+
+
+def backfill(dry_run: bool = False, force: bool = False) -> Dict:
+    """Render every S3 post that lacks the current derived fields and re-upload it"""
+    import os
+    try:
+        from backend.auto_blogger.publisher import S3BlogStorage
+        from backend.s3_access import get_json_many, list_keys
+    except ImportError:
+        from auto_blogger.publisher import S3BlogStorage
+        from s3_access import get_json_many, list_keys
+
+    storage = S3BlogStorage(bucket_name=os.getenv("S3_BLOG_BUCKET", "althaf-blogs-storage"))
+    keys = list_keys(storage.bucket, prefix=storage.posts_prefix, suffix=".json")
+    posts, errors = get_json_many(storage.bucket, keys)
+    rendered = []
+    for key, blog in posts.items():
+        if not (force and blog.get("content")) and not needs_render(blog):
+            continue
+        blog_id = blog.get("id") or key[len(storage.posts_prefix):-len(".json")]
+        # Keep the excerpt already shown in listings; only fill it in when missing
+        derived = render_post(blog["content"])
+        if blog.get("excerpt"):
+            derived.pop("excerpt")
+        blog.update(derived)
+        if not dry_run:
+            storage.upload_post(blog_id, blog)
+        rendered.append(blog_id)
+    return {"posts": len(posts), "rendered": rendered, "errors": {k: str(e) for k, e in errors.items()},
+            "dry_run": dry_run}
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Pre-render HTML/TOC/reading time for blog posts in S3")
+    parser.add_argument("--backfill", action="store_true", help="render posts missing the current fields")
+    parser.add_argument("--force", action="store_true", help="re-render every post")
+    parser.add_argument("--dry-run", action="store_true", help="report without uploading")
+    args = parser.parse_args()
+    if args.backfill or args.force:
+        result = backfill(dry_run=args.dry_run, force=args.force)
+        print(json.dumps({**result, "rendered": len(result["rendered"])}, indent=2))
+    else:
+        parser.print_help()
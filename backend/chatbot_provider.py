@@ -8,10 +8,31 @@ import time
 import requests
 import logging
 from typing import List, Dict, Optional
-from google import genai
-from gradio_client import Client
 from datetime import datetime
 
+try:
+    from backend.lazy_imports import lazy_import
+except ImportError:
+    from lazy_imports import lazy_import
+
+try:
+    from backend.response_postprocess import postprocess_reply, strip_model_artifacts
+except ImportError:
+    from response_postprocess import postprocess_reply, strip_model_artifacts
+
+try:
+    from backend.monitoring.metrics import CHAT_STAGE_SECONDS, record_cache_lookup, record_tier, track_llm_call
+    from backend.monitoring.tracing import span
+    from backend.monitoring.async_logging import SAMPLED
+except ImportError:
+    from monitoring.metrics import CHAT_STAGE_SECONDS, record_cache_lookup, record_tier, track_llm_call
+    from monitoring.tracing import span
+    from monitoring.async_logging import SAMPLED
+
+# Fallback-tier SDKs load on first use, not at server import
+genai = lazy_import("google.genai")
+gradio_client = lazy_import("gradio_client")
+
 logger = logging.getLogger(__name__)
 
 class OpenRouterError(Exception):
@@ -265,27 +286,20 @@ class ChatbotProvider:
         """Initialize all API clients"""
         # OpenRouter - Dedicated key for chatbot (isolated from auto-blogger)
         self.openrouter_key = os.getenv('CHATBOT_NEW_KEY')
-        self.openrouter_url = "https://openrouter.ai/api/v1/chat/completions"
+        # OPENROUTER_BASE_URL points at any OpenAI-compatible server (e.g. the benchmark stub)
+        openrouter_base = os.getenv('OPENROUTER_BASE_URL', "https://openrouter.ai/api/v1").rstrip('/')
+        self.openrouter_url = f"{openrouter_base}/chat/completions"
         
-        # Hugging Face
+        # Hugging Face (Tier 4) - the Gradio client connects to the Space on creation,
+        # so it is built on first use instead of blocking server startup
         self.hf_token = os.getenv('CHATBOT')
-        self.hf_client = None
-        if self.hf_token:
-            try:
-                self.hf_client = Client("huggingface-projects/llama-3.2-3B-Instruct")
-                logger.info("Hugging Face client initialized")
-            except Exception as e:
-                logger.warning(f"Failed to initialize HF client: {e}")
+        self._hf_client = None
+        self._hf_init_attempted = False
         
-        # Gemini (fallback)
+        # Gemini (Tier 3 fallback) - created on first use
         self.gemini_key = os.getenv('CHATBOT_GEMINI_KEY')
-        self.gemini_client = None
-        if self.gemini_key:
-            try:
-                self.gemini_client = genai.Client(api_key=self.gemini_key)
-                logger.info("Gemini Client initialized")
-            except Exception as e:
-                logger.error(f"Gemini Client init failed: {e}")
+        self._gemini_client = None
+        self._gemini_init_attempted = False
             
         # Task 6: Summary Cache (In-Memory)
         # Structure: {md5_hash: summary_text}
@@ -293,6 +307,30 @@ class ChatbotProvider:
         
         logger.info("ChatbotProvider initialized with all providers")
     
+    @property
+    def hf_client(self):
+        """Lazily connect the Hugging Face Gradio client (one attempt per process)"""
+        if self._hf_client is None and self.hf_token and not self._hf_init_attempted:
+            self._hf_init_attempted = True
+            try:
+                self._hf_client = gradio_client.Client("huggingface-projects/llama-3.2-3B-Instruct")
+                logger.info("Hugging Face client initialized")
+            except Exception as e:
+                logger.warning(f"Failed to initialize HF client: {e}")
+        return self._hf_client
+    
+    @property
+    def gemini_client(self):
+        """Lazily create the Gemini client (one attempt per process)"""
+        if self._gemini_client is None and self.gemini_key and not self._gemini_init_attempted:
+            self._gemini_init_attempted = True
+            try:
+                self._gemini_client = genai.Client(api_key=self.gemini_key)
+                logger.info("Gemini Client initialized")
+            except Exception as e:
+                logger.error(f"Gemini Client init failed: {e}")
+        return self._gemini_client
+    
     
     def _detect_query_complexity(self, query: str) -> int:
         """
@@ -322,52 +360,59 @@ class ChatbotProvider:
         Reduces token usage by 60-70% while maintaining signal.
         Includes Caching (Task 6).
         """
-        # If text is already short, don't waste time creating a summary
-        if len(text) < 600:
-            return text
+        with span("summarize_content", input_chars=len(text)) as sp:
+            # If text is already short, don't waste time creating a summary
+            if len(text) < 600:
+                sp.set(cache="skipped")
+                return text
             
-        # Check Cache
-        import hashlib
-        text_hash = hashlib.md5(text.encode()).hexdigest()
-        if text_hash in self.summary_cache:
-            logger.info("⚡ Returning cached summary")
-            return self.summary_cache[text_hash]
+            # Check Cache
+            import hashlib
+            text_hash = hashlib.md5(text.encode()).hexdigest()
+            cached = text_hash in self.summary_cache
+            record_cache_lookup("summary", cached)
+            sp.set(cache="hit" if cached else "miss")
+            if cached:
+                logger.info("⚡ Returning cached summary")
+                return self.summary_cache[text_hash]
             
-        try:
-            prompt = f"""
-            TASK: Summarize this project/document into exactly 3 standardized bullet points.
-            FORMAT:
-            - Problem: (1 sentence)
-            - Tech: (List key tools)
-            - Outcome: (1 sentence, quantify if possible)
-            
-            TEXT:
-            {text[:4000]}
-            """
-            
-            # Use Mistral (via OpenRouter) for internal micro-tasks
-            # 1. Wrap the prompt in the standard message format
-            messages = [{"role": "user", "content": prompt}]
-
-            # 2. Call your existing OpenRouter helper function
-            # Using the same model as your main chat: mistralai/mistral-7b-instruct:free
-            summary_text = self._call_openrouter(
-                model="mistralai/mistral-7b-instruct:free",
-                messages=messages,
-                max_tokens=300  # 300 tokens is plenty for a bullet-point summary
-            )
+            try:
+                prompt = f"""
+                TASK: Summarize this project/document into exactly 3 standardized bullet points.
+                FORMAT:
+                - Problem: (1 sentence)
+                - Tech: (List key tools)
+                - Outcome: (1 sentence, quantify if possible)
+            
+                TEXT:
+                {text[:4000]}
+                """
+            
+                # Use Mistral (via OpenRouter) for internal micro-tasks
+                # 1. Wrap the prompt in the standard message format
+                messages = [{"role": "user", "content": prompt}]
+
+                # 2. Call your existing OpenRouter helper function
+                # Using the same model as your main chat: mistralai/mistral-7b-instruct:free
+                with CHAT_STAGE_SECONDS.time(stage="summarize"):
+                    summary_text = self._call_openrouter(
+                        model="mistralai/mistral-7b-instruct:free",
+                        messages=messages,
+                        max_tokens=300  # 300 tokens is plenty for a bullet-point summary
+                    )
             
-            if summary_text:
-                summary = f"[Summarized Evidence]:\n{summary_text}"
-                # Cache the result
-                self.summary_cache[text_hash] = summary
-                return summary
+                summary_text = strip_model_artifacts(summary_text)
+                if summary_text:
+                    summary = f"[Summarized Evidence]:\n{summary_text}"
+                    # Cache the result
+                    self.summary_cache[text_hash] = summary
+                    return summary
             
-            return text[:1000] + "... [Truncated]"
+                return text[:1000] + "... [Truncated]"
             
-        except Exception as e:
-            logger.warning(f"Summarization failed: {e}")
-            return text[:600] + "... [Truncated fallback]"
+            except Exception as e:
+                logger.warning(f"Summarization failed: {e}")
+                return text[:600] + "... [Truncated fallback]"
     
     def detect_conversation_state(self, text: str) -> str:
         """
@@ -447,38 +492,37 @@ Remember: You are Assist Bot (never say Allu Bot). Respond naturally in conversa
             Response text or None on failure
         """
         try:
-            response = requests.post(
-                self.openrouter_url,
-                headers={
-                    "Authorization": f"Bearer {self.openrouter_key}",
-                    "HTTP-Referer": "https://althafportfolio.site",
-                    "X-Title": "Althaf Portfolio Chatbot",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": model,
-                    "messages": messages,
-                    "max_tokens": max_tokens,
-                    "temperature": 0.6,
-                    "stream": False
-                },
-                timeout=timeout
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                text = data['choices'][0]['message']['content']
-                # Clean up model artifacts and raw tokens
-                text = text.replace("<s>", "").replace("</s>", "").strip()
-                text = text.replace("[/INST]", "").replace("[INST]", "").strip()
-                text = text.replace("</INST>", "").replace("<INST>", "").strip()
-                # Remove empty lines
-                text = "\n".join(line for line in text.split("\n") if line.strip())
-                logger.info(f"OpenRouter success ({model}): {len(text)} chars")
-                return text
-            else:
-                logger.warning(f"OpenRouter failed ({model}): {response.status_code} - {response.text[:200]}")
-                raise OpenRouterError(f"OpenRouter API failed with status {response.status_code}", response.status_code)
+            with track_llm_call("openrouter", model) as call:
+                response = requests.post(
+                    self.openrouter_url,
+                    headers={
+                        "Authorization": f"Bearer {self.openrouter_key}",
+                        "HTTP-Referer": "https://althafportfolio.site",
+                        "X-Title": "Althaf Portfolio Chatbot",
+                        "Content-Type": "application/json"
+                    },
+                    json={
+                        "model": model,
+                        "messages": messages,
+                        "max_tokens": max_tokens,
+                        "temperature": 0.6,
+                        "stream": False
+                    },
+                    timeout=timeout
+                )
+                
+                if response.status_code == 200:
+                    data = response.json()
+                    # Raw text: artifacts are stripped by the caller's post-processing pass
+                    text = (data['choices'][0]['message']['content'] or "").strip()
+                    if not text:
+                        call["status"] = "empty"
+                    logger.info(f"OpenRouter success ({model}): {len(text)} chars")
+                    return text
+                else:
+                    call["status"] = f"http_{response.status_code}"
+                    logger.warning(f"OpenRouter failed ({model}): {response.status_code} - {response.text[:200]}")
+                    raise OpenRouterError(f"OpenRouter API failed with status {response.status_code}", response.status_code)
                 
         except requests.exceptions.RequestException as e:
             logger.error(f"OpenRouter connection error ({model}): {str(e)}")
@@ -491,48 +535,54 @@ Remember: You are Assist Bot (never say Allu Bot). Respond naturally in conversa
 
     def _call_openrouter_with_healing(self, tier_key: str, messages: List[Dict], max_tokens: int) -> Optional[str]:
         """Calls OpenRouter with cooldown checks and self-healing fallback promotion"""
-        primary = CHATBOT_MODELS.get_tier_primary(tier_key)
-        fallback = CHATBOT_MODELS.get_tier_fallback(tier_key)
+        with span("llm.tier", tier=tier_key) as tier_span:
+            primary = CHATBOT_MODELS.get_tier_primary(tier_key)
+            fallback = CHATBOT_MODELS.get_tier_fallback(tier_key)
         
-        # Determine active model (if primary is on cooldown, jump straight to fallback)
-        active_model = primary
-        if CHATBOT_MODELS.is_on_cooldown(primary, tier_key):
-            active_model = fallback
+            # Determine active model (if primary is on cooldown, jump straight to fallback)
+            active_model = primary
+            if CHATBOT_MODELS.is_on_cooldown(primary, tier_key):
+                active_model = fallback
+                tier_span.event("primary_on_cooldown", model=primary)
+            tier_span.set(model=active_model)
             
-        try:
-            logger.info(f"🤖 {tier_key}: {active_model}")
-            return self._call_openrouter(active_model, messages, max_tokens)
-            
-        except OpenRouterError as e:
-            # Fatal Errors: Invalid key, model removed, etc. No retries.
-            if e.status_code in [401, 403, 404]:
-                logger.error(f"🚨 Fatal OpenRouter error {e.status_code} for {active_model}. Aborting tier.")
-                return None
+            try:
+                logger.info(f"🤖 {tier_key}: {active_model}")
+                return self._call_openrouter(active_model, messages, max_tokens)
+            
+            except OpenRouterError as e:
+                # Fatal Errors: Invalid key, model removed, etc. No retries.
+                if e.status_code in [401, 403, 404]:
+                    logger.error(f"🚨 Fatal OpenRouter error {e.status_code} for {active_model}. Aborting tier.")
+                    tier_span.event("fatal_error", model=active_model, status=e.status_code)
+                    return None
                 
-            # Transient / Rate Limits: Track failures and potentially promote
-            if e.status_code in [429, 502, 503, 504]:
-                if CHATBOT_MODELS.record_failure(active_model):
-                    CHATBOT_MODELS.mark_failed(active_model)
+                # Transient / Rate Limits: Track failures and potentially promote
+                if e.status_code in [429, 502, 503, 504]:
+                    if CHATBOT_MODELS.record_failure(active_model):
+                        CHATBOT_MODELS.mark_failed(active_model)
                     
-                    # If the failed model was primary, override to fallback immediately
+                        # If the failed model was primary, override to fallback immediately
+                        if active_model == primary and fallback:
+                            CHATBOT_MODELS.promote_to_override(tier_key)
+                            logger.info(f"🤖 {tier_key} (fallback): {fallback}")
+                            tier_span.event("promoted_to_fallback", model=fallback, status=e.status_code)
+                            try:
+                                return self._call_openrouter(fallback, messages, max_tokens)
+                            except Exception as fallback_e:
+                                logger.error(f"Fallback {fallback} also failed: {fallback_e}")
+                            
+                # Immediate Fallback: Try fallback for this request but don't count towards promotion
+                elif e.status_code == 408:
+                    logger.warning(f"⚠️ {active_model} timed out (408). Trying fallback for this request only.")
+                    tier_span.event("timeout_fallback", model=fallback)
                     if active_model == primary and fallback:
-                        CHATBOT_MODELS.promote_to_override(tier_key)
-                        logger.info(f"🤖 {tier_key} (fallback): {fallback}")
                         try:
                             return self._call_openrouter(fallback, messages, max_tokens)
-                        except Exception as fallback_e:
-                            logger.error(f"Fallback {fallback} also failed: {fallback_e}")
-                            
-            # Immediate Fallback: Try fallback for this request but don't count towards promotion
-            elif e.status_code == 408:
-                logger.warning(f"⚠️ {active_model} timed out (408). Trying fallback for this request only.")
-                if active_model == primary and fallback:
-                    try:
-                        return self._call_openrouter(fallback, messages, max_tokens)
-                    except Exception:
-                        pass
+                        except Exception:
+                            pass
                         
-            return None
+                return None
     
     def _call_huggingface(self, message: str, max_tokens: int) -> Optional[str]:
         """
@@ -550,15 +600,19 @@ Remember: You are Assist Bot (never say Allu Bot). Respond naturally in conversa
             return None
         
         try:
-            result = self.hf_client.predict(
-                message=message,
-                max_new_tokens=max_tokens,
-                temperature=0.6,
-                top_p=0.9,
-                top_k=50,
-                repetition_penalty=1.2,
-                api_name="/chat"
-            )
+            hf_model = (CHATBOT_MODELS.get_tier_config("tier4") or {}).get("huggingface_model", "huggingface")
+            with track_llm_call("huggingface", hf_model) as call:
+                result = self.hf_client.predict(
+                    message=message,
+                    max_new_tokens=max_tokens,
+                    temperature=0.6,
+                    top_p=0.9,
+                    top_k=50,
+                    repetition_penalty=1.2,
+                    api_name="/chat"
+                )
+                if not result:
+                    call["status"] = "empty"
             
             logger.info(f"Hugging Face success: {len(result)} chars")
             return result
@@ -580,102 +634,106 @@ Remember: You are Assist Bot (never say Allu Bot). Respond naturally in conversa
         Returns:
             Response text or None on failure
         """
-        if not self.gemini_key:
-            logger.warning("Gemini API key not configured")
-            return None
+        with span("gemini_fallback", context_chars=len(context or "")):
+            if not self.gemini_key:
+                logger.warning("Gemini API key not configured")
+                return None
         
-        try:
-            # Get current date for date awareness
-            from datetime import datetime
-            current_date = datetime.now().strftime("%B %d, %Y")
-            
-            # Gemini has 1M context window - use generous 100K chars (~25K tokens)
-            max_gemini_context_chars = 100000
-            truncated_context = context[:max_gemini_context_chars] if context else ""
-            
-            if len(context or "") > max_gemini_context_chars:
-                logger.info(f"Gemini context truncated to {max_gemini_context_chars} chars")
-            
-            # Build Gemini-optimized prompt with unified system instructions
-            system_instruction = (
-                f"You are Assist Bot, Althaf Hussain Syed's portfolio assistant.\n\n"
-                f"🗓️ CRITICAL: TODAY'S DATE IS {current_date}. Use this for ALL date-related logic.\n\n"
-                "DATE AWARENESS RULES (MANDATORY):\n"
-                "1. TODAY IS " + current_date + " - memorize this\n"
-                "2. If an event's END DATE is before today → use PAST tense ('completed', 'finished', 'earned')\n"
-                "3. If an event's START DATE is before today but NO END DATE given → use PRESENT tense ('is working', 'is pursuing')\n"
-                "4. CRITICAL EXAMPLE:\n"
-                "   - Context says: 'Master's degree, December 2022 - June 2024'\n"
-                "   - Today is " + current_date + "\n"
-                "   - June 2024 was 18 MONTHS AGO\n"
-                "   - CORRECT: 'He completed his Master's degree in June 2024'\n"
-                "   - WRONG: 'He is currently completing' or 'expected to finish in June 2024'\n"
-                "5. Always mentally calculate: Is the end date BEFORE " + current_date + "? If YES → past tense\n\n"
-                "IDENTITY & TONE (NON-NEGOTIABLE):\n"
-                "1. You are 'Assist Bot', but you MUST refer to yourself as 'I' or 'me'\n"
-                "2. NEVER refer to yourself in the third person (e.g., NEVER say 'Assist Bot can help', say 'I can help')\n"
-                "3. NEVER say 'Allu Bot' or any other name\n"
-                "4. You speak about Althaf Hussain Syed in third person (he/his)\n"
-                "5. Be warm, professional, conversational, and highly intelligent\n"
-                "6. You have ADVANCED RAG (Retrieval-Augmented Generation) capabilities\n\n"
-                "CRITICAL RETRIEVAL RULES (STRICT):\n"
-                "1. The context provided below is from Althaf's verified portfolio database with categorized metadata\n"
-                "2. Context is tagged with categories: personal, experience, achievements, education, contact, certifications, projects, blogs\n"
-                "3. You MUST analyze context metadata and retrieve ONLY relevant information\n"
-                "4. NEVER hallucinate or invent information not explicitly stated in the context\n"
-                "5. If context is empty or irrelevant, say 'I checked Althaf's portfolio, but I couldn't find that specific detail'\n\n"
-                "ADVANCED RAG CAPABILITIES:\n"
-                "1. Intelligent context filtering based on metadata categories\n"
-                "2. Multi-document reasoning across different data sources\n"
-                "3. Precise information extraction with source attribution\n\n"
-                "RESPONSE STYLE:\n"
-                "1. Write like a human - no hyphens, no bullet points unless necessary\n"
-                "2. Use natural paragraphs with proper sentences\n"
-                "3. Keep responses concise - 2 to 4 sentences for most questions\n\n"
-                "FORBIDDEN:\n"
-                "- Never say 'Allu Bot' (you are Assist Bot)\n"
-                "- Never refer to yourself in third person ('Assist Bot can...') - always use 'I'\n"
-                "- No markdown formatting (no *, -, #, etc.)\n"
-                "- No apologizing unless user points out error\n"
-                "- No inventing information outside the provided context\n\n"
-                "CONTEXT:\n" + truncated_context
-            )
+            try:
+                # Get current date for date awareness
+                from datetime import datetime
+                current_date = datetime.now().strftime("%B %d, %Y")
+            
+                # Gemini has 1M context window - use generous 100K chars (~25K tokens)
+                max_gemini_context_chars = 100000
+                truncated_context = context[:max_gemini_context_chars] if context else ""
+            
+                if len(context or "") > max_gemini_context_chars:
+                    logger.info(f"Gemini context truncated to {max_gemini_context_chars} chars")
+            
+                # Build Gemini-optimized prompt with unified system instructions
+                system_instruction = (
+                    f"You are Assist Bot, Althaf Hussain Syed's portfolio assistant.\n\n"
+                    f"🗓️ CRITICAL: TODAY'S DATE IS {current_date}. Use this for ALL date-related logic.\n\n"
+                    "DATE AWARENESS RULES (MANDATORY):\n"
+                    "1. TODAY IS " + current_date + " - memorize this\n"
+                    "2. If an event's END DATE is before today → use PAST tense ('completed', 'finished', 'earned')\n"
+                    "3. If an event's START DATE is before today but NO END DATE given → use PRESENT tense ('is working', 'is pursuing')\n"
+                    "4. CRITICAL EXAMPLE:\n"
+                    "   - Context says: 'Master's degree, December 2022 - June 2024'\n"
+                    "   - Today is " + current_date + "\n"
+                    "   - June 2024 was 18 MONTHS AGO\n"
+                    "   - CORRECT: 'He completed his Master's degree in June 2024'\n"
+                    "   - WRONG: 'He is currently completing' or 'expected to finish in June 2024'\n"
+                    "5. Always mentally calculate: Is the end date BEFORE " + current_date + "? If YES → past tense\n\n"
+                    "IDENTITY & TONE (NON-NEGOTIABLE):\n"
+                    "1. You are 'Assist Bot', but you MUST refer to yourself as 'I' or 'me'\n"
+                    "2. NEVER refer to yourself in the third person (e.g., NEVER say 'Assist Bot can help', say 'I can help')\n"
+                    "3. NEVER say 'Allu Bot' or any other name\n"
+                    "4. You speak about Althaf Hussain Syed in third person (he/his)\n"
+                    "5. Be warm, professional, conversational, and highly intelligent\n"
+                    "6. You have ADVANCED RAG (Retrieval-Augmented Generation) capabilities\n\n"
+                    "CRITICAL RETRIEVAL RULES (STRICT):\n"
+                    "1. The context provided below is from Althaf's verified portfolio database with categorized metadata\n"
+                    "2. Context is tagged with categories: personal, experience, achievements, education, contact, certifications, projects, blogs\n"
+                    "3. You MUST analyze context metadata and retrieve ONLY relevant information\n"
+                    "4. NEVER hallucinate or invent information not explicitly stated in the context\n"
+                    "5. If context is empty or irrelevant, say 'I checked Althaf's portfolio, but I couldn't find that specific detail'\n\n"
+                    "ADVANCED RAG CAPABILITIES:\n"
+                    "1. Intelligent context filtering based on metadata categories\n"
+                    "2. Multi-document reasoning across different data sources\n"
+                    "3. Precise information extraction with source attribution\n\n"
+                    "RESPONSE STYLE:\n"
+                    "1. Write like a human - no hyphens, no bullet points unless necessary\n"
+                    "2. Use natural paragraphs with proper sentences\n"
+                    "3. Keep responses concise - 2 to 4 sentences for most questions\n\n"
+                    "FORBIDDEN:\n"
+                    "- Never say 'Allu Bot' (you are Assist Bot)\n"
+                    "- Never refer to yourself in third person ('Assist Bot can...') - always use 'I'\n"
+                    "- No markdown formatting (no *, -, #, etc.)\n"
+                    "- No apologizing unless user points out error\n"
+                    "- No inventing information outside the provided context\n\n"
+                    "CONTEXT:\n" + truncated_context
+                )
             
-            combined_prompt = f"{system_instruction}\n\nUSER QUESTION: {query}"
-            
-            # Fallback Chain: Try models in order until one works
-            # Different models often have separate rate limit buckets
-            models_to_try = [
-                "models/gemini-2.5-flash",  # Primary Flash (Latest)
-                "models/gemini-2.0-flash-exp",  # Experimental Flash 2.0
-                "models/gemma-3-12b-it"    # High Quality Backup
-            ]
-            
-            for model_id in models_to_try:
-                try:
-                    logger.info(f"Trying Gemini Fallback Model: {model_id}")
-                    # Remove 'models/' prefix if present as new SDK often prefers clean names, but it usually handles both. 
-                    # Let's keep it clean.
-                    clean_model = model_id.replace("models/", "")
+                combined_prompt = f"{system_instruction}\n\nUSER QUESTION: {query}"
+            
+                # Fallback Chain: Try models in order until one works
+                # Different models often have separate rate limit buckets
+                models_to_try = [
+                    "models/gemini-2.5-flash",  # Primary Flash (Latest)
+                    "models/gemini-2.0-flash-exp",  # Experimental Flash 2.0
+                    "models/gemma-3-12b-it"    # High Quality Backup
+                ]
+            
+                for model_id in models_to_try:
+                    try:
+                        logger.info(f"Trying Gemini Fallback Model: {model_id}")
+                        # Remove 'models/' prefix if present as new SDK often prefers clean names, but it usually handles both. 
+                        # Let's keep it clean.
+                        clean_model = model_id.replace("models/", "")
                     
-                    response = self.gemini_client.models.generate_content(
-                        model=clean_model,
-                        contents=combined_prompt
-                    )
+                        with track_llm_call("gemini", clean_model) as call:
+                            response = self.gemini_client.models.generate_content(
+                                model=clean_model,
+                                contents=combined_prompt
+                            )
+                            if not (response and response.text):
+                                call["status"] = "empty"
                     
-                    if response and response.text:
-                        logger.info(f"Gemini fallback success ({model_id}): {len(response.text)} chars")
-                        return response.text
-                except Exception as inner_e:
-                    logger.warning(f"Failed {model_id}: {inner_e}")
-                    continue
-            
-            logger.error("All Google GenAI models failed in chain")
-            return None
+                        if response and response.text:
+                            logger.info(f"Gemini fallback success ({model_id}): {len(response.text)} chars")
+                            return response.text
+                    except Exception as inner_e:
+                        logger.warning(f"Failed {model_id}: {inner_e}")
+                        continue
+            
+                logger.error("All Google GenAI models failed in chain")
+                return None
             
-        except Exception as e:
-            logger.error(f"Gemini fallback major error: {str(e)}")
-            return None
+            except Exception as e:
+                logger.error(f"Gemini fallback major error: {str(e)}")
+                return None
     
     
     def is_behavior_question(self, text: str) -> bool:
@@ -769,17 +827,18 @@ Remember: You are Assist Bot (never say Allu Bot). Respond naturally in conversa
         # If it's not a greeting and context is effectively empty/useless
         if not is_greeting and (not context or len(context) < 50 or "No external context" in context):
             logger.warning(f"⛔ BLOCKING LLM CALL: No context found for query: {query[:50]}...")
+            record_tier("context_guard")
             return "I checked Althaf's portfolio, but I couldn't find specific details matching your request. You might want to ask about his 'Projects', 'Skills', or 'Experience' directly!"
         # ------------------------------------------------------
         
         # Detect query complexity for dynamic token allocation
         max_tokens = self._detect_query_complexity(query)
-        logger.info(f"Query complexity: {max_tokens} tokens")
+        logger.info(f"Query complexity: {max_tokens} tokens", extra=SAMPLED)
         
-        # Log context for debugging (truncate if too long)
+        # Log context for debugging (truncate if too long; sampled at LOG_SAMPLE_RATE)
         context_preview = context[:200] + "..." if len(context) > 200 else context
-        logger.info(f"Context preview: {context_preview}")
-        logger.info(f"Context length: {len(context)} chars")
+        logger.info(f"Context preview: {context_preview}", extra=SAMPLED)
+        logger.info(f"Context length: {len(context)} chars", extra=SAMPLED)
         
         # Format messages with query
         messages = self._format_messages(query, context, history, sentiment)
@@ -823,17 +882,20 @@ Remember: You are Assist Bot (never say Allu Bot). Respond naturally in conversa
         # Tier 1: Primary Model with Self-Healing
         response = self._call_openrouter_with_healing("tier1", messages, max_tokens)
         if response:
+            record_tier("tier1")
             return self._clean_response(response)
             
         # Tier 2: Fast Fallback with Self-Healing
         response = self._call_openrouter_with_healing("tier2", messages, max_tokens)
         if response:
+            record_tier("tier2")
             return self._clean_response(response)
         
         # Tier 3: Gemini Chain (Standard) - Moved up as requested
         logger.info("🤖 Tier 3: Gemini Chain (Standard)")
         response = self._call_gemini_fallback(query, context, history, max_tokens)
         if response:
+            record_tier("tier3")
             return self._clean_response(response)
 
         # Tier 4: Hugging Face Fallback
@@ -848,41 +910,20 @@ Remember: You are Assist Bot (never say Allu Bot). Respond naturally in conversa
         response = self._call_huggingface(hf_prompt, max_tokens)
         if response:
             logger.info(f"✅ Response from {tier4_model} (HF)")
+            record_tier("tier4")
             return self._clean_response(response)
 
         # All providers failed
         logger.error("All providers failed")
+        record_tier("none")
         return "Hmm, I'm having some connection issues. Mind trying that again?"
 
     def _clean_response(self, response: str) -> str:
         """
-        Post-process response to remove unwanted formatting
-        - Remove hyphen bullets (- item)
-        - Remove numbered lists if standalone
-        - Clean up excessive line breaks
+        Post-process a reply, keeping its layout (see response_postprocess):
+        model artifacts, hyphen bullets, bot name, leading apology sentences,
+        excessive line breaks.
         """
-        import re
-        
-        # Remove lines that start with "- " (hyphen bullets)
-        lines = response.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            stripped = line.strip()
-            # Skip lines that are just "- something"
-            if stripped.startswith('- '):
-                # Convert "- item" to just "item" (remove bullet, keep content)
-                cleaned_lines.append(stripped[2:])
-            else:
-                cleaned_lines.append(line)
-        
-        response = '\n'.join(cleaned_lines)
-        
-        # Remove excessive line breaks (more than 2 consecutive)
-        response = re.sub(r'\n{3,}', '\n\n', response)
-        
-        # Remove trailing/leading whitespace
-        response = response.strip()
-        
-        return response
+        return postprocess_reply(response)
 
 
@@ -3,9 +3,13 @@ Check if today's blog is in S3 index.json
 """
 
 import boto3
-import json
 import logging
 
+try:
+    from backend.s3_access import read_json_body
+except ImportError:
+    from s3_access import read_json_body
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -21,7 +25,7 @@ def check_s3_index():
         
         # Download index.json
         response = s3.get_object(Bucket=bucket, Key=index_key)
-        index_data = json.loads(response['Body'].read().decode('utf-8'))
+        index_data = read_json_body(response)
         
         blogs = index_data.get('blogs', [])
         logger.info(f"📊 S3 index.json contains {len(blogs)} blogs")
@@ -0,0 +1,283 @@
+"""
+Passage-Level Chunking for RAG
+Splits blogs (markdown, heading-aware) and the resume (section-aware) into
+small overlapping passages with parent-document ids, and groups chunk hits
+back to their source document at query time.
+"""
+import re
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Chunk sizing (characters). ~1200 chars ≈ 300 tokens per passage.
+DEFAULT_MAX_CHARS = 1200
+DEFAULT_OVERLAP_CHARS = 150
+MIN_SECTION_CHARS = 200
+
+CHUNK_ID_SEPARATOR = "::c"
+
+_MD_HEADING = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+_CODE_FENCE = re.compile(r'^\s*(```|~~~)')
+# Resume section headers are standalone UPPERCASE lines ("SUMMARY", "EXPERIENCE", ...)
+_RESUME_HEADING = re.compile(r'^[A-Z][A-Z &/\-]{2,40}$')
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def make_chunk_id(parent_id: str, index: int) -> str:
+    """Build a stable chunk id from its parent document id"""
+    return f"{parent_id}{CHUNK_ID_SEPARATOR}{index:03d}"
+
+
+def parent_id_of(chunk_id: str, metadata: Optional[Dict] = None) -> str:
+    """Resolve the parent document id of a chunk (legacy whole-docs map to themselves)"""
+    if metadata and metadata.get('parent_id'):
+        return str(metadata['parent_id'])
+    return chunk_id.split(CHUNK_ID_SEPARATOR, 1)[0]
+
+
+def _tail_overlap(text: str, overlap_chars: int) -> str:
+    """Return the last ~overlap_chars of text, cut at a word boundary"""
+    if overlap_chars <= 0 or len(text) <= overlap_chars:
+        return ""
+    tail = text[-overlap_chars:]
+    space = tail.find(' ')
+    return tail[space + 1:] if space != -1 else tail
+
+
+def _split_oversized(paragraph: str, max_chars: int) -> List[str]:
+    """Split a single paragraph larger than max_chars on sentence, then word, boundaries"""
+    pieces = []
+    current = ""
+    for sentence in _SENTENCE_END.split(paragraph):
+        if len(sentence) > max_chars:
+            # Pathological run-on sentence: hard wrap on words
+            words = sentence.split()
+            for word in words:
+                if current and len(current) + len(word) + 1 > max_chars:
+                    pieces.append(current)
+                    current = word
+                else:
+                    current = f"{current} {word}" if current else word
+            continue
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _pack_paragraphs(text: str, max_chars: int, overlap_chars: int) -> List[str]:
+    """
+    Pack paragraphs of a section into windows of at most max_chars,
+    carrying a word-aligned tail of the previous window as overlap.
+    """
+    text = text.strip()
+    if not text:
+        return []
+    if len(text) <= max_chars:
+        return [text]
+
+    paragraphs = []
+    for para in re.split(r'\n\s*\n', text):
+        para = para.strip()
+        if not para:
+            continue
+        if len(para) > max_chars:
+            paragraphs.extend(_split_oversized(para, max_chars - overlap_chars))
+        else:
+            paragraphs.append(para)
+
+    windows = []
+    current = ""
+    for para in paragraphs:
+        if current and len(current) + len(para) + 2 > max_chars:
+            windows.append(current)
+            overlap = _tail_overlap(current, overlap_chars)
+            # Overlap is best-effort: never let it push a window past max_chars
+            if overlap and len(overlap) + len(para) + 2 <= max_chars:
+                current = f"{overlap}\n\n{para}"
+            else:
+                current = para
+        else:
+            current = f"{current}\n\n{para}" if current else para
+    if current:
+        windows.append(current)
+    return windows
+
+
+def _merge_small_sections(sections: List[Dict], max_chars: int) -> List[Dict]:
+    """Fold tiny sections into their successor so we don't embed one-line passages"""
+    merged = []
+    pending = None
+    for section in sections:
+        if pending is not None:
+            combined = f"{pending['text']}\n\n{section['text']}"
+            if len(combined) <= max_chars:
+                headings = [h for h in (pending['heading'], section['heading']) if h]
+                section = {"heading": " / ".join(dict.fromkeys(headings)), "text": combined}
+            else:
+                merged.append(pending)
+            pending = None
+        if len(section['text']) < MIN_SECTION_CHARS:
+            pending = section
+        else:
+            merged.append(section)
+    if pending is not None:
+        if merged and len(merged[-1]['text']) + len(pending['text']) + 2 <= max_chars:
+            merged[-1] = {
+                "heading": merged[-1]['heading'],
+                "text": f"{merged[-1]['text']}\n\n{pending['text']}"
+            }
+        else:
+            merged.append(pending)
+    return merged
+
+
+def _build_chunks(sections: List[Dict], parent_id: str, max_chars: int,
+                  overlap_chars: int, base_metadata: Optional[Dict]) -> List[Dict]:
+    """Turn (heading, text) sections into chunk records with chunk-level metadata"""
+    windows = []
+    for section in _merge_small_sections(sections, max_chars):
+        for window in _pack_paragraphs(section['text'], max_chars, overlap_chars):
+            windows.append((section['heading'], window))
+
+    chunks = []
+    for i, (heading, window) in enumerate(windows):
+        metadata = dict(base_metadata or {})
+        metadata.update({
+            "parent_id": parent_id,
+            "chunk_index": i,
+            "chunk_count": len(windows),
+            "section": heading or "",
+        })
+        chunks.append({"id": make_chunk_id(parent_id, i), "text": window, "metadata": metadata})
+    return chunks
+
+
+def chunk_markdown(text: str, parent_id: str, max_chars: int = DEFAULT_MAX_CHARS,
+                   overlap_chars: int = DEFAULT_OVERLAP_CHARS,
+                   base_metadata: Optional[Dict] = None) -> List[Dict]:
+    """
+    Heading-aware chunking for markdown blog bodies.
+
+    Args:
+        text: Markdown content
+        parent_id: Source document id (blog id)
+        max_chars: Maximum characters per chunk
+        overlap_chars: Characters of the previous chunk repeated at the start of the next
+        base_metadata: Metadata copied onto every chunk (title, category, dates, ...)
+
+    Returns:
+        List of {"id", "text", "metadata"} dicts in document order
+    """
+    if not text:
+        return []
+
+    sections = []
+    heading_path = {}
+    current_heading = ""
+    buffer = []
+    in_code = False
+
+    for line in text.splitlines():
+        if _CODE_FENCE.match(line):
+            in_code = not in_code
+        match = None if in_code else _MD_HEADING.match(line)
+        if match:
+            if buffer and '\n'.join(buffer).strip():
+                sections.append({"heading": current_heading, "text": '\n'.join(buffer).strip()})
+            level = len(match.group(1))
+            heading_path = {lvl: h for lvl, h in heading_path.items() if lvl < level}
+            heading_path[level] = match.group(2).strip()
+            # The H1 is the blog title (already on the parent); label by sub-headings
+            levels = [lvl for lvl in sorted(heading_path) if lvl > 1] or sorted(heading_path)
+            current_heading = " > ".join(heading_path[lvl] for lvl in levels)
+            # Keep the heading line in the passage so it reads standalone
+            buffer = [line]
+        else:
+            buffer.append(line)
+
+    if buffer and '\n'.join(buffer).strip():
+        sections.append({"heading": current_heading, "text": '\n'.join(buffer).strip()})
+
+    return _build_chunks(sections, parent_id, max_chars, overlap_chars, base_metadata)
+
+
+def chunk_resume(text: str, parent_id: str = "resume_full", max_chars: int = DEFAULT_MAX_CHARS,
+                 overlap_chars: int = DEFAULT_OVERLAP_CHARS,
+                 base_metadata: Optional[Dict] = None) -> List[Dict]:
+    """
+    Section-aware chunking for the plain-text resume (SUMMARY, EDUCATION, SKILLS, ...).
+
+    Args:
+        text: Resume text with UPPERCASE section header lines
+        parent_id: Source document id
+        max_chars: Maximum characters per chunk
+        overlap_chars: Characters of the previous chunk repeated at the start of the next
+        base_metadata: Metadata copied onto every chunk
+
+    Returns:
+        List of {"id", "text", "metadata"} dicts in document order
+    """
+    if not text:
+        return []
+
+    sections = []
+    current_heading = ""
+    buffer = []
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if _RESUME_HEADING.match(stripped):
+            if buffer and '\n'.join(buffer).strip():
+                sections.append({"heading": current_heading, "text": '\n'.join(buffer).strip()})
+            current_heading = stripped.title()
+            buffer = [stripped]
+        else:
+            buffer.append(line)
+
+    if buffer and '\n'.join(buffer).strip():
+        sections.append({"heading": current_heading, "text": '\n'.join(buffer).strip()})
+
+    return _build_chunks(sections, parent_id, max_chars, overlap_chars, base_metadata)
+
+
+def group_chunk_hits(docs: List[str], metas: List[Dict], ids: List[str],
+                     max_chunks_per_source: int = 3) -> Dict[str, List]:
+    """
+    Group ranked chunk hits back to their source document.
+
+    Sources keep the rank of their best chunk; each source's passages are
+    re-ordered by chunk_index so the injected text reads in document order.
+    Legacy whole-document records pass through unchanged.
+
+    Args:
+        docs, metas, ids: Parallel lists from a Chroma query (ranked)
+        max_chunks_per_source: Cap on passages injected per source
+
+    Returns:
+        {"docs": [...], "metas": [...], "ids": [...]} with one entry per source
+    """
+    grouped = {}
+    order = []
+    for doc, meta, chunk_id in zip(docs, metas, ids):
+        meta = meta or {}
+        parent = parent_id_of(chunk_id, meta)
+        if parent not in grouped:
+            grouped[parent] = {"meta": meta, "chunks": []}
+            order.append(parent)
+        if len(grouped[parent]["chunks"]) < max_chunks_per_source:
+            grouped[parent]["chunks"].append((meta.get('chunk_index', 0), doc))
+
+    out_docs, out_metas, out_ids = [], [], []
+    for parent in order:
+        chunks = sorted(grouped[parent]["chunks"], key=lambda c: c[0])
+        out_docs.append("\n...\n".join(text for _, text in chunks))
+        out_metas.append(grouped[parent]["meta"])
+        out_ids.append(parent)
+
+    return {"docs": out_docs, "metas": out_metas, "ids": out_ids}
@@ -48,13 +48,45 @@ def check_rag_limits():
         print("  ✅ Limit Split Guard Passed.")
 
     # 2. Check for Date Anchoring Logic
-    if "filter_blogs_by_date" not in content:
+    # It lives in backend/retrieval.py (select_hits), shared with the offline eval
+    retrieval_path = Path(__file__).parent.parent / 'retrieval.py'
+    if not retrieval_path.exists():
+        print(f"❌ Critical: {retrieval_path} not found.")
+        sys.exit(1)
+    
+    with open(retrieval_path, 'r', encoding='utf-8') as f:
+        retrieval = f.read()
+    
+    print(f"🔍 Analyzing {retrieval_path} for Date Anchoring...")
+    
+    if not re.search(r'^def filter_blogs_by_date\(', retrieval, re.MULTILINE):
         print("❌ FAIL: 'filter_blogs_by_date' function missing. Date Anchoring logic was removed!")
         sys.exit(1)
     
-    if "normalize_blog_query" not in content:
+    if not re.search(r'^def normalize_blog_query\(', retrieval, re.MULTILINE):
         print("❌ FAIL: 'normalize_blog_query' function missing.")
         sys.exit(1)
+    
+    select_hits = re.search(r'^def select_hits\(.*?(?=^def |\Z)', retrieval, re.MULTILINE | re.DOTALL)
+    if not select_hits or "normalize_blog_query(" not in select_hits.group(0) \
+            or "filter_blogs_by_date(" not in select_hits.group(0):
+        print("❌ FAIL: select_hits no longer applies Date Anchoring (normalize_blog_query + filter_blogs_by_date).")
+        sys.exit(1)
+    
+    blog_cand = re.search(r'blog_candidate_limit:\s*int\s*=\s*(\d+)', retrieval)
+    blog_inj = re.search(r'blog_injection_limit:\s*int\s*=\s*(\d+)', retrieval)
+    if not blog_cand or not blog_inj:
+        print("❌ FAIL: Could not find RetrievalConfig blog_candidate_limit / blog_injection_limit defaults.")
+        sys.exit(1)
+    if int(blog_cand.group(1)) <= int(blog_inj.group(1)):
+        print(f"❌ FAIL: Visibility Regression! blog_candidate_limit ({blog_cand.group(1)}) must be greater than blog_injection_limit ({blog_inj.group(1)}).")
+        sys.exit(1)
+    
+    # 3. server.py must still route chat retrieval through it
+    if not re.search(r'from backend\.retrieval import [^\n]*\bselect_hits\b', content) \
+            or "select_hits(" not in content:
+        print("❌ FAIL: server.py no longer calls retrieval.select_hits. Date Anchoring is not wired in!")
+        sys.exit(1)
         
     print("  ✅ Logic Integrity Guard Passed.")
     print("\n🎉 RAG Compliance Check Passed.")
@@ -1,9 +1,13 @@
 import boto3
 import chromadb
-import json
 import os
 import logging
 
+try:
+    from backend.s3_access import read_json_body
+except ImportError:
+    from s3_access import read_json_body
+
 # Setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("ChromaDebug")
@@ -13,7 +17,7 @@ s3 = boto3.client('s3')
 bucket = 'althaf-blogs-storage'
 try:
     resp = s3.get_object(Bucket=bucket, Key='blogs/index.json')
-    index = json.loads(resp['Body'].read())
+    index = read_json_body(resp)
     s3_blogs = index.get('blogs', [])
     print(f"📦 S3 Total Blogs: {len(s3_blogs)}")
     s3_ids = [b['id'] for b in s3_blogs]
@@ -4,17 +4,23 @@ Fix blog URLs with slashes in IDs by renaming them to use hyphens instead.
 This script:
 1. Finds blogs with slashes in their IDs in S3
 2. Renames them to use hyphens (URL-safe format)
-3. Updates index.json
+3. Updates the sharded blog index (and its index.json mirror)
 4. Updates ChromaDB embeddings
 """
 
 import boto3
-import json
 import os
 from dotenv import load_dotenv
 import chromadb
 from datetime import datetime
 
+try:
+    from backend.s3_access import json_object, read_json_body
+    from backend.auto_blogger.publisher import S3BlogStorage
+except ImportError:
+    from s3_access import json_object, read_json_body
+    from auto_blogger.publisher import S3BlogStorage
+
 load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env.local'))
 
 S3_BUCKET = os.getenv('S3_BLOG_BUCKET', 'althaf-blogs-storage')
@@ -25,20 +31,20 @@ CHROMA_DATABASE = os.getenv('CHROMA_DATABASE') or os.getenv('CHROMA_DB_NAME')
 def fix_blog_urls():
     """Fix all blogs with slashes in their IDs"""
     s3 = boto3.client('s3')
+    storage = S3BlogStorage(bucket_name=S3_BUCKET)
     
     print("=" * 80)
     print("BLOG URL FIXER - Migrating slashes to hyphens in blog IDs")
     print("=" * 80)
     
-    # 1. Download index.json
-    print("\n1. Downloading index.json from S3...")
+    # 1. Download the index (all shards)
+    print("\n1. Downloading blog index from S3...")
     try:
-        response = s3.get_object(Bucket=S3_BUCKET, Key='blogs/index.json')
-        index_data = json.loads(response['Body'].read().decode('utf-8'))
+        index_data, _ = storage.read_index_if_changed()
         blogs = index_data.get('blogs', [])
         print(f"   ✅ Found {len(blogs)} blogs in index")
     except Exception as e:
-        print(f"   ❌ Error downloading index.json: {e}")
+        print(f"   ❌ Error downloading index: {e}")
         return
     
     # 2. Find blogs with slashes
@@ -66,12 +72,12 @@ def fix_blog_urls():
             old_key = f"blogs/posts/{old_id}.json"
             try:
                 response = s3.get_object(Bucket=S3_BUCKET, Key=old_key)
-                blog_content = json.loads(response['Body'].read().decode('utf-8'))
+                blog_content = read_json_body(response)
             except:
                 # Try alternate path
                 old_key = f"blogs/{old_id}.json"
                 response = s3.get_object(Bucket=S3_BUCKET, Key=old_key)
-                blog_content = json.loads(response['Body'].read().decode('utf-8'))
+                blog_content = read_json_body(response)
             
             print(f"   ✅ Downloaded: {old_key}")
             
@@ -84,8 +90,7 @@ def fix_blog_urls():
             s3.put_object(
                 Bucket=S3_BUCKET,
                 Key=new_key,
-                Body=json.dumps(blog_content, ensure_ascii=False, indent=2),
-                ContentType='application/json'
+                **json_object(blog_content)
             )
             print(f"   ✅ Uploaded: {new_key}")
             
@@ -96,25 +101,22 @@ def fix_blog_urls():
             fixed_blogs.append({
                 'old_id': old_id,
                 'new_id': new_id,
-                'title': blog.get('title', 'Unknown')
+                'title': blog.get('title', 'Unknown'),
+                'post': blog_content
             })
             
         except Exception as e:
             print(f"   ❌ Error fixing {old_id}: {e}")
     
-    # 4. Update index.json
+    # 4. Update the index (conditional: old id out, new id in; refreshes index.json and the active listing)
     if fixed_blogs:
-        print(f"\n4. Updating index.json with {len(fixed_blogs)} fixed blog IDs...")
-        try:
-            s3.put_object(
-                Bucket=S3_BUCKET,
-                Key='blogs/index.json',
-                Body=json.dumps(index_data, ensure_ascii=False, indent=2),
-                ContentType='application/json'
-            )
-            print("   ✅ index.json updated")
-        except Exception as e:
-            print(f"   ❌ Error updating index.json: {e}")
+        print(f"\n4. Updating index with {len(fixed_blogs)} fixed blog IDs...")
+        for fix in fixed_blogs:
+            try:
+                storage.update_index_entry(fix['post'], old_id=fix['old_id'])
+                print(f"   ✅ Index updated: {fix['old_id']} → {fix['new_id']}")
+            except Exception as e:
+                print(f"   ❌ Error updating index for {fix['old_id']}: {e}")
     
     # 5. Update ChromaDB
     if fixed_blogs and CHROMA_API_KEY:
@@ -5,11 +5,15 @@ Fix ChromaDB embedding for migrated blog using correct Gemini model
 import os
 import sys
 import boto3
-import json
 import google.generativeai as genai
 import chromadb
 from chromadb.config import Settings
 
+try:
+    from backend.s3_access import read_json_body
+except ImportError:
+    from s3_access import read_json_body
+
 def main():
     print("=" * 80)
     print("CHROMADB EMBEDDING FIX - Using Gemini text-embedding-004")
@@ -32,7 +36,7 @@ def main():
     print(f"\n1. Downloading blog from S3: {key}")
     try:
         response = s3.get_object(Bucket='althaf-blogs-storage', Key=key)
-        blog_data = json.loads(response['Body'].read())
+        blog_data = read_json_body(response)
         print(f"   ✅ Title: {blog_data['title'][:70]}...")
     except Exception as e:
         print(f"   ❌ Failed to download: {e}")
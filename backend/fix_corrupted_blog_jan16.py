@@ -11,11 +11,17 @@ This script will:
 """
 
 import os
-import json
 import boto3
 from datetime import datetime
 from dotenv import load_dotenv
 
+try:
+    from backend.s3_access import json_object, read_json_body
+    from backend.auto_blogger.publisher import S3BlogStorage
+except ImportError:
+    from s3_access import json_object, read_json_body
+    from auto_blogger.publisher import S3BlogStorage
+
 # Load environment variables
 load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env.local'))
 
@@ -23,7 +29,6 @@ load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env.local
 BLOG_ID = "Cybersecurity_1768537800"
 BUCKET = "althaf-blogs-storage"
 BLOG_KEY = f"blogs/posts/{BLOG_ID}.json"
-INDEX_KEY = "blogs/index.json"
 
 # Correct title from the email
 CORRECT_TITLE = "Cybersecurity 2026: Implementing Agentic AI Defenses Against Hyperautomated Threats"
@@ -341,7 +346,7 @@ def main():
         # Step 1: Download the corrupted blog
         print(f"\n1. Downloading corrupted blog from S3...")
         response = s3.get_object(Bucket=BUCKET, Key=BLOG_KEY)
-        corrupted_blog = json.loads(response['Body'].read().decode('utf-8'))
+        corrupted_blog = read_json_body(response)
         
         print(f"   Current Title: {corrupted_blog.get('title')}")
         print(f"   Current Content Length: {len(corrupted_blog.get('content', ''))} chars")
@@ -369,46 +374,22 @@ def main():
         s3.put_object(
             Bucket=BUCKET,
             Key=BLOG_KEY,
-            Body=json.dumps(fixed_blog, indent=2),
-            ContentType='application/json'
+            **json_object(fixed_blog)
         )
         print(f"   [OK] Blog uploaded successfully to s3://{BUCKET}/{BLOG_KEY}")
         
-        # Step 4: Update index.json
-        print(f"\n4. Updating index.json...")
+        # Step 4: Update the sharded index (and its index.json mirror)
+        print("\n4. Updating index...")
         try:
-            index_response = s3.get_object(Bucket=BUCKET, Key=INDEX_KEY)
-            index_data = json.loads(index_response['Body'].read().decode('utf-8'))
-            
-            # Find and update the blog entry in index
-            updated = False
-            for blog in index_data.get('blogs', []):
-                if blog.get('id') == BLOG_ID:
-                    blog['title'] = CORRECT_TITLE
-                    blog['summary'] = fixed_blog['summary']
-                    updated = True
-                    print(f"   [OK] Updated blog entry in index")
-                    break
-            
-            if updated:
-                # Upload updated index
-                s3.put_object(
-                    Bucket=BUCKET,
-                    Key=INDEX_KEY,
-                    Body=json.dumps(index_data, indent=2),
-                    ContentType='application/json'
-                )
-                print(f"   [OK] Index updated successfully")
-            else:
-                print(f"   [WARN] Blog not found in index (may need manual update)")
-                
+            S3BlogStorage(bucket_name=BUCKET).update_index_entry(fixed_blog)
+            print("   [OK] Index updated successfully")
         except Exception as e:
             print(f"   [WARN] Could not update index: {e}")
         
         # Step 5: Verification
         print(f"\n5. Verifying fix...")
         verify_response = s3.get_object(Bucket=BUCKET, Key=BLOG_KEY)
-        verified_blog = json.loads(verify_response['Body'].read().decode('utf-8'))
+        verified_blog = read_json_body(verify_response)
         
         print(f"   Title: {verified_blog['title']}")
         print(f"   Content starts with: {verified_blog['content'][:100]}...")
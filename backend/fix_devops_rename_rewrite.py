@@ -1,11 +1,17 @@
 import boto3
-import json
 import logging
 import os
 import chromadb
 import google.generativeai as genai
 import time
 
+try:
+    from backend.s3_access import json_object, read_json_body
+    from backend.auto_blogger.publisher import S3BlogStorage
+except ImportError:
+    from s3_access import json_object, read_json_body
+    from auto_blogger.publisher import S3BlogStorage
+
 # Setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("DevOpsFix")
@@ -78,7 +84,7 @@ try:
     # 1. Fetch Old Blog
     print(f"🔧 Fetching Old Blog: {old_id}")
     resp = s3.get_object(Bucket=bucket, Key=f'blogs/posts/{old_id}.json')
-    blog = json.loads(resp['Body'].read())
+    blog = read_json_body(resp)
     
     # 2. Prepare New Content
     content = blog.get('content', '')
@@ -101,37 +107,13 @@ try:
     s3.put_object(
         Bucket=bucket,
         Key=f'blogs/posts/{new_id}.json',
-        Body=json.dumps(blog, indent=2).encode(),
-        ContentType='application/json'
+        **json_object(blog)
     )
     print(f"✅ Saved NEW blog to S3: {new_id}")
 
     # 4. Update Index (Remove Old, Add New)
     print("📚 Updating Index...")
-    resp = s3.get_object(Bucket=bucket, Key='blogs/index.json')
-    index = json.loads(resp['Body'].read())
-    
-    # Filter out old ID
-    new_list = [b for b in index['blogs'] if b['id'] != old_id]
-    
-    # Add new entry
-    new_entry = {
-         "id": new_id,
-         "title": blog.get('title'),
-         "summary": blog.get('summary'),
-         "category": "DevOps",
-         "created_at": blog.get('created_at'),
-         "tags": blog.get('tags')
-    }
-    new_list.insert(0, new_entry) # Add to top
-    index['blogs'] = new_list
-    
-    s3.put_object(
-        Bucket=bucket,
-        Key='blogs/index.json',
-        Body=json.dumps(index, indent=2).encode(),
-        ContentType='application/json'
-    )
+    S3BlogStorage(bucket_name=bucket).update_index_entry(blog, old_id=old_id)
     print("✅ Index Updated (Old removed, New added).")
 
     # 5. Delete OLD Blog File
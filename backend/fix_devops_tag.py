@@ -1,10 +1,16 @@
 import boto3
-import json
 import logging
 import os
 import chromadb
 import time
 
+try:
+    from backend.s3_access import json_object, read_json_body
+    from backend.auto_blogger.publisher import S3BlogStorage
+except ImportError:
+    from s3_access import json_object, read_json_body
+    from auto_blogger.publisher import S3BlogStorage
+
 # Setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("TagFix")
@@ -16,7 +22,7 @@ blog_id = 'DevOps_1767069000' # The NEW ID we just made
 try:
     print(f"🔧 Fetching Blog: {blog_id}")
     resp = s3.get_object(Bucket=bucket, Key=f'blogs/posts/{blog_id}.json')
-    blog = json.loads(resp['Body'].read())
+    blog = read_json_body(resp)
     
     # 1. Cleaning Tags
     old_tags = blog.get('tags', [])
@@ -39,28 +45,14 @@ try:
     s3.put_object(
         Bucket=bucket,
         Key=f'blogs/posts/{blog_id}.json',
-        Body=json.dumps(blog, indent=2).encode(),
-        ContentType='application/json'
+        **json_object(blog)
     )
     print("✅ Blog JSON updated on S3.")
 
     # 3. Update Index
     print("📚 Updating Index...")
-    resp = s3.get_object(Bucket=bucket, Key='blogs/index.json')
-    index = json.loads(resp['Body'].read())
-    
-    for b in index['blogs']:
-        if b['id'] == blog_id:
-            b['tags'] = new_tags
-            print("✅ Index entry updated.")
-            break
-            
-    s3.put_object(
-        Bucket=bucket,
-        Key='blogs/index.json',
-        Body=json.dumps(index, indent=2).encode(),
-        ContentType='application/json'
-    )
+    S3BlogStorage(bucket_name=bucket).update_index_entry(blog)
+    print("✅ Index entry updated.")
 
     # 4. Update Chroma
     print("🧠 Updating ChromaDB...")
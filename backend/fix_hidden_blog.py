@@ -1,5 +1,11 @@
 import boto3
-import json
+
+try:
+    from backend.s3_access import json_object, read_json_body
+    from backend.auto_blogger.publisher import S3BlogStorage
+except ImportError:
+    from s3_access import json_object, read_json_body
+    from auto_blogger.publisher import S3BlogStorage
 
 s3 = boto3.client('s3')
 bucket = 'althaf-blogs-storage'
@@ -9,7 +15,7 @@ print(f"🔧 Fixing Blog: {blog_id}")
 
 # 1. Get the blog
 resp = s3.get_object(Bucket=bucket, Key=f'blogs/posts/{blog_id}.json')
-blog = json.loads(resp['Body'].read())
+blog = read_json_body(resp)
 
 # 2. Fix Metadata
 print(f"Old Category: {blog.get('category')}")
@@ -23,44 +29,11 @@ print(f"New Category: {blog.get('category')}")
 s3.put_object(
     Bucket=bucket,
     Key=f'blogs/posts/{blog_id}.json',
-    Body=json.dumps(blog, indent=2).encode(),
-    ContentType='application/json'
+    **json_object(blog)
 )
 
-# 4. Fix Index
+# 4. Fix Index (re-derived from the fixed post; added if it was missing)
 print("📝 Updating Index...")
-resp = s3.get_object(Bucket=bucket, Key='blogs/index.json')
-index = json.loads(resp['Body'].read())
-
-found = False
-for b in index['blogs']:
-    if b['id'] == blog_id:
-        b['category'] = 'DevOps' # Fix here too
-        b['title'] = blog['title']
-        found = True
-        print("✅ Found and fixed in index")
-        break
-
-if not found:
-    print("⚠️ Blog not found in index! Adding it...")
-    # Add it manually if missing
-    new_entry = {
-        "id": blog_id,
-        "title": blog['title'],
-        "summary": blog.get('summary', ''),
-        "category": "DevOps",
-        "tags": blog.get('tags', []),
-        "published": True,
-        "created_at": blog.get('created_at')
-    }
-    index['blogs'].insert(0, new_entry)
-
-# Save Index
-s3.put_object(
-    Bucket=bucket,
-    Key='blogs/index.json',
-    Body=json.dumps(index, indent=2).encode(),
-    ContentType='application/json'
-)
+S3BlogStorage(bucket_name=bucket).update_index_entry(blog)
 
 print("✅ Fix Complete! Blog should now be visible in 'DevOps' tab.")
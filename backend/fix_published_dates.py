@@ -4,11 +4,15 @@ Reads from S3, extracts created_at (not createdAt), updates ChromaDB.
 """
 import os
 import boto3
-import json
 import chromadb
 from dotenv import load_dotenv
 from datetime import datetime
 
+try:
+    from backend.s3_access import read_json_body
+except ImportError:
+    from s3_access import read_json_body
+
 load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env.local'))
 
 def main():
@@ -43,7 +47,7 @@ def main():
         try:
             # Read blog from S3
             response = s3.get_object(Bucket='althaf-blogs-storage', Key=blog_key)
-            blog = json.loads(response['Body'].read())
+            blog = read_json_body(response)
             
             blog_id = blog.get('id', blog_key.split('/')[-1].replace('.json', ''))
             created_at = blog.get('created_at', '')
@@ -3,10 +3,14 @@ Quick Fix Script: Patch Today's Blog (Jan 1, 2026)
 Removes leaked SEO instructions from published blog
 """
 import boto3
-import json
 import re
 import sys
 
+try:
+    from backend.s3_access import json_object, read_json_body
+except ImportError:
+    from s3_access import json_object, read_json_body
+
 def strip_seo_leakage(content: str) -> str:
     """Remove leaked SEO instructions from content"""
     # Remove SEO Implementation sections
@@ -41,7 +45,7 @@ def main():
     try:
         # Download
         response = s3.get_object(Bucket=bucket, Key=key)
-        blog = json.loads(response['Body'].read())
+        blog = read_json_body(response)
         
         original_content = blog['content']
         
@@ -60,8 +64,7 @@ def main():
         s3.put_object(
             Bucket=bucket,
             Key=key,
-            Body=json.dumps(blog, indent=2).encode('utf-8'),
-            ContentType='application/json'
+            **json_object(blog)
         )
         
         print(f"✅ Successfully patched {blog_id}")
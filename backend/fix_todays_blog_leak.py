@@ -4,7 +4,11 @@ Fix SEO metadata leak in today's Low-Code/No-Code blog
 """
 import os
 import boto3
-import json
+
+try:
+    from backend.s3_access import json_object, read_json_body
+except ImportError:
+    from s3_access import json_object, read_json_body
 
 def main():
     print("=" * 80)
@@ -20,7 +24,7 @@ def main():
     print(f"\n1. Downloading blog from S3: {key}")
     try:
         response = s3.get_object(Bucket=bucket, Key=key)
-        blog_data = json.loads(response['Body'].read())
+        blog_data = read_json_body(response)
         print(f"   ✅ Downloaded: {blog_data['title'][:70]}...")
     except Exception as e:
         print(f"   ❌ Failed to download: {e}")
@@ -75,8 +79,7 @@ def main():
         s3.put_object(
             Bucket=bucket,
             Key=key,
-            Body=json.dumps(blog_data, indent=2),
-            ContentType='application/json'
+            **json_object(blog_data)
         )
         print(f"   ✅ Uploaded: {key}")
     except Exception as e:
@@ -0,0 +1,85 @@
+"""
+Query Embedding Functions for ChromaDB
+Lives outside server.py so chromadb and google-genai are only imported
+on the first RAG query instead of at server startup.
+"""
+import logging
+import requests
+from chromadb import EmbeddingFunction, Documents, Embeddings
+from google.genai import types
+
+try:
+    from backend.monitoring.metrics import time_stage
+except ImportError:
+    from monitoring.metrics import time_stage
+
+logger = logging.getLogger('PortfolioBackend')
+
+
+class GeminiEmbeddingFunction(EmbeddingFunction):
+    def __init__(self, client=None):
+        self.client = client
+
+    def __call__(self, input: Documents) -> Embeddings:
+        try:
+            # New SDK Embedding logic
+            if not self.client:
+                return [[0.0] * 768 for _ in input]
+                
+            embeddings = []
+            with time_stage("embedding"):
+                for text in input:
+                    response = self.client.models.embed_content(
+                        model='gemini-embedding-001',
+                        contents=text,
+                        config=types.EmbedContentConfig(
+                            task_type="RETRIEVAL_QUERY",
+                            output_dimensionality=768
+                        )
+                    )
+                    embeddings.append(response.embeddings[0].values)
+            return embeddings
+        except Exception as e:
+            logger.error(f"Embedding failed: {e}")
+            return [[0.0] * 768 for _ in input]
+
+
+class HttpEmbeddingFunction(EmbeddingFunction):
+    """
+    Embeds via a plain HTTP endpoint: POST {"texts": [...]} -> {"embeddings": [[...], ...]}.
+    Used with EMBEDDING_ENDPOINT to point the server at the benchmark stub.
+    """
+    def __init__(self, endpoint: str, timeout: float = 10.0):
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def __call__(self, input: Documents) -> Embeddings:
+        try:
+            with time_stage("embedding"):
+                response = requests.post(self.endpoint, json={"texts": list(input)}, timeout=self.timeout)
+                response.raise_for_status()
+                return response.json()["embeddings"]
+        except Exception as e:
+            logger.error(f"Embedding failed: {e}")
+            return [[0.0] * 768 for _ in input]
+
+
+def embed_documents(client, texts, batch_size: int = 100) -> Embeddings:
+    """RETRIEVAL_DOCUMENT embeddings for passages being indexed, one Gemini call per batch.
+
+    Unlike the query functions above, failures raise: storing placeholder
+    vectors would silently break retrieval for these documents.
+    """
+    embeddings = []
+    with time_stage("embedding"):
+        for start in range(0, len(texts), batch_size):
+            response = client.models.embed_content(
+                model='gemini-embedding-001',
+                contents=list(texts[start:start + batch_size]),
+                config=types.EmbedContentConfig(
+                    task_type="RETRIEVAL_DOCUMENT",
+                    output_dimensionality=768
+                )
+            )
+            embeddings.extend(emb.values for emb in response.embeddings)
+    return embeddings
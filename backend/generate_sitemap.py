@@ -5,40 +5,54 @@ Can be run as a cron job or triggered after blog generation.
 """
 
 import os
-import json
-import boto3
-from datetime import datetime
 from typing import List, Dict
-import xml.etree.ElementTree as ET
+
+try:
+    from backend.s3_access import get_s3_client, get_json_many, list_keys, read_json_body
+    from backend.blog_index import MANIFEST_KEY, ShardedBlogIndex
+    from backend.sitemap_service import SITE_URL, MAX_URLS, build_url_entries, render_documents
+except ImportError:
+    from s3_access import get_s3_client, get_json_many, list_keys, read_json_body
+    from blog_index import MANIFEST_KEY, ShardedBlogIndex
+    from sitemap_service import SITE_URL, MAX_URLS, build_url_entries, render_documents
 
 # Configuration
 S3_BUCKET = os.getenv('S3_BLOG_BUCKET', 'althaf-blogs-storage')
-SITE_URL = 'https://althafportfolio.site'
-OUTPUT_FILE = '/tmp/sitemap.xml'
+OUTPUT_DIR = '/tmp'
 
 def fetch_blogs_from_s3() -> List[Dict]:
-    """Fetch all blog posts from S3 bucket"""
+    """Fetch every indexed blog (the sitemap lists all posts, not just the active listing)"""
     try:
-        s3 = boto3.client('s3')
+        s3 = get_s3_client()
         
-        # First, try to get index.json
+        # The month-sharded index (manifest + shards), as the API reads it
         try:
-            index_obj = s3.get_object(Bucket=S3_BUCKET, Key='index.json')
-            index_data = json.loads(index_obj['Body'].read().decode('utf-8'))
-            print(f"✅ Found {len(index_data)} blogs from index.json")
-            return index_data
-        except:
-            # Fallback: List all JSON files in bucket
-            print("⚠️  index.json not found, listing bucket objects...")
-            response = s3.list_objects_v2(Bucket=S3_BUCKET)
-            blogs = []
-            
-            for obj in response.get('Contents', []):
-                key = obj['Key']
-                if key.endswith('.json') and key != 'index.json':
-                    blog_obj = s3.get_object(Bucket=S3_BUCKET, Key=key)
-                    blog_data = json.loads(blog_obj['Body'].read().decode('utf-8'))
-                    blogs.append(blog_data)
+            index = ShardedBlogIndex(s3, S3_BUCKET)
+            manifest, _ = index.read_manifest_if_changed()
+            if manifest is not None:
+                blogs = index.read_all(manifest)
+                print(f"✅ Found {len(blogs)} blogs from {MANIFEST_KEY}")
+                return blogs
+            print(f"⚠️  {MANIFEST_KEY} not found, reading blogs/index.json...")
+        except Exception as e:
+            print(f"⚠️  Sharded index unreadable ({e}), reading blogs/index.json...")
+        
+        # Then the single-file index written before sharding
+        try:
+            index_obj = s3.get_object(Bucket=S3_BUCKET, Key='blogs/index.json')
+            index_data = read_json_body(index_obj)
+            blogs = index_data.get('blogs', []) if isinstance(index_data, dict) else index_data
+            print(f"✅ Found {len(blogs)} blogs from blogs/index.json")
+            return blogs
+        except Exception:
+            # Fallback: List all post files in the bucket
+            print("⚠️  blogs/index.json not found, listing bucket objects...")
+            keys = list_keys(S3_BUCKET, prefix='blogs/posts/', suffix='.json')
+            # Parallel reads over the shared connection pool
+            found, errors = get_json_many(S3_BUCKET, keys)
+            blogs = [found[key] for key in keys if key in found]
+            for key, error in errors.items():
+                print(f"⚠️  Skipped {key}: {error}")
             
             print(f"✅ Found {len(blogs)} blogs from bucket listing")
             return blogs
@@ -68,78 +82,24 @@ def fetch_projects_from_mongodb() -> List[Dict]:
         print(f"⚠️  Could not fetch projects from MongoDB: {e}")
         return []
 
-def generate_sitemap(blogs: List[Dict], projects: List[Dict]) -> str:
-    """Generate XML sitemap"""
-    
-    # Create root element
-    urlset = ET.Element('urlset')
-    urlset.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-    urlset.set('xmlns:news', 'http://www.google.com/schemas/sitemap-news/0.9')
-    urlset.set('xmlns:xhtml', 'http://www.w3.org/1999/xhtml')
-    urlset.set('xmlns:mobile', 'http://www.google.com/schemas/sitemap-mobile/1.0')
-    urlset.set('xmlns:image', 'http://www.google.com/schemas/sitemap-image/1.1')
-    urlset.set('xmlns:video', 'http://www.google.com/schemas/sitemap-video/1.1')
-    
-    # Static pages
-    static_pages = [
-        {'url': '/', 'priority': '1.0', 'changefreq': 'weekly'},
-        {'url': '/#about', 'priority': '0.8', 'changefreq': 'monthly'},
-        {'url': '/#projects', 'priority': '0.8', 'changefreq': 'weekly'},
-        {'url': '/#blogs', 'priority': '0.9', 'changefreq': 'daily'},
-        {'url': '/#contact', 'priority': '0.7', 'changefreq': 'monthly'},
-    ]
-    
-    for page in static_pages:
-        url_elem = ET.SubElement(urlset, 'url')
-        ET.SubElement(url_elem, 'loc').text = f"{SITE_URL}{page['url']}"
-        ET.SubElement(url_elem, 'changefreq').text = page['changefreq']
-        ET.SubElement(url_elem, 'priority').text = page['priority']
-    
-    # Blog pages
-    for blog in blogs:
-        if blog.get('published', True) and blog.get('id'):
-            url_elem = ET.SubElement(urlset, 'url')
-            ET.SubElement(url_elem, 'loc').text = f"{SITE_URL}/blogs/{blog['id']}"
-            
-            # Add lastmod if created_at exists
-            if 'created_at' in blog:
-                try:
-                    date_str = blog['created_at'].split('T')[0]
-                    ET.SubElement(url_elem, 'lastmod').text = date_str
-                except:
-                    pass
-            
-            ET.SubElement(url_elem, 'changefreq').text = 'weekly'
-            ET.SubElement(url_elem, 'priority').text = '0.9'
-    
-    # Project pages
-    for project in projects:
-        project_id = str(project.get('_id', project.get('id', '')))
-        if project_id:
-            url_elem = ET.SubElement(urlset, 'url')
-            ET.SubElement(url_elem, 'loc').text = f"{SITE_URL}/projects/{project_id}"
-            ET.SubElement(url_elem, 'changefreq').text = 'monthly'
-            ET.SubElement(url_elem, 'priority').text = '0.8'
-            ET.SubElement(url_elem, 'lastmod').text = datetime.now().strftime('%Y-%m-%d')
-    
-    # Generate XML string
-    tree = ET.ElementTree(urlset)
-    ET.indent(tree, space="  ")
-    
-    return ET.tostring(urlset, encoding='unicode', xml_declaration=True)
+def generate_sitemap(blogs: List[Dict], projects: List[Dict]) -> Dict[str, str]:
+    """Generate the sitemap documents: {'sitemap.xml': ...} plus sitemap-N.xml
+    children once there are more than SITEMAP_MAX_URLS URLs"""
+    documents = render_documents(build_url_entries(blogs, projects), MAX_URLS)
+    return {path.lstrip('/'): xml for path, xml in documents.items()}
 
-def upload_to_s3(xml_content: str):
+def upload_to_s3(xml_content: str, key: str = 'sitemap.xml'):
     """Upload sitemap to S3 bucket"""
     try:
-        s3 = boto3.client('s3')
+        s3 = get_s3_client()
         s3.put_object(
             Bucket=S3_BUCKET,
-            Key='sitemap.xml',
+            Key=key,
             Body=xml_content.encode('utf-8'),
             ContentType='application/xml',
             CacheControl='max-age=3600'
         )
-        print(f"✅ Sitemap uploaded to S3: s3://{S3_BUCKET}/sitemap.xml")
+        print(f"✅ Sitemap uploaded to S3: s3://{S3_BUCKET}/{key}")
         return True
     except Exception as e:
         print(f"❌ Error uploading sitemap to S3: {e}")
@@ -156,22 +116,25 @@ def main():
     blogs = fetch_blogs_from_s3()
     projects = fetch_projects_from_mongodb()
     
-    # Generate sitemap
-    xml_content = generate_sitemap(blogs, projects)
+    # Generate sitemap (an index plus children past SITEMAP_MAX_URLS URLs)
+    documents = generate_sitemap(blogs, projects)
     
     # Save locally
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        f.write(xml_content)
+    for name, xml_content in documents.items():
+        with open(os.path.join(OUTPUT_DIR, name), 'w', encoding='utf-8') as f:
+            f.write(xml_content)
     
     print(f"\n✅ Dynamic sitemap generated successfully!")
     print(f"   📊 Total URLs: {5 + len(blogs) + len(projects)}")
     print(f"   - 5 static pages")
     print(f"   - {len(blogs)} blog posts")
     print(f"   - {len(projects)} projects")
-    print(f"   📍 Local: {OUTPUT_FILE}")
+    print(f"   📄 Documents: {', '.join(documents)}")
+    print(f"   📍 Local: {OUTPUT_DIR}")
     
     # Upload to S3 (optional - can be disabled if using frontend build)
-    upload_to_s3(xml_content)
+    for name, xml_content in documents.items():
+        upload_to_s3(xml_content, key=name)
     
     print(f"\n🌐 Submit to Google Search Console:")
     print(f"   https://search.google.com/search-console")
@@ -0,0 +1,139 @@
+"""
+Project Image Uploads
+Cloudinary uploads for the project endpoints, kept off the event loop:
+
+    image = await upload_project_image(get_cloudinary_uploader, file)
+    project.update(image)   # image_url, image_variants, image_width, image_height
+
+- The upload is validated before anything is sent: at most
+  PROJECT_IMAGE_MAX_BYTES (measured by seeking Starlette's spooled temp
+  file, not by reading it) and a JPEG/PNG/WebP/GIF/AVIF signature.
+- The SDK call runs on a small dedicated thread pool, so an admin upload
+  never blocks other requests.
+- Responsive variants (RESPONSIVE_WIDTHS x VARIANT_FORMATS) are generated
+  eagerly by Cloudinary as part of the upload and stored with the project:
+  the frontend picks one through <picture>/srcset instead of downloading the
+  original. image_url stays the original (Open Graph, old clients).
+
+Env: PROJECT_IMAGE_MAX_BYTES, PROJECT_IMAGE_WIDTHS (comma-separated),
+PROJECT_IMAGE_UPLOAD_WORKERS.
+"""
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+logger = logging.getLogger("ImageUploads")
+
+MAX_IMAGE_BYTES = int(os.getenv("PROJECT_IMAGE_MAX_BYTES", str(10 * 1024 * 1024)))
+RESPONSIVE_WIDTHS = tuple(int(w) for w in os.getenv("PROJECT_IMAGE_WIDTHS", "480,800,1200,1600").split(","))
+VARIANT_FORMATS = ("avif", "webp")  # most compact first; <picture> falls through in this order
+UPLOAD_WORKERS = int(os.getenv("PROJECT_IMAGE_UPLOAD_WORKERS", "2"))
+UPLOAD_FOLDER = "portfolio_projects"
+
+# Leading bytes of the accepted formats
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class ImageRejected(ValueError):
+    """The upload is not an acceptable image; status_code is the HTTP answer"""
+
+    def __init__(self, message: str, status_code: int = 415):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    for signature, kind in _SIGNATURES:
+        if head.startswith(signature):
+            return kind
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[4:8] == b"ftyp" and head[8:12] in (b"avif", b"avis"):
+        return "avif"
+    return None
+
+
+def check_image(stream: BinaryIO, max_bytes: int = MAX_IMAGE_BYTES) -> str:
+    """Size and signature check on a seekable stream (left rewound); returns the image type"""
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    if size == 0:
+        raise ImageRejected("Empty image upload", status_code=400)
+    if size > max_bytes:
+        raise ImageRejected(f"Image is {size} bytes; the limit is {max_bytes}", status_code=413)
+    kind = sniff_image_type(stream.read(16))
+    stream.seek(0)
+    if kind is None:
+        raise ImageRejected("Unsupported image type (use JPEG, PNG, WebP, GIF or AVIF)")
+    return kind
+
+
+def variant_transformations(widths=RESPONSIVE_WIDTHS, formats=VARIANT_FORMATS) -> List[Dict]:
+    """Cloudinary eager transformations, one per (format, width); never upscaled"""
+    return [{"width": width, "crop": "limit", "quality": "auto", "fetch_format": fmt}
+            for fmt in formats for width in widths]
+
+
+def image_fields(result: Dict, transformations: List[Dict]) -> Dict:
+    """Project fields from a Cloudinary upload response"""
+    eager = result.get("eager") or []
+    original_width = result.get("width")
+    # crop=limit never upscales: widths past the first one covering the original are duplicates
+    widths = sorted({t["width"] for t in transformations})
+    cap = next((w for w in widths if original_width and w >= original_width), None)
+    variants = []
+    for transformation, generated in zip(transformations, eager):
+        width = transformation["width"]
+        if not generated.get("secure_url") or (cap is not None and width > cap):
+            continue
+        variants.append({"width": min(width, original_width or width),
+                         "format": transformation["fetch_format"], "url": generated["secure_url"]})
+    return {
+        "image_url": result.get("secure_url"),
+        "image_variants": variants,
+        "image_width": original_width,
+        "image_height": result.get("height"),
+    }
+
+
+def upload_image(uploader_factory: Callable[[], Any], source, folder: str = UPLOAD_FOLDER) -> Dict:
+    """Blocking: upload with eager variants, return the project image fields.
+
+    `source` is a stream (validated here first) or an http(s) URL that
+    Cloudinary fetches itself (bulk import).
+    """
+    if not isinstance(source, str):
+        check_image(source)
+    transformations = variant_transformations()
+    result = uploader_factory().upload(source, folder=folder, eager=transformations, eager_async=False)
+    fields = image_fields(result, transformations)
+    logger.info(f"Uploaded {result.get('public_id')} with {len(fields['image_variants'])} variants")
+    return fields
+
+
+def get_upload_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="image-upload")
+    return _executor
+
+
+async def upload_project_image(uploader_factory: Callable[[], Any], file, folder: str = UPLOAD_FOLDER) -> Dict:
+    """upload_image for a FastAPI UploadFile (or an image URL), awaited on the upload pool"""
+    source = file if isinstance(file, str) else file.file
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_upload_executor(), upload_image, uploader_factory, source, folder)
@@ -0,0 +1,69 @@
+"""
+Lazy Import Helpers
+Defers heavy optional dependencies (chromadb, google-genai, boto3, cloudinary, ...)
+until first use so the API can start serving before they are loaded,
+and records how long each deferred import took.
+"""
+import importlib
+import logging
+import threading
+import time
+from typing import Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+# {module_name: import_duration_ms} for every module loaded through this helper
+IMPORT_TIMINGS: Dict[str, float] = {}
+
+
+class LazyModule:
+    """Module proxy that performs the real import on first attribute access"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self):
+        """Import the module now (thread-safe, idempotent)"""
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    duration_ms = (time.perf_counter() - start) * 1000
+                    IMPORT_TIMINGS[self._name] = round(duration_ms, 1)
+                    logger.info(f"📦 Lazy-loaded {self._name} in {duration_ms:.0f}ms")
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "deferred"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a proxy for `name` that is imported on first use"""
+    return LazyModule(name)
+
+
+def warm_imports(modules: Iterable[LazyModule]) -> Dict[str, float]:
+    """
+    Load deferred modules ahead of first use (intended for a background thread).
+
+    Failures are logged, never raised: a missing optional dependency must not
+    take down the warm-up of the others.
+    """
+    for module in modules:
+        try:
+            module.load()
+        except Exception as e:
+            logger.warning(f"Warm-up import failed for {module._name}: {e}")
+    return dict(IMPORT_TIMINGS)
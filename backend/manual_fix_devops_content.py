@@ -1,7 +1,13 @@
 import boto3
-import json
 import logging
 
+try:
+    from backend.s3_access import json_object, read_json_body
+    from backend.auto_blogger.publisher import S3BlogStorage
+except ImportError:
+    from s3_access import json_object, read_json_body
+    from auto_blogger.publisher import S3BlogStorage
+
 logging.basicConfig(level=logging.INFO)
 s3 = boto3.client('s3')
 bucket = 'althaf-blogs-storage'
@@ -38,7 +44,7 @@ def clean_content(text):
 try:
     print(f"🔧 Fetching Blog: {blog_id}")
     resp = s3.get_object(Bucket=bucket, Key=f'blogs/posts/{blog_id}.json')
-    blog = json.loads(resp['Body'].read())
+    blog = read_json_body(resp)
     
     content = blog.get('content', '')
     print(f"🧐 CURRENT ENDING (Last 50 chars): '{content[-50:]}'")
@@ -67,30 +73,13 @@ try:
     s3.put_object(
         Bucket=bucket,
         Key=f'blogs/posts/{blog_id}.json',
-        Body=json.dumps(blog, indent=2).encode(),
-        ContentType='application/json'
+        **json_object(blog)
     )
     
     # 4. Update Index
     print("📚 Updating Index...")
-    resp = s3.get_object(Bucket=bucket, Key='blogs/index.json')
-    index = json.loads(resp['Body'].read())
-    
-    found = False
-    for b in index['blogs']:
-        if b['id'] == blog_id:
-            b['summary'] = summary
-            print("✅ Index entry updated.")
-            found = True
-            break
-            
-    if found:
-        s3.put_object(
-            Bucket=bucket,
-            Key='blogs/index.json',
-            Body=json.dumps(index, indent=2).encode(),
-            ContentType='application/json'
-        )
+    S3BlogStorage(bucket_name=bucket).update_index_entry(blog)
+    print("✅ Index entry updated.")
     print("🚀 Done.")
 
 except Exception as e:
@@ -1,8 +1,14 @@
 import boto3
-import json
 import os
 from datetime import datetime
 
+try:
+    from backend.s3_access import json_object, read_json_body
+    from backend.auto_blogger.publisher import S3BlogStorage
+except ImportError:
+    from s3_access import json_object, read_json_body
+    from auto_blogger.publisher import S3BlogStorage
+
 # Config
 BLOG_ID = "DevOps_1767241800"
 NEW_TITLE = "DevOps 2026: AI-Driven Pipelines & Self-Healing Infrastructure"
@@ -17,7 +23,7 @@ def fix_title():
     try:
         print(f"   Fetching {key_post}...")
         resp = s3.get_object(Bucket=BUCKET, Key=key_post)
-        blog_data = json.loads(resp['Body'].read())
+        blog_data = read_json_body(resp)
         
         old_title = blog_data.get('title')
         print(f"   Old Title: {old_title}")
@@ -29,8 +35,7 @@ def fix_title():
         s3.put_object(
             Bucket=BUCKET,
             Key=key_post,
-            Body=json.dumps(blog_data, indent=2),
-            ContentType='application/json'
+            **json_object(blog_data)
         )
         print(f"✅ Updated post file with new title: {NEW_TITLE}")
         
@@ -38,31 +43,10 @@ def fix_title():
         print(f"❌ Failed to update post file: {e}")
         return
 
-    # 2. Update Index File
-    key_index = "blogs/index.json"
+    # 2. Update Index (sharded index and its index.json mirror)
     try:
-        print(f"   Fetching {key_index}...")
-        resp = s3.get_object(Bucket=BUCKET, Key=key_index)
-        index_data = json.loads(resp['Body'].read())
-        
-        updated = False
-        for blog in index_data['blogs']:
-            if blog['id'] == BLOG_ID:
-                blog['title'] = NEW_TITLE
-                updated = True
-                break
-        
-        if updated:
-            s3.put_object(
-                Bucket=BUCKET,
-                Key=key_index,
-                Body=json.dumps(index_data, indent=2),
-                ContentType='application/json'
-            )
-            print(f"✅ Updated index file with new title")
-        else:
-            print(f"⚠️ Blog ID not found in index")
-            
+        S3BlogStorage(bucket_name=BUCKET).update_index_entry(blog_data)
+        print("✅ Updated index with new title")
     except Exception as e:
         print(f"❌ Failed to update index file: {e}")
 
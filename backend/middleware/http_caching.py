@@ -0,0 +1,130 @@
+"""
+HTTP caching helpers for the public read endpoints
+(/api/blogs, /api/blogs/{id}, /api/projects, /api/projects/{id}, /sitemap.xml).
+
+Each endpoint derives a strong ETag from a content version (the materialized
+blog listing's generation, a post's own timestamps) or, where no version
+exists, from the serialized body. A matching If-None-Match (or, without one,
+If-Modified-Since) is answered with 304 before the body is built whenever the
+version is known up front. Compression is handled by GZipMiddleware in
+server.py, except for bodies that already have a stored gzip encoding (blog
+posts from S3), which cached_body sends as-is.
+"""
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Optional
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+# Browser/CDN policy per endpoint family
+CACHE_POLICIES = {
+    "blog_list": "public, max-age=60, stale-while-revalidate=300",
+    "blog_post": "public, max-age=300, stale-while-revalidate=86400",
+    "projects": "public, max-age=60, stale-while-revalidate=600",
+    "sitemap": "public, max-age=3600, stale-while-revalidate=86400",
+}
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over version components"""
+    digest = hashlib.sha1(json.dumps(parts, default=str, sort_keys=True).encode("utf-8")).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def encode_json(data: Any) -> bytes:
+    """Compact JSON body, as cached_json sends it"""
+    return json.dumps(jsonable_encoder(data), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag over a serialized body"""
+    return f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+
+def http_date(value: Any) -> Optional[str]:
+    """ISO string or datetime -> IMF-fixdate; None if missing or unparseable"""
+    if not value:
+        return None
+    try:
+        dt = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_datetime(dt.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[str] = None) -> bool:
+    """RFC 9110 precedence: If-None-Match wins; If-Modified-Since only without it"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison, as GET/HEAD allow (proxies may add W/ after compressing)
+        return "*" in candidates or etag in (c[2:] if c.startswith("W/") else c for c in candidates)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def accepts_gzip(request: Request) -> bool:
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _validator_headers(etag: str, cache_control: str, last_modified: Optional[str]) -> dict:
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return headers
+
+
+def cached_json(request: Request, cache_control: str, build: Callable[[], Any],
+                etag: Optional[str] = None, last_modified: Optional[str] = None) -> Response:
+    """JSON response with validators.
+
+    With `etag` given, a conditional hit returns 304 without calling `build`;
+    otherwise the body is built and hashed to derive the ETag.
+    """
+    if etag is not None and is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=_validator_headers(etag, cache_control, last_modified))
+
+    body = encode_json(build())
+    if etag is None:
+        etag = body_etag(body)
+        if is_not_modified(request, etag, last_modified):
+            return Response(status_code=304, headers=_validator_headers(etag, cache_control, last_modified))
+    return Response(content=body, media_type="application/json",
+                    headers=_validator_headers(etag, cache_control, last_modified))
+
+
+def cached_body(request: Request, cache_control: str, body: bytes, etag: str,
+                last_modified: Optional[str] = None, media_type: str = "application/json",
+                gzip_body: Optional[bytes] = None) -> Response:
+    """Same as cached_json for a body that is already serialized (e.g. the blog post LRU, the sitemap).
+
+    `gzip_body`, a ready gzip encoding of `body`, is sent as-is to clients
+    that accept gzip (its ETag gets a -gz suffix: a different representation).
+    """
+    encoded = gzip_body is not None and accepts_gzip(request)
+    if encoded:
+        etag = f'{etag[:-1]}-gz"'
+    headers = _validator_headers(etag, cache_control, last_modified)
+    if gzip_body is not None:
+        headers["Vary"] = "Accept-Encoding"
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    if encoded:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=gzip_body, media_type=media_type, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
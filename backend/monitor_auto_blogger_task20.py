@@ -10,6 +10,11 @@ from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import pytz
 
+try:
+    from backend.s3_access import read_json_body
+except ImportError:
+    from s3_access import read_json_body
+
 load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env.local'))
 
 IST = pytz.timezone('Asia/Kolkata')
@@ -142,7 +147,6 @@ def check_s3_sync():
     
     try:
         import boto3
-        import json
         
         s3 = boto3.client('s3')
         bucket = os.getenv('S3_BLOG_BUCKET', 'althaf-blogs-storage')
@@ -150,7 +154,7 @@ def check_s3_sync():
         # Get index.json from S3
         try:
             response = s3.get_object(Bucket=bucket, Key='blogs/index.json')
-            s3_index = json.loads(response['Body'].read().decode('utf-8'))
+            s3_index = read_json_body(response)
             s3_blog_ids = {blog['id'] for blog in s3_index}
             
             print(f"✅ S3 blogs: {len(s3_blog_ids)}")
@@ -11,10 +11,36 @@ from .chromadb_monitor import (
     ChromaDBError,
     monitor_chromadb_operation
 )
+from .metrics import (
+    REGISTRY,
+    time_stage,
+    record_cache_lookup,
+    track_llm_call,
+    stage_percentiles
+)
+from .tracing import (
+    start_trace,
+    span,
+    current_trace_id
+)
+from .async_logging import (
+    configure_logging,
+    SAMPLED
+)
 
 __all__ = [
     'chromadb_monitor',
     'ChromaDBMonitor',
     'ChromaDBError',
-    'monitor_chromadb_operation'
+    'monitor_chromadb_operation',
+    'REGISTRY',
+    'time_stage',
+    'record_cache_lookup',
+    'track_llm_call',
+    'stage_percentiles',
+    'start_trace',
+    'span',
+    'current_trace_id',
+    'configure_logging',
+    'SAMPLED'
 ]
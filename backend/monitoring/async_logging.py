@@ -0,0 +1,168 @@
+"""
+Queue-Based Application Logging
+
+Purpose: Keep log I/O off the request path. Handlers that touch disk or
+stdout run on a BackgroundWriter thread; request code only enqueues records.
+
+Features:
+- Non-blocking enqueue on a bounded queue; records are dropped (and counted
+  in log_records_dropped_total) rather than stalling the event loop
+- Size-based (LOG_MAX_BYTES) or time-based (LOG_ROTATE_WHEN) file rotation
+- Sampling for high-volume lines: log with `extra=SAMPLED` and only
+  LOG_SAMPLE_RATE of them are kept
+- Per-logger levels via LOG_LEVELS="name=LEVEL,name=LEVEL"
+
+Environment:
+- LOG_LEVEL (INFO), LOG_ASYNC (true), LOG_QUEUE_SIZE (10000)
+- LOG_MAX_BYTES (10 MB), LOG_BACKUP_COUNT (5), LOG_ROTATE_WHEN (unset = size rotation)
+- LOG_SAMPLE_RATE (0.1), LOG_LEVELS
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .background_writer import BackgroundWriter
+from .metrics import REGISTRY
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Pass as `extra=` to mark a record as sampleable (e.g. context previews)
+SAMPLED = {'sampled': True}
+
+LOG_RECORDS_DROPPED = REGISTRY.counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def parse_logger_levels(spec: str) -> Dict[str, int]:
+    """'httpx=WARNING,backend.chatbot_provider=DEBUG' -> {name: level}"""
+    levels = {}
+    for pair in filter(None, (p.strip() for p in (spec or '').split(','))):
+        name, _, level = pair.partition('=')
+        value = logging.getLevelName(level.strip().upper())
+        if name and isinstance(value, int):
+            levels[name.strip()] = value
+    return levels
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps `rate` of records logged with extra=SAMPLED; everything else passes"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = max(0.0, min(1.0, rate))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, 'sampled', False):
+            return True
+        return self.rate >= 1.0 or random.random() < self.rate
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler feeding a BackgroundWriter: never blocks, a full queue drops the record"""
+
+    def __init__(self, writer: BackgroundWriter):
+        super().__init__(None)
+        self.writer = writer
+
+    def enqueue(self, record: logging.LogRecord):
+        self.writer.submit(record)
+
+
+class LogWriter(BackgroundWriter):
+    """Background dispatch of queued records to the real handlers (handler levels respected)"""
+
+    def __init__(self, handlers: List[logging.Handler], queue_size: int):
+        super().__init__(self._dispatch, name="LogWriter", queue_size=queue_size,
+                         on_drop=LOG_RECORDS_DROPPED.inc)
+        self.handlers = handlers
+
+    def _dispatch(self, records: List[logging.LogRecord]):
+        for record in records:
+            for handler in self.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+
+def build_file_handler(log_file: Path) -> logging.Handler:
+    """Rotating file handler: time-based if LOG_ROTATE_WHEN is set, size-based otherwise"""
+    backup_count = int(os.environ.get('LOG_BACKUP_COUNT', 5))
+    when = os.environ.get('LOG_ROTATE_WHEN')
+    if when:
+        return logging.handlers.TimedRotatingFileHandler(
+            str(log_file), when=when, backupCount=backup_count, encoding='utf-8', delay=True)
+    return logging.handlers.RotatingFileHandler(
+        str(log_file), maxBytes=int(os.environ.get('LOG_MAX_BYTES', 10 * 1024 * 1024)),
+        backupCount=backup_count, encoding='utf-8', delay=True)
+
+
+_listener: Optional[LogWriter] = None
+
+
+def configure_logging(log_file: Optional[Path] = None, level: Optional[str] = None,
+                      stream=None) -> Optional[LogWriter]:
+    """
+    Install root logging: stdout + rotating file, behind a queue when LOG_ASYNC is on.
+
+    Replaces any handlers already on the root logger, so calling it twice
+    (e.g. module reload) does not duplicate output. Returns the log
+    LogWriter, or None in synchronous mode.
+    """
+    global _listener
+    shutdown_logging()
+
+    root = logging.getLogger()
+    root.setLevel(level or os.environ.get('LOG_LEVEL', 'INFO').upper())
+    for name, logger_level in parse_logger_levels(os.environ.get('LOG_LEVELS', '')).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers: List[logging.Handler] = [logging.StreamHandler(stream or sys.stdout)]
+    if log_file is not None:
+        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+        handlers.append(build_file_handler(Path(log_file)))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    sampler = SamplingFilter(_env_float('LOG_SAMPLE_RATE', 0.1))
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+    if os.environ.get('LOG_ASYNC', 'true').lower() != 'true':
+        for handler in handlers:
+            handler.addFilter(sampler)
+            root.addHandler(handler)
+        return None
+
+    _listener = LogWriter(handlers, queue_size=int(os.environ.get('LOG_QUEUE_SIZE', 10000)))
+    queue_handler = DroppingQueueHandler(_listener)
+    # Filter before enqueueing so sampled-out records cost nothing downstream
+    queue_handler.addFilter(sampler)
+    root.addHandler(queue_handler)
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread (idempotent)"""
+    global _listener
+    if _listener is not None:
+        _listener.close()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
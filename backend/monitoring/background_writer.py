@@ -0,0 +1,108 @@
+"""
+Background Batch Writer
+
+Purpose: The one queue-and-thread writer behind request-path I/O in this
+package (log records, trace spans, telemetry rows). Callers only enqueue;
+a daemon thread hands whatever has accumulated to a sink in one call.
+
+Features:
+- Bounded queue, non-blocking submit: a full queue drops the item (counted,
+  optional on_drop callback) instead of stalling the event loop
+- Bursts are drained into one batch, so the sink does one write/transaction
+- flush() waits for everything queued so far; close() also stops the thread
+- A failing sink is logged and the writer keeps running
+"""
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger('BackgroundWriter')
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """Bounded queue drained by a daemon thread into `sink(batch)`"""
+
+    def __init__(self, sink: Callable[[List[Any]], None], name: str, queue_size: int,
+                 on_drop: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.dropped = 0
+        self._sink = sink
+        self._on_drop = on_drop
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, item: Any) -> bool:
+        """Queue one item; never blocks (returns False when it was dropped)"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self._on_drop:
+                self._on_drop()
+            return False
+
+    def flush(self, timeout: float = 5.0):
+        """Block until everything queued so far has reached the sink (tests, shutdown)"""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Flush and stop the thread; a later submit() starts a new one"""
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                return
+        thread.join(timeout)
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = []
+            # Drain whatever else is waiting so bursts become one write;
+            # markers are handled in order, after the items queued before them
+            while True:
+                if item is _STOP or isinstance(item, threading.Event):
+                    self._write(batch)
+                    batch = []
+                    if item is _STOP:
+                        return
+                    item.set()
+                else:
+                    batch.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch: List[Any]):
+        if not batch:
+            return
+        try:
+            self._sink(batch)
+        except Exception as e:
+            logger.warning(f"{self.name} write failed ({len(batch)} items): {e}")
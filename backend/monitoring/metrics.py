@@ -0,0 +1,373 @@
+"""
+Chat Pipeline Metrics (Prometheus text format)
+
+Purpose: Per-stage latency histograms, per-tier/model counters, cache hit
+ratios and in-flight gauges for /api/ask-all-u-bot, exported at /metrics.
+
+Features:
+- Fixed-bucket histograms (cheap to record, p50/p95/p99 via bucket interpolation)
+- Labelled counters and gauges, thread-safe, no external dependency
+- Prometheus exposition format 0.0.4 rendering
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .tracing import span
+
+# Seconds. Spans sub-10ms stages (intent, cache) up to slow LLM fallbacks.
+DEFAULT_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set"""
+    metric_type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[Dict[str, str], float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(dict(zip(self.labelnames, key)), v) for key, v in items]
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down per label set"""
+    metric_type = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[Dict[str, str], float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(dict(zip(self.labelnames, key)), v) for key, v in items]
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items
+        ]
+
+
+class Histogram(_Metric):
+    """Fixed-bucket latency histogram per label set"""
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # {labels: [per-bucket counts (+Inf last), sum, count]}
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside the bucket (like histogram_quantile)"""
+        series = self._series.get(self._key(labels))
+        if not series or not series[2]:
+            return None
+        with self._lock:
+            counts, total = list(series[0]), series[2]
+        rank = q * total
+        cumulative = 0
+        for i, c in enumerate(counts):
+            if cumulative + c >= rank and c:
+                if i == len(self.buckets):
+                    # Landed in +Inf: best we can say is "above the largest bucket"
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i]
+                return lower + (upper - lower) * ((rank - cumulative) / c)
+            cumulative += c
+        return self.buckets[-1]
+
+    def label_sets(self) -> List[Dict[str, str]]:
+        return [dict(zip(self.labelnames, key)) for key in sorted(self._series)]
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, [list(s[0]), s[1], s[2]]) for k, s in self._series.items())
+        lines = self._header()
+        for key, (counts, total_sum, total_count) in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(round(total_sum, 6))}")
+            lines.append(f"{self.name}_count{labels} {total_count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics in registration order and renders the exposition text"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                return self._metrics[metric.name]
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REGISTRY = MetricsRegistry()
+
+# --- Chat pipeline instruments ---
+CHAT_REQUEST_SECONDS = REGISTRY.histogram(
+    "chat_request_duration_seconds", "End-to-end /api/ask-all-u-bot latency", ["outcome"])
+CHAT_STAGE_SECONDS = REGISTRY.histogram(
+    "chat_stage_duration_seconds", "Latency of each chat pipeline stage", ["stage"])
+CHAT_IN_FLIGHT = REGISTRY.gauge(
+    "chat_requests_in_flight", "Chat requests currently being processed")
+CHAT_IN_FLIGHT.set(0)
+LLM_CALL_SECONDS = REGISTRY.histogram(
+    "chat_llm_call_duration_seconds", "Latency of individual LLM provider calls", ["provider", "model"])
+LLM_CALLS = REGISTRY.counter(
+    "chat_llm_calls_total", "LLM provider calls by outcome", ["provider", "model", "outcome"])
+LLM_IN_FLIGHT = REGISTRY.gauge(
+    "chat_llm_calls_in_flight", "LLM provider calls currently waiting on a response", ["provider"])
+TIER_RESPONSES = REGISTRY.counter(
+    "chat_tier_responses_total", "Which fallback tier produced the reply", ["tier"])
+CACHE_LOOKUPS = REGISTRY.counter(
+    "chat_cache_lookups_total", "Cache lookups by cache and result", ["cache", "result"])
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    "chat_cache_hit_ratio", "Hit ratio since process start", ["cache"])
+PIPELINE_STAGES = ("cache_lookup", "intent", "retrieval", "chroma_connect",
+                   "chroma_query", "embedding", "summarize", "generate")
+
+
+# Per-request accumulator (stage ms, LLM calls, answering tier) for the telemetry store
+_request_stats: contextvars.ContextVar = contextvars.ContextVar('request_stats', default=None)
+
+
+@contextmanager
+def collect_request_stats():
+    """Collect stage timings, LLM calls and the answering tier for the enclosed request"""
+    stats = {"stages": {}, "llm_calls": [], "tier": None}
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+@contextmanager
+def time_stage(stage: str, **attrs):
+    """Record one pipeline stage into chat_stage_duration_seconds and as a trace span"""
+    start = time.perf_counter()
+    with span(stage, **attrs) as sp:
+        try:
+            yield sp
+        finally:
+            elapsed = time.perf_counter() - start
+            CHAT_STAGE_SECONDS.observe(elapsed, stage=stage)
+            stats = _request_stats.get()
+            if stats is not None:
+                stats["stages"][stage] = stats["stages"].get(stage, 0.0) + elapsed * 1000
+
+
+def record_tier(tier: str):
+    """Count which tier produced the reply (and note it on the current request)"""
+    TIER_RESPONSES.inc(tier=tier)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats["tier"] = tier
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    """Count a cache lookup and refresh that cache's hit ratio gauge"""
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+    hits = CACHE_LOOKUPS.get(cache=cache, result="hit")
+    total = hits + CACHE_LOOKUPS.get(cache=cache, result="miss")
+    CACHE_HIT_RATIO.set(hits / total if total else 0.0, cache=cache)
+
+
+@contextmanager
+def track_llm_call(provider: str, model: str):
+    """
+    Time one provider call. The body may set `outcome["status"]` (e.g. "empty",
+    "http_429"); an exception without an explicit status counts as "error".
+    """
+    outcome = {"status": "success"}
+    start = time.perf_counter()
+    LLM_IN_FLIGHT.inc(provider=provider)
+    with span(f"llm.{provider}", model=model) as sp:
+        try:
+            yield outcome
+        except Exception:
+            if outcome["status"] == "success":
+                outcome["status"] = "error"
+            raise
+        finally:
+            LLM_IN_FLIGHT.dec(provider=provider)
+            LLM_CALL_SECONDS.observe(time.perf_counter() - start, provider=provider, model=model)
+            LLM_CALLS.inc(provider=provider, model=model, outcome=outcome["status"])
+            sp.set(outcome=outcome["status"])
+            stats = _request_stats.get()
+            if stats is not None:
+                stats["llm_calls"].append({"provider": provider, "model": model, "outcome": outcome["status"]})
+
+
+def _percentiles(histogram: Histogram, label: str, quantiles: Sequence[float]) -> Dict[str, Dict]:
+    summary = {}
+    for labels in histogram.label_sets():
+        entry = {"count": histogram.count(**labels)}
+        for q in quantiles:
+            value = histogram.quantile(q, **labels)
+            entry[f"p{int(q * 100)}"] = round(value * 1000, 1) if value is not None else None
+        summary[labels[label]] = entry
+    return summary
+
+
+def stage_percentiles(quantiles: Sequence[float] = (0.5, 0.95, 0.99)) -> Dict[str, Dict]:
+    """{stage: {"count", "p50", "p95", "p99"}} in milliseconds, for dashboards and logs"""
+    return _percentiles(CHAT_STAGE_SECONDS, "stage", quantiles)
+
+
+def snapshot() -> Dict:
+    """JSON view of the chat metrics (percentiles in ms), used by /metrics?format=json and benchmarks"""
+    llm_calls = {}
+    for labels, value in LLM_CALLS.samples():
+        key = f"{labels['provider']}:{labels['model']}"
+        llm_calls.setdefault(key, {})[labels["outcome"]] = int(value)
+    return {
+        "requests": _percentiles(CHAT_REQUEST_SECONDS, "outcome", (0.5, 0.95, 0.99)),
+        "stages": stage_percentiles(),
+        "llm_calls": llm_calls,
+        "tiers": {labels["tier"]: int(v) for labels, v in TIER_RESPONSES.samples()},
+        "cache_hit_ratio": {labels["cache"]: round(v, 3) for labels, v in CACHE_HIT_RATIO.samples()},
+    }
@@ -0,0 +1,131 @@
+"""
+Chat Telemetry Store
+
+Purpose: One structured row per /api/ask-all-u-bot request in an append-only
+SQLite table, so performance reviews query columns instead of scanning and
+JSON-parsing chatbot.log. Analyze with `python -m backend.analytics.analyze_logs`.
+
+Features:
+- Background writer thread (BackgroundWriter); the request path only enqueues a dict (drops when full)
+- Batched inserts, one transaction per burst, WAL mode so readers never block it
+- Fixed column set (latency, stage ms, intent, outcome, tier, model, tokens)
+
+Environment:
+- TELEMETRY_ENABLED (true), TELEMETRY_DB_PATH (backend/logs/telemetry/chat_telemetry.db)
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .background_writer import BackgroundWriter
+
+logger = logging.getLogger('Telemetry')
+
+TELEMETRY_ENABLED = os.environ.get('TELEMETRY_ENABLED', 'true').lower() == 'true'
+DEFAULT_TELEMETRY_PATH = Path(__file__).resolve().parent.parent / 'logs' / 'telemetry' / 'chat_telemetry.db'
+TELEMETRY_DB_PATH = Path(os.environ.get('TELEMETRY_DB_PATH', str(DEFAULT_TELEMETRY_PATH)))
+TELEMETRY_QUEUE_SIZE = 5000
+
+# (column, SQL type); `id` is the incremental-processing cursor for the analyzer
+COLUMNS = (
+    ("ts", "REAL NOT NULL"),
+    ("day", "TEXT NOT NULL"),
+    ("session_id", "TEXT"),
+    ("trace_id", "TEXT"),
+    ("intent", "TEXT"),
+    ("outcome", "TEXT"),
+    ("cache_hit", "INTEGER"),
+    ("tier", "TEXT"),
+    ("model", "TEXT"),
+    ("llm_calls", "INTEGER"),
+    ("llm_errors", "INTEGER"),
+    ("input_tokens", "INTEGER"),
+    ("output_tokens", "INTEGER"),
+    ("latency_ms", "REAL"),
+    ("retrieval_ms", "REAL"),
+    ("generate_ms", "REAL"),
+    ("context_chars", "INTEGER"),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS chat_requests (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    + ", ".join(f"{name} {sql_type}" for name, sql_type in COLUMNS) + ")",
+    "CREATE INDEX IF NOT EXISTS idx_chat_requests_day ON chat_requests(day)",
+)
+
+
+def connect(path: Path = TELEMETRY_DB_PATH) -> sqlite3.Connection:
+    """Open (and create if needed) the telemetry database"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.commit()
+    return conn
+
+
+def build_record(stats: Optional[Dict] = None, **fields) -> Dict:
+    """
+    Row dict from explicit fields plus a collect_request_stats() result:
+    answering model = last successful LLM call, stage ms from the timed stages.
+    """
+    now = fields.pop("ts", None) or time.time()
+    record = {name: None for name in COLUMN_NAMES}
+    record.update(ts=now, day=datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d"))
+    if stats:
+        calls = stats.get("llm_calls", [])
+        answered = [c for c in calls if c["outcome"] == "success"]
+        record.update(
+            tier=stats.get("tier"),
+            model=f"{answered[-1]['provider']}:{answered[-1]['model']}" if answered else None,
+            llm_calls=len(calls),
+            llm_errors=len(calls) - len(answered),
+            retrieval_ms=stats.get("stages", {}).get("retrieval"),
+            generate_ms=stats.get("stages", {}).get("generate"),
+        )
+    record.update({k: v for k, v in fields.items() if k in record})
+    return record
+
+
+class TelemetryWriter(BackgroundWriter):
+    """Background batch inserter into chat_requests (one transaction per burst)"""
+
+    def __init__(self, path: Path = TELEMETRY_DB_PATH, queue_size: int = TELEMETRY_QUEUE_SIZE):
+        super().__init__(self._write_batch, name="TelemetryWriter", queue_size=queue_size)
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _write_batch(self, records: List[Dict]):
+        try:
+            self._conn = self._conn or connect(self.path)
+            self._insert(self._conn, records)
+        except Exception:
+            self._conn = None  # reconnect on the next batch
+            raise
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, records: List[Dict]):
+        placeholders = ", ".join("?" for _ in COLUMN_NAMES)
+        conn.executemany(
+            f"INSERT INTO chat_requests ({', '.join(COLUMN_NAMES)}) VALUES ({placeholders})",
+            [tuple(r.get(name) for name in COLUMN_NAMES) for r in records],
+        )
+        conn.commit()
+
+
+telemetry_writer = TelemetryWriter()
+
+
+def record_chat_request(stats: Optional[Dict] = None, writer: Optional[TelemetryWriter] = None, **fields):
+    """Queue one chat request row (no-op when TELEMETRY_ENABLED is false)"""
+    if TELEMETRY_ENABLED:
+        (writer or telemetry_writer).submit(build_record(stats, **fields))
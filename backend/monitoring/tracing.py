@@ -0,0 +1,215 @@
+"""
+Request-Scoped Trace Spans
+
+Purpose: Record one trace per /api/ask-all-u-bot request (retrieval, summarize
+calls, model attempts, retries, fallbacks) so individual slow requests can be
+inspected end to end. View with `python -m backend.trace_viewer`.
+
+Features:
+- contextvars propagation: nested `span()` calls attach to the active trace
+- No-op (near zero cost) when no trace is active or tracing is disabled
+- Finished traces are queued and written by a BackgroundWriter thread to a
+  size-rotated JSONL file, so the request path never waits on disk I/O
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .background_writer import BackgroundWriter
+
+logger = logging.getLogger('Tracing')
+
+TRACING_ENABLED = os.environ.get('TRACING_ENABLED', 'true').lower() == 'true'
+DEFAULT_TRACE_PATH = Path(__file__).resolve().parent.parent / 'logs' / 'traces' / 'chat_traces.jsonl'
+TRACE_LOG_PATH = Path(os.environ.get('TRACE_LOG_PATH', str(DEFAULT_TRACE_PATH)))
+TRACE_MAX_BYTES = int(os.environ.get('TRACE_MAX_BYTES', 5 * 1024 * 1024))
+TRACE_BACKUP_COUNT = int(os.environ.get('TRACE_BACKUP_COUNT', 3))
+TRACE_QUEUE_SIZE = 1000
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('current_trace', default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    """One timed operation inside a trace"""
+    __slots__ = ('span_id', 'parent_id', 'name', 'attrs', 'events', 'status', '_start', '_trace_start', 'duration_ms')
+
+    def __init__(self, name: str, parent_id: Optional[str], trace_start: float, attrs: Dict):
+        self.span_id = uuid.uuid4().hex[:8]
+        self.parent_id = parent_id
+        self.name = name
+        self.attrs = attrs
+        self.events: List[Dict] = []
+        self.status = "ok"
+        self._trace_start = trace_start
+        self._start = time.perf_counter()
+        self.duration_ms = None
+
+    def set(self, **attrs):
+        """Attach attributes (model used, cache hit, result size, ...)"""
+        self.attrs.update(attrs)
+
+    def event(self, name: str, **attrs):
+        """Record a point-in-time event such as a retry or fallback promotion"""
+        offset_ms = (time.perf_counter() - self._trace_start) * 1000
+        self.events.append({"name": name, "offset_ms": round(offset_ms, 2), **attrs})
+
+    def end(self):
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+
+    def to_dict(self) -> Dict:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "offset_ms": round((self._start - self._trace_start) * 1000, 2),
+            "duration_ms": round(self.duration_ms or 0.0, 2),
+            "status": self.status,
+            "attrs": self.attrs,
+            "events": self.events,
+        }
+
+
+class _NoopSpan:
+    """Returned when no trace is active so call sites never need to check"""
+    span_id = None
+
+    def set(self, **attrs):
+        pass
+
+    def event(self, name: str, **attrs):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """All spans recorded for one request"""
+
+    def __init__(self, name: str, attrs: Dict):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.started_at = time.time()
+        self.root = Span(name, None, time.perf_counter(), attrs)
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def to_dict(self) -> Dict:
+        spans = sorted(self.spans, key=lambda s: s._start)
+        return {
+            "trace_id": self.trace_id,
+            "root_span_id": self.root.span_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.root.duration_ms or 0.0, 2),
+            "status": self.root.status,
+            "attrs": self.root.attrs,
+            "events": self.root.events,
+            "spans": [s.to_dict() for s in spans],
+        }
+
+
+class TraceWriter(BackgroundWriter):
+    """Background JSONL writer with size-based rotation (file.1 ... file.N)"""
+
+    def __init__(self, path: Path = TRACE_LOG_PATH, max_bytes: int = TRACE_MAX_BYTES,
+                 backup_count: int = TRACE_BACKUP_COUNT, queue_size: int = TRACE_QUEUE_SIZE):
+        super().__init__(self._write_batch, name="TraceWriter", queue_size=queue_size)
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+    def _write_batch(self, records: List[Dict]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(r, default=str) + "\n" for r in records)
+        if self.path.exists() and self.path.stat().st_size + len(payload) > self.max_bytes:
+            self._rotate()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(payload)
+
+    def _rotate(self):
+        for i in range(self.backup_count - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{i}")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backup_count > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+
+trace_writer = TraceWriter()
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.trace_id if trace else None
+
+
+def current_span():
+    """The innermost active span (or a no-op span outside a trace)"""
+    return _current_span.get() or NOOP_SPAN
+
+
+@contextmanager
+def start_trace(name: str, writer: Optional[TraceWriter] = None, **attrs):
+    """
+    Open a trace for one request; nested span() calls are recorded into it
+    and the finished trace is handed to the background writer.
+    """
+    if not TRACING_ENABLED or _current_trace.get() is not None:
+        # Disabled, or already inside a trace: behave like a plain span
+        with span(name, **attrs) as sp:
+            yield sp
+        return
+
+    trace = Trace(name, attrs)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(trace.root)
+    try:
+        yield trace.root
+    except Exception as e:
+        trace.root.status = "error"
+        trace.root.set(error=str(e)[:200])
+        raise
+    finally:
+        trace.root.end()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        (writer or trace_writer).submit(trace.to_dict())
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time a block as a child of the current span; no-op outside a trace"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    sp = Span(name, parent.span_id if parent else None, trace.root._trace_start, attrs)
+    token = _current_span.set(sp)
+    try:
+        yield sp
+    except Exception as e:
+        sp.status = "error"
+        sp.set(error=str(e)[:200])
+        raise
+    finally:
+        sp.end()
+        _current_span.reset(token)
+        trace.add(sp)
@@ -3,13 +3,23 @@ import os
 import json
 import re
 import glob
-import boto3
 from google import genai
 from google.genai import types
 from chromadb import Documents, EmbeddingFunction, Embeddings
 from dotenv import load_dotenv
 from pymongo import MongoClient
 
+try:
+    from backend.chunking import chunk_markdown, chunk_resume
+    from backend.blog_listing import filter_active_blogs, materialize_active_listing
+    from backend.s3_access import get_s3_client, read_json_body
+    from backend.project_import import project_document
+except ImportError:
+    from chunking import chunk_markdown, chunk_resume
+    from blog_listing import filter_active_blogs, materialize_active_listing
+    from s3_access import get_s3_client, read_json_body
+    from project_import import project_document
+
 # Load environment variables
 load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env.local'))
 
@@ -138,47 +148,65 @@ def write_to_portfolio_master(client, embed_function, uid, doc, meta, category,
         print(f"[ERROR] Failed to write {uid} to portfolio_master: {e}")
         return False
 
-def filter_active_blogs(blogs):
-    """
-    Filters blogs: keeps all blogs newer than 60 days.
-    If the count of such blogs is less than 30, it keeps the latest 30 blogs overall
-    to guarantee a minimum of 30 blogs are always displayed and indexed.
+def write_chunks_to_portfolio_master(client, embed_function, parent_id, chunks, category, subcategory=None):
+    """Write passage-level chunks of one source document to portfolio_master
+
+    Unchanged chunks are skipped, changed/new chunks are upserted in one batch,
+    and stale chunks (plus any legacy whole-document record stored under
+    parent_id itself) are deleted so a source never appears twice.
+
+    Args:
+        client: ChromaDB client
+        embed_function: GeminiEmbeddingFunction instance
+        parent_id: Source document id (blog id, 'resume_full', ...)
+        chunks: Output of chunk_markdown()/chunk_resume() with cleaned text
+        category: Main category ('profile', 'project', 'blog')
+        subcategory: Optional subcategory
+
+    Returns:
+        bool: Success status
     """
-    import datetime
-    # Sort all blogs by date (newest first)
-    blogs_sorted = sorted(
-        blogs, 
-        key=lambda x: x.get('created_at', x.get('timestamp', '')), 
-        reverse=True
-    )
-    
-    cutoff_date = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=60)
-    
-    active_blogs = []
-    for blog in blogs_sorted:
-        created_at_str = blog.get('created_at', blog.get('timestamp', ''))
-        is_new = True
-        if created_at_str:
-            try:
-                date_part = created_at_str[:10]
-                blog_date = datetime.datetime.strptime(date_part, "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc)
-                if blog_date < cutoff_date:
-                    is_new = False
-            except Exception:
-                pass
-        
-        if is_new:
-            active_blogs.append(blog)
+    try:
+        master_col = client.get_or_create_collection('portfolio_master', embedding_function=embed_function)
+
+        ids, docs, metas = [], [], []
+        for chunk in chunks:
+            meta = chunk['metadata'].copy()
+            meta['category'] = category
+            if subcategory:
+                meta['subcategory'] = subcategory
+            ids.append(chunk['id'])
+            docs.append(chunk['text'])
+            metas.append(meta)
+
+        existing = master_col.get(where={"parent_id": parent_id})
+        existing_docs = dict(zip(existing.get('ids') or [], existing.get('documents') or []))
+
+        changed = [i for i, uid in enumerate(ids) if existing_docs.get(uid) != docs[i]]
+        if changed:
+            master_col.upsert(
+                ids=[ids[i] for i in changed],
+                documents=[docs[i] for i in changed],
+                metadatas=[metas[i] for i in changed]
+            )
+            print(f"[UPDATE] {parent_id}: upserted {len(changed)}/{len(ids)} chunks (category={category})")
         else:
-            if len(active_blogs) < 30:
-                active_blogs.append(blog)
-            else:
-                break
-                
-    if len(active_blogs) < 30 and len(blogs_sorted) > len(active_blogs):
-        active_blogs = blogs_sorted[:30]
-        
-    return active_blogs
+            print(f"[SKIP] Matches existing chunks in portfolio_master: {parent_id}")
+
+        current_ids = set(ids)
+        stale = [uid for uid in existing_docs if uid not in current_ids]
+        legacy = master_col.get(ids=[parent_id])
+        if legacy and legacy['ids']:
+            stale.append(parent_id)
+        if stale:
+            master_col.delete(ids=stale)
+            print(f"[PRUNE] {parent_id}: removed {len(stale)} stale/legacy records")
+
+        return True
+
+    except Exception as e:
+        print(f"[ERROR] Failed to write chunks for {parent_id} to portfolio_master: {e}")
+        return False
 
 def sync_blogs_from_s3(chroma_client, embed_function):
     """
@@ -191,11 +219,11 @@ def sync_blogs_from_s3(chroma_client, embed_function):
     
     # 1. Fetch S3 blogs
     try:
-        s3 = boto3.client('s3')
+        s3 = get_s3_client()
         bucket = os.getenv('S3_BLOG_BUCKET', 'althaf-blogs-storage')
         
         response = s3.get_object(Bucket=bucket, Key='blogs/index.json')
-        index_data = json.loads(response['Body'].read().decode('utf-8'))
+        index_data = read_json_body(response)
         
         if isinstance(index_data, dict):
             if 'blogs' in index_data:
@@ -247,9 +275,20 @@ def sync_blogs_from_s3(chroma_client, embed_function):
             seen_ids.add(blog_id)
             unique_blogs.append(blog)
             
-    # 4. Filter active blogs (newer than 60 days, minimum of 30 latest)
-    active_blogs = filter_active_blogs(unique_blogs)
-    active_ids = set(b.get('id') for b in active_blogs)
+    # 4. Active blogs (newer than 60 days, minimum of 30 latest): rebuild the
+    #    materialized listing the API serves and index exactly its ids
+    try:
+        try:
+            from backend.auto_blogger.publisher import S3BlogStorage
+        except ImportError:
+            from auto_blogger.publisher import S3BlogStorage
+        listing = materialize_active_listing(S3BlogStorage(bucket_name=os.getenv('S3_BLOG_BUCKET', 'althaf-blogs-storage')))
+        active_ids = set(b['id'] for b in listing['blogs'])
+        active_blogs = [b for b in unique_blogs if b.get('id') in active_ids]
+    except Exception as e:
+        print(f"⚠️ Could not refresh the active listing ({e}); applying retention locally")
+        active_blogs = filter_active_blogs(unique_blogs)
+        active_ids = set(b.get('id') for b in active_blogs)
     print(f"📋 Enforcing retention policy. Active blogs to index: {len(active_blogs)}")
     
     # 5. Sync the active blogs
@@ -281,15 +320,18 @@ def sync_blogs_from_s3(chroma_client, embed_function):
             "metadata_category": "blogs"
         }
         
-        # Truncate content to avoid exceeding Chroma Cloud document size limit (16KB)
-        text_to_embed = f"Blog Title: {title}. Content: {content[:6000]}..."
+        # Heading-aware passages (small enough to inject without summarization)
+        chunks = chunk_markdown(content, blog_id, base_metadata=metadata)
+        for chunk in chunks:
+            section = chunk['metadata']['section']
+            prefix = f"Blog Title: {title}. Section: {section}. " if section else f"Blog Title: {title}. "
+            chunk['text'] = clean_text(prefix + chunk['text'])
         
-        success = write_to_portfolio_master(
+        success = write_chunks_to_portfolio_master(
             chroma_client,
             embed_function,
             blog_id,
-            clean_text(text_to_embed),
-            metadata,
+            chunks,
             category='blog',
             subcategory=blog_category
         )
@@ -308,8 +350,10 @@ def sync_blogs_from_s3(chroma_client, embed_function):
         
         if existing and existing['ids']:
             pruned_count = 0
-            for record_id in existing['ids']:
-                if record_id not in active_ids:
+            for record_id, record_meta in zip(existing['ids'], existing['metadatas']):
+                # Chunks carry parent_id; legacy whole-blog records are their own parent
+                parent_id = (record_meta or {}).get('parent_id') or record_id
+                if parent_id not in active_ids:
                     print(f"🗑️ Pruning stale blog from ChromaDB: {record_id}")
                     master_col.delete(ids=[record_id])
                     pruned_count += 1
@@ -369,12 +413,9 @@ def main():
             for p in projects_cursor:
                 p_id = str(p.get('id', p.get('_id')))
                 p_name = safe_meta(p.get('name') or p.get('title'))
-                p_summary = safe_meta(p.get('summary'))
-                p_details = safe_meta(p.get('details'))
-                p_tech = ", ".join(p.get('technologies', []))
                 
-                # Create rich context for the project
-                text = f"Project: {p_name}. Tech Stack: {p_tech}. Summary: {p_summary}. Implementation Details: {p_details}"
+                # Rich context for the project (shared with the bulk import endpoint)
+                text = project_document(p)
                 metadata = {
                     "name": p_name,
                     "category": "Project",
@@ -451,12 +492,16 @@ def main():
                     resume_content = f.read()
                     if resume_content:
                         metadata = {"type": "resume", "title": "Full Resume"}
-                        success = write_to_portfolio_master(
+                        # Section-aware passages instead of one giant resume document
+                        chunks = chunk_resume(resume_content, "resume_full", base_metadata=metadata)
+                        for chunk in chunks:
+                            chunk['metadata']['title'] = f"Resume: {chunk['metadata']['section'] or 'Overview'}"
+                            chunk['text'] = clean_text(chunk['text'])
+                        success = write_chunks_to_portfolio_master(
                             client,
                             GeminiEmbeddingFunction(),
                             "resume_full",
-                            clean_text(resume_content),
-                            metadata,
+                            chunks,
                             category='profile'
                         )
                         if success:
@@ -0,0 +1,265 @@
+"""
+Project Catalog
+In-memory copy of the portfolio projects behind GET /api/projects and
+GET /api/projects/{id}.
+
+- Loaded once from MongoDB, or from the bundled portfolio_data_complete.json /
+  portfolio_data.json when Mongo is unavailable or empty, and normalized to
+  the Project shape. The list and every project are serialized once per
+  load, so a request is a dict lookup plus an ETag comparison.
+- The list carries LIST_FIELDS only (what the project cards use); the large
+  `details` HTML is served by the detail endpoint alone. Mongo reads project
+  just the stored fields normalize_project uses (DOCUMENT_PROJECTION).
+- create/update/delete_project call invalidate_project_catalog(); the next
+  request reloads.
+- Every PROJECT_CATALOG_TTL seconds a cheap version probe (document count +
+  newest timestamp) picks up writes made by other workers or scripts; the
+  collection is only re-read when the version changed. While serving the
+  JSON fallback, Mongo is retried on the same schedule.
+- The fallback files are watched by mtime/size signature and re-read when
+  they change.
+
+Reloads are single-flight: concurrent requests on a cold or invalidated
+catalog share one Mongo read.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+try:
+    from backend.middleware.http_caching import body_etag, encode_json
+except ImportError:
+    from middleware.http_caching import body_etag, encode_json
+
+logger = logging.getLogger("ProjectCatalog")
+
+DEFAULT_TTL_SECONDS = float(os.getenv("PROJECT_CATALOG_TTL", "60"))
+BACKEND_DIR = Path(__file__).parent
+# First existing file feeds the list; ids from all of them resolve on the detail endpoint
+FALLBACK_FILES = (BACKEND_DIR / "portfolio_data_complete.json", BACKEND_DIR / "portfolio_data.json")
+
+# Fields of GET /api/projects items; the detail endpoint returns every Project field
+LIST_FIELDS = ("id", "name", "title", "summary", "description", "image_url", "technologies",
+               "key_outcomes", "github_url", "live_url", "duration", "timestamp")
+# Stored fields normalize_project reads (legacy names included)
+DOCUMENT_PROJECTION = {name: 1 for name in (
+    "id", "name", "title", "summary", "description", "details", "content", "image_url", "image_variants",
+    "image_width", "image_height", "technologies", "key_outcomes", "github_url", "live_url", "duration",
+    "project_duration", "projectDuration", "timestamp")}
+# (keys, options) for db.projects: id lookups and the newest-timestamp version probe
+PROJECT_INDEXES = (([("id", 1)], {"name": "id"}), ([("timestamp", -1)], {"name": "timestamp_desc"}))
+
+# Stand-in for projects stored without a timestamp: stable across reloads
+# so repeat reads serialize identically (and keep the same ETag)
+PROJECT_TIMESTAMP_FALLBACK = datetime.utcnow()
+
+
+def stable_project_id(p: Dict) -> str:
+    """Stored id, else the Mongo _id (resolvable by /projects/{id}), else derived from the name"""
+    if p.get("id"):
+        return str(p["id"])
+    if p.get("_id"):
+        return str(p["_id"])
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"project:{p.get('name', p.get('title', ''))}"))
+
+
+def normalize_project(p: Dict) -> Dict:
+    """Stored project (Mongo document or bundled JSON) -> Project fields with safe defaults"""
+    return {
+        "id": stable_project_id(p),
+        "name": p.get("name", p.get("title", "Untitled")),
+        "title": p.get("title", p.get("name", "Untitled")),
+        "summary": p.get("summary", p.get("description", "")),
+        "description": p.get("description", ""),
+        "details": p.get("details", p.get("content", "")),
+        "image_url": p.get("image_url", ""),
+        "image_variants": p.get("image_variants", []),
+        "image_width": p.get("image_width"),
+        "image_height": p.get("image_height"),
+        "technologies": p.get("technologies", []),
+        "key_outcomes": p.get("key_outcomes", ""),
+        "github_url": p.get("github_url", ""),
+        "live_url": p.get("live_url", ""),
+        "duration": p.get("duration", p.get("project_duration", p.get("projectDuration", ""))),
+        "timestamp": p.get("timestamp", PROJECT_TIMESTAMP_FALLBACK),
+    }
+
+
+async def ensure_project_indexes(collection):
+    """Create the project indexes if missing (idempotent; failures are logged, not fatal)"""
+    for keys, options in PROJECT_INDEXES:
+        try:
+            await collection.create_index(keys, **options)
+        except Exception as e:
+            logger.warning(f"Could not ensure index {options['name']} on projects: {e}")
+
+
+def files_signature(paths: Sequence[Path]) -> Tuple:
+    """Cheap change detector for the fallback files"""
+    signature = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+@dataclass(frozen=True)
+class SerializedProject:
+    project: Dict
+    body: bytes
+    etag: str
+
+
+@dataclass
+class ProjectSnapshot:
+    """One load of the catalog; shared and immutable, callers must not mutate it"""
+    projects: List[Dict]
+    body: bytes
+    etag: str
+    source: str  # "mongo", "file" or "empty"
+    version: Any  # Mongo probe result or fallback files signature
+    checked_at: float
+    items: Dict[str, SerializedProject] = field(default_factory=dict)
+
+    def get(self, project_id: str) -> Optional[SerializedProject]:
+        return self.items.get(project_id)
+
+
+class ProjectCatalog:
+    """Cached, pre-serialized projects (see module docstring)"""
+
+    def __init__(self, fetch: Callable[[], Awaitable[Optional[List[Dict]]]],
+                 probe: Callable[[], Awaitable[Any]],
+                 serialize: Callable[[Dict], Any] = lambda p: p,
+                 files: Sequence[Path] = FALLBACK_FILES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self._fetch = fetch          # raw Mongo documents, None when Mongo is not configured
+        self._probe = probe          # cheap version of the Mongo collection
+        self._serialize = serialize  # normalized dict -> response model
+        self.files = tuple(files)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._snapshot: Optional[ProjectSnapshot] = None
+        self._invalidated = False
+        self._lock: Optional[asyncio.Lock] = None
+        self.loads = 0
+
+    async def get(self) -> ProjectSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and not self._needs_check(snapshot):
+            return snapshot
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or self._needs_check(snapshot):
+                self._snapshot = await self._refresh(snapshot)
+            return self._snapshot
+
+    async def get_projects(self) -> List[Dict]:
+        return (await self.get()).projects
+
+    def invalidate(self):
+        """Force a full reload on the next request (write endpoints)"""
+        self._invalidated = True
+
+    def _needs_check(self, snapshot: ProjectSnapshot) -> bool:
+        if self._invalidated or self._clock() - snapshot.checked_at >= self.ttl_seconds:
+            return True
+        return snapshot.source != "mongo" and files_signature(self.files) != snapshot.version
+
+    async def _refresh(self, previous: Optional[ProjectSnapshot]) -> ProjectSnapshot:
+        full = self._invalidated or previous is None
+        self._invalidated = False
+        now = self._clock()
+        try:
+            version = await self._probe()
+            if not full and previous.source == "mongo" and version == previous.version:
+                previous.checked_at = now
+                return previous
+            documents = await self._fetch()
+        except Exception as e:
+            logger.error(f"Error fetching projects from MongoDB: {e}")
+            if previous is not None and previous.source == "mongo" and not full:
+                # Keep serving what we have; try again after another TTL
+                previous.checked_at = now
+                return previous
+            documents, version = None, None
+
+        if documents:
+            projects = [normalize_project(p) for p in documents]
+            # Projects that do have an id stay reachable by their Mongo _id too
+            aliases = {str(doc["_id"]): p["id"] for doc, p in zip(documents, projects) if doc.get("_id")}
+            return self._build(projects, [], "mongo", version, now, aliases)
+
+        # Mongo unavailable or empty: bundled JSON
+        signature = files_signature(self.files)
+        if previous is not None and previous.source != "mongo" and previous.version == signature:
+            previous.checked_at = now
+            return previous
+        listed, extra = self._read_files()
+        return self._build(listed, extra, "file" if signature else "empty", signature, now)
+
+    def _read_files(self) -> Tuple[List[Dict], List[Dict]]:
+        """(projects of the first readable file, projects only found in the others)"""
+        listed: Optional[List[Dict]] = None
+        extra: List[Dict] = []
+        for path in self.files:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    projects = [normalize_project(p) for p in json.load(f).get("projects", [])]
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.error(f"Error reading projects from {path.name}: {e}")
+                continue
+            if listed is None:
+                listed = projects
+            else:
+                extra.extend(projects)
+        return listed or [], extra
+
+    def _build(self, projects: List[Dict], extra: List[Dict], source: str, version: Any,
+               now: float, aliases: Optional[Dict[str, str]] = None) -> ProjectSnapshot:
+        listing = [jsonable_encoder(self._serialize(p)) for p in projects]
+        body = encode_json([{name: item[name] for name in LIST_FIELDS if name in item} for item in listing])
+        snapshot = ProjectSnapshot(projects, body, body_etag(body), source, version, now)
+        for p in extra + projects:  # listed projects win on id clashes
+            item_body = encode_json(self._serialize(p))
+            snapshot.items[p["id"]] = SerializedProject(p, item_body, body_etag(item_body))
+        for alias, project_id in (aliases or {}).items():
+            snapshot.items.setdefault(alias, snapshot.items[project_id])
+        self.loads += 1
+        logger.info(f"Loaded {len(projects)} projects from {source}")
+        return snapshot
+
+
+_catalog: Optional[ProjectCatalog] = None
+
+
+def get_project_catalog(fetch: Optional[Callable] = None, probe: Optional[Callable] = None,
+                        serialize: Optional[Callable] = None) -> ProjectCatalog:
+    """Shared process-wide catalog, created on first use"""
+    global _catalog
+    if _catalog is None:
+        _catalog = ProjectCatalog(fetch, probe, serialize or (lambda p: p))
+    return _catalog
+
+
+def invalidate_project_catalog():
+    """Called by the project write endpoints; a no-op before the catalog is used"""
+    if _catalog is not None:
+        _catalog.invalidate()
@@ -0,0 +1,277 @@
+"""
+Bulk Project Import / Export
+Batch counterpart of the multipart project endpoints, behind
+POST /api/projects/import and GET /api/projects/export:
+
+- A batch is a JSON array, {"projects": [...]} or NDJSON (one project per
+  line), e.g. the output of the export endpoint. Every item is validated and
+  sanitized in one pass (same cleaning as create_project); any error rejects
+  the whole batch before anything is written.
+- Items are upserted by `id` (a new id is assigned when absent) with a
+  single unordered Mongo bulk_write.
+- image_url may point anywhere: with rehost_images, non-Cloudinary images
+  are uploaded by URL with the same responsive variants as form uploads.
+- The affected projects alone are re-embedded into portfolio_master, in one
+  batched embedding call and one upsert, skipping unchanged documents. The
+  document text and metadata match populate_vector_db.py, so a later full
+  sync sees them as up to date.
+
+CLI (validates locally, then goes through the API so the server's caches
+and search index stay in step):
+
+    python backend/project_import.py projects.ndjson --api https://api.althafportfolio.site [--dry-run]
+    python backend/project_import.py --export projects.ndjson --api ...
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import bleach
+
+try:
+    from backend.image_uploads import upload_project_image
+    from backend.security_utils import sanitize_html
+except ImportError:
+    from image_uploads import upload_project_image
+    from security_utils import sanitize_html
+
+logger = logging.getLogger("ProjectImport")
+
+MAX_BATCH_SIZE = int(os.getenv("PROJECT_IMPORT_MAX_ITEMS", "200"))
+MAX_BATCH_BYTES = int(os.getenv("PROJECT_IMPORT_MAX_BYTES", str(5 * 1024 * 1024)))
+VECTOR_COLLECTION = "portfolio_master"
+
+_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,99}$")
+_URL_FIELDS = ("image_url", "github_url", "live_url")
+
+
+class BatchError(ValueError):
+    """The batch could not be parsed at all (as opposed to per-item errors)"""
+
+
+def parse_batch(body: bytes) -> List[Any]:
+    """JSON array, {"projects": [...]} or NDJSON -> raw items"""
+    if len(body) > MAX_BATCH_BYTES:
+        raise BatchError(f"Batch is {len(body)} bytes; the limit is {MAX_BATCH_BYTES}")
+    text = body.decode("utf-8-sig").strip()
+    if not text:
+        raise BatchError("Empty batch")
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        data = None
+    if isinstance(data, dict):
+        data = data.get("projects")
+    if not isinstance(data, list):
+        try:
+            data = [json.loads(line) for line in text.splitlines() if line.strip()]
+        except json.JSONDecodeError as e:
+            raise BatchError(f"Not JSON or NDJSON: {e}")
+    if len(data) > MAX_BATCH_SIZE:
+        raise BatchError(f"Batch has {len(data)} projects; the limit is {MAX_BATCH_SIZE}")
+    return data
+
+
+def _clean_url(value: Any, field: str) -> str:
+    value = str(value or "").strip()
+    if value and not re.match(r"^https?://[^\s<>\"']+$", value):
+        raise ValueError(f"{field} must be an http(s) URL")
+    return value
+
+
+def _first(item: Dict, *names: str) -> Tuple[bool, Any]:
+    """(present, value) for the first of `names` present in the item"""
+    for name in names:
+        if name in item:
+            return True, item[name]
+    return False, None
+
+
+def _clean_variants(variants: Any) -> List[Dict]:
+    if not isinstance(variants, list):
+        raise ValueError("image_variants must be a list")
+    return [{"width": int(v["width"]), "format": bleach.clean(str(v["format"])),
+             "url": _clean_url(v["url"], "image_variants url")}
+            for v in variants if isinstance(v, dict) and v.get("url")]
+
+
+def clean_project(item: Any) -> Dict:
+    """Validated, sanitized project fields (raises ValueError).
+
+    name and summary are required; other fields are only set when the item
+    has them, so a batch can update a few fields without wiping the rest.
+    """
+    if not isinstance(item, dict):
+        raise ValueError("expected an object")
+    name = bleach.clean(str(item.get("name") or item.get("title") or "")).strip()
+    summary = bleach.clean(str(item.get("summary") or item.get("description") or "")).strip()
+    if not name:
+        raise ValueError("name is required")
+    if not summary:
+        raise ValueError("summary is required")
+    project_id = str(item.get("id") or uuid.uuid4())
+    if not _ID_RE.match(project_id):
+        raise ValueError("id may only contain letters, digits, '-' and '_'")
+    project = {"id": project_id, "name": name, "title": name, "summary": summary, "description": summary}
+
+    present, details = _first(item, "details", "content")
+    if present:
+        project["details"] = sanitize_html(str(details or ""))
+    present, technologies = _first(item, "technologies")
+    if present:
+        if isinstance(technologies, str):
+            technologies = technologies.split(",")
+        if not isinstance(technologies, list):
+            raise ValueError("technologies must be a list or a comma-separated string")
+        project["technologies"] = [bleach.clean(str(t)).strip() for t in technologies if str(t).strip()]
+    for field, aliases in (("key_outcomes", ()), ("duration", ("project_duration", "projectDuration"))):
+        present, value = _first(item, field, *aliases)
+        if present:
+            project[field] = bleach.clean(str(value or "")).strip()
+    for field in _URL_FIELDS:
+        if field in item:
+            project[field] = _clean_url(item[field], field)
+    if "image_url" in item:
+        # Variants belong to one image: replaced together (or cleared)
+        try:
+            project["image_variants"] = _clean_variants(item.get("image_variants") or [])
+            project["image_width"] = int(item["image_width"]) if item.get("image_width") else None
+            project["image_height"] = int(item["image_height"]) if item.get("image_height") else None
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"invalid image fields: {e}")
+    return project
+
+
+def validate_batch(items: List[Any]) -> Tuple[List[Dict], List[Dict]]:
+    """(clean projects, [{"index", "id", "error"}]) in one pass; duplicate ids are errors"""
+    projects: List[Dict] = []
+    errors: List[Dict] = []
+    seen: Dict[str, int] = {}
+    for index, item in enumerate(items):
+        item_id = item.get("id") if isinstance(item, dict) else None
+        try:
+            project = clean_project(item)
+        except ValueError as e:
+            errors.append({"index": index, "id": item_id, "error": str(e)})
+            continue
+        if project["id"] in seen:
+            errors.append({"index": index, "id": project["id"],
+                           "error": f"duplicate id (also item {seen[project['id']]})"})
+            continue
+        seen[project["id"]] = index
+        projects.append(project)
+    return projects, errors
+
+
+def needs_rehost(image_url: str) -> bool:
+    return bool(image_url) and "res.cloudinary.com/" not in image_url
+
+
+async def rehost_images(uploader_factory: Callable, projects: List[Dict]) -> List[Dict]:
+    """Upload non-Cloudinary image_urls by URL, in parallel on the upload pool.
+
+    A failed upload keeps the given URL and is reported as a warning.
+    """
+    targets = [p for p in projects if needs_rehost(p.get("image_url", ""))]
+    results = await asyncio.gather(*(upload_project_image(uploader_factory, p["image_url"]) for p in targets),
+                                   return_exceptions=True)
+    warnings = []
+    for project, result in zip(targets, results):
+        if isinstance(result, Exception):
+            warnings.append({"id": project["id"], "warning": f"image not re-hosted: {result}"})
+        else:
+            project.update(result)
+    return warnings
+
+
+def bulk_operations(projects: List[Dict], now: Optional[datetime] = None) -> List:
+    """One upsert per project, keyed by id; timestamps bump the catalog's version probe"""
+    from pymongo import UpdateOne
+
+    now = now or datetime.utcnow()
+    return [UpdateOne({"id": p["id"]}, {"$set": dict(p, timestamp=now)}, upsert=True) for p in projects]
+
+
+def project_document(p: Dict) -> str:
+    """Text embedded for a project (same as populate_vector_db.py)"""
+    def meta(value):
+        return "Unknown" if value is None else str(value)
+
+    text = (f"Project: {meta(p.get('name') or p.get('title'))}. "
+            f"Tech Stack: {', '.join(p.get('technologies', []))}. "
+            f"Summary: {meta(p.get('summary'))}. Implementation Details: {meta(p.get('details'))}")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def project_metadata(p: Dict) -> Dict:
+    return {"name": str(p.get("name") or p.get("title")), "category": "project", "source": "MongoDB",
+            "metadata_category": "projects"}
+
+
+def reindex_projects(collection, projects: List[Dict], embed_documents: Callable[[List[str]], List]) -> Dict:
+    """Blocking: embed and upsert the given projects whose document text changed"""
+    if not projects:
+        return {"upserted": 0, "unchanged": 0}
+    ids = [p["id"] for p in projects]
+    documents = [project_document(p) for p in projects]
+    existing = collection.get(ids=ids, include=["documents"])
+    current = dict(zip(existing.get("ids") or [], existing.get("documents") or []))
+    changed = [i for i, (pid, doc) in enumerate(zip(ids, documents)) if current.get(pid) != doc]
+    if changed:
+        changed_docs = [documents[i] for i in changed]
+        collection.upsert(ids=[ids[i] for i in changed], documents=changed_docs,
+                          metadatas=[project_metadata(projects[i]) for i in changed],
+                          embeddings=embed_documents(changed_docs))
+    logger.info(f"Reindexed projects: {len(changed)} upserted, {len(ids) - len(changed)} unchanged")
+    return {"upserted": len(changed), "unchanged": len(ids) - len(changed)}
+
+
+def to_ndjson(projects: List[Dict]) -> str:
+    return "".join(json.dumps(p, default=str, ensure_ascii=False) + "\n" for p in projects)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    import requests
+
+    parser = argparse.ArgumentParser(description="Bulk import/export portfolio projects through the API")
+    parser.add_argument("file", nargs="?", help="JSON or NDJSON batch to import")
+    parser.add_argument("--api", default=os.getenv("PORTFOLIO_API_URL", "http://localhost:8000"))
+    parser.add_argument("--export", metavar="OUT", help="write every project as NDJSON instead")
+    parser.add_argument("--dry-run", action="store_true", help="validate on the server without writing")
+    parser.add_argument("--no-reindex", action="store_true", help="skip the portfolio_master update")
+    parser.add_argument("--keep-image-urls", action="store_true", help="do not re-host image URLs on Cloudinary")
+    args = parser.parse_args()
+    if not os.getenv("PROJECTS_ADMIN_TOKEN"):
+        parser.error("PROJECTS_ADMIN_TOKEN must be set (the API rejects bulk requests without it)")
+    headers = {"X-Admin-Token": os.environ["PROJECTS_ADMIN_TOKEN"]}
+
+    if args.export:
+        response = requests.get(f"{args.api}/api/projects/export", headers=headers, timeout=60)
+        response.raise_for_status()
+        with open(args.export, "w", encoding="utf-8") as f:
+            f.write(response.text)
+        print(f"Exported {len(response.text.splitlines())} projects to {args.export}")
+        sys.exit(0)
+    if not args.file:
+        parser.error("a batch file or --export is required")
+
+    with open(args.file, "rb") as f:
+        body = f.read()
+    _, local_errors = validate_batch(parse_batch(body))
+    if local_errors:
+        print(json.dumps({"errors": local_errors}, indent=2))
+        sys.exit(1)
+    response = requests.post(f"{args.api}/api/projects/import", data=body, timeout=300,
+                             headers=dict(headers, **{"Content-Type": "application/x-ndjson"}),
+                             params={"dry_run": args.dry_run, "reindex": not args.no_reindex,
+                                     "rehost_images": not args.keep_image_urls})
+    print(json.dumps(response.json(), indent=2))
+    sys.exit(0 if response.ok else 1)
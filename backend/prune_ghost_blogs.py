@@ -1,21 +1,24 @@
 import boto3
-import json
 import os
 
+try:
+    from backend.auto_blogger.publisher import S3BlogStorage
+except ImportError:
+    from auto_blogger.publisher import S3BlogStorage
+
 # Config
 BUCKET = "althaf-blogs-storage"
-INDEX_KEY = "blogs/index.json"
 POSTS_PREFIX = "blogs/posts/"
 
 def prune_index():
     print("🔍 Connectng to S3...")
     s3 = boto3.client('s3')
+    storage = S3BlogStorage(bucket_name=BUCKET)
     
-    # 1. Fetch Index
+    # 1. Fetch Index (all shards of blogs/index/)
     try:
-        print(f"   Fetching {INDEX_KEY}...")
-        resp = s3.get_object(Bucket=BUCKET, Key=INDEX_KEY)
-        index_data = json.loads(resp['Body'].read())
+        print("   Fetching sharded index...")
+        index_data, _ = storage.read_index_if_changed()
         initial_count = len(index_data.get('blogs', []))
         print(f"   Index contains {initial_count} blogs.")
     except Exception as e:
@@ -46,36 +49,17 @@ def prune_index():
         return
 
     # 3. Identify & Prune Ghosts
-    valid_blogs = []
-    ghosts = []
-    
-    for blog in index_data.get('blogs', []):
-        bid = blog.get('id')
-        if bid in actual_files:
-            valid_blogs.append(blog)
-        else:
-            ghosts.append(bid)
+    ghosts = [blog.get('id') for blog in index_data.get('blogs', []) if blog.get('id') not in actual_files]
             
     # 4. Report & Update
     if ghosts:
         print(f"⚠️ Found {len(ghosts)} GHOST entries in index (Missing files):")
         for g in ghosts:
             print(f"   - {g}")
-            
-        index_data['blogs'] = valid_blogs
-        
-        # Determine strict or recent sort if needed, but for now just preserving order of valid ones
-        # Sort by date just to be clean
-        index_data['blogs'].sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        
-        print(f"💾 Updating index.json (Removing {len(ghosts)} items)...")
         
-        s3.put_object(
-            Bucket=BUCKET,
-            Key=INDEX_KEY,
-            Body=json.dumps(index_data, indent=2),
-            ContentType='application/json'
-        )
+        # Conditional removal from the shards; also refreshes index.json and the active listing
+        print(f"💾 Updating index (Removing {len(ghosts)} items)...")
+        storage.remove_from_index(ghosts)
         print("✅ Index Pruned Successfully!")
     else:
         print("✅ Index is already clean. No ghosts found.")
@@ -11,12 +11,11 @@ from pathlib import Path
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("LocalBlogsReader")
 
-def get_local_blogs():
+BLOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_blogs")
+
+def get_local_blogs(blog_dir: str = BLOG_DIR):
     """Read all locally generated blog posts from the generated_blogs directory"""
     try:
-        # Define the path to the generated blogs directory
-        blog_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_blogs")
-        
         # Check if directory exists
         if not os.path.exists(blog_dir):
             logger.warning(f"Blog directory not found: {blog_dir}")
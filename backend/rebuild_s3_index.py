@@ -1,16 +1,22 @@
 #!/usr/bin/env python3
 """
 Rebuild S3 blog index to match actual blog files
-Scans S3 bucket for actual blog JSON files and rebuilds index.json
+Scans S3 bucket for actual blog JSON files and rebuilds the sharded index
+(blogs/index/manifest.json + monthly shards) and its index.json mirror
 """
 
 import os
 import sys
-import json
-import boto3
 from datetime import datetime
 from dotenv import load_dotenv
 
+try:
+    from backend.s3_access import get_s3_client, get_json_many, json_object, list_keys
+    from backend.blog_index import ShardedBlogIndex
+except ImportError:
+    from s3_access import get_s3_client, get_json_many, json_object, list_keys
+    from blog_index import ShardedBlogIndex
+
 # Load environment variables
 load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env.local'))
 
@@ -20,29 +26,29 @@ def rebuild_s3_index():
     bucket_name = os.getenv('S3_BLOG_BUCKET', 'althaf-blogs-storage')
     
     try:
-        # Initialize S3 client
-        s3 = boto3.client('s3')
+        # Shared pooled S3 client
+        s3 = get_s3_client()
         
         print(f"✅ Connected to S3 bucket: {bucket_name}")
         
-        # List all blog files in S3
+        # List all blog files in S3 (paginated)
         prefix = 'blogs/posts/'
-        response = s3.list_objects_v2(Bucket=bucket_name, Prefix=prefix)
+        blog_files = list_keys(bucket_name, prefix=prefix, suffix='.json')
         
-        if 'Contents' not in response:
+        if not blog_files:
             print("❌ No blog files found in S3")
             return
         
-        blog_files = [obj['Key'] for obj in response['Contents'] if obj['Key'].endswith('.json')]
         print(f"🔍 Found {len(blog_files)} blog files in S3:")
         
-        # Load each blog file and build index
+        # Download every blog file in parallel, then build the index
+        found, errors = get_json_many(bucket_name, blog_files)
         blogs = []
         for file_key in blog_files:
             try:
-                # Download blog file
-                obj = s3.get_object(Bucket=bucket_name, Key=file_key)
-                blog_data = json.loads(obj['Body'].read().decode('utf-8'))
+                if file_key in errors:
+                    raise errors[file_key]
+                blog_data = found[file_key]
                 
                 # Extract blog ID from filename
                 blog_id = file_key.split('/')[-1].replace('.json', '')
@@ -76,13 +82,16 @@ def rebuild_s3_index():
         
         print(f"\n📊 New index contains {len(blogs)} blogs")
         
-        # Upload new index to S3
+        # Replace the sharded index (what the app reads)
+        manifest = ShardedBlogIndex(s3, bucket_name).rebuild(blogs)
+        print(f"✅ Rebuilt sharded index: {len(manifest['shards'])} monthly shards")
+        
+        # Upload the single-file mirror for scripts that still read it
         index_key = 'blogs/index.json'
         s3.put_object(
             Bucket=bucket_name,
             Key=index_key,
-            Body=json.dumps(new_index, indent=2),
-            ContentType='application/json'
+            **json_object(new_index, compress=False)
         )
         
         print(f"✅ Uploaded new index to S3: {index_key}")
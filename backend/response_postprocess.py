@@ -0,0 +1,95 @@
+"""
+Chatbot Reply Post-Processing
+Applied once at the source in ChatbotProvider._clean_response. Layout is
+kept (paragraphs, **bold**): one compiled pass strips model artifacts,
+fixes the bot name and removes hyphen bullets, then leading apology
+sentences are dropped and runs of blank lines squashed.
+"""
+import re
+
+# Raw chat-template tokens some OpenRouter/HF models leak into their output
+MODEL_ARTIFACTS = ["<s>", "</s>", "[INST]", "[/INST]", "<INST>", "</INST>"]
+
+APOLOGY_PATTERNS = [
+    r"\bit seems i may not have\b",
+    r"\bi may not have\b",
+    r"\bit seems\b",
+    r"\bi may\b",
+    r"\bi might\b",
+    r"\bi apologize\b",
+    r"\bsorry\b",
+    r"\bapologies\b",
+    r"\bfor the confusion\b",
+    r"\bi didn.?t explain\b",
+    r"\bbased on the provided information\b",
+    r"\bas an ai model\b",
+    r"\bi don.?t have real-time capabilities\b",
+    r"\bi don.?t have access to real-time\b",
+    r"\bi can.?t access real-time\b"
+]
+
+# Bot name corrections
+BOT_NAME_REPLACEMENTS = [
+    (r'\bAllu Bot\b', 'Assist Bot'),
+    (r'\bAlluBot\b', 'Assist Bot'),
+    (r'\bAllu\b(?!\s*Althaf)', 'Assist Bot'),  # Replace "Allu" only if not followed by "Althaf"
+]
+
+_ARTIFACT_RE = re.compile("|".join(re.escape(token) for token in MODEL_ARTIFACTS))
+
+# Alternation order is precedence: bot name first, then artifacts, then bullets
+_PIPELINE_RE = re.compile(
+    "|".join(
+        [f"(?P<bot{i}>{pattern})" for i, (pattern, _) in enumerate(BOT_NAME_REPLACEMENTS)]
+        + ["(?P<artifact>" + _ARTIFACT_RE.pattern + ")"]
+        + [r"^[ \t]*-[ \t]"]  # hyphen bullets: "- item" -> "item"
+    ),
+    re.IGNORECASE | re.MULTILINE,
+)
+_BOT_GROUPS = {f"bot{i}": replacement for i, (_, replacement) in enumerate(BOT_NAME_REPLACEMENTS)}
+
+_APOLOGY_RE = re.compile("|".join(APOLOGY_PATTERNS), re.IGNORECASE)
+# First sentence (or line) of the remaining text, with the whitespace after it
+_LEADING_SENTENCE_RE = re.compile(r"[^.!?\n]*(?:[.!?]+|\n|$)\s*")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def _replace(match: "re.Match") -> str:
+    return _BOT_GROUPS.get(match.lastgroup, "")
+
+
+def strip_model_artifacts(text: str) -> str:
+    """Remove leaked chat-template tokens only (keeps layout; used for summaries)"""
+    if not text:
+        return text
+    return _ARTIFACT_RE.sub("", text).strip()
+
+
+def strip_leading_apologies(text: str) -> str:
+    """
+    Drop whole leading sentences that are apology/hedging boilerplate
+    ("I apologize for the confusion. ..."). Phrases later in the reply are
+    left alone, and a reply that is nothing but such sentences is kept.
+    """
+    pos = 0
+    while pos < len(text):
+        sentence = _LEADING_SENTENCE_RE.match(text, pos)
+        if not sentence.group(0) or not _APOLOGY_RE.search(sentence.group(0)):
+            break
+        pos = sentence.end()
+    rest = text[pos:]
+    return rest if rest.strip() else text
+
+
+def postprocess_reply(text: str) -> str:
+    """
+    Clean a complete chatbot reply, keeping its line layout.
+
+    Strips model artifacts and hyphen bullets, replaces the legacy bot name,
+    drops leading apology sentences and squashes 3+ line breaks to 2.
+    """
+    if not text:
+        return ""
+    cleaned = _PIPELINE_RE.sub(_replace, text).strip()
+    cleaned = strip_leading_apologies(cleaned)
+    return _BLANK_LINES_RE.sub("\n\n", cleaned).strip()
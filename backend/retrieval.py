@@ -0,0 +1,223 @@
+"""
+Retrieval Planning & Hit Selection
+The query plan (search text, candidate count, metadata filter, injection cap)
+and post-query selection (passage grouping, optional lexical re-rank, blog
+date anchoring, injection clamp) for portfolio_master, shared by
+get_portfolio_context and the offline evaluation in
+backend/benchmarks/retrieval_eval.py so both run the same logic.
+
+Limits can be tuned per deployment without a code change:
+    RAG_CANDIDATE_LIMIT, RAG_INJECTION_LIMIT,
+    RAG_BLOG_CANDIDATE_LIMIT, RAG_BLOG_INJECTION_LIMIT,
+    RAG_USE_FILTERS (true/false), RAG_HYBRID (true/false)
+"""
+import logging
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from backend.chunking import group_chunk_hits
+except ImportError:
+    from chunking import group_chunk_hits
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have he his him in is it of on or that the this to was were what "
+    "which who with about does did can tell me you your i show list any".split()
+)
+
+AWS_QUERY_PREFIX = "AWS Cloud Infrastructure"
+
+# Intent -> metadata filter on portfolio_master (None = all categories)
+INTENT_FILTERS = {
+    "blogs": {"category": "blog"},
+    "projects": {"$or": [{"category": "project"}, {"category": "profile"}]},
+    "aws_projects": {"$or": [{"category": "project"}, {"category": "profile"}]},
+    "profile": {"category": "profile"},
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class RetrievalConfig:
+    """Knobs for one retrieval configuration (defaults match production behaviour)"""
+    name: str = "default"
+    candidate_limit: int = 6
+    injection_limit: int = 6
+    # Blog queries fetch wide so date sorting can surface new posts that rank low semantically
+    blog_candidate_limit: int = 30
+    blog_injection_limit: int = 6
+    use_filters: bool = True
+    hybrid: bool = False
+    max_chunks_per_source: int = 3
+
+    @classmethod
+    def from_env(cls) -> "RetrievalConfig":
+        return cls(
+            name="env",
+            candidate_limit=_env_int("RAG_CANDIDATE_LIMIT", cls.candidate_limit),
+            injection_limit=_env_int("RAG_INJECTION_LIMIT", cls.injection_limit),
+            blog_candidate_limit=_env_int("RAG_BLOG_CANDIDATE_LIMIT", cls.blog_candidate_limit),
+            blog_injection_limit=_env_int("RAG_BLOG_INJECTION_LIMIT", cls.blog_injection_limit),
+            use_filters=_env_bool("RAG_USE_FILTERS", cls.use_filters),
+            hybrid=_env_bool("RAG_HYBRID", cls.hybrid),
+        )
+
+
+@dataclass
+class QueryPlan:
+    search_query: str
+    n_results: int
+    injection_limit: int
+    where: Optional[Dict] = None
+    query_kwargs: Dict = field(default_factory=dict)
+
+
+def plan_query(query: str, intent: str, config: RetrievalConfig) -> QueryPlan:
+    """Search text, candidate count, filter and injection cap for one unified-collection query"""
+    search_query = f"{AWS_QUERY_PREFIX} {query}" if intent == "aws_projects" else query
+    if intent == "blogs":
+        n_results, injection_limit = config.blog_candidate_limit, config.blog_injection_limit
+    else:
+        n_results, injection_limit = config.candidate_limit, config.injection_limit
+    where = INTENT_FILTERS.get(intent) if config.use_filters else None
+
+    query_kwargs = {"query_texts": [search_query], "n_results": n_results}
+    if where:
+        query_kwargs["where"] = where
+    return QueryPlan(search_query, n_results, injection_limit, where, query_kwargs)
+
+
+# --- BLOG DATE ANCHORING ---
+
+def normalize_blog_query(text: str) -> dict:
+    text = text.lower()
+    return {
+        "is_today": any(k in text for k in ["today", "todays", "posted today"]),
+        "is_recent": any(k in text for k in ["recent", "latest", "new"]),
+        "explicit_title": None  # Placeholder for NLP title extraction
+    }
+
+
+def filter_blogs_by_date(docs, metas, ids, target_date=None, mode="exact"):
+    """
+    Filter blogs by date logic.
+    mode="exact": strict match (e.g., today)
+    mode="recent": sort by date DESC, take top 1
+    """
+    combined = []
+    for d, m, i in zip(docs, metas, ids):
+        pub_date = m.get('published_date', '1970-01-01')
+        combined.append({"doc": d, "meta": m, "id": i, "date": pub_date})
+
+    if mode == "exact" and target_date:
+        filtered = [c for c in combined if c['date'] == target_date]
+        return ([c['doc'] for c in filtered],
+                [c['meta'] for c in filtered],
+                [c['id'] for c in filtered])
+
+    if mode == "recent":
+        # ISO dates sort correctly as strings
+        combined.sort(key=lambda x: x['date'], reverse=True)
+        if not combined:
+            return [], [], []
+        top = combined[0]
+        return [top['doc']], [top['meta']], [top['id']]
+
+    return docs, metas, ids
+
+
+# --- HYBRID (LEXICAL) RE-RANK ---
+
+def _terms(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def hybrid_rerank(query: str, docs: List[str], metas: List[Dict], ids: List[str],
+                  rrf_k: int = 60) -> Tuple[List[str], List[Dict], List[str]]:
+    """
+    Re-order vector candidates by reciprocal-rank fusion with a keyword score
+    (IDF-weighted query-term overlap over the candidate set, title included).
+    Helps exact names (tools, certifications, blog titles) that embeddings blur.
+    """
+    query_terms = set(_terms(query))
+    if not query_terms or len(docs) < 2:
+        return docs, metas, ids
+
+    doc_terms = [set(_terms(f"{(m or {}).get('title', '')} {d}")) for d, m in zip(docs, metas)]
+    n = len(docs)
+    idf = {t: math.log(1 + n / (1 + sum(t in terms for terms in doc_terms))) for t in query_terms}
+    lexical = [sum(idf[t] for t in query_terms if t in terms) for terms in doc_terms]
+    lexical_rank = {i: r for r, i in enumerate(sorted(range(n), key=lambda i: -lexical[i]))}
+
+    fused = sorted(range(n), key=lambda i: -(1 / (rrf_k + i) + 1 / (rrf_k + lexical_rank[i])))
+    return [docs[i] for i in fused], [metas[i] for i in fused], [ids[i] for i in fused]
+
+
+def select_hits(query: str, results: Dict, injection_limit: int, is_blog_query: bool,
+                config: RetrievalConfig, today: Optional[date] = None) -> Tuple[List[str], List[Dict], List[str]]:
+    """
+    Raw Chroma query results -> the (docs, metas, ids) to inject, one entry per source.
+
+    Passage hits collapse to their source (ranked by best chunk), then blog
+    queries apply date anchoring ("today" = exact date, "latest" = newest),
+    and the result is clamped to the injection limit.
+    """
+    docs = results.get('documents', [[]])[0]
+    metas = results.get('metadatas', [[]])[0]
+    ids = results.get('ids', [[]])[0]
+
+    # Limits below count sources, not chunks
+    grouped = group_chunk_hits(docs, metas, ids, max_chunks_per_source=config.max_chunks_per_source)
+    docs, metas, ids = grouped["docs"], grouped["metas"], grouped["ids"]
+
+    if config.hybrid:
+        docs, metas, ids = hybrid_rerank(query, docs, metas, ids)
+
+    if is_blog_query:
+        filters = normalize_blog_query(query)
+        if filters['is_today']:
+            # Prioritize temporal match over semantic rank; scope lock to one source
+            today_iso = (today or date.today()).isoformat()
+            f_docs, f_metas, f_ids = filter_blogs_by_date(docs, metas, ids, today_iso)
+            if f_docs:
+                logger.info(f"📅 Date Anchor Hit: Found {len(f_docs)} blogs for {today_iso}")
+                docs, metas, ids = f_docs, f_metas, f_ids
+                injection_limit = 1
+            else:
+                logger.info(f"📅 Date Anchor Miss: No blogs found for {today_iso}")
+        elif filters['is_recent']:
+            # "Recent" means TIME, not RELEVANCE
+            f_docs, f_metas, f_ids = filter_blogs_by_date(docs, metas, ids, mode="recent")
+            if f_docs:
+                docs, metas, ids = f_docs, f_metas, f_ids
+                injection_limit = 1
+                logger.info(f"✅ Found most recent blog: {metas[0].get('title')} ({metas[0].get('published_date')})")
+            else:
+                logger.info("⚠️ Recent filter failed, falling back to semantic.")
+
+    return docs[:injection_limit], metas[:injection_limit], ids[:injection_limit]
+
+
+def format_passage(doc: str, meta: Dict, fallback_label: str) -> Optional[str]:
+    """Context block for a chunked passage (injected as-is); None for whole records needing summarization"""
+    if not meta.get('parent_id'):
+        return None
+    section = f" | Section: {meta['section']}" if meta.get('section') else ""
+    return f"[Source: {meta.get('title', fallback_label)}{section}] (Date: {meta.get('published_date', 'N/A')})\n{doc}"
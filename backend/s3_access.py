@@ -0,0 +1,148 @@
+"""
+Shared S3 Access
+One boto3 S3 client per process (boto3 clients are thread-safe) with a sized
+connection pool, standard retries and timeouts, plus a dedicated thread pool
+so async endpoints can await S3 without blocking the event loop or starving
+the default executor.
+
+    s3 = get_s3_client()                                  # sync callers (publisher, scripts)
+    data = await run_s3(storage.read_blog, blog_id)       # async endpoints
+    found, errors = get_json_many(bucket, keys)           # parallel multi-object reads
+
+JSON objects the app writes are minified and stored gzip-encoded
+(Content-Encoding: gzip; S3_JSON_GZIP=false to write them plain):
+
+    s3.put_object(Bucket=bucket, Key=key, **json_object(data))
+    data = read_json_body(s3.get_object(Bucket=bucket, Key=key))   # plain or gzip
+
+Tuning (env): S3_MAX_POOL_CONNECTIONS, S3_MAX_ATTEMPTS, S3_RETRY_MODE,
+S3_CONNECT_TIMEOUT, S3_READ_TIMEOUT, S3_IO_WORKERS.
+"""
+import asyncio
+import functools
+import gzip
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from backend.lazy_imports import lazy_import
+except ImportError:
+    from lazy_imports import lazy_import
+
+# Deferred like the other SDKs so importing the API stays light (see tests/test_startup_profile.py)
+boto3 = lazy_import("boto3")
+
+logger = logging.getLogger("S3Access")
+
+MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))
+GZIP_JSON = os.getenv("S3_JSON_GZIP", "true").lower() != "false"
+GZIP_MAGIC = b"\x1f\x8b"
+IO_WORKERS = int(os.getenv("S3_IO_WORKERS", str(MAX_POOL_CONNECTIONS)))
+
+_client = None
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def s3_config():
+    from botocore.config import Config
+    return Config(
+        max_pool_connections=MAX_POOL_CONNECTIONS,
+        retries={"max_attempts": int(os.getenv("S3_MAX_ATTEMPTS", "5")),
+                 "mode": os.getenv("S3_RETRY_MODE", "standard")},
+        connect_timeout=float(os.getenv("S3_CONNECT_TIMEOUT", "3")),
+        read_timeout=float(os.getenv("S3_READ_TIMEOUT", "10")),
+        tcp_keepalive=True,
+    )
+
+
+def get_s3_client():
+    """Process-wide pooled S3 client (credentials from the IAM role / environment)"""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = boto3.client("s3", config=s3_config())
+                logger.info(f"S3 client initialized (pool {MAX_POOL_CONNECTIONS})")
+    return _client
+
+
+def get_s3_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="s3-io")
+    return _executor
+
+
+async def run_s3(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking S3 call on the S3 thread pool and await it"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_s3_executor(), functools.partial(func, *args, **kwargs))
+
+
+def dump_json(data: Any) -> bytes:
+    """Minified UTF-8 JSON (the same bytes the API serves for a cached post)"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_object(data: Any, compress: Optional[bool] = None) -> Dict[str, Any]:
+    """put_object keyword arguments for a JSON document"""
+    body = dump_json(data)
+    if not (GZIP_JSON if compress is None else compress):
+        return {"Body": body, "ContentType": "application/json"}
+    # mtime=0: identical documents give identical bytes (and ETags)
+    return {"Body": gzip.compress(body, compresslevel=6, mtime=0),
+            "ContentType": "application/json", "ContentEncoding": "gzip"}
+
+
+def read_body(response: Dict) -> Tuple[bytes, Optional[bytes]]:
+    """(decoded bytes, gzip bytes as stored or None) for a get_object response"""
+    stored = response["Body"].read()
+    if response.get("ContentEncoding") == "gzip" or stored[:2] == GZIP_MAGIC:
+        return gzip.decompress(stored), stored
+    return stored, None
+
+
+def read_json_body(response: Dict) -> Any:
+    return json.loads(read_body(response)[0].decode("utf-8"))
+
+
+def get_json(bucket: str, key: str) -> Any:
+    return read_json_body(get_s3_client().get_object(Bucket=bucket, Key=key))
+
+
+def list_keys(bucket: str, prefix: str = "", suffix: str = "") -> List[str]:
+    """All keys under a prefix (paginated past the 1000-key list_objects_v2 limit)"""
+    paginator = get_s3_client().get_paginator("list_objects_v2")
+    keys = []
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        keys.extend(obj["Key"] for obj in page.get("Contents", []) if obj["Key"].endswith(suffix))
+    return keys
+
+
+def get_json_many(bucket: str, keys: List[str],
+                  max_workers: Optional[int] = None) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """Fetch and parse many JSON objects in parallel over the shared pool.
+
+    Returns (results, errors) keyed by object key; one failure does not
+    abort the batch.
+    """
+    results: Dict[str, Any] = {}
+    errors: Dict[str, Exception] = {}
+    if not keys:
+        return results, errors
+    workers = max(1, min(max_workers or MAX_POOL_CONNECTIONS, len(keys)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-batch") as pool:
+        futures = {key: pool.submit(get_json, bucket, key) for key in keys}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                errors[key] = e
+    return results, errors
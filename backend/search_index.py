@@ -0,0 +1,378 @@
+"""
+Search Index
+Local inverted index over blogs and projects for GET /api/search.
+
+Titles, tags, categories, excerpts, blog bodies and project tech stacks are
+tokenized with per-field weights and ranked with BM25. The last query term
+also matches as a prefix, so the endpoint doubles as typeahead. Lookups are
+pure in-memory work: no S3, Chroma or model calls.
+
+The index is kept current incrementally:
+- BlogPublisher.publish indexes the new post (full body) via index_blog();
+- project create/update/delete call index_project() / remove_project();
+- the API reconciles against the blog catalog's active listing, so blogs that
+  age out (daily cleanup) or are published elsewhere are dropped/added.
+
+It is persisted as gzipped compact JSON of the forward index (doc -> term
+weights); postings are rebuilt on load. `python search_index.py --rebuild`
+re-indexes the active blogs with their full bodies from S3.
+"""
+import bisect
+import gzip
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("SearchIndex")
+
+INDEX_PATH = os.getenv("SEARCH_INDEX_PATH",
+                       os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "search_index.json.gz"))
+FORMAT_VERSION = 1
+MAX_QUERY_TERMS = 8
+MAX_PREFIX_EXPANSIONS = 64
+PREFIX_PENALTY = 0.8  # a prefix match ranks below the same exact match
+SNIPPET_CHARS = 200
+
+# BM25
+K1 = 1.2
+B = 0.75
+
+BLOG_FIELDS = (("title", 5.0), ("tags", 4.0), ("category", 3.0), ("excerpt", 2.0), ("content", 1.0))
+PROJECT_FIELDS = (("title", 5.0), ("name", 5.0), ("technologies", 4.0), ("summary", 2.0),
+                  ("description", 1.5), ("key_outcomes", 1.0), ("details", 1.0))
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have how in into is it its of on or that the their this
+to was were what when where which who why will with you your
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_TAG_RE = re.compile(r"<[^>]+>")  # project details are stored as sanitized HTML
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; keeps c++ / c# / k8s, drops stopwords and stray letters"""
+    return [t for t in _TOKEN_RE.findall(_TAG_RE.sub(" ", text).lower())
+            if t not in STOPWORDS and (len(t) > 1 or t.isdigit())]
+
+
+def _text(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value)
+    return str(value) if value else ""
+
+
+def _term_weights(doc: Dict, fields: Iterable[Tuple[str, float]]) -> Dict[str, float]:
+    weights: Dict[str, float] = defaultdict(float)
+    for field, weight in fields:
+        for term in tokenize(_text(doc.get(field))):
+            weights[term] += weight
+    return dict(weights)
+
+
+def _snippet(text: str) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= SNIPPET_CHARS else text[:SNIPPET_CHARS].rsplit(" ", 1)[0] + "…"
+
+
+def blog_document(blog: Dict) -> Tuple[str, Dict, Dict[str, float]]:
+    """(key, display metadata, term weights) for a full post or a listing entry"""
+    meta = {
+        "type": "blog",
+        "id": blog["id"],
+        "title": blog.get("title", ""),
+        "snippet": _snippet(blog.get("excerpt") or ""),
+        "category": blog.get("category"),
+        "created_at": blog.get("created_at"),
+        "url": f"/blogs/{blog['id']}",
+        "body": bool(blog.get("content")),
+    }
+    return f"blog:{blog['id']}", meta, _term_weights(blog, BLOG_FIELDS)
+
+
+def project_document(project: Dict) -> Tuple[str, Dict, Dict[str, float]]:
+    project_id = str(project.get("id") or project.get("_id"))
+    meta = {
+        "type": "project",
+        "id": project_id,
+        "title": project.get("title") or project.get("name", ""),
+        "snippet": _snippet(project.get("summary") or project.get("description") or ""),
+        "category": None,
+        "created_at": str(project["timestamp"]) if project.get("timestamp") else None,
+        "url": f"/projects/{project_id}",
+    }
+    return f"project:{project_id}", meta, _term_weights(project, PROJECT_FIELDS)
+
+
+class SearchIndex:
+    def __init__(self, path: Optional[str] = INDEX_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        self._docs: Dict[str, Dict] = {}      # key -> display metadata
+        self._terms: Dict[str, Dict[str, float]] = {}  # key -> {term: weight} (forward index)
+        self._lengths: Dict[str, float] = {}
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)  # term -> {key: weight}
+        self._sorted_terms: Optional[List[str]] = None
+        self._total_length = 0.0
+        self.projects_loaded = False
+        self.listing_seen = None  # last catalog listing reconciled (identity)
+
+    # --- mutation ---------------------------------------------------------
+
+    def upsert(self, key: str, meta: Dict, weights: Dict[str, float]):
+        with self._lock:
+            self._remove(key)
+            self._docs[key] = meta
+            self._terms[key] = weights
+            length = sum(weights.values())
+            self._lengths[key] = length
+            self._total_length += length
+            for term, weight in weights.items():
+                if term not in self._postings:
+                    self._sorted_terms = None
+                self._postings[term][key] = weight
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def _remove(self, key: str) -> bool:
+        weights = self._terms.pop(key, None)
+        if weights is None:
+            return False
+        del self._docs[key]
+        self._total_length -= self._lengths.pop(key)
+        for term in weights:
+            postings = self._postings[term]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+                self._sorted_terms = None
+        return True
+
+    def upsert_blog(self, blog: Dict):
+        self.upsert(*blog_document(blog))
+
+    def upsert_project(self, project: Dict):
+        self.upsert(*project_document(project))
+
+    def replace_projects(self, projects: List[Dict]):
+        with self._lock:
+            for key in [k for k in self._docs if k.startswith("project:")]:
+                self._remove(key)
+            for project in projects:
+                self.upsert_project(project)
+            self.projects_loaded = True
+
+    def reconcile_blogs(self, listing_blogs: List[Dict]) -> bool:
+        """Match the indexed blogs to the active listing; True if anything changed.
+
+        Blogs already indexed keep their entry (and body terms); new ones are
+        indexed from their listing fields until a full post is indexed.
+        """
+        with self._lock:
+            active = {b["id"]: b for b in listing_blogs if b.get("id")}
+            changed = False
+            for key in [k for k in self._docs if k.startswith("blog:")]:
+                if key[5:] not in active:
+                    changed |= self._remove(key)
+            for blog_id, blog in active.items():
+                if f"blog:{blog_id}" not in self._docs:
+                    self.upsert_blog(blog)
+                    changed = True
+            return changed
+
+    # --- query ------------------------------------------------------------
+
+    def search(self, query: str, doc_type: Optional[str] = None, limit: int = 10,
+               prefix: bool = True) -> Dict:
+        """Ranked documents matching every query term (the last one also as a prefix)"""
+        terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+        if not terms:
+            return {"results": [], "total": 0}
+        with self._lock:
+            n_docs = len(self._docs)
+            avg_length = (self._total_length / n_docs) if n_docs else 1.0
+            scores: Optional[Dict[str, float]] = None
+            for i, term in enumerate(terms):
+                expansions = [(term, 1.0)] if term in self._postings else []
+                if prefix and i == len(terms) - 1:
+                    expansions += [(t, PREFIX_PENALTY) for t in self._expand(term) if t != term]
+                term_scores: Dict[str, float] = {}
+                for expanded, factor in expansions:
+                    postings = self._postings[expanded]
+                    idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for key, tf in postings.items():
+                        norm = tf * (K1 + 1) / (tf + K1 * (1 - B + B * self._lengths[key] / avg_length))
+                        score = idf * norm * factor
+                        if score > term_scores.get(key, 0.0):
+                            term_scores[key] = score
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {key: s + term_scores[key] for key, s in scores.items() if key in term_scores}
+                if not scores:
+                    break
+            hits = [(key, score) for key, score in (scores or {}).items()
+                    if doc_type is None or self._docs[key]["type"] == doc_type]
+            # Newest first among equal scores (sorts are stable)
+            hits.sort(key=lambda h: self._docs[h[0]].get("created_at") or "", reverse=True)
+            hits.sort(key=lambda h: h[1], reverse=True)
+            results = []
+            for key, score in hits[:limit]:
+                meta = {k: v for k, v in self._docs[key].items() if k != "body"}
+                meta["score"] = round(score, 3)
+                results.append(meta)
+            return {"results": results, "total": len(hits)}
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[str]:
+        """Indexed terms starting with a prefix, most frequent first"""
+        tokens = tokenize(prefix)
+        if not tokens:
+            return []
+        with self._lock:
+            candidates = self._expand(tokens[-1])
+            candidates.sort(key=lambda t: -len(self._postings[t]))
+            return candidates[:limit]
+
+    def _expand(self, prefix: str) -> List[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        start = bisect.bisect_left(self._sorted_terms, prefix)
+        expansions = []
+        for term in self._sorted_terms[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            expansions.append(term)
+        return expansions
+
+    def stats(self) -> Dict:
+        with self._lock:
+            blogs = sum(1 for k in self._docs if k.startswith("blog:"))
+            return {"documents": len(self._docs), "blogs": blogs, "projects": len(self._docs) - blogs,
+                    "terms": len(self._postings), "projects_loaded": self.projects_loaded}
+
+    # --- persistence --------------------------------------------------------
+
+    def save(self):
+        """Atomically write the forward index (gzipped compact JSON)"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {"version": FORMAT_VERSION, "projects_loaded": self.projects_loaded,
+                    "docs": {key: [self._docs[key], self._terms[key]] for key in self._docs}}
+            payload = gzip.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> bool:
+        """Load a saved index; False (and empty) when missing, unreadable or an old format"""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != FORMAT_VERSION:
+                return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable search index {self.path}: {e}")
+            return False
+        with self._lock:
+            for key, (meta, weights) in data["docs"].items():
+                self.upsert(key, meta, weights)
+            self.projects_loaded = data.get("projects_loaded", False)
+        return True
+
+
+_index: Optional[SearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    """Shared process-wide index, loaded from disk on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = SearchIndex()
+                index.load()
+                _index = index
+    return _index
+
+
+def _update(mutate: Callable[[SearchIndex], None]):
+    """Apply and persist an incremental update; search stays best-effort for writers"""
+    try:
+        index = get_search_index()
+        mutate(index)
+        index.save()
+    except Exception as e:
+        logger.error(f"Search index update failed: {e}")
+
+
+def index_blog(blog: Dict):
+    """Called by the publisher with the full post"""
+    _update(lambda index: index.upsert_blog(blog))
+
+
+def index_project(project: Dict):
+    _update(lambda index: index.upsert_project(project))
+
+
+def index_projects(projects: List[Dict]):
+    """Several projects, saved once (bulk import)"""
+    def mutate(index: SearchIndex):
+        for project in projects:
+            index.upsert_project(project)
+    _update(mutate)
+
+
+def remove_project(project_id: str):
+    def mutate(index: SearchIndex):
+        # Deleted by the other id form (_id vs id): reload projects on the next search
+        if not index.remove(f"project:{project_id}"):
+            index.projects_loaded = False
+    _update(mutate)
+
+
+def rebuild(blogs: List[Dict], projects: Optional[List[Dict]] = None) -> SearchIndex:
+    """Replace the saved index with the given blogs (and projects, if given)"""
+    index = SearchIndex()
+    for blog in blogs:
+        index.upsert_blog(blog)
+    if projects is not None:
+        index.replace_projects(projects)
+    index.save()
+    return index
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rebuild the local search index from S3")
+    parser.add_argument("--rebuild", action="store_true", help="re-index active blogs with full bodies")
+    args = parser.parse_args()
+    if args.rebuild:
+        try:
+            from backend.blog_listing import LISTING_KEY
+            from backend.s3_access import get_json, get_json_many
+        except ImportError:
+            from blog_listing import LISTING_KEY
+            from s3_access import get_json, get_json_many
+        bucket = os.getenv("S3_BLOG_BUCKET", "althaf-blogs-storage")
+        listing = get_json(bucket, LISTING_KEY)
+        keys = [f"blogs/posts/{b['id']}.json" for b in listing["blogs"]]
+        found, errors = get_json_many(bucket, keys)
+        # Listing entry first: keeps its clean excerpt, the post adds the body
+        blogs = [dict(b, **found.get(f"blogs/posts/{b['id']}.json", {})) for b in listing["blogs"]]
+        # Projects are re-read from MongoDB by the API on its next search
+        index = rebuild(blogs)
+        print(f"Indexed {index.stats()['blogs']} blogs ({len(errors)} fell back to listing fields) -> {INDEX_PATH}")
@@ -2,41 +2,43 @@
 FastAPI Portfolio Backend Server
 Updated: March 3, 2026 - Model Configuration Update (Auto-Blogger)
 """
+import asyncio
+import hmac
 import os
-import sys
+import time
 import logging
 import uuid
 import json
 import threading
-import boto3
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import List, Optional, Union, Tuple
 
+_IMPORT_START = time.perf_counter()  # Cold-start reference point (see lifespan)
+
 # Third-party imports
-from fastapi import FastAPI, APIRouter, UploadFile, File, Form, HTTPException, status, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, UploadFile, File, Form, HTTPException, status, BackgroundTasks, Query, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from fastapi.middleware.gzip import GZipMiddleware
+from contextlib import asynccontextmanager, suppress
 from dotenv import load_dotenv
-from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel, Field, EmailStr
 import bleach
-import subprocess
-import cloudinary
-import cloudinary.uploader
-from google import genai
-from google.genai import types
-import chromadb
-from chromadb import EmbeddingFunction, Documents, Embeddings
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
 from bson import ObjectId
 
+# Heavy optional dependencies are deferred until first use (cold start).
+# Run `python -m backend.startup_profile` for a per-module import report.
+from backend.lazy_imports import lazy_import, warm_imports
+boto3 = lazy_import("boto3")
+chromadb = lazy_import("chromadb")
+genai = lazy_import("google.genai")
+cloudinary = lazy_import("cloudinary")
+cloudinary_uploader = lazy_import("cloudinary.uploader")
+
 # Local imports
 try:
     from backend import agent_service
-    from backend.ai_service import gemini_service
     from backend.notification_service import notification_service
     from backend.security_utils import sanitize_html
     from backend.models import ChatbotQuery
@@ -55,6 +57,31 @@ except ImportError as e:
     def sanitize_html(text):
         return bleach.clean(text)
 
+# Retrieval plan + hit selection (shared with backend/benchmarks/retrieval_eval.py)
+from backend.retrieval import RetrievalConfig, plan_query, select_hits, format_passage
+from backend.monitoring.metrics import (
+    REGISTRY as METRICS_REGISTRY, PROMETHEUS_CONTENT_TYPE, CHAT_IN_FLIGHT, CHAT_REQUEST_SECONDS,
+    time_stage, record_cache_lookup, collect_request_stats, snapshot as metrics_snapshot
+)
+from backend.monitoring.tracing import start_trace, current_trace_id
+from backend.monitoring.telemetry import record_chat_request
+from backend.monitoring.async_logging import configure_logging, SAMPLED
+from backend.blog_catalog import get_blog_catalog
+from backend.blog_listing import parse_fields, query_listing
+from backend.blog_post_cache import get_blog_post_cache
+from backend.s3_access import run_s3
+from backend.sitemap_service import get_full_blog_index, get_sitemap_service, invalidate_sitemap_projects
+from backend.image_uploads import ImageRejected, upload_project_image
+from backend.project_import import (
+    MAX_BATCH_BYTES, VECTOR_COLLECTION, BatchError, bulk_operations, parse_batch, reindex_projects,
+    rehost_images as rehost_images_by_url, to_ndjson, validate_batch
+)
+from backend.project_catalog import (
+    DOCUMENT_PROJECTION, ensure_project_indexes, get_project_catalog, invalidate_project_catalog, normalize_project
+)
+from backend.search_index import get_search_index, index_project, index_projects, remove_project
+from backend.middleware.http_caching import CACHE_POLICIES, cached_body, cached_json, http_date, make_etag
+
 # Security middleware with fallback
 try:
     from backend.security_utils import SecurityHeadersMiddleware
@@ -72,14 +99,9 @@ log_dir = ROOT_DIR / 'logs'
 log_dir.mkdir(exist_ok=True)
 log_file_path = log_dir / 'chatbot.log'
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler(str(log_file_path), encoding='utf-8')
-    ]
-)
+# stdout + rotating file handlers run on a background QueueListener so request
+# handlers never block on log I/O (see monitoring/async_logging.py for LOG_* env vars)
+configure_logging(log_file_path)
 logger = logging.getLogger('PortfolioBackend')
 
 # Database Setup
@@ -91,31 +113,63 @@ db = None
 # ChromaDB Migration Toggle (Task 15)
 USE_LEGACY_COLLECTIONS = os.environ.get('USE_LEGACY_COLLECTIONS', 'false').lower() == 'true'
 logger.info(f"ChromaDB Mode: {'LEGACY (3 collections)' if USE_LEGACY_COLLECTIONS else 'UNIFIED (portfolio_master)'}")
+# Unified-mode candidate/injection limits, filters and re-rank (RAG_* env overrides)
+RETRIEVAL_CONFIG = RetrievalConfig.from_env()
 
 if mongo_url:
     try:
+        from motor.motor_asyncio import AsyncIOMotorClient
         client = AsyncIOMotorClient(mongo_url)
         db = client[db_name]
         print(f"✅ Connected to MongoDB: {db_name}")
     except Exception as e:
         print(f"❌ MongoDB Connection Error: {e}")
 
-# Cloudinary Setup
-cloudinary.config(
-    cloud_name=os.environ.get('CLOUDINARY_CLOUD_NAME'),
-    api_key=os.environ.get('CLOUDINARY_API_KEY'),
-    api_secret=os.environ.get('CLOUDINARY_API_SECRET'),
-    secure=True
-)
+# Cloudinary Setup (deferred: configured on first upload)
+_cloudinary_configured = False
+
+def get_cloudinary_uploader():
+    """Import and configure Cloudinary on first use"""
+    global _cloudinary_configured
+    if not _cloudinary_configured:
+        cloudinary.config(
+            cloud_name=os.environ.get('CLOUDINARY_CLOUD_NAME'),
+            api_key=os.environ.get('CLOUDINARY_API_KEY'),
+            api_secret=os.environ.get('CLOUDINARY_API_SECRET'),
+            secure=True
+        )
+        _cloudinary_configured = True
+    return cloudinary_uploader
 
-# Configure Gemini
-# Configure Gemini Client
+# Configure Gemini Client (deferred: created on first RAG query or background warm-up)
 # genai.configure(api_key=os.getenv('GEMINI_API_KEY')) # Legacy
-try:
-    genai_client = genai.Client(api_key=os.getenv('CHATBOT_GEMINI_KEY') or os.getenv('GEMINI_API_KEY'))
-except Exception as e:
-    print(f"Warning: Failed to init global Gemini Client: {e}")
-    genai_client = None
+_genai_client = None
+_genai_client_lock = threading.Lock()
+
+def get_genai_client():
+    """Create the shared Gemini client on first use (None if unavailable)"""
+    global _genai_client
+    if _genai_client is None:
+        with _genai_client_lock:
+            if _genai_client is None:
+                try:
+                    _genai_client = genai.Client(api_key=os.getenv('CHATBOT_GEMINI_KEY') or os.getenv('GEMINI_API_KEY'))
+                except Exception as e:
+                    logger.warning(f"Failed to init global Gemini Client: {e}")
+                    _genai_client = False
+    return _genai_client or None
+
+# Blog storage (auto_blogger.publisher) - imported once, shared across requests
+_blog_storage = None
+
+def get_blog_storage():
+    """Return the shared S3BlogStorage, importing the publisher module on first use"""
+    global _blog_storage
+    if _blog_storage is None:
+        from backend.auto_blogger.publisher import S3BlogStorage
+        s3_bucket = os.getenv("S3_BLOG_BUCKET", "althaf-blogs-storage")
+        _blog_storage = S3BlogStorage(bucket_name=s3_bucket)
+    return _blog_storage
 
 # Initialize Multi-Provider Chatbot Components
 try:
@@ -176,40 +230,70 @@ def determine_next_state(current_state: str, scores: dict, disengagement_count:
     return "AMBIGUOUS"
 
 # --- EMBEDDING FUNCTION FOR SERVER ---
-class GeminiEmbeddingFunction(EmbeddingFunction):
-    def __init__(self):
-        pass
-
-    def __call__(self, input: Documents) -> Embeddings:
-        try:
-            # New SDK Embedding logic
-            if not genai_client:
-                return [[0.0] * 768 for _ in input]
-                
-            embeddings = []
-            for text in input:
-                response = genai_client.models.embed_content(
-                    model='gemini-embedding-001',
-                    contents=text,
-                    config=types.EmbedContentConfig(
-                        task_type="RETRIEVAL_QUERY",
-                        output_dimensionality=768
+# GeminiEmbeddingFunction lives in backend.gemini_embeddings (imports chromadb + genai);
+# it is loaded on the first RAG query or by the background warm-up below.
+def get_query_embedding_function():
+    """Query embedder: Gemini, or a plain HTTP endpoint when EMBEDDING_ENDPOINT is set (benchmarks)"""
+    endpoint = os.getenv('EMBEDDING_ENDPOINT')
+    if endpoint:
+        from backend.gemini_embeddings import HttpEmbeddingFunction
+        return HttpEmbeddingFunction(endpoint)
+    from backend.gemini_embeddings import GeminiEmbeddingFunction
+    return GeminiEmbeddingFunction(get_genai_client())
+
+_chroma_client = None
+_chroma_client_lock = threading.Lock()
+
+def get_chroma_client():
+    """
+    Shared Chroma client, created once per process.
+    CHROMA_PERSIST_DIR selects a local PersistentClient (benchmarks, offline eval);
+    otherwise Chroma Cloud credentials are required. Returns None if neither is configured.
+    """
+    global _chroma_client
+    if _chroma_client is None:
+        with _chroma_client_lock:
+            if _chroma_client is None:
+                persist_dir = os.getenv('CHROMA_PERSIST_DIR')
+                if persist_dir:
+                    _chroma_client = chromadb.PersistentClient(path=persist_dir)
+                else:
+                    chroma_api_key = os.getenv('CHROMA_API_KEY')
+                    chroma_tenant = os.getenv('CHROMA_TENANT') or os.getenv('CHROMA_TENANT_ID')
+                    chroma_database = os.getenv('CHROMA_DATABASE') or os.getenv('CHROMA_DB_NAME')
+                    if not (chroma_api_key and chroma_tenant and chroma_database):
+                        return None
+                    _chroma_client = chromadb.CloudClient(
+                        api_key=chroma_api_key,
+                        tenant=chroma_tenant,
+                        database=chroma_database
                     )
-                )
-                embeddings.append(response.embeddings[0].values)
-            return embeddings
-        except Exception as e:
-            logger.error(f"Embedding failed: {e}")
-            return [[0.0] * 768 for _ in input]
-            
-# Scheduler Setup
-scheduler = AsyncIOScheduler()
+    return _chroma_client
 
+def warm_heavy_subsystems():
+    """Load deferred dependencies off the request path once the API is up"""
+    timings = warm_imports([chromadb, genai, boto3])
+    get_genai_client()
+    try:
+        import backend.gemini_embeddings  # noqa: F401
+    except Exception as e:
+        logger.warning(f"Embedding function warm-up failed: {e}")
+    logger.info(f"🔥 Background warm-up complete: {timings}")
 
 
 # --- LIFESPAN MANAGER ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    logger.info(f"⚡ API ready to serve {(time.perf_counter() - _IMPORT_START) * 1000:.0f}ms after import start")
+    
+    # Warm heavy subsystems in the background so the first chat request doesn't pay for them
+    if os.environ.get('WARM_START', 'true').lower() == 'true':
+        threading.Thread(target=warm_heavy_subsystems, daemon=True, name="WarmStart").start()
+    
+    # Project indexes (id lookups, catalog version probe); in the background so an
+    # unreachable MongoDB cannot hold up startup
+    index_task = asyncio.create_task(ensure_project_indexes(db.projects)) if db is not None else None
+    
     # Initialize & Start New Auto-Blogger Scheduler
     print("🚀 Starting Auto-Blogger Scheduler...")
     try:
@@ -240,6 +324,11 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Failed to start Auto-Blogger Scheduler: {e}")
     
     yield
+    if index_task is not None and not index_task.done():
+        # Still waiting on MongoDB: don't let it hold up (or outlive) shutdown
+        index_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await index_task
     print("🛑 Shutting down Server...")
 
 # --- APP INSTANCE ---
@@ -250,9 +339,10 @@ api_router = APIRouter(prefix="/api")
 if HAS_SECURITY_MIDDLEWARE and SecurityHeadersMiddleware:
     app.add_middleware(SecurityHeadersMiddleware)
 
-# Register Apology Sanitizer Middleware (Phase 9)
-from backend.middleware.response_sanitizer import ResponseSanitizerMiddleware
-app.add_middleware(ResponseSanitizerMiddleware)
+# Reply sanitizing (Phase 9) runs inside ChatbotProvider, so chat bodies pass through unbuffered
+
+# Compress JSON bodies above 1 KB for clients that accept gzip (blog/project listings, posts)
+app.add_middleware(GZipMiddleware, minimum_size=int(os.getenv("GZIP_MIN_SIZE", "1024")))
 
 # Explicitly define allowed origins
 default_origins = [
@@ -293,6 +383,24 @@ class Project(BaseModel):
     description: str
     details: str = ""
     image_url: str
+    image_variants: List[dict] = []  # [{"width", "format", "url"}], see image_uploads.py
+    image_width: Optional[int] = None
+    image_height: Optional[int] = None
+    technologies: List[str] = []
+    key_outcomes: Optional[str] = None
+    github_url: Optional[str] = None
+    live_url: Optional[str] = None
+    duration: Optional[str] = None
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+class ProjectSummary(BaseModel):
+    """GET /api/projects item: Project without the `details` body (see project_catalog.LIST_FIELDS)"""
+    id: str
+    name: str
+    title: str
+    summary: str
+    description: str
+    image_url: str
     technologies: List[str] = []
     key_outcomes: Optional[str] = None
     github_url: Optional[str] = None
@@ -439,23 +547,16 @@ async def get_portfolio_context(query: str, intent: str) -> str:
     all_context = []
     
     try:
-        chroma_api_key = os.getenv('CHROMA_API_KEY')
-        chroma_tenant = os.getenv('CHROMA_TENANT') or os.getenv('CHROMA_TENANT_ID')
-        chroma_database = os.getenv('CHROMA_DATABASE') or os.getenv('CHROMA_DB_NAME')
+        with time_stage("chroma_connect"):
+            chroma_client = get_chroma_client()
         
-        if not (chroma_api_key and chroma_tenant and chroma_database):
+        if chroma_client is None:
             logger.warning("ChromaDB credentials missing")
-            return ""
-            
-        chroma_client = chromadb.CloudClient(
-            api_key=chroma_api_key,
-            tenant=chroma_tenant,
-            database=chroma_database
-        )
+            return "", intent
 
         # --- EXECUTING RAG ROUTING ---
         # Use passed intent
-        logger.info(f"🧠 Routing Intent: {str(intent).upper()}")
+        logger.info(f"🧠 Routing Intent: {str(intent).upper()}", extra=SAMPLED)
         
         # Unified Collection Logic (Task 11)
         if USE_LEGACY_COLLECTIONS:
@@ -475,52 +576,7 @@ async def get_portfolio_context(query: str, intent: str) -> str:
         else:
             # Production Mode: Use unified portfolio_master with metadata filters
             collections_to_query = None  # Will use unified logic below
-            logger.info(f"[UNIFIED MODE] Using portfolio_master with metadata filtering")
-        
-        # --- RAG DATE ANCHORING UTILS ---
-        from datetime import date
-        
-        def normalize_blog_query(text: str) -> dict:
-            text = text.lower()
-            return {
-                "is_today": any(k in text for k in ["today", "todays", "posted today"]),
-                "is_recent": any(k in text for k in ["recent", "latest", "new"]),
-                "explicit_title": None # Placeholder for NLP title extraction
-            }
-
-            
-        def filter_blogs_by_date(docs, metas, ids, target_date=None, mode="exact"):
-            """
-            Filter blogs by date logic.
-            mode="exact": strict match (e.g., today)
-            mode="recent": sort by date DESC, take top 1
-            """
-            # Combine into objects for sorting
-            combined = []
-            for d, m, i in zip(docs, metas, ids):
-                pub_date = m.get('published_date', '1970-01-01')
-                combined.append({"doc": d, "meta": m, "id": i, "date": pub_date})
-            
-            if mode == "exact" and target_date:
-                # Filter strict
-                filtered = [c for c in combined if c['date'] == target_date]
-                return ([c['doc'] for c in filtered], 
-                        [c['meta'] for c in filtered], 
-                        [c['id'] for c in filtered])
-                        
-            if mode == "recent":
-                # Sort DESC string comparison works for ISO dates
-                combined.sort(key=lambda x: x['date'], reverse=True)
-                # Take top 1 (The latest blog)
-                # But keep list structure
-                if not combined:
-                    return [], [], []
-                top = combined[0]
-                return [top['doc']], [top['meta']], [top['id']]
-                
-            return docs, metas, ids
-
-        # --------------------------------
+            logger.info(f"[UNIFIED MODE] Using portfolio_master with metadata filtering", extra=SAMPLED)
         
         # Unified Collection Query Logic
         if USE_LEGACY_COLLECTIONS:
@@ -532,35 +588,17 @@ async def get_portfolio_context(query: str, intent: str) -> str:
         
         for collection_name in collection_iterator:
             try:
-                # Prepare metadata filter for unified collection
-                metadata_filter = None
-                
-                if not USE_LEGACY_COLLECTIONS:
-                    # Intelligent filtering based on intent (Task 11)
-                    if intent == "blogs":
-                        # Strict blog filter
-                        metadata_filter = {"category": "blog"}
-                    elif intent == "projects" or intent == "aws_projects":
-                        # Mixed query: project + profile data
-                        metadata_filter = {"$or": [{"category": "project"}, {"category": "profile"}]}
-                    elif intent == "profile":
-                        # Profile only
-                        metadata_filter = {"category": "profile"}
-                    # else: No filter (query all categories)
-                    
-                    logger.info(f"Metadata filter: {metadata_filter}")
-                
-                collection = chroma_client.get_collection(
-                    name=collection_name,
-                    embedding_function=GeminiEmbeddingFunction()
-                )
+                with time_stage("chroma_connect"):
+                    collection = chroma_client.get_collection(
+                        name=collection_name,
+                        embedding_function=get_query_embedding_function()
+                    )
                 
                 # Monitor ChromaDB operation success
                 if chromadb_monitor:
                     chromadb_monitor.track_success("get_collection", collection_name, duration_ms=0)
                 
                 # Split Limits Strategy (Visibility vs Safety)
-                # Unified collection uses GLOBAL_LIMIT = 6 (Task 11)
                 if USE_LEGACY_COLLECTIONS:
                     CANDIDATE_LIMIT = 5  
                     INJECTION_LIMIT = 2
@@ -581,84 +619,35 @@ async def get_portfolio_context(query: str, intent: str) -> str:
                     elif intent == "profile":
                         CANDIDATE_LIMIT = 3
                         INJECTION_LIMIT = 2
+                    query_kwargs = {"query_texts": [search_query], "n_results": CANDIDATE_LIMIT}
                 else:
-                    # Unified Mode: Logic Update
-                    # Default limit
-                    CANDIDATE_LIMIT = 6
-                    INJECTION_LIMIT = 6  # Return all candidates in unified mode
-                    search_query = query
-                    
-                    # --- FIX START: Expand blog search for date sorting ---
-                    # If we are looking for BLOGS, we must fetch more candidates
-                    # to ensure the "chronologically new" items aren't pushed out 
-                    # by "semantically relevant" old items.
-                    if intent == "blogs":
-                        CANDIDATE_LIMIT = 30  # Fetch top 30 to catch recent dates
-                        INJECTION_LIMIT = 6   # Only show top 6 after sorting
-                        logger.info("📚 Blog Query: Expanded candidate limit to 30 for date sorting.")
-                    # --- FIX END ---
-                    
-                    if intent == "aws_projects":
-                        search_query = f"AWS Cloud Infrastructure {query}"
-
-                logger.info(f"Querying {collection_name} | Candidates: {CANDIDATE_LIMIT} | Injection: {INJECTION_LIMIT}")
+                    # Unified Mode: intent filter + limits from RETRIEVAL_CONFIG (RAG_* env vars).
+                    # Blog intents fetch a wide candidate set so date sorting can surface new posts.
+                    # Tune with `python -m backend.benchmarks.retrieval_eval` before changing.
+                    plan = plan_query(query, intent, RETRIEVAL_CONFIG)
+                    CANDIDATE_LIMIT, INJECTION_LIMIT = plan.n_results, plan.injection_limit
+                    query_kwargs = plan.query_kwargs
+                    logger.info(f"Metadata filter: {plan.where}", extra=SAMPLED)
+
+                logger.info(f"Querying {collection_name} | Candidates: {CANDIDATE_LIMIT} | Injection: {INJECTION_LIMIT}", extra=SAMPLED)
                 
                 # 1. Fetch Candidates (High Visibility)
-                # Apply metadata filter for unified collection
-                query_kwargs = {"query_texts": [search_query], "n_results": CANDIDATE_LIMIT}
-                if metadata_filter and not USE_LEGACY_COLLECTIONS:
-                    query_kwargs["where"] = metadata_filter
-                
-                # Monitor query operation
-                if chromadb_monitor:
-                    with chromadb_monitor.track_operation("query", collection_name):
+                # Monitor query operation (includes query embedding, also timed on its own)
+                with time_stage("chroma_query", collection=collection_name, n_results=CANDIDATE_LIMIT,
+                                where=json.dumps(query_kwargs.get("where"))) as query_span:
+                    if chromadb_monitor:
+                        with chromadb_monitor.track_operation("query", collection_name):
+                            results = collection.query(**query_kwargs)
+                    else:
                         results = collection.query(**query_kwargs)
-                else:
-                    results = collection.query(**query_kwargs)
-                
-                docs = results.get('documents', [[]])[0]
-                metas = results.get('metadatas', [[]])[0]
-                ids = results.get('ids', [[]])[0]
+                    query_span.set(hits=len(results.get('ids', [[]])[0]))
                 
-                # 2. Date Anchoring & Scope Logic (Blogs Only)
+                # 2. Passage grouping + Date Anchoring (Blogs Only) + 3. Injection Clamping (Safety)
                 # Works for both legacy (Blogs_data) and unified (portfolio_master with category='blog')
                 is_blog_query = (USE_LEGACY_COLLECTIONS and collection_name == "Blogs_data") or \
                                 (not USE_LEGACY_COLLECTIONS and intent == "blogs")
-                
-                if is_blog_query:
-                    filters = normalize_blog_query(query)
-                    today_iso = date.today().isoformat()
-                    
-                    if filters['is_today']:
-                        # Prioritize temporal match over semantic rank
-                        f_docs, f_metas, f_ids = filter_blogs_by_date(docs, metas, ids, today_iso)
-                        if f_docs:
-                            logger.info(f"📅 Date Anchor Hit: Found {len(f_docs)} blogs for {today_iso}")
-                            docs, metas, ids = f_docs, f_metas, f_ids
-                            # SCOPE LOCK: Force exactly 1 source for specific date queries
-                            INJECTION_LIMIT = 1 
-                        else:
-                            logger.info(f"📅 Date Anchor Miss: No blogs found for {today_iso}")
-                            
-                    elif filters['is_recent']:
-                        # NEW PHASE 9 LOGIC: "Recent" means TIME, not RELEVANCE
-                        # Re-sort by date DESC and take top 1
-                        logger.info("📅 Temporal Logic: Sorting by 'Recent' (Date DESC)")
-                        f_docs, f_metas, f_ids = filter_blogs_by_date(docs, metas, ids, mode="recent")
-                        if f_docs:
-                            docs, metas, ids = f_docs, f_metas, f_ids
-                            INJECTION_LIMIT = 1
-                            logger.info(f"✅ Found most recent blog: {metas[0].get('title')} ({metas[0].get('published_date')})")
-                        else:
-                            logger.info("⚠️ Recent filter failed, falling back to semantic.")
-                            
-                            # Fallback to semantic recent (already sorted by similarity)
-                            pass
-                            
-                # 3. Injection Clamping (Safety)
                 limit = INJECTION_LIMIT  # Safety clamp explicitly named 'limit' (Gate Requirement)
-                docs = docs[:limit]
-                metas = metas[:limit]
+                docs, metas, _ = select_hits(query, results, limit, is_blog_query, RETRIEVAL_CONFIG)
                 
                 if docs:
                     summarized_docs = []
@@ -666,7 +655,11 @@ async def get_portfolio_context(query: str, intent: str) -> str:
                         meta = metas[i] if i < len(metas) else {}
                         source_label = meta.get('title', collection_name)
                         
-                        if chatbot_provider:
+                        # Chunked passages are already small and on-topic: inject as-is (no LLM summarization)
+                        passage = format_passage(d, meta, collection_name)
+                        if passage:
+                            summarized_docs.append(passage)
+                        elif chatbot_provider:
                             summary = chatbot_provider.summarize_content(d)
                             summarized_docs.append(f"[Source: {source_label}] (Date: {meta.get('published_date', 'N/A')})\n{summary}")
                         else:
@@ -738,28 +731,60 @@ def welcome():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+def metrics(format: str = "prometheus"):
+    """Chat pipeline metrics in Prometheus text format (?format=json for p50/p95/p99 in ms and counts)"""
+    if format == "json":
+        return metrics_snapshot()
+    return Response(content=METRICS_REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 # --- SITEMAP ENDPOINT ---
-@app.get("/sitemap.xml")
-async def serve_sitemap():
-    """Serve sitemap from S3 with proper XML content-type to bypass Amplify SPA routing."""
-    import boto3
-    from fastapi.responses import Response
-    
+async def sitemap_response(request: Request, path: str) -> Response:
+    """In-memory sitemap document with ETag/Last-Modified.
+
+    Lists every indexed post (not just the active listing). Rebuilt only when
+    the blog index changes (publish, cleanup) or projects change; otherwise a
+    crawler hit is a dict lookup or a 304.
+    """
     try:
-        # Fetch sitemap from S3
-        s3 = boto3.client('s3')
-        response = s3.get_object(
-            Bucket='althaf-blogs-storage',
-            Key='sitemap.xml'
-        )
-        sitemap_content = response['Body'].read()
+        full_index = get_full_blog_index(get_blog_storage)
+        blog_index = await run_s3(full_index.get) if full_index.would_block() else full_index.get()
+        service = get_sitemap_service()
+        projects = await load_projects() if service.needs_projects() else None
+        if projects is None and service.is_current(blog_index):
+            document = service.get(path, blog_index)
+        else:
+            # Rebuilding renders up to SITEMAP_MAX_URLS entries: keep it off the event loop
+            document = await run_s3(service.get, path, blog_index, projects)
+    except Exception as e:
+        if path != "/sitemap.xml":
+            logger.error(f"Failed to build {path}: {e}")
+            raise HTTPException(status_code=500, detail="Sitemap unavailable")
+        logger.error(f"Failed to build sitemap, serving the S3 copy: {e}")
+        return await s3_sitemap_response()
+
+    if document is None:
+        raise HTTPException(status_code=404, detail="Sitemap not found")
+    response = cached_body(request, CACHE_POLICIES["sitemap"], document.body, document.etag,
+                           last_modified=document.last_modified, media_type="application/xml")
+    response.headers["X-Content-Type-Options"] = "nosniff"
+    return response
+
+async def s3_sitemap_response() -> Response:
+    """Last-resort copy uploaded by generate_sitemap.py"""
+    try:
+        s3 = get_blog_storage().s3
+        
+        def read_sitemap():
+            response = s3.get_object(Bucket='althaf-blogs-storage', Key='sitemap.xml')
+            return response['Body'].read()
         
-        # Return with XML content-type
+        sitemap_content = await run_s3(read_sitemap)
         return Response(
             content=sitemap_content,
             media_type="application/xml",
             headers={
-                "Cache-Control": "max-age=3600",
+                "Cache-Control": "max-age=300",
                 "X-Content-Type-Options": "nosniff"
             }
         )
@@ -767,135 +792,138 @@ async def serve_sitemap():
         logger.error(f"Failed to fetch sitemap from S3: {e}")
         raise HTTPException(status_code=500, detail="Sitemap unavailable")
 
+@app.get("/sitemap.xml")
+async def serve_sitemap(request: Request):
+    """Serve the sitemap (or, past SITEMAP_MAX_URLS, the sitemap index) as XML to bypass Amplify SPA routing."""
+    return await sitemap_response(request, "/sitemap.xml")
+
+@app.get("/sitemap-{part}.xml")
+async def serve_sitemap_part(part: int, request: Request):
+    """Child sitemap listed by the sitemap index"""
+    return await sitemap_response(request, f"/sitemap-{part}.xml")
+
+# --- PROJECT CATALOG ---
+async def fetch_mongo_projects() -> Optional[List[dict]]:
+    """Every stored project document; None when MongoDB is not configured"""
+    if db is None:
+        return None
+    return [p async for p in db.projects.find({}, projection=DOCUMENT_PROJECTION)]
+
+async def probe_mongo_projects():
+    """Cheap collection version (count + newest timestamp): writes by other workers change it"""
+    if db is None:
+        return None
+    newest = await db.projects.find_one({}, sort=[("timestamp", -1)], projection={"timestamp": 1})
+    return await db.projects.estimated_document_count(), (newest or {}).get("timestamp")
+
+def project_lookup(project_id: str) -> dict:
+    """One query for the public id or, for documents stored without one, the Mongo _id"""
+    if ObjectId.is_valid(project_id):
+        return {"$or": [{"id": project_id}, {"_id": ObjectId(project_id)}]}
+    return {"id": project_id}
+
+def get_projects_catalog():
+    return get_project_catalog(fetch_mongo_projects, probe_mongo_projects, lambda p: Project(**p))
+
+# --- BULK PROJECT IMPORT / EXPORT ---
+PROJECTS_ADMIN_TOKEN = os.getenv('PROJECTS_ADMIN_TOKEN')
+
+def check_projects_admin(request: Request):
+    """Bulk endpoints require PROJECTS_ADMIN_TOKEN in X-Admin-Token (fail closed: 503 while it is unset)"""
+    if not PROJECTS_ADMIN_TOKEN:
+        raise HTTPException(status_code=503, detail="Bulk project endpoints disabled: PROJECTS_ADMIN_TOKEN not configured")
+    if not hmac.compare_digest(request.headers.get('x-admin-token', '').encode(), PROJECTS_ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Admin token required")
+
+def reindex_imported_projects(projects: List[dict]):
+    """Background task: embed just the imported projects into portfolio_master (one batched call)"""
+    try:
+        chroma_client = get_chroma_client()
+        if chroma_client is None:
+            logger.warning("ChromaDB not configured; imported projects not reindexed")
+            return
+        from backend.gemini_embeddings import embed_documents
+        collection = chroma_client.get_or_create_collection(
+            VECTOR_COLLECTION, embedding_function=get_query_embedding_function())
+        reindex_projects(collection, projects, lambda texts: embed_documents(get_genai_client(), texts))
+    except Exception as e:
+        logger.error(f"Reindexing imported projects failed: {e}")
+
+@api_router.get("/projects/export")
+async def export_projects(request: Request):
+    """Every project with all fields as NDJSON (the format /projects/import accepts)"""
+    check_projects_admin(request)
+    projects = await get_projects_catalog().get_projects()
+    return Response(content=to_ndjson(projects), media_type="application/x-ndjson",
+                    headers={"Content-Disposition": 'attachment; filename="projects.ndjson"'})
+
+@api_router.post("/projects/import")
+async def import_projects(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    dry_run: bool = False,
+    reindex: bool = True,
+    rehost_images: bool = True,
+):
+    """
+    Bulk upsert projects from a JSON array or NDJSON body (see project_import.py).
+    All items are validated first (422 with per-item errors, nothing written);
+    then one Mongo bulk_write, one search index save and, in the background,
+    one batched re-embedding of just these projects.
+    """
+    check_projects_admin(request)
+    if db is None:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    if int(request.headers.get('content-length') or 0) > MAX_BATCH_BYTES:
+        raise HTTPException(status_code=413, detail=f"Batch larger than {MAX_BATCH_BYTES} bytes")
+    try:
+        items = parse_batch(await request.body())
+    except BatchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    projects, errors = validate_batch(items)
+    if errors:
+        return JSONResponse(status_code=422, content={"received": len(items), "errors": errors})
+    ids = [p["id"] for p in projects]
+    result = {"received": len(items), "ids": ids, "dry_run": dry_run}
+    if dry_run or not projects:
+        return result
+    
+    result["warnings"] = await rehost_images_by_url(get_cloudinary_uploader, projects) if rehost_images else []
+    write = await db.projects.bulk_write(bulk_operations(projects), ordered=False)
+    result.update(inserted=write.upserted_count, updated=write.modified_count)
+    invalidate_project_catalog()
+    invalidate_sitemap_projects()
+    
+    # Items may carry only some fields: index the stored documents
+    stored = [normalize_project(p) async for p in
+              db.projects.find({"id": {"$in": ids}}, projection=DOCUMENT_PROJECTION)]
+    index_projects(stored)
+    if reindex:
+        background_tasks.add_task(reindex_imported_projects, stored)
+    result["reindex"] = "scheduled" if reindex else "skipped"
+    return result
+
 # --- GET SINGLE PROJECT ---
 @api_router.get("/projects/{project_id}", response_model=Project)
-async def get_project_details(project_id: str):
-    """Fetch a single project by ID with safe defaults."""
-    # 1. Try MongoDB
-    if db is not None:
-        try:
-            # Try finding by 'id' string field
-            project = await db.projects.find_one({"id": project_id})
-            
-            # If not found, try 'slug' or '_id' if valid objectid
-            if not project:
-                try:
-                    if ObjectId.is_valid(project_id):
-                        project = await db.projects.find_one({"_id": ObjectId(project_id)})
-                except:
-                    pass
-
-            if project:
-                # SAFE RETURN: Manually build dict to ensure no missing fields cause 500
-                return {
-                    "id": str(project.get("id", project_id)),
-                    "name": project.get("name", project.get("title", "Untitled")),
-                    "title": project.get("title", project.get("name", "Untitled")),
-                    "summary": project.get("summary", project.get("description", "")),
-                    "description": project.get("description", ""),
-                    "details": project.get("details", project.get("content", "")),
-                    "image_url": project.get("image_url", ""),
-                    "technologies": project.get("technologies", []),
-                    "key_outcomes": project.get("key_outcomes", ""),
-                    "github_url": project.get("github_url", ""),
-                    "live_url": project.get("live_url", ""),
-                    "duration": project.get("duration", project.get("project_duration", project.get("projectDuration", ""))),
-                    "timestamp": project.get("timestamp", datetime.utcnow())
-                }
-        except Exception as e:
-            logger.error(f"MongoDB error: {e}")
+async def get_project_details(project_id: str, request: Request):
+    """Fetch a single project by id (or Mongo _id) from the in-memory catalog (ETag/304 aware)."""
+    item = (await get_projects_catalog().get()).get(project_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
+    return cached_body(request, CACHE_POLICIES["projects"], item.body, item.etag)
 
-    # 2. Fallback to Local JSON
-    for filename in ['portfolio_data_complete.json', 'portfolio_data.json']:
-        try:
-            json_path = ROOT_DIR / filename
-            if not json_path.exists():
-                json_path = Path(f'backend/{filename}')
-            
-            if json_path.exists():
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for p in data.get('projects', []):
-                        if str(p.get("id")) == project_id:
-                            return {
-                                "id": str(p.get("id")),
-                                "name": p.get("name", p.get("title", "Untitled")),
-                                "title": p.get("title", p.get("name", "Untitled")),
-                                "summary": p.get("summary", p.get("description", "")),
-                                "description": p.get("description", ""),
-                                "details": p.get("details", p.get("content", "")),
-                                "image_url": p.get("image_url", ""),
-                                "technologies": p.get("technologies", []),
-                                "key_outcomes": p.get("key_outcomes", ""),
-                                "github_url": p.get("github_url", ""),
-                                "live_url": p.get("live_url", ""),
-                                "duration": p.get("duration", p.get("project_duration", p.get("projectDuration", ""))),
-                                "timestamp": p.get("timestamp", datetime.utcnow())
-                            }
-        except Exception:
-            continue
-
-    raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
-
-@api_router.get("/projects", response_model=List[Project])
-async def get_projects():
-    # 1. Try fetching from MongoDB first (Priority)
-    mongo_projects = []
-    if db is not None:
-        try:
-            cursor = db.projects.find({})
-            async for p in cursor:
-                # Normalize fields
-                mongo_projects.append({
-                    "id": str(p.get("id", uuid.uuid4())),
-                    "name": p.get("name", p.get("title", "Untitled")),
-                    "title": p.get("title", p.get("name", "Untitled")),
-                    "summary": p.get("summary", p.get("description", "")),
-                    "description": p.get("description", ""),
-                    "details": p.get("details", ""),
-                    "image_url": p.get("image_url", ""),
-                    "technologies": p.get("technologies", []),
-                    "key_outcomes": p.get("key_outcomes", ""),
-                    "github_url": p.get("github_url", ""),
-                    "live_url": p.get("live_url", ""),
-                    "duration": p.get("duration", p.get("project_duration", p.get("projectDuration", ""))),
-                    "timestamp": p.get("timestamp", datetime.utcnow())
-                })
-            if mongo_projects:
-                return mongo_projects
-        except Exception as e:
-            logger.error(f"Error fetching from MongoDB: {e}")
+@api_router.get("/projects", response_model=List[ProjectSummary])
+async def get_projects(request: Request):
+    """All projects (MongoDB first, bundled JSON fallback) without their `details` body:
+    pre-serialized, with ETag/304 support. Full fields come from /projects/{id}."""
+    snapshot = await get_projects_catalog().get()
+    return cached_body(request, CACHE_POLICIES["projects"], snapshot.body, snapshot.etag)
 
-    # 2. Fallback to Local JSON (Only if Mongo is empty or fails)
+async def load_projects() -> List[dict]:
+    """Normalized projects for the sitemap and search index (shared, do not mutate)"""
     try:
-        json_path = ROOT_DIR / 'portfolio_data_complete.json'
-        if not json_path.exists():
-            json_path = Path('backend/portfolio_data_complete.json')
-        if not json_path.exists():
-            return []
-
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        raw_projects = data.get('projects', [])
-        clean_projects = []
-
-        for p in raw_projects:
-            clean_projects.append({
-                "id": str(p.get("id", uuid.uuid4())),
-                "name": p.get("name", p.get("title", "Untitled")),
-                "title": p.get("title", p.get("name", "Untitled")),
-                "summary": p.get("summary", p.get("description", "")),
-                "description": p.get("description", ""),
-                "details": p.get("details", ""),
-                "image_url": p.get("image_url", ""),
-                "technologies": p.get("technologies", []),
-                "key_outcomes": p.get("key_outcomes", ""),
-                "github_url": p.get("github_url", ""),
-                "live_url": p.get("live_url", ""),
-                "timestamp": p.get("timestamp", datetime.utcnow())
-            })
-        return clean_projects
+        return await get_projects_catalog().get_projects()
     except Exception as e:
         logger.error(f"Error reading projects: {e}")
         return []
@@ -914,8 +942,9 @@ async def create_project(
     if db is None:
         raise HTTPException(status_code=503, detail="Database unavailable")
     try:
-        upload_result = cloudinary.uploader.upload(file.file, folder="portfolio_projects")
-        image_url = upload_result.get("secure_url")
+        image = await upload_project_image(get_cloudinary_uploader, file)
+    except ImageRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Image upload failed: {str(e)}")
 
@@ -927,124 +956,88 @@ async def create_project(
         "summary": bleach.clean(summary),
         "description": bleach.clean(summary),
         "details": sanitize_html(details),
-        "image_url": image_url,
+        **image,
         "technologies": [t.strip() for t in bleach.clean(technologies).split(',')],
         "key_outcomes": bleach.clean(key_outcomes),
         "duration": bleach.clean(final_duration) if final_duration else "",
         "timestamp": datetime.utcnow()
     }
     await db.projects.insert_one(project_data)
+    invalidate_project_catalog()
+    invalidate_sitemap_projects()
+    index_project(project_data)
     # Remove ObjectId to prevent FastAPI serialization error
     if "_id" in project_data:
         del project_data["_id"]
     return project_data
 
-# --- GET /api/blogs (Merged: Local + S3) ---
+# --- GET /api/blogs (Materialized active listing: Local + S3) ---
 @api_router.get("/blogs")
-async def get_blogs():
+async def get_blogs(
+    request: Request,
+    category: Optional[str] = None,
+    tag: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    fields: Optional[str] = None,
+):
     """
-    Serve ALL blogs: existing local blogs + new S3 auto-generated blogs
-    Returns merged list sorted by creation date (newest first)
+    Serve the active blogs: local + S3 auto-generated blogs, newest first,
+    60-day retention with a minimum of 30 (materialized at publish/cleanup
+    time in blogs/active.json, held in memory by the blog catalog).
+
+    Optional: category/tag filters, cursor pagination (pass next_cursor back
+    with the same limit) and a comma-separated `fields` projection
+    (default: id, title, category, excerpt, created_at, tags; `all` for every field).
     """
-    all_blogs = []
+    try:
+        projection = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     try:
-        # 1. Load existing local blogs (original 10 blogs)
-        try:
-            from backend.read_local_blogs import get_local_blogs
-            local_blogs = get_local_blogs()
-            if local_blogs:
-                logger.info(f"Loaded {len(local_blogs)} local blogs")
-                all_blogs.extend(local_blogs)
-        except Exception as e:
-            logger.warning(f"Could not load local blogs: {e}")
-        
-        # 2. Load new auto-generated blogs from S3
-        try:
-            import sys
-            from pathlib import Path
-            sys.path.insert(0, str(Path(__file__).parent))
-            from auto_blogger.publisher import S3BlogStorage
-            
-            s3_bucket = os.getenv("S3_BLOG_BUCKET", "althaf-blogs-storage")
-            storage = S3BlogStorage(bucket_name=s3_bucket)
-            index_data = storage.read_index()
-            s3_blogs = index_data.get('blogs', [])
-            
-            if s3_blogs:
-                logger.info(f"Loaded {len(s3_blogs)} S3 blogs")
-                all_blogs.extend(s3_blogs)
-        except Exception as e:
-            logger.warning(f"Could not load S3 blogs: {e}")
-        
-        # 3. Remove duplicates (in case a blog exists in both sources)
-        seen_ids = set()
-        unique_blogs = []
-        for blog in all_blogs:
-            blog_id = blog.get('id') or blog.get('_id')
-            if blog_id and blog_id not in seen_ids:
-                seen_ids.add(blog_id)
-                unique_blogs.append(blog)
-        
-        # 4. Sort by creation date (newest first)
-        unique_blogs.sort(key=lambda x: x.get('created_at', x.get('timestamp', '')), reverse=True)
-        
-        # Apply 60-day retention policy (guaranteeing a minimum of 30 latest blogs)
-        import datetime
-        cutoff_date = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=60)
-        
-        active_blogs = []
-        for blog in unique_blogs:
-            created_at_str = blog.get('created_at', blog.get('timestamp', ''))
-            is_new = True
-            if created_at_str:
-                try:
-                    date_part = created_at_str[:10]
-                    blog_date = datetime.datetime.strptime(date_part, "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc)
-                    if blog_date < cutoff_date:
-                        is_new = False
-                except Exception:
-                    pass
-            
-            if is_new:
-                active_blogs.append(blog)
-            else:
-                if len(active_blogs) < 30:
-                    active_blogs.append(blog)
-                else:
-                    break
-                    
-        if len(active_blogs) < 30 and len(unique_blogs) > len(active_blogs):
-            active_blogs = unique_blogs[:30]
-            
-        logger.info(f"Total blogs served: {len(active_blogs)} (retention active: older than 60 days pruned except minimum 30)")
-        return {"blogs": active_blogs}
-        
+        catalog = get_blog_catalog(get_blog_storage)
+        # Warm catalog: served inline from memory; cold/stale: wait on the S3 pool, not the event loop
+        listing, index = await run_s3(catalog.get_index) if catalog.would_block() else catalog.get_index()
     except Exception as e:
         logger.error(f"Error loading blogs: {e}")
         return {"blogs": []}
+    
+    # Validators come from the listing generation, so a 304 skips filtering/paging entirely
+    generated_at = listing.get("generated_at")
+    etag = make_etag(generated_at, len(index.blogs), category, tag, cursor, limit, projection)
+    
+    def build_page():
+        page = query_listing(index, category=category, tag=tag, cursor=cursor, limit=limit, fields=projection)
+        page["category_counts"] = listing.get("category_counts", {})
+        return page
+    
+    try:
+        return cached_json(request, CACHE_POLICIES["blog_list"], build_page,
+                           etag=etag if generated_at else None, last_modified=http_date(generated_at))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @api_router.get("/blogs/{blog_id}")
-async def get_blog_post(blog_id: str):
+async def get_blog_post(blog_id: str, request: Request):
     """
-    Serve individual blog post JSON from S3
+    Serve individual blog post JSON from S3 (ETag/304 aware)
     """
     try:
-        # Import S3BlogStorage dynamically
-        import sys
-        from pathlib import Path
-        sys.path.insert(0, str(Path(__file__).parent))
-        from auto_blogger.publisher import S3BlogStorage
+        # Parsed + pre-serialized posts from the LRU (S3 only on miss/revalidation,
+        # awaited on the S3 thread pool)
+        post_cache = get_blog_post_cache(get_blog_storage)
+        answered, post = post_cache.cached(blog_id)
+        if not answered:
+            post = await run_s3(post_cache.get, blog_id)
         
-        s3_bucket = os.getenv("S3_BLOG_BUCKET", "althaf-blogs-storage")
-        storage = S3BlogStorage(bucket_name=s3_bucket)
-        
-        blog = storage.read_blog(blog_id)
-        
-        if not blog:
+        if not post:
              raise HTTPException(status_code=404, detail="Blog not found")
-             
-        return blog
+        
+        # Fix-up scripts rewrite bodies in place without touching created_at,
+        # so the ETag hashes the body and only updated_at may act as Last-Modified
+        return cached_body(request, CACHE_POLICIES["blog_post"], post.body, post.etag,
+                           last_modified=http_date(post.blog.get('updated_at')), gzip_body=post.gzip_body)
         
     except HTTPException:
         raise
@@ -1052,6 +1045,52 @@ async def get_blog_post(blog_id: str):
         logger.error(f"Error loading blog {blog_id} from S3: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
+SEARCH_PAGE_SIZE = 10
+
+async def get_ready_search_index():
+    """Local search index, caught up with the active blog listing and the projects"""
+    index = get_search_index()
+    changed = False
+    if not index.projects_loaded:
+        index.replace_projects(await load_projects())
+        changed = True
+    try:
+        catalog = get_blog_catalog(get_blog_storage)
+        listing = None
+        if not catalog.would_block():
+            listing = catalog.get_listing()
+        elif not index.stats()["blogs"]:
+            # Nothing indexed yet: worth one wait on S3 (on the S3 pool)
+            listing = await run_s3(catalog.get_listing)
+        if listing is not None and listing is not index.listing_seen:
+            changed |= index.reconcile_blogs(listing.get("blogs", []))
+            index.listing_seen = listing
+    except Exception as e:
+        logger.warning(f"Search index not reconciled with the blog listing: {e}")
+    if changed:
+        index.save()
+    return index
+
+@api_router.get("/search")
+async def search_site(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[str] = Query(None, pattern="^(blog|project)$"),
+    limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=50),
+    prefix: bool = True,
+):
+    """
+    Keyword search over blogs and projects from the local inverted index
+    (BM25 ranked; the last term also matches as a prefix for typeahead).
+    """
+    started = time.perf_counter()
+    index = await get_ready_search_index()
+    result = index.search(q, doc_type=type, limit=limit, prefix=prefix)
+    result["query"] = q
+    if prefix:
+        result["suggestions"] = index.suggest(q)
+    result["took_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
 
 @api_router.put("/projects/{project_id}", response_model=Project)
 async def update_project(
@@ -1069,13 +1108,9 @@ async def update_project(
     if db is None:
         raise HTTPException(status_code=503, detail="Database unavailable")
 
-    # Find the project
-    project = await db.projects.find_one({"id": project_id})
-    if not project:
-         if ObjectId.is_valid(project_id):
-            project = await db.projects.find_one({"_id": ObjectId(project_id)})
-    
-    if not project:
+    lookup = project_lookup(project_id)
+    # Checked before uploading so an unknown id leaves no orphaned image
+    if file and not await db.projects.find_one(lookup, projection={"_id": 1}):
         raise HTTPException(status_code=404, detail="Project not found")
 
     update_data = {}
@@ -1091,35 +1126,28 @@ async def update_project(
 
     if file:
         try:
-            upload_result = cloudinary.uploader.upload(file.file, folder="portfolio_projects")
-            update_data["image_url"] = upload_result.get("secure_url")
+            update_data.update(await upload_project_image(get_cloudinary_uploader, file))
+        except ImageRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Image upload failed: {str(e)}")
 
+    # Update and read back in one round trip
     if update_data:
         update_data["timestamp"] = datetime.utcnow()
-        await db.projects.update_one({"_id": project["_id"]}, {"$set": update_data})
-        
-    # Return updated project
-    updated_project = await db.projects.find_one({"_id": project["_id"]})
-    if "_id" in updated_project: del updated_project["_id"]
+        updated_project = await db.projects.find_one_and_update(
+            lookup, {"$set": update_data}, projection=DOCUMENT_PROJECTION, return_document=True)
+    else:
+        updated_project = await db.projects.find_one(lookup, projection=DOCUMENT_PROJECTION)
+    if not updated_project:
+        raise HTTPException(status_code=404, detail="Project not found")
     
-    # Safe return manual construction
-    return {
-        "id": str(updated_project.get("id", project_id)),
-        "name": updated_project.get("name", ""),
-        "title": updated_project.get("title", ""),
-        "summary": updated_project.get("summary", ""),
-        "description": updated_project.get("description", ""),
-        "details": updated_project.get("details", ""),
-        "image_url": updated_project.get("image_url", ""),
-        "technologies": updated_project.get("technologies", []),
-        "key_outcomes": updated_project.get("key_outcomes", ""),
-        "github_url": updated_project.get("github_url", ""),
-        "live_url": updated_project.get("live_url", ""),
-        "duration": updated_project.get("duration", updated_project.get("project_duration", updated_project.get("projectDuration", ""))),
-        "timestamp": updated_project.get("timestamp", datetime.utcnow())
-    }
+    response = normalize_project(updated_project)
+    if update_data:
+        invalidate_project_catalog()
+        invalidate_sitemap_projects()
+        index_project(response)
+    return response
 
 # --- DELETE PROJECT ---
 @api_router.delete("/projects/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -1128,17 +1156,13 @@ async def delete_project(project_id: str):
     if db is None:
         raise HTTPException(status_code=503, detail="Database unavailable")
     
-    # Try deleting by custom 'id' string first
-    result = await db.projects.delete_one({"id": project_id})
-    
-    # If not found, try deleting by MongoDB '_id'
-    if result.deleted_count == 0:
-        if ObjectId.is_valid(project_id):
-            result = await db.projects.delete_one({"_id": ObjectId(project_id)})
-            
+    result = await db.projects.delete_one(project_lookup(project_id))
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
     
+    invalidate_project_catalog()
+    invalidate_sitemap_projects()
+    remove_project(project_id)
     return None
 
 @api_router.post("/contact")
@@ -1175,125 +1199,155 @@ async def ask_agent(query: dict):
             content={"reply": "I'm listening. How can I help you with Althaf's portfolio?"}
         )
     
-    try:
-        # Per-session rate limiting check
-        if not rate_limiter.check_limit(session_id):
-            wait_time = rate_limiter.get_wait_time(session_id)
-            logger.warning(f"Rate limit exceeded for session {session_id}. Wait time: {wait_time:.1f}s")
-            return JSONResponse(
-                status_code=429,
-                content={
-                    "reply": f"Please wait {int(wait_time)} seconds before sending another message.",
-                    "wait_time": wait_time
+    request_start = time.perf_counter()
+    outcome = "error"
+    telemetry_fields = {}  # filled in as the request progresses; stored in finally
+    CHAT_IN_FLIGHT.inc()
+    with start_trace("ask-all-u-bot", session_id=session_id) as trace_span, \
+            collect_request_stats() as request_stats:
+        try:
+            # Per-session rate limiting check
+            if not rate_limiter.check_limit(session_id):
+                wait_time = rate_limiter.get_wait_time(session_id)
+                logger.warning(f"Rate limit exceeded for session {session_id}. Wait time: {wait_time:.1f}s")
+                outcome = "rate_limited"
+                return JSONResponse(
+                    status_code=429,
+                    content={
+                        "reply": f"Please wait {int(wait_time)} seconds before sending another message.",
+                        "wait_time": wait_time
+                    }
+                )
+            
+            # Get conversation history
+            history = conversation_sessions.get(session_id, [])
+            
+            # Check cache first
+            with time_stage("cache_lookup"):
+                cached_response = response_cache.get(message, history)
+            record_cache_lookup("response", bool(cached_response))
+            if cached_response:
+                logger.info("Returning cached response")
+                outcome = "cache_hit"
+                return JSONResponse(
+                    status_code=200,
+                    content={"reply": cached_response, "source": "Cache"}
+                )
+            
+            # Record request for per-session rate limiting
+            rate_limiter.record_request(session_id)
+            
+            # Start timer for telemetry
+            start_time = datetime.now()
+            
+            # --- STATE MACHINE RECOVERY ---
+            if session_id not in session_metadata:
+                session_metadata[session_id] = {
+                    "state": "ACTIVE", 
+                    "greeting_count": 0,
+                    "history": []
                 }
-            )
-        
-        # Get conversation history
-        history = conversation_sessions.get(session_id, [])
-        
-        # Check cache first
-        cached_response = response_cache.get(message, history)
-        if cached_response:
-            logger.info("Returning cached response")
+            
+            # Track conversation history
+            history = session_metadata[session_id].get("history", [])
+            history.append({"role": "user", "content": message})
+            session_metadata[session_id]["history"] = history[-10:]  # Keep last 10 messages
+            logger.info(f"🧠 Processing message: {message[:50]}...")
+
+            # LLM HANDLES EVERYTHING NATURALLY - No predefined rules
+            response_text = ""
+            portfolio_context = ""
+            
+            # A. Intent Detection for Retrieval (only for RAG, not response control)
+            with time_stage("intent"):
+                intent, _, intent_scores = detect_intent_priority(message)
+            telemetry_fields["intent"] = intent
+            
+            # B. Smart RAG retrieval based on intent
+            if intent == "conversation":
+                # For casual talk, provide general profile context
+                rag_intent = "profile"
+            else:
+                rag_intent = intent
+                
+            with time_stage("retrieval"):
+                portfolio_context, _ = await get_portfolio_context(message, rag_intent)
+            
+            # C. Check if first interaction for personalized greeting
+            is_first_interaction = session_metadata[session_id].get("greeting_count", 0) == 0
+            
+            # D. Let LLM handle everything naturally
+            with time_stage("generate"):
+                response_text = chatbot_provider.generate_response(
+                    query=message,
+                    context=portfolio_context,
+                    history=history,
+                    sentiment="neutral",
+                    is_first_interaction=is_first_interaction
+                )
+            
+            # E. Track interaction count
+            if is_first_interaction:
+                session_metadata[session_id]["greeting_count"] = 1
+
+            duration = (datetime.now() - start_time).total_seconds()
+            
+            # 5. UPDATE STATE (simplified - just track conversation flow)
+            session_metadata[session_id]["state"] = "ACTIVE"
+            session_metadata[session_id]["disengagement_count"] = 0
+            
+            # 6. TELEMETRY LOGGING
+            est_input_tok = (len(message) + len(portfolio_context)) / 4
+            est_output_tok = len(response_text) / 4
+            
+            telemetry_log = {
+                "session_id": session_id,
+                "timestamp": datetime.utcnow().isoformat(),
+                "normalized_input": message.lower().strip()[:50],
+                "intent": intent,
+                "input_tokens": int(est_input_tok),
+                "output_tokens": int(est_output_tok),
+                "latency_ms": int(duration * 1000),
+                "trace_id": current_trace_id()
+            }
+            logger.info(json.dumps(telemetry_log))
+            telemetry_fields.update(input_tokens=int(est_input_tok), output_tokens=int(est_output_tok),
+                                    context_chars=len(portfolio_context))
+            
+            # Update conversation history
+            history.append({"role": "assistant", "content": response_text})
+            session_metadata[session_id]["history"] = history[-10:]
+            
+            outcome = "success"
+            trace_span.set(intent=intent, context_chars=len(portfolio_context), reply_chars=len(response_text))
             return JSONResponse(
                 status_code=200,
-                content={"reply": cached_response, "source": "Cache"}
+                content={"reply": response_text, "source": "AI Assistant"},
+                headers={"X-Trace-Id": current_trace_id() or ""}
             )
-        
-        # Record request for per-session rate limiting
-        rate_limiter.record_request(session_id)
-        
-        # Start timer for telemetry
-        start_time = datetime.now()
-        
-        # --- STATE MACHINE RECOVERY ---
-        if session_id not in session_metadata:
-            session_metadata[session_id] = {
-                "state": "ACTIVE", 
-                "greeting_count": 0,
-                "history": []
-            }
-        
-        # Track conversation history
-        history = session_metadata[session_id].get("history", [])
-        history.append({"role": "user", "content": message})
-        session_metadata[session_id]["history"] = history[-10:]  # Keep last 10 messages
-        logger.info(f"🧠 Processing message: {message[:50]}...")
-
-        # LLM HANDLES EVERYTHING NATURALLY - No predefined rules
-        response_text = ""
-        portfolio_context = ""
-        
-        # A. Intent Detection for Retrieval (only for RAG, not response control)
-        intent, _, intent_scores = detect_intent_priority(message)
-        
-        # B. Smart RAG retrieval based on intent
-        if intent == "conversation":
-            # For casual talk, provide general profile context
-            rag_intent = "profile"
-        else:
-            rag_intent = intent
             
-        portfolio_context, _ = await get_portfolio_context(message, rag_intent)
-        
-        # C. Check if first interaction for personalized greeting
-        is_first_interaction = session_metadata[session_id].get("greeting_count", 0) == 0
-        
-        # D. Let LLM handle everything naturally
-        response_text = chatbot_provider.generate_response(
-            query=message,
-            context=portfolio_context,
-            history=history,
-            sentiment="neutral",
-            is_first_interaction=is_first_interaction
-        )
-        
-        # E. Track interaction count
-        if is_first_interaction:
-            session_metadata[session_id]["greeting_count"] = 1
-
-        duration = (datetime.now() - start_time).total_seconds()
-        
-        # 5. UPDATE STATE (simplified - just track conversation flow)
-        session_metadata[session_id]["state"] = "ACTIVE"
-        session_metadata[session_id]["disengagement_count"] = 0
-        
-        # 6. TELEMETRY LOGGING
-        est_input_tok = (len(message) + len(portfolio_context)) / 4
-        est_output_tok = len(response_text) / 4
-        
-        telemetry_log = {
-            "session_id": session_id,
-            "timestamp": datetime.utcnow().isoformat(),
-            "normalized_input": message.lower().strip()[:50],
-            "intent": intent,
-            "input_tokens": int(est_input_tok),
-            "output_tokens": int(est_output_tok),
-            "latency_ms": int(duration * 1000)
-        }
-        logger.info(json.dumps(telemetry_log))
-        
-        # Update conversation history
-        history.append({"role": "assistant", "content": response_text})
-        session_metadata[session_id]["history"] = history[-10:]
-        
-        return JSONResponse(
-            status_code=200,
-            content={"reply": response_text, "source": "AI Assistant"}
-        )
-        
-    except Exception as e:
-        logger.error(f"Error in ask_agent: {str(e)}")
-        return JSONResponse(
-            status_code=500,
-            content={"reply": "I'm having technical difficulties. Please try again in a moment."}
-        )
+        except Exception as e:
+            logger.error(f"Error in ask_agent: {str(e)}")
+            trace_span.status = "error"
+            trace_span.set(error=str(e)[:200])
+            return JSONResponse(
+                status_code=500,
+                content={"reply": "I'm having technical difficulties. Please try again in a moment."}
+            )
+        finally:
+            elapsed = time.perf_counter() - request_start
+            CHAT_IN_FLIGHT.dec()
+            CHAT_REQUEST_SECONDS.observe(elapsed, outcome=outcome)
+            trace_span.set(outcome=outcome)
+            # Structured row for analytics/analyze_logs.py (queued; written off the request path)
+            record_chat_request(request_stats, session_id=session_id, trace_id=current_trace_id(),
+                                outcome=outcome, cache_hit=int(outcome == "cache_hit"),
+                                latency_ms=round(elapsed * 1000, 1), **telemetry_fields)
 
 # Include router
 app.include_router(api_router)
 
 # Health/Version Endpoint
-from datetime import timezone # Added for timezone.utc
 @app.get("/version")
 async def get_version():
     return {"version": "1.0.0", "status": "active", "timestamp": datetime.now(timezone.utc).isoformat()}
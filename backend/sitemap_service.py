@@ -0,0 +1,265 @@
+"""
+Sitemap Service
+Builds /sitemap.xml in memory from the full blog index (every indexed post,
+not the retention-filtered active listing: older posts are still served at
+/blogs/{id}) and the project list, and serves it with ETag/Last-Modified.
+
+- The index is held by FullBlogIndex: revalidated with a conditional GET of
+  the manifest at most every SITEMAP_INDEX_TTL seconds (or at once after
+  invalidate_sitemap_blogs()), and only re-read when the manifest changed.
+- Rebuilt only when its inputs change: a new index object (publish, cleanup,
+  rename) or a project write (invalidate_sitemap_projects()).
+  Projects are otherwise re-read at most every SITEMAP_PROJECTS_TTL seconds.
+- Rebuilds are incremental: each URL's <url> fragment is cached by
+  (loc, lastmod), so only new or changed entries are rendered again.
+- Past SITEMAP_MAX_URLS URLs (protocol limit 50,000), /sitemap.xml becomes a
+  <sitemapindex> of /sitemap-1.xml, /sitemap-2.xml, ... children. A child's
+  ETag only changes when its own URLs change.
+
+generate_sitemap.py renders the same documents for the offline/S3 copy.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+SITE_URL = os.getenv("SITE_URL", "https://althafportfolio.site")
+# Child sitemaps must live on the same host as the index that lists them
+SITEMAP_BASE_URL = os.getenv("SITEMAP_BASE_URL", SITE_URL)
+MAX_URLS = int(os.getenv("SITEMAP_MAX_URLS", "50000"))
+PROJECTS_TTL_SECONDS = float(os.getenv("SITEMAP_PROJECTS_TTL", "3600"))
+INDEX_TTL_SECONDS = float(os.getenv("SITEMAP_INDEX_TTL", "300"))
+
+logger = logging.getLogger("SitemapService")
+
+URLSET_OPEN = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+               '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+INDEX_OPEN = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+
+STATIC_PAGES = [
+    {'url': '/', 'priority': '1.0', 'changefreq': 'weekly'},
+    {'url': '/#about', 'priority': '0.8', 'changefreq': 'monthly'},
+    {'url': '/#projects', 'priority': '0.8', 'changefreq': 'weekly'},
+    {'url': '/#blogs', 'priority': '0.9', 'changefreq': 'daily'},
+    {'url': '/#contact', 'priority': '0.7', 'changefreq': 'monthly'},
+]
+
+# (loc, lastmod, changefreq, priority)
+UrlEntry = Tuple[str, Optional[str], str, str]
+
+
+def _date(value) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, str) and len(value) >= 10:
+        return value[:10]
+    return None
+
+
+def build_url_entries(blogs: Iterable[Dict], projects: Iterable[Dict]) -> List[UrlEntry]:
+    """Static pages, then blogs (newest first, as listed), then projects"""
+    entries: List[UrlEntry] = [(f"{SITE_URL}{p['url']}", None, p['changefreq'], p['priority'])
+                               for p in STATIC_PAGES]
+    for blog in blogs:
+        if blog.get('published', True) and blog.get('id'):
+            entries.append((f"{SITE_URL}/blogs/{blog['id']}", _date(blog.get('created_at')), 'weekly', '0.9'))
+    for project in projects:
+        project_id = str(project.get('id') or project.get('_id') or '')
+        if project_id:
+            entries.append((f"{SITE_URL}/projects/{project_id}", _date(project.get('timestamp')), 'monthly', '0.8'))
+    return entries
+
+
+def render_url(entry: UrlEntry) -> str:
+    loc, lastmod, changefreq, priority = entry
+    lastmod_xml = f"    <lastmod>{lastmod}</lastmod>\n" if lastmod else ""
+    return (f"  <url>\n    <loc>{escape(loc)}</loc>\n{lastmod_xml}"
+            f"    <changefreq>{changefreq}</changefreq>\n    <priority>{priority}</priority>\n  </url>\n")
+
+
+def render_urlset(fragments: Iterable[str]) -> str:
+    return URLSET_OPEN + "".join(fragments) + "</urlset>\n"
+
+
+def render_index(children: List[Tuple[str, Optional[str]]]) -> str:
+    parts = [INDEX_OPEN]
+    for loc, lastmod in children:
+        lastmod_xml = f"    <lastmod>{lastmod}</lastmod>\n" if lastmod else ""
+        parts.append(f"  <sitemap>\n    <loc>{escape(loc)}</loc>\n{lastmod_xml}  </sitemap>\n")
+    parts.append("</sitemapindex>\n")
+    return "".join(parts)
+
+
+def render_documents(entries: List[UrlEntry], max_urls: int = MAX_URLS,
+                     render: Callable[[UrlEntry], str] = render_url,
+                     base_url: str = SITEMAP_BASE_URL) -> Dict[str, str]:
+    """{path: xml}: one urlset at /sitemap.xml, or an index plus /sitemap-N.xml children"""
+    if len(entries) <= max_urls:
+        return {"/sitemap.xml": render_urlset(render(e) for e in entries)}
+    documents = {}
+    children = []
+    for n, start in enumerate(range(0, len(entries), max_urls), start=1):
+        chunk = entries[start:start + max_urls]
+        path = f"/sitemap-{n}.xml"
+        documents[path] = render_urlset(render(e) for e in chunk)
+        children.append((f"{base_url}{path}", max((e[1] for e in chunk if e[1]), default=None)))
+    documents["/sitemap.xml"] = render_index(children)
+    return documents
+
+
+class SitemapDocument:
+    __slots__ = ("body", "etag", "last_modified")
+
+    def __init__(self, xml: str, last_modified: str):
+        self.body = xml.encode("utf-8")
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()[:20]}"'
+        self.last_modified = last_modified
+
+
+class SitemapService:
+    def __init__(self, max_urls: int = MAX_URLS, projects_ttl_seconds: float = PROJECTS_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_urls = max_urls
+        self.projects_ttl_seconds = projects_ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._documents: Dict[str, SitemapDocument] = {}
+        self._fragments: Dict[UrlEntry, str] = {}
+        self._index_seen: Optional[Dict] = None
+        self._projects: Optional[List[Dict]] = None
+        self._projects_at: Optional[float] = None
+        self.builds = 0
+
+    def needs_projects(self) -> bool:
+        """True when the cached project list is missing, invalidated or past its TTL"""
+        with self._lock:
+            return self._projects_at is None or self._clock() - self._projects_at >= self.projects_ttl_seconds
+
+    def is_current(self, blog_index: Dict) -> bool:
+        """True when get() for this index is a plain dict lookup (no rebuild)"""
+        with self._lock:
+            return bool(self._documents) and blog_index is self._index_seen
+
+    def invalidate_projects(self):
+        with self._lock:
+            self._projects_at = None
+
+    def get(self, path: str, blog_index: Dict, projects: Optional[List[Dict]] = None) -> Optional[SitemapDocument]:
+        """Document for a sitemap path, rebuilding first if the blog index or projects changed"""
+        with self._lock:
+            if projects is not None:
+                self._projects, self._projects_at = projects, self._clock()
+                self._index_seen = None  # force a rebuild with the new projects
+            if blog_index is not self._index_seen or not self._documents:
+                self._rebuild(blog_index)
+            return self._documents.get(path)
+
+    def _rebuild(self, blog_index: Dict):
+        entries = build_url_entries(blog_index.get("blogs", []), self._projects or [])
+        fragments = {}
+        for entry in entries:
+            fragments[entry] = self._fragments.get(entry) or render_url(entry)
+        self._fragments = fragments  # drops entries that left the sitemap
+
+        previous = self._documents
+        last_modified = format_datetime(datetime.now(timezone.utc).replace(microsecond=0), usegmt=True)
+        documents = {}
+        for path, xml in render_documents(entries, self.max_urls, render=fragments.__getitem__).items():
+            old = previous.get(path)
+            # Unchanged documents keep their validators (and Last-Modified) across rebuilds
+            if old is not None and old.body == xml.encode("utf-8"):
+                documents[path] = old
+            else:
+                documents[path] = SitemapDocument(xml, last_modified)
+        self._documents = documents
+        self._index_seen = blog_index
+        self.builds += 1
+
+
+class FullBlogIndex:
+    """
+    Every indexed post ({"blogs": [...]}, all shards), revalidated by the
+    manifest ETag. get() returns the same object until the index changes,
+    which is what SitemapService keys its rebuilds on.
+    """
+
+    def __init__(self, storage_factory: Callable, ttl_seconds: float = INDEX_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self._storage_factory = storage_factory
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()  # single-flight for S3 reads
+        self._data: Optional[Dict] = None
+        self._etag: Optional[str] = None
+        self._checked_at: Optional[float] = None
+
+    def would_block(self) -> bool:
+        """True when the next get() goes to S3 (async callers offload it)"""
+        checked_at = self._checked_at
+        return checked_at is None or self._clock() - checked_at >= self.ttl_seconds
+
+    def invalidate(self):
+        self._checked_at = None
+
+    def get(self) -> Dict:
+        with self._lock:
+            if not self.would_block():
+                return self._data
+            started = self._clock()
+            try:
+                data, etag = self._storage_factory().read_index_if_changed(self._etag)
+            except Exception as e:
+                if self._data is None:
+                    raise
+                # Keep serving the last good copy; retry after another TTL
+                logger.warning(f"Blog index revalidation failed: {e}")
+                self._checked_at = started
+                return self._data
+            if data is not None:
+                self._data, self._etag = data, etag
+                logger.info(f"Sitemap blog index loaded: {len(data.get('blogs', []))} posts")
+            self._checked_at = started
+            return self._data
+
+
+_service: Optional[SitemapService] = None
+_blog_index: Optional[FullBlogIndex] = None
+_service_lock = threading.Lock()
+
+
+def get_sitemap_service() -> SitemapService:
+    """Shared process-wide service, created on first use"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = SitemapService()
+    return _service
+
+
+def get_full_blog_index(storage_factory: Callable) -> FullBlogIndex:
+    """Shared process-wide full index, created on first use"""
+    global _blog_index
+    if _blog_index is None:
+        with _service_lock:
+            if _blog_index is None:
+                _blog_index = FullBlogIndex(storage_factory)
+    return _blog_index
+
+
+def invalidate_sitemap_blogs():
+    """Called after index writes (publish); a no-op in processes that never served the sitemap"""
+    if _blog_index is not None:
+        _blog_index.invalidate()
+
+
+def invalidate_sitemap_projects():
+    """Called after project writes; a no-op in processes that never served the sitemap"""
+    if _service is not None:
+        _service.invalidate_projects()
@@ -0,0 +1,111 @@
+"""
+Startup Import Profiler
+Reports per-module import time for the API process using CPython's
+`-X importtime`, so cold-start regressions show up as a ranked table.
+
+Usage (from repo root):
+    python -m backend.startup_profile                  # profile backend.server
+    python -m backend.startup_profile --top 40
+    python -m backend.startup_profile --module backend.chatbot_provider --json
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    Parse `-X importtime` output into records.
+
+    Returns:
+        List of {"module", "self_ms", "cumulative_ms", "depth"} in import order
+    """
+    records = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        records.append({
+            "module": module,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            # importtime indents nested imports by two spaces per level
+            "depth": max(0, (len(indent) - 1) // 2),
+        })
+    return records
+
+
+def summarize(records: List[Dict], top: int = 25) -> Dict:
+    """Aggregate records into totals, slowest modules and per-package self time"""
+    by_package = defaultdict(float)
+    for rec in records:
+        by_package[rec["module"].split('.')[0]] += rec["self_ms"]
+
+    slowest = sorted(records, key=lambda r: r["cumulative_ms"], reverse=True)[:top]
+    packages = sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:top]
+
+    return {
+        "total_ms": round(sum(r["self_ms"] for r in records), 1),
+        "module_count": len(records),
+        "slowest_modules": slowest,
+        "packages": [{"package": name, "self_ms": round(ms, 1)} for name, ms in packages],
+    }
+
+
+def profile_imports(module: str = "backend.server") -> List[Dict]:
+    """Import `module` in a fresh interpreter with -X importtime and parse the result"""
+    env = dict(os.environ)
+    env.setdefault("WARM_START", "false")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        tail = result.stderr.strip().splitlines()[-5:]
+        raise RuntimeError(f"Importing {module} failed:\n" + "\n".join(tail))
+    return parse_importtime(result.stderr)
+
+
+def print_report(module: str, summary: Dict):
+    print(f"\n⏱️  Startup import profile: {module}")
+    print(f"   Total import time: {summary['total_ms']:.0f}ms across {summary['module_count']} modules\n")
+
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for rec in summary["slowest_modules"]:
+        indent = "  " * min(rec["depth"], 6)
+        print(f"{rec['cumulative_ms']:>10.1f}ms {rec['self_ms']:>8.1f}ms  {indent}{rec['module']}")
+
+    print(f"\n{'self (sum)':>12}  top-level package")
+    for pkg in summary["packages"]:
+        print(f"{pkg['self_ms']:>10.1f}ms  {pkg['package']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-module import time report for the API process")
+    parser.add_argument("--module", default="backend.server", help="Module to import (default: backend.server)")
+    parser.add_argument("--top", type=int, default=25, help="Rows to show per table")
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of a table")
+    args = parser.parse_args()
+
+    summary = summarize(profile_imports(args.module), top=args.top)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(args.module, summary)
+
+
+if __name__ == "__main__":
+    main()
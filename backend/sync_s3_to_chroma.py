@@ -1,6 +1,5 @@
 import boto3
 import chromadb
-import json
 import os
 import logging
 from google import genai
@@ -8,6 +7,11 @@ from google.genai import types
 import time
 from datetime import datetime
 
+try:
+    from backend.s3_access import read_json_body
+except ImportError:
+    from s3_access import read_json_body
+
 # Setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("ChromaSync")
@@ -51,7 +55,7 @@ def sync():
     # 1. Get S3 Index
     try:
         resp = s3.get_object(Bucket=bucket, Key='blogs/index.json')
-        index = json.loads(resp['Body'].read())
+        index = read_json_body(resp)
         s3_blogs = index.get('blogs', [])
         s3_ids = {b['id'] for b in s3_blogs}
         print(f"📦 Found {len(s3_blogs)} blogs in S3.")
@@ -106,7 +110,7 @@ def sync():
                 print(f"   Processing: {blog_id}")
                 # Fetch full content from S3
                 resp = s3.get_object(Bucket=bucket, Key=f'blogs/posts/{blog_id}.json')
-                blog_data = json.loads(resp['Body'].read())
+                blog_data = read_json_body(resp)
                 
                 content = blog_data.get('content')
                 if not content:
@@ -0,0 +1,132 @@
+"""
+Chat Trace Viewer
+Reads the JSONL trace log written by backend.monitoring.tracing and renders
+the slowest requests or a per-span waterfall for one trace.
+
+Usage (from repo root):
+    python -m backend.trace_viewer slowest               # 10 slowest traces
+    python -m backend.trace_viewer slowest --top 25 --since-minutes 60
+    python -m backend.trace_viewer show <trace_id>       # waterfall for one trace
+    python -m backend.trace_viewer show --slowest        # waterfall for the slowest trace
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    from backend.monitoring.tracing import TRACE_LOG_PATH
+except ImportError:
+    from monitoring.tracing import TRACE_LOG_PATH
+
+BAR_WIDTH = 40
+
+
+def trace_files(path: Path) -> List[Path]:
+    """Current file plus rotated backups (file.1, file.2, ...), oldest first"""
+    rotated = [p for p in path.parent.glob(path.name + ".*") if p.suffix[1:].isdigit()]
+    files = sorted(rotated, key=lambda p: int(p.suffix[1:]), reverse=True)
+    if path.exists():
+        files.append(path)
+    return files
+
+
+def load_traces(path: Path, since: Optional[float] = None) -> Iterator[Dict]:
+    for file in trace_files(path):
+        with open(file, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    trace = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # partially written line during rotation
+                if since is None or trace.get("started_at", 0) >= since:
+                    yield trace
+
+
+def slowest(traces: Iterator[Dict], top: int = 10) -> List[Dict]:
+    return sorted(traces, key=lambda t: t.get("duration_ms", 0), reverse=True)[:top]
+
+
+def _depths(spans: List[Dict], root_id: Optional[str]) -> Dict[str, int]:
+    parents = {s["span_id"]: s.get("parent_id") for s in spans}
+    depths = {}
+    for span_id in parents:
+        depth, parent = 1, parents[span_id]
+        while parent and parent != root_id and parent in parents and depth < 20:
+            depth += 1
+            parent = parents[parent]
+        depths[span_id] = depth
+    return depths
+
+
+def render_waterfall(trace: Dict) -> str:
+    total = max(trace.get("duration_ms", 0), 0.001)
+    started = datetime.fromtimestamp(trace.get("started_at", 0)).isoformat(timespec="seconds")
+    attrs = " ".join(f"{k}={v}" for k, v in trace.get("attrs", {}).items())
+    lines = [f"Trace {trace['trace_id']}  {trace['name']}  {total:.0f}ms  [{trace.get('status')}]  {started}  {attrs}"]
+
+    spans = trace.get("spans", [])
+    depths = _depths(spans, trace.get("root_span_id"))
+
+    for s in spans:
+        start = int(BAR_WIDTH * s["offset_ms"] / total)
+        width = max(1, int(BAR_WIDTH * s["duration_ms"] / total))
+        bar = " " * min(start, BAR_WIDTH - 1) + "█" * min(width, BAR_WIDTH - min(start, BAR_WIDTH - 1))
+        label = "  " * (depths.get(s["span_id"], 1) - 1) + s["name"]
+        details = ", ".join(f"{k}={v}" for k, v in s.get("attrs", {}).items())
+        flag = " ✗" if s.get("status") == "error" else ""
+        lines.append(f"  {label:<32} |{bar:<{BAR_WIDTH}}| {s['offset_ms']:>8.1f}ms +{s['duration_ms']:>8.1f}ms{flag}  {details}")
+        for ev in s.get("events", []):
+            extra = ", ".join(f"{k}={v}" for k, v in ev.items() if k not in ("name", "offset_ms"))
+            lines.append(f"  {'':<32}  ↳ {ev['offset_ms']:.1f}ms {ev['name']} {extra}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect chat request traces")
+    parser.add_argument("--file", default=str(TRACE_LOG_PATH), help="Trace JSONL path (rotated backups are read too)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_slow = sub.add_parser("slowest", help="List the slowest traces")
+    p_slow.add_argument("--top", type=int, default=10)
+    p_slow.add_argument("--since-minutes", type=float, default=None)
+
+    p_show = sub.add_parser("show", help="Render a waterfall for one trace")
+    p_show.add_argument("trace_id", nargs="?")
+    p_show.add_argument("--slowest", action="store_true", help="Show the slowest trace instead of an id")
+
+    args = parser.parse_args()
+    path = Path(args.file)
+    if not trace_files(path):
+        print(f"No trace log at {path}")
+        sys.exit(1)
+
+    if args.command == "slowest":
+        since = time.time() - args.since_minutes * 60 if args.since_minutes else None
+        print(f"{'duration':>10}  {'trace_id':<16}  {'started':<19}  {'status':<6}  attrs")
+        for t in slowest(load_traces(path, since), args.top):
+            started = datetime.fromtimestamp(t.get("started_at", 0)).isoformat(timespec="seconds")
+            attrs = " ".join(f"{k}={v}" for k, v in t.get("attrs", {}).items())
+            print(f"{t['duration_ms']:>8.0f}ms  {t['trace_id']:<16}  {started:<19}  {t.get('status', ''):<6}  {attrs}")
+        return
+
+    if args.slowest:
+        found = slowest(load_traces(path), 1)
+    else:
+        if not args.trace_id:
+            parser.error("show needs a trace_id or --slowest")
+        found = [t for t in load_traces(path) if t["trace_id"] == args.trace_id]
+    if not found:
+        print("Trace not found")
+        sys.exit(1)
+    print(render_waterfall(found[0]))
+
+
+if __name__ == "__main__":
+    main()
@@ -283,6 +283,9 @@ const BlogDetailPage = () => {
                     day: 'numeric'
                   })}
                 </span>
+                {blog.reading_time && (
+                  <span className="ml-4">{blog.reading_time} min read</span>
+                )}
               </div>
             </div>
 
@@ -328,6 +331,22 @@ const BlogDetailPage = () => {
               </div>
             )}
 
+            {/* Table of Contents pre-rendered at publish time (heading ids are in content_html) */}
+            {!(blog.sections && blog.sections.length > 0) && blog.content_html && blog.toc && blog.toc.length > 0 && (
+              <div className="bg-secondary/10 p-4 rounded-md mb-8">
+                <h2 className="text-xl font-semibold mb-3">Table of Contents</h2>
+                <ul className="list-none space-y-2">
+                  {blog.toc.map((item) => (
+                    <li key={item.id} className={item.level > 2 ? 'ml-6' : ''}>
+                      <a href={`#${item.id}`} className="text-primary hover:underline">
+                        {item.text}
+                      </a>
+                    </li>
+                  ))}
+                </ul>
+              </div>
+            )}
+
             {/* Main Content */}
             <div className="mt-6 prose dark:prose-invert max-w-none">
               {blog.content ? (
@@ -340,7 +359,7 @@ const BlogDetailPage = () => {
                   [&_h3]:text-xl [&_h3]:text-pink-600 dark:[&_h3]:text-pink-400 [&_h3]:mt-8 [&_h3]:mb-3
                   [&_strong]:text-gray-900 dark:[&_strong]:text-white
                 "
-                  dangerouslySetInnerHTML={{ __html: renderMarkdown(blog.content) }}
+                  dangerouslySetInnerHTML={{ __html: blog.content_html || renderMarkdown(blog.content) }}
                 />
               ) : (
                 <div className="text-red-500 font-semibold">Full blog content is not available for this entry.</div>
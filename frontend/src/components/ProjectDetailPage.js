@@ -7,6 +7,15 @@ import { ArrowLeft, Loader2, AlertTriangle, Zap, Code, CheckCircle, Newspaper, C
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'https://api.althafportfolio.site';
 
+// Card is max-w-4xl (896px) with p-8 padding: the image is never wider than ~832px
+const PROJECT_IMAGE_SIZES = '(min-width: 928px) 832px, calc(100vw - 6rem)';
+
+// srcset for one format from the responsive variants generated at upload time
+const variantSrcSet = (variants, format) => variants
+  .filter((variant) => variant.format === format)
+  .map((variant) => `${variant.url} ${variant.width}w`)
+  .join(', ');
+
 // Helper function to check if a line is a code example
 const isCodeLine = (line) => {
   const trimmedLine = line.trim();
@@ -443,7 +452,20 @@ const ProjectDetailsPage = () => {
         <h1 className="text-3xl font-bold text-foreground mb-4">{project.name}</h1>
         
         {project.image_url && (
-          <img src={project.image_url} alt={project.name} className="w-full h-auto rounded-lg mb-8 shadow-md"/>
+          <picture>
+            {['avif', 'webp'].map((format) => {
+              const srcSet = variantSrcSet(project.image_variants || [], format);
+              return srcSet ? <source key={format} type={`image/${format}`} srcSet={srcSet} sizes={PROJECT_IMAGE_SIZES} /> : null;
+            })}
+            <img
+              src={project.image_url}
+              alt={project.name}
+              width={project.image_width || undefined}
+              height={project.image_height || undefined}
+              decoding="async"
+              className="w-full h-auto rounded-lg mb-8 shadow-md"
+            />
+          </picture>
         )}
 
         {/* Render Project Duration if present */}
@@ -2,5 +2,22 @@
 import sys
 import os
 
+import pytest
+
 # Add backend to sys.path so tests can import modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '../backend'))
+
+
+class FakeClock:
+    """Monotonic clock stand-in for TTL tests: advance it with `clock.now += seconds`"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
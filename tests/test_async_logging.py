@@ -0,0 +1,79 @@
+import io
+import logging
+import threading
+
+import pytest
+
+from monitoring.async_logging import (
+    LOG_RECORDS_DROPPED, SAMPLED, DroppingQueueHandler, LogWriter, SamplingFilter,
+    configure_logging, parse_logger_levels, shutdown_logging,
+)
+
+
+@pytest.fixture
+def restore_root_logging():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    shutdown_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def test_records_go_through_queue_to_rotating_file(tmp_path, monkeypatch, restore_root_logging):
+    monkeypatch.setenv("LOG_MAX_BYTES", "300")
+    monkeypatch.setenv("LOG_BACKUP_COUNT", "2")
+    monkeypatch.setenv("LOG_SAMPLE_RATE", "0")
+    stream = io.StringIO()
+    listener = configure_logging(tmp_path / "chatbot.log", level="INFO", stream=stream)
+    assert listener is not None
+    assert isinstance(logging.getLogger().handlers[0], DroppingQueueHandler)
+
+    log = logging.getLogger("test.async")
+    for i in range(20):
+        log.info("request %d handled", i)
+    log.info("Context preview: secret-ish", extra=SAMPLED)
+    shutdown_logging()
+
+    output = stream.getvalue()
+    assert "request 19 handled" in output
+    assert "Context preview" not in output  # sampled out at rate 0
+    assert (tmp_path / "chatbot.log.1").exists()
+    assert not (tmp_path / "chatbot.log.3").exists()
+
+
+def test_sync_mode_and_logger_levels(tmp_path, monkeypatch, restore_root_logging):
+    monkeypatch.setenv("LOG_ASYNC", "false")
+    monkeypatch.setenv("LOG_LEVELS", "noisy.lib=WARNING")
+    stream = io.StringIO()
+    assert configure_logging(None, level="INFO", stream=stream) is None
+    logging.getLogger("noisy.lib").info("hidden")
+    logging.getLogger("noisy.lib").warning("shown")
+    assert "shown" in stream.getvalue() and "hidden" not in stream.getvalue()
+    logging.getLogger("noisy.lib").setLevel(logging.NOTSET)
+
+
+def test_full_queue_drops_instead_of_blocking():
+    busy, release = threading.Event(), threading.Event()
+    stuck = logging.Handler()
+    stuck.handle = lambda record: (busy.set(), release.wait(5))
+    writer = LogWriter([stuck], queue_size=1)
+    handler = DroppingQueueHandler(writer)
+    before = LOG_RECORDS_DROPPED.get()
+    handler.emit(logging.makeLogRecord({"msg": "x", "levelno": logging.INFO}))
+    assert busy.wait(5)  # the writer thread is stuck in a slow handler
+    for _ in range(3):
+        handler.emit(logging.makeLogRecord({"msg": "x", "levelno": logging.INFO}))
+    assert LOG_RECORDS_DROPPED.get() - before == 2 and writer.dropped == 2
+    release.set()
+    writer.close()
+
+
+def test_sampling_filter_and_level_spec():
+    record = logging.makeLogRecord({"msg": "x", "sampled": True})
+    assert SamplingFilter(1.0).filter(record) and not SamplingFilter(0.0).filter(record)
+    assert SamplingFilter(0.0).filter(logging.makeLogRecord({"msg": "plain"}))
+    assert parse_logger_levels("httpx=warning, bad, x=NOPE,a.b=DEBUG") == {"httpx": 30, "a.b": 10}
@@ -0,0 +1,79 @@
+import sqlite3
+import threading
+
+from monitoring.background_writer import BackgroundWriter
+
+
+def test_bursts_are_batched_and_flush_waits_for_the_sink():
+    batches = []
+    gate = threading.Event()
+
+    def sink(batch):
+        gate.wait(5)
+        batches.append(list(batch))
+
+    writer = BackgroundWriter(sink, name="test-writer", queue_size=100)
+    writer.submit(0)  # taken at once; the sink blocks on the gate
+    for i in range(1, 6):
+        writer.submit(i)
+    gate.set()
+    writer.flush()
+    assert [item for batch in batches for item in batch] == list(range(6))
+    assert len(batches) <= 3  # the burst behind the blocked write is drained as one batch
+    writer.close()
+
+
+def test_failing_sink_is_logged_and_the_writer_keeps_going():
+    seen = []
+
+    def sink(batch):
+        if "bad" in batch:
+            raise IOError("disk full")
+        seen.extend(batch)
+
+    writer = BackgroundWriter(sink, name="test-writer", queue_size=10)
+    writer.submit("bad")
+    writer.flush()
+    writer.submit("good")
+    writer.close()
+    assert seen == ["good"]
+    writer.submit("after close")  # restarts the thread
+    writer.flush()
+    assert seen == ["good", "after close"]
+    writer.close()
+
+
+def test_telemetry_and_trace_writers_survive_a_failed_batch(tmp_path, monkeypatch):
+    from monitoring import telemetry
+    from monitoring.telemetry import TelemetryWriter, build_record
+    from monitoring.tracing import TraceWriter
+
+    real_connect = telemetry.connect
+    attempts = []
+
+    def flaky_connect(path):
+        attempts.append(path)
+        if len(attempts) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return real_connect(path)
+
+    monkeypatch.setattr(telemetry, "connect", flaky_connect)
+    rows = TelemetryWriter(path=tmp_path / "telemetry.db")
+    rows.submit(build_record(None, session_id="lost"))
+    rows.flush()
+    rows.submit(build_record(None, session_id="kept"))
+    rows.flush()
+    stored = real_connect(tmp_path / "telemetry.db").execute("SELECT session_id FROM chat_requests")
+    assert [r[0] for r in stored] == ["kept"]
+    rows.close()
+
+    blocker = tmp_path / "traces"
+    blocker.write_text("not a directory")  # mkdir of the log directory fails
+    traces = TraceWriter(path=blocker / "traces.jsonl")
+    traces.submit({"trace_id": "lost"})
+    traces.flush()
+    blocker.unlink()
+    traces.submit({"trace_id": "kept"})
+    traces.flush()
+    assert (blocker / "traces.jsonl").read_text().count("kept") == 1
+    traces.close()
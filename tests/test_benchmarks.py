@@ -0,0 +1,49 @@
+import math
+
+import requests
+
+from benchmarks.chat_load import load_queries, percentile
+from benchmarks.local_index import build_default_snapshot, hashed_embedding
+from benchmarks.stubs import LatencyProfile, StubEmbeddingServer, StubLLMServer
+from gemini_embeddings import HttpEmbeddingFunction
+
+
+def test_hashed_embedding_is_deterministic_and_normalized():
+    vec = hashed_embedding("Terraform state locking on AWS")
+    assert len(vec) == 768
+    assert vec == hashed_embedding("Terraform state locking on AWS")
+    assert math.isclose(sum(v * v for v in vec), 1.0, rel_tol=1e-9)
+
+
+def test_stub_llm_serves_completions_and_injects_errors():
+    with StubLLMServer(LatencyProfile(0), error_rate=0.0) as llm:
+        resp = requests.post(f"{llm.url}/chat/completions",
+                             json={"model": "m", "messages": [{"role": "user", "content": "hi"}]})
+        assert resp.status_code == 200
+        assert resp.json()["choices"][0]["message"]["content"]
+
+    with StubLLMServer(LatencyProfile(0), error_rate=1.0, error_statuses=[503]) as llm:
+        resp = requests.post(f"{llm.url}/chat/completions", json={"messages": []})
+        assert resp.status_code == 503
+        assert llm.stats.errors == 1
+
+
+def test_local_snapshot_answers_queries_through_embedding_stub(tmp_path):
+    import chromadb
+
+    assert build_default_snapshot(str(tmp_path)) > 0
+    with StubEmbeddingServer(LatencyProfile(0)) as embedder:
+        ef = HttpEmbeddingFunction(embedder.endpoint)
+        collection = chromadb.PersistentClient(path=str(tmp_path)).get_collection(
+            "portfolio_master", embedding_function=ef)
+        results = collection.query(query_texts=["Scanning Container Images with Trivy"], n_results=3,
+                                   where={"category": "blog"})
+    assert results["ids"][0][0].startswith("synthetic-blog-4")
+
+
+def test_load_queries_and_percentile(tmp_path):
+    path = tmp_path / "q.jsonl"
+    path.write_text('{"message": "a"}\n{"query": "b"}\n"c"\nplain d\n\n', encoding="utf-8")
+    assert load_queries(str(path)) == ["a", "b", "c", "plain d"]
+    assert percentile([5, 1, 3], 0.5) == 3
+    assert percentile([], 0.95) is None
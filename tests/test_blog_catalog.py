@@ -0,0 +1,220 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+from botocore.exceptions import ClientError
+
+from blog_catalog import BlogCatalog
+from blog_listing import (
+    ListingIndex, build_active_listing, filter_active_blogs, materialize_active_listing,
+    merge_blogs, parse_fields, query_listing,
+)
+
+NOW = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+
+class FakeStorage:
+    """S3BlogStorage stand-in holding index.json and active.json in memory"""
+
+    def __init__(self, index_blogs=None, listing=None):
+        self.index_blogs = index_blogs or []
+        self.listing = listing
+        self.listing_version = 1
+        self.calls = []
+        self.gate = None
+
+    @property
+    def listing_etag(self):
+        return f'"v{self.listing_version}"'
+
+    def read_index_if_changed(self, etag=None):
+        return {"blogs": list(self.index_blogs)}, '"idx"'
+
+    def read_recent_index(self, since, min_count=0):
+        return list(self.index_blogs), len(self.index_blogs)
+
+    def read_active_listing_if_changed(self, etag=None):
+        self.calls.append(etag)
+        if self.gate:
+            self.gate.wait(5)
+        if self.listing is None:
+            return None, None
+        if etag == self.listing_etag:
+            return None, etag
+        return self.listing, self.listing_etag
+
+    def write_active_listing(self, listing):
+        self.listing = listing
+        self.listing_version += 1
+        return self.listing_etag
+
+
+def _blog(blog_id, created_at, category="DevOps"):
+    return {"id": blog_id, "title": blog_id, "category": category, "created_at": created_at}
+
+
+def _write_local(blog_dir, name, created_at):
+    with open(os.path.join(blog_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+        json.dump({**_blog(name, created_at), "content": "Local body. " * 40}, f)
+
+
+def _wait_idle(catalog):
+    deadline = time.time() + 5
+    while catalog.stats()["refreshing"] and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def _ids(blogs):
+    return [b["id"] for b in blogs]
+
+
+def test_retention_keeps_recent_blogs_and_a_minimum_of_30():
+    recent = [_blog(f"r{i}", f"2026-10-{i + 1:02d}") for i in range(10)]
+    old = [_blog(f"o{i}", f"2025-01-{i + 1:02d}") for i in range(28)]
+    active = filter_active_blogs(recent + old, now=NOW)
+    assert len(active) == 30 and _ids(active)[:2] == ["r9", "r8"]
+
+    many_recent = [_blog(f"n{i}", "2026-10-01") for i in range(35)]
+    assert len(filter_active_blogs(many_recent + old, now=NOW)) == 35
+
+
+def test_listing_is_lightweight_with_category_counts():
+    merged = merge_blogs([{**_blog("a", "2026-10-02", "Cloud"), "content": "# Title\n\n" + "Body text. " * 50}],
+                         [_blog("a", "2026-10-02"), _blog("b", "2026-10-01"), _blog("c", "2026-10-03")])
+    listing = build_active_listing(merged, now=NOW)
+    assert _ids(listing["blogs"]) == ["c", "a", "b"]
+    assert "content" not in listing["blogs"][1] and "Body text." in listing["blogs"][1]["excerpt"]
+    assert listing["category_counts"] == {"DevOps": 2, "Cloud": 1}
+    assert listing["total_blogs"] == 3
+
+
+def test_serves_listing_from_memory_and_materializes_when_missing(tmp_path, clock):
+    _write_local(str(tmp_path), "local-a", "2026-10-01T00:00:00")
+    storage = FakeStorage(index_blogs=[_blog("s3-b", "2026-10-18T00:00:00"), _blog("local-a", "2026-10-01")])
+    catalog = BlogCatalog(lambda: storage, blog_dir=str(tmp_path), ttl_seconds=60, clock=clock)
+
+    first = catalog.get_listing()
+    assert _ids(first["blogs"]) == ["s3-b", "local-a"]
+    assert storage.listing is first  # written back to S3 for the other readers
+    assert catalog.get_listing() is first
+    assert storage.calls == [None]  # nothing re-fetched within the TTL
+
+
+def test_stale_copy_is_served_while_one_conditional_refresh_runs(tmp_path, clock):
+    storage = FakeStorage(listing={"blogs": [_blog("a", "2026-10-01")]})
+    catalog = BlogCatalog(lambda: storage, blog_dir=str(tmp_path), ttl_seconds=60, clock=clock)
+    catalog.get_blogs()
+
+    clock.now += 120
+    storage.listing = {"blogs": [_blog("b", "2026-10-02"), _blog("a", "2026-10-01")]}
+    storage.listing_version = 2
+    storage.gate = threading.Event()
+    assert _ids(catalog.get_blogs()) == ["a"]  # stale, refresh in background
+    assert _ids(catalog.get_blogs()) == ["a"]  # no second refresh started
+    storage.gate.set()
+    _wait_idle(catalog)
+
+    assert storage.calls == [None, '"v1"']  # conditional GET with the cached ETag
+    assert _ids(catalog.get_blogs()) == ["b", "a"]
+
+    clock.now += 120
+    storage.gate = None
+    catalog.get_blogs()
+    _wait_idle(catalog)
+    assert storage.calls[-1] == '"v2"' and catalog.stats()["blogs"] == 2  # 304 keeps the listing
+
+
+def test_invalidate_and_local_changes_are_picked_up(tmp_path, clock):
+    storage = FakeStorage(listing={"blogs": []})
+    catalog = BlogCatalog(lambda: storage, blog_dir=str(tmp_path), ttl_seconds=60, clock=clock)
+    assert catalog.get_blogs() == []
+
+    assert not catalog.would_block()
+    _write_local(str(tmp_path), "new-local", "2026-10-19T00:00:00")
+    catalog.get_blogs()  # out-of-band local change rebuilds in the background
+    _wait_idle(catalog)
+    assert _ids(catalog.get_blogs()) == ["new-local"]
+
+    materialize_active_listing(storage, index_blogs=[_blog("published", "2026-10-20")],
+                               local_blogs=[], now=NOW)
+    catalog.invalidate()
+    assert catalog.would_block()
+    assert _ids(catalog.get_blogs()) == ["published"]  # synchronous after publish
+
+
+def test_failed_refresh_keeps_last_good_copy(tmp_path, clock):
+    storage = FakeStorage(listing={"blogs": [_blog("a", "2026-10-01")]})
+    catalog = BlogCatalog(lambda: storage, blog_dir=str(tmp_path), ttl_seconds=60,
+                          max_stale_seconds=90, clock=clock)
+    catalog.get_blogs()
+
+    def boom(etag=None):
+        raise ClientError({"Error": {"Code": "503"}}, "GetObject")
+
+    storage.read_active_listing_if_changed = boom
+    clock.now += 100  # past max-stale: refresh happens inline
+    assert _ids(catalog.get_blogs()) == ["a"]
+
+
+def test_local_only_catalog_applies_retention(tmp_path):
+    _write_local(str(tmp_path), "only", "2026-10-19T00:00:00")
+    listing = BlogCatalog(None, blog_dir=str(tmp_path)).get_listing()
+    assert _ids(listing["blogs"]) == ["only"] and listing["category_counts"] == {"DevOps": 1}
+
+
+def _paged_index():
+    blogs = [{**_blog(f"b{i}", f"2026-10-{19 - i:02d}", "Cloud_Computing" if i % 2 else "DevOps"),
+              "tags": ["aws"] if i % 3 == 0 else [], "author": "A"} for i in range(10)]
+    return ListingIndex({"blogs": blogs})
+
+
+def test_query_pages_by_cursor_with_filters_and_projection():
+    index = _paged_index()
+    first = query_listing(index, limit=4)
+    assert _ids(first["blogs"]) == ["b0", "b1", "b2", "b3"] and first["total"] == 10
+    assert set(first["blogs"][0]) == {"id", "title", "category", "created_at", "tags"}  # no author/content
+    second = query_listing(index, cursor=first["next_cursor"], limit=4)
+    assert _ids(second["blogs"]) == ["b4", "b5", "b6", "b7"]
+    last = query_listing(index, cursor=second["next_cursor"], limit=4)
+    assert _ids(last["blogs"]) == ["b8", "b9"] and last["next_cursor"] is None
+
+    cloud = query_listing(index, category="cloud computing", limit=2)
+    assert _ids(cloud["blogs"]) == ["b1", "b3"] and cloud["total"] == 5
+    assert _ids(query_listing(index, category="Cloud_Computing", tag="AWS")["blogs"]) == ["b3", "b9"]
+    assert _ids(query_listing(index, fields=("id", "author"), limit=1)["blogs"]) == ["b0"]
+
+    # The cursor's blog left the listing (retention) -> resume at the next older one
+    shrunk = ListingIndex({"blogs": [b for b in index.blogs if b["id"] != "b3"]})
+    assert _ids(query_listing(shrunk, cursor=first["next_cursor"], limit=2)["blogs"]) == ["b4", "b5"]
+
+
+def test_bad_fields_and_cursor_are_rejected():
+    assert parse_fields("title,excerpt") == ("id", "title", "excerpt")
+    assert "author" in parse_fields("all")
+    with pytest.raises(ValueError):
+        parse_fields("content")
+    with pytest.raises(ValueError):
+        query_listing(_paged_index(), cursor="not-a-cursor")
+
+
+def test_s3_conditional_read_maps_304():
+    from auto_blogger.publisher import S3BlogStorage
+
+    class FakeS3:
+        class exceptions:
+            NoSuchKey = KeyError
+
+        def get_object(self, **kwargs):
+            if kwargs["Key"] == "blogs/active.json":
+                raise KeyError(kwargs["Key"])
+            assert kwargs["IfNoneMatch"] == '"abc"'
+            raise ClientError({"Error": {"Code": "304", "Message": "Not Modified"}}, "GetObject")
+
+    storage = S3BlogStorage.__new__(S3BlogStorage)
+    storage.s3, storage.bucket = FakeS3(), "bucket"
+    storage.index_key, storage.listing_key = "blogs/index.json", "blogs/active.json"
+    assert storage.read_index_if_changed('"abc"') == (None, '"abc"')
+    assert storage.read_active_listing_if_changed() == (None, None)
@@ -0,0 +1,103 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from backend.auto_blogger import writer
+from backend.auto_blogger.writer import BlogWriter, RequestPacer, section_flow_context
+
+SECTIONS = ["Introduction", "Vector Search", "Chunking", "Evaluation", "Conclusion"]
+
+
+class FakeJobs:
+    def __init__(self, completed):
+        self.completed = completed
+        self.saved = []
+
+    def get_completed_sections(self, job_id):
+        return dict(self.completed)
+
+    def save_section(self, job_id, index, content):
+        self.saved.append(index)
+
+
+class FakeDrafter:
+    """run_agent_completion stand-in: records prompts and peak parallelism"""
+
+    def __init__(self, fail=()):
+        self.fail = fail
+        self.prompts = {}
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, client, agent_key, messages, max_tokens):
+        prompt = messages[0]["content"]
+        section = next(s for s in SECTIONS if f'Current Section: "{s}"' in prompt)
+        with self.lock:
+            self.prompts[section] = prompt
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        if section in self.fail:
+            raise RuntimeError("rate limited")
+        return f"{section} body starts here. It covers the topic in depth and ends properly."
+
+
+@pytest.fixture
+def drafter_env(monkeypatch):
+    def setup(concurrency, completed=None, fail=()):
+        jobs = FakeJobs(completed or {})
+        fake = FakeDrafter(fail)
+        monkeypatch.setattr(writer, "DRAFT_CONCURRENCY", concurrency)
+        monkeypatch.setattr(writer, "DRAFT_MIN_INTERVAL", 0)
+        monkeypatch.setattr(writer, "get_job_state_manager", lambda: jobs)
+        monkeypatch.setattr(writer, "run_agent_completion", fake)
+        monkeypatch.setattr(writer, "setup_section_logger", lambda job_id, i, s: logging.getLogger("test.section"))
+        agent = BlogWriter.__new__(BlogWriter)  # no OpenRouter key needed
+        agent.client = None
+        return agent, jobs, fake
+    return setup
+
+
+def test_parallel_drafting_keeps_outline_order_and_checkpoints(drafter_env):
+    agent, jobs, fake = drafter_env(3, completed={1: "\n\n## Vector Search\n\nResumed text. Uses HNSW."})
+    blog = agent._agent_drafter_loop("AI", SECTIONS, {}, "job-1")
+
+    assert fake.peak == 3 and "Vector Search" not in fake.prompts  # resumed section is not redrafted
+    assert sorted(jobs.saved) == [0, 2, 3, 4]
+    headings = [line for line in blog.splitlines() if line.startswith("## ")]
+    assert headings == [f"## {s}" for s in SECTIONS]
+    # Flow comes from the outline and neighbour summaries, not the previous section's tail
+    prompt = fake.prompts["Chunking"]
+    assert ">> 3. Chunking" in prompt and 'Previous section "Vector Search" covers: Resumed text. ... Uses HNSW.' in prompt
+
+
+def test_failed_sections_are_skipped_and_sequential_mode_sees_drafted_neighbours(drafter_env):
+    agent, jobs, fake = drafter_env(1, fail=("Evaluation",))
+    blog = agent._agent_drafter_loop("AI", SECTIONS, {}, "job-2")
+
+    assert fake.peak == 1 and jobs.saved == [0, 1, 2, 4]
+    assert "## Evaluation" not in blog and blog.index("## Chunking") < blog.index("## Conclusion")
+    assert 'Previous section "Introduction" covers: Introduction body starts here.' in fake.prompts["Vector Search"]
+    assert "(not drafted yet) Chunking" in fake.prompts["Vector Search"]
+
+
+def test_pacer_spaces_call_starts_across_threads():
+    now = [0.0]
+    sleeps = []
+    pacer = RequestPacer(3, clock=lambda: now[0], sleep=sleeps.append)
+    for _ in range(3):
+        pacer.wait()
+    assert sleeps == [3, 6]  # first call immediately, then one slot every 3s
+    now[0] = 100.0
+    pacer.wait()
+    assert sleeps == [3, 6]  # an idle budget is not banked
+
+
+def test_flow_context_marks_position():
+    context = section_flow_context(SECTIONS, 0, {})
+    assert context.splitlines()[1] == ">> 1. Introduction" and "Previous section" not in context
@@ -0,0 +1,190 @@
+import gzip
+import io
+import json
+import threading
+from datetime import datetime
+
+import pytest
+from botocore.exceptions import ClientError
+
+from blog_index import MANIFEST_KEY, IndexWriteConflict, ShardedBlogIndex, shard_key
+
+
+class FakeS3:
+    """In-memory S3 honouring If-Match / If-None-Match on put_object"""
+
+    class exceptions:
+        class NoSuchKey(Exception):
+            pass
+
+    def __init__(self):
+        self.objects = {}  # key -> (body, etag, content encoding)
+        self.version = 0
+        self.lock = threading.Lock()
+        self.gets = []
+        self.before_put = None  # hook simulating a concurrent writer
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None):
+        self.gets.append(Key)
+        if Key not in self.objects:
+            raise self.exceptions.NoSuchKey(Key)
+        body, etag, encoding = self.objects[Key]
+        if IfNoneMatch == etag:
+            raise ClientError({"Error": {"Code": "304"}}, "GetObject")
+        return {"Body": io.BytesIO(body), "ETag": etag, "ContentEncoding": encoding}
+
+    def put_object(self, Bucket, Key, Body, ContentType, ContentEncoding=None, IfMatch=None, IfNoneMatch=None):
+        if self.before_put:
+            hook, self.before_put = self.before_put, None
+            hook(Key)
+        with self.lock:
+            current = self.objects.get(Key)
+            if (IfMatch and (current is None or current[1] != IfMatch)) or (IfNoneMatch == "*" and current):
+                raise ClientError({"Error": {"Code": "PreconditionFailed"}}, "PutObject")
+            self.version += 1
+            self.objects[Key] = (Body, f'"{self.version}"', ContentEncoding)
+            return {"ETag": f'"{self.version}"'}
+
+    def raw(self, key):
+        body, _, encoding = self.objects[key]
+        return gzip.decompress(body) if encoding == "gzip" else body
+
+    def json(self, key):
+        return json.loads(self.raw(key))
+
+
+def _entry(blog_id, created_at):
+    return {"id": blog_id, "title": blog_id, "created_at": created_at}
+
+
+def _index(s3):
+    return ShardedBlogIndex(s3, "bucket", sleep=lambda _: None)
+
+
+def test_entries_land_in_month_shards_with_a_compact_manifest():
+    s3 = FakeS3()
+    index = _index(s3)
+    index.upsert(_entry("a", "2026-09-30T10:00:00"))
+    manifest = index.upsert(_entry("b", "2026-10-02T10:00:00"))
+    index.upsert(_entry("b", "2026-10-02T10:00:00"))  # republish: replaced, not duplicated
+
+    assert [s["month"] for s in manifest["shards"]] == ["2026-10", "2026-09"] and manifest["total"] == 2
+    assert s3.json(shard_key("2026-10"))["blogs"] == [_entry("b", "2026-10-02T10:00:00")]
+    assert s3.objects[MANIFEST_KEY][2] == "gzip" and b" " not in s3.raw(MANIFEST_KEY)  # compact JSON
+    assert [e["id"] for e in index.read_all(s3.json(MANIFEST_KEY))] == ["b", "a"]
+
+
+def test_concurrent_writer_is_not_clobbered():
+    s3 = FakeS3()
+    index = _index(s3)
+    index.upsert(_entry("a", "2026-10-01T00:00:00"))
+
+    # Another publisher writes the same shard between our read and our put
+    s3.before_put = lambda key: _index(s3).upsert(_entry("other", "2026-10-03T00:00:00"))
+    manifest = index.upsert(_entry("mine", "2026-10-02T00:00:00"))
+
+    assert [e["id"] for e in index.read_all(manifest)] == ["other", "mine", "a"]
+    assert s3.json(MANIFEST_KEY)["total"] == 3
+
+
+def test_gives_up_after_repeated_conflicts():
+    s3 = FakeS3()
+    index = _index(s3)
+    index.upsert(_entry("a", "2026-10-01T00:00:00"))
+
+    def always_conflict(key):
+        s3.before_put = always_conflict
+        with s3.lock:
+            body, _, encoding = s3.objects[key]
+            s3.version += 1
+            s3.objects[key] = (body, f'"{s3.version}"', encoding)
+
+    s3.before_put = always_conflict
+    with pytest.raises(IndexWriteConflict):
+        index.upsert(_entry("b", "2026-10-02T00:00:00"))
+
+
+def test_readers_fetch_only_the_shards_they_need():
+    s3 = FakeS3()
+    index = _index(s3)
+    manifest = index.rebuild([_entry(f"m{m}-{i}", f"2026-{m:02d}-{10 + i}T00:00:00")
+                              for m in range(1, 11) for i in range(5)] + [{"id": "nodate"}])
+    assert manifest["total"] == 51 and manifest["shards"][-1]["month"] == "undated"
+
+    s3.gets.clear()
+    recent = index.read_recent(manifest, since_month="2026-08", min_count=0)
+    assert {e["id"][:3] for e in recent} == {"m8-", "m9-", "m10", "nod"}
+    assert len(s3.gets) == 4
+
+    # Not enough recent entries for the minimum: older shards are added newest first
+    recent = index.read_recent(manifest, since_month="2026-10", min_count=12)
+    assert len(recent) == 16 and recent[0]["id"] == "m10-4"
+
+
+def test_storage_migrates_the_legacy_index_on_first_write():
+    from auto_blogger.publisher import S3BlogStorage
+
+    s3 = FakeS3()
+    legacy = {"blogs": [_entry("old", "2026-08-01T00:00:00")]}
+    s3.objects["blogs/index.json"] = (json.dumps(legacy).encode(), '"legacy"', None)
+    storage = S3BlogStorage.__new__(S3BlogStorage)
+    storage.s3, storage.bucket, storage.index_key = s3, "bucket", "blogs/index.json"
+
+    assert storage.read_index_if_changed()[0] == legacy  # not migrated yet: legacy file
+    storage.add_blog_to_index({"id": "new", "title": "New", "category": "DevOps", "excerpt": "x" * 120,
+                               "created_at": "2026-10-18T00:00:00", "content": "body"})
+    data, etag = storage.read_index_if_changed()
+    assert [b["id"] for b in data["blogs"]] == ["new", "old"] and data["total"] == 2
+    assert storage.read_index_if_changed(etag) == (None, etag)
+    assert [b["id"] for b in s3.json("blogs/index.json")["blogs"]] == ["new", "old"]  # mirror
+    assert s3.objects["blogs/index.json"][2] is None  # kept plain for the scripts
+
+    blogs, total = storage.read_recent_index(datetime(2026, 10, 1), min_count=0)
+    assert [b["id"] for b in blogs] == ["new"] and total == 2
+
+
+def test_remove_and_replace_decrement_counts_and_drop_empty_shards():
+    s3 = FakeS3()
+    index = _index(s3)
+    index.merge([_entry("a", "2026-09-30T10:00:00"), _entry("b", "2026-10-02T10:00:00"),
+                 _entry("c", "2026-10-01T10:00:00")])
+
+    manifest = index.remove(["b", "ghost"])
+    assert s3.json(shard_key("2026-10"))["blogs"] == [_entry("c", "2026-10-01T10:00:00")]
+    assert manifest["total"] == 2 and manifest["shards"][0]["newest"] == "2026-10-01T10:00:00"
+
+    # Renamed and re-dated: the old id leaves its shard, the emptied shard leaves the manifest
+    manifest = index.replace(_entry("a2", "2026-10-05T00:00:00"), old_id="a")
+    assert [s["month"] for s in manifest["shards"]] == ["2026-10"] and manifest["total"] == 2
+    assert [e["id"] for e in index.read_all(manifest)] == ["a2", "c"]
+
+
+def test_remove_does_not_undo_a_concurrent_publish():
+    s3 = FakeS3()
+    index = _index(s3)
+    index.merge([_entry("a", "2026-10-01T00:00:00"), _entry("ghost", "2026-10-02T00:00:00")])
+
+    s3.before_put = lambda key: _index(s3).upsert(_entry("new", "2026-10-03T00:00:00"))
+    manifest = index.remove(["ghost"])
+
+    assert [e["id"] for e in index.read_all(manifest)] == ["new", "a"] and manifest["total"] == 2
+
+
+def test_storage_maintenance_edits_refresh_the_mirror_and_listing(monkeypatch):
+    from auto_blogger import publisher
+
+    listings = []
+    monkeypatch.setattr(publisher, "materialize_active_listing", listings.append)
+    s3 = FakeS3()
+    storage = publisher.S3BlogStorage.__new__(publisher.S3BlogStorage)
+    storage.s3, storage.bucket, storage.index_key = s3, "bucket", "blogs/index.json"
+    storage.add_blog_to_index({"id": "DevOps_(Review_Pending)_1", "title": "Old", "category": "DevOps",
+                               "excerpt": "x" * 120, "created_at": "2026-10-01T00:00:00"})
+
+    storage.update_index_entry({"id": "DevOps_1", "title": "Fixed", "category": "DevOps",
+                                "content": "y" * 200, "created_at": "2026-10-01T00:00:00"},
+                               old_id="DevOps_(Review_Pending)_1")
+    assert [(b["id"], b["title"]) for b in s3.json("blogs/index.json")["blogs"]] == [("DevOps_1", "Fixed")]
+
+    storage.remove_from_index(["DevOps_1"])
+    assert s3.json("blogs/index.json")["blogs"] == [] and listings == [storage, storage]
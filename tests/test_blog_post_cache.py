@@ -0,0 +1,101 @@
+import gzip
+import json
+
+import pytest
+
+from blog_post_cache import BlogPostCache
+
+
+class FakeStorage:
+    def __init__(self, posts):
+        self.posts = posts  # id -> (blog, etag)
+        self.calls = []
+        self.fail = False
+
+    def read_blog_bytes_if_changed(self, blog_id, etag=None):
+        self.calls.append((blog_id, etag))
+        if self.fail:
+            raise ConnectionError("s3 down")
+        if blog_id not in self.posts:
+            return None, None, None
+        blog, current = self.posts[blog_id]
+        if etag == current:
+            return None, None, etag
+        if isinstance(blog, bytes):  # stored gzip-encoded
+            return gzip.decompress(blog), blog, current
+        return json.dumps(blog, indent=2).encode(), None, current
+
+
+def _post(blog_id, size=10):
+    return {"id": blog_id, "content": "x" * size}
+
+
+def test_hits_are_served_from_memory_preserialized(clock):
+    storage = FakeStorage({"a": (_post("a"), '"1"')})
+    cache = BlogPostCache(lambda: storage, clock=clock)
+    first = cache.get("a")
+    assert json.loads(first.body) == _post("a") and first.etag.startswith('"')
+    assert cache.get("a") is first
+    assert cache.cached("a") == (True, first)
+    assert cache.cached("b") == (False, None)  # needs S3
+    assert storage.calls == [("a", None)]
+    assert cache.stats()["hits"] == 2
+
+
+def test_unknown_ids_are_negatively_cached_until_published(clock):
+    storage = FakeStorage({})
+    cache = BlogPostCache(lambda: storage, negative_ttl_seconds=60, clock=clock)
+    assert cache.get("ghost") is None and cache.get("ghost") is None
+    assert len(storage.calls) == 1
+    assert cache.get("../etc/passwd") is None and len(storage.calls) == 1  # never reaches S3
+
+    storage.posts["ghost"] = (_post("ghost"), '"1"')
+    cache.invalidate("ghost")  # upload_post hook
+    assert cache.get("ghost").blog["id"] == "ghost"
+
+    clock.now += 61
+    assert cache.get("other") is None and cache.stats()["negative"] == 1
+
+
+def test_lru_respects_entry_and_byte_limits(clock):
+    storage = FakeStorage({k: (_post(k, 400), '"1"') for k in "abcd"})
+    cache = BlogPostCache(lambda: storage, max_entries=3, max_bytes=1000, clock=clock)
+    cache.get("a"), cache.get("b")
+    cache.get("a")  # a is now most recent
+    cache.get("c")  # 3 x ~430 bytes > 1000: evicts b (least recent)
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["bytes"] <= 1000
+    storage.calls.clear()
+    cache.get("a"), cache.get("c")
+    assert storage.calls == []
+    cache.get("b")
+    assert storage.calls == [("b", None)]
+
+
+def test_stale_entries_revalidate_with_the_s3_etag(clock):
+    storage = FakeStorage({"a": (_post("a"), '"1"')})
+    cache = BlogPostCache(lambda: storage, ttl_seconds=10, clock=clock)
+    first = cache.get("a")
+
+    clock.now += 11
+    assert cache.get("a") is first and storage.calls[-1] == ("a", '"1"')  # 304
+
+    storage.posts["a"] = (_post("a", 20), '"2"')  # out-of-process fix script
+    clock.now += 11
+    assert cache.get("a").blog["content"] == "x" * 20
+
+    storage.fail = True
+    clock.now += 11
+    assert cache.get("a").blog["content"] == "x" * 20  # S3 down: keep serving
+    with pytest.raises(ConnectionError):
+        cache.get("never-seen")
+
+
+def test_gzip_objects_keep_their_stored_bytes(clock):
+    raw = json.dumps(_post("a"), separators=(",", ":")).encode()
+    stored = gzip.compress(raw)
+    cache = BlogPostCache(lambda: FakeStorage({"a": (stored, '"1"'), "b": (_post("b"), '"1"')}), clock=clock)
+    post = cache.get("a")
+    assert post.body == raw and post.gzip_body is stored and post.blog == _post("a")
+    legacy = cache.get("b")  # pretty-printed, uncompressed: minified once
+    assert legacy.gzip_body is None and b" " not in legacy.body
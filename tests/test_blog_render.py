@@ -0,0 +1,47 @@
+from blog_render import RENDER_VERSION, needs_render, render_post
+
+POST = """# Scaling Jenkins
+
+Jenkins agents on **EKS** with *spot* nodes and `kubectl` access.
+See [the docs](https://www.jenkins.io/doc/) or [this](javascript:alert(1)).
+
+## Architecture
+- Controller <script>alert(1)</script>
+- Agents
+
+```bash
+helm install jenkins <chart>
+```
+
+---
+## Architecture
+### Cost
+Done.
+"""
+
+
+def test_renders_sanitized_html_with_heading_anchors():
+    html = render_post(POST)["content_html"]
+    assert '<h2 id="architecture"' in html and '<h2 id="architecture-2"' in html
+    assert '<span class="font-semibold' in html and "<em>spot</em>" in html
+    assert 'href="https://www.jenkins.io/doc/"' in html and "javascript:" not in html
+    assert "<script>" not in html and "&lt;script&gt;" in html
+    assert "helm install jenkins &lt;chart&gt;</code></pre>" in html
+    assert "---" not in html
+
+
+def test_derived_fields_come_from_the_same_pass():
+    fields = render_post(POST)
+    assert fields["toc"] == [{"id": "architecture", "text": "Architecture", "level": 2},
+                             {"id": "architecture-2", "text": "Architecture", "level": 2},
+                             {"id": "cost", "text": "Cost", "level": 3}]
+    assert fields["excerpt"].startswith("Scaling Jenkins Jenkins agents on EKS with spot nodes and kubectl access.")
+    assert "helm" not in fields["excerpt"]
+    assert fields["word_count"] > 20 and fields["reading_time"] == 1
+    assert render_post("word " * 1000)["reading_time"] == 5
+
+
+def test_backfill_selection():
+    assert needs_render({"content": "x"})
+    assert not needs_render({"content": "x", "render_version": RENDER_VERSION})
+    assert not needs_render({"title": "index entry without a body"})
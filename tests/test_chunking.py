@@ -0,0 +1,63 @@
+from chunking import chunk_markdown, chunk_resume, group_chunk_hits, make_chunk_id
+
+BLOG = """# Blog Title
+
+Intro paragraph about the topic. """ + "Filler sentence for the intro. " * 10 + """
+
+## Terraform State
+
+""" + "State locking keeps concurrent applies safe. " * 40 + """
+
+## Monitoring
+
+""" + "CloudWatch alarms page the on-call engineer. " * 10
+
+RESUME = """ALTHAF HUSSAIN SYED
+DevOps Engineer
+
+SUMMARY
+DevOps Engineer with experience in cloud infrastructure automation and CI/CD pipelines across AWS.
+""" + "Hands-on with Terraform and Kubernetes. " * 5 + """
+
+EDUCATION
+Master of Science in Computer Science Dec 2022 - June 2024
+""" + "Coursework in distributed systems. " * 6
+
+def test_markdown_chunks_respect_size_and_headings():
+    chunks = chunk_markdown(BLOG, "devops_1", max_chars=600, overlap_chars=80)
+    assert len(chunks) > 2
+    assert all(len(c["text"]) <= 600 for c in chunks)
+    assert chunks[0]["id"] == make_chunk_id("devops_1", 0)
+    sections = {c["metadata"]["section"] for c in chunks}
+    assert "Terraform State" in sections
+    assert all(c["metadata"]["parent_id"] == "devops_1" for c in chunks)
+    assert all(c["metadata"]["chunk_count"] == len(chunks) for c in chunks)
+
+def test_markdown_chunks_overlap():
+    chunks = chunk_markdown(BLOG, "devops_1", max_chars=600, overlap_chars=80)
+    terraform = [c["text"] for c in chunks if c["metadata"]["section"] == "Terraform State"]
+    assert len(terraform) >= 2
+    # The tail of one window is repeated at the head of the next
+    assert terraform[0][-40:].split()[-1] in terraform[1][:120]
+
+def test_resume_chunks_are_section_aware():
+    chunks = chunk_resume(RESUME, max_chars=500, base_metadata={"type": "resume"})
+    sections = [c["metadata"]["section"] for c in chunks]
+    assert any("Summary" in s for s in sections)
+    assert any("Education" in s for s in sections)
+    assert all(c["metadata"]["type"] == "resume" for c in chunks)
+
+def test_group_chunk_hits_regroups_by_parent():
+    docs = ["b-2", "a-0", "b-0", "legacy"]
+    metas = [
+        {"parent_id": "b", "chunk_index": 2},
+        {"parent_id": "a", "chunk_index": 0},
+        {"parent_id": "b", "chunk_index": 0},
+        {"title": "Old whole doc"},
+    ]
+    ids = [make_chunk_id("b", 2), make_chunk_id("a", 0), make_chunk_id("b", 0), "legacy_doc"]
+    grouped = group_chunk_hits(docs, metas, ids)
+    assert grouped["ids"] == ["b", "a", "legacy_doc"]
+    # Passages of one source are re-ordered into document order
+    assert grouped["docs"][0].startswith("b-0")
+    assert grouped["docs"][2] == "legacy"
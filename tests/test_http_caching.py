@@ -0,0 +1,72 @@
+import gzip
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.testclient import TestClient
+
+from middleware.http_caching import cached_body, cached_json, http_date, make_etag
+
+
+def _client(builds):
+    app = FastAPI()
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+    @app.get("/versioned")
+    def versioned(request: Request):
+        def build():
+            builds.append(1)
+            return {"items": ["x" * 50] * 40}
+        return cached_json(request, "public, max-age=60", build, etag=make_etag("gen-1"),
+                           last_modified=http_date("2026-10-19T08:00:00"))
+
+    @app.get("/stored")
+    def stored(request: Request):
+        body = b'{"title":"' + b"x" * 2000 + b'"}'
+        return cached_body(request, "public, max-age=60", body, '"abc"', gzip_body=gzip.compress(body, mtime=0))
+
+    @app.get("/hashed")
+    def hashed(request: Request):
+        return cached_json(request, "public, max-age=300", lambda: {"title": "post"})
+
+    return TestClient(app)
+
+
+def test_versioned_etag_short_circuits_the_body():
+    builds = []
+    client = _client(builds)
+    first = client.get("/versioned", headers={"Accept-Encoding": "gzip"})
+    assert first.status_code == 200 and first.headers["content-encoding"] == "gzip"
+    assert first.headers["cache-control"] == "public, max-age=60"
+    assert first.headers["last-modified"] == "Mon, 19 Oct 2026 08:00:00 GMT"
+    etag = first.headers["etag"]
+
+    again = client.get("/versioned", headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert again.status_code == 304 and again.content == b"" and again.headers["etag"] == etag
+    assert len(builds) == 1  # the 304 never built the body
+
+    by_date = client.get("/versioned", headers={"If-Modified-Since": "Tue, 20 Oct 2026 00:00:00 GMT"})
+    assert by_date.status_code == 304
+    assert client.get("/versioned", headers={"If-None-Match": '"stale"',
+                                             "If-Modified-Since": "Tue, 20 Oct 2026 00:00:00 GMT"}).status_code == 200
+
+
+def test_body_hash_etag_when_no_version_is_known():
+    client = _client([])
+    first = client.get("/hashed")
+    assert first.json() == {"title": "post"} and "content-encoding" not in first.headers  # below 1 KB
+    assert client.get("/hashed", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+    assert http_date(None) is None and http_date("not a date") is None
+
+
+def test_stored_gzip_is_passed_through():
+    client = _client([])
+    zipped = client.get("/stored", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["content-encoding"] == "gzip" and zipped.headers["etag"] == '"abc-gz"'
+    assert zipped.json()["title"] == "x" * 2000  # decoded once by the client, not double-encoded
+    assert zipped.headers["vary"] == "Accept-Encoding"
+    assert client.get("/stored", headers={"Accept-Encoding": "gzip",
+                                          "If-None-Match": '"abc-gz"'}).status_code == 304
+
+    plain = client.get("/stored", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.headers["etag"] == '"abc"'
+    assert client.get("/stored", headers={"Accept-Encoding": "gzip;q=0"}).headers["etag"] == '"abc"'
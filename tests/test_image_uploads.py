@@ -0,0 +1,55 @@
+import asyncio
+import io
+import threading
+
+import pytest
+
+import image_uploads
+from image_uploads import ImageRejected, check_image, image_fields, upload_project_image, variant_transformations
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class FakeUploader:
+    def __init__(self, width):
+        self.width = width
+        self.calls = []
+
+    def upload(self, stream, folder, eager, eager_async):
+        self.calls.append((threading.current_thread().name, stream.read(4), folder, eager_async))
+        return {"public_id": "p/1", "secure_url": "https://cdn/p/1.png", "width": self.width, "height": 600,
+                "eager": [{"secure_url": f"https://cdn/{t['fetch_format']}/w_{t['width']}/p/1"} for t in eager]}
+
+
+class Upload:
+    def __init__(self, data):
+        self.file = io.BytesIO(data)
+
+
+def test_rejects_oversized_empty_and_non_image_uploads():
+    assert check_image(io.BytesIO(PNG)) == "png"
+    assert check_image(io.BytesIO(b"RIFF\x00\x00\x00\x00WEBPVP8 ")) == "webp"
+    with pytest.raises(ImageRejected) as too_big:
+        check_image(io.BytesIO(PNG), max_bytes=10)
+    assert too_big.value.status_code == 413
+    with pytest.raises(ImageRejected) as svg:
+        check_image(io.BytesIO(b"<svg onload=alert(1)>"))
+    assert svg.value.status_code == 415
+    assert pytest.raises(ImageRejected, check_image, io.BytesIO(b"")).value.status_code == 400
+
+
+def test_variants_are_capped_at_the_original_width():
+    transformations = variant_transformations(widths=(480, 800, 1200), formats=("avif", "webp"))
+    fields = image_fields(FakeUploader(1000).upload(io.BytesIO(PNG), "f", transformations, False), transformations)
+    assert [(v["format"], v["width"]) for v in fields["image_variants"]] == [
+        ("avif", 480), ("avif", 800), ("avif", 1000), ("webp", 480), ("webp", 800), ("webp", 1000)]
+    assert fields["image_url"] == "https://cdn/p/1.png" and fields["image_width"] == 1000
+
+
+def test_upload_runs_off_the_event_loop():
+    uploader = FakeUploader(2000)
+    fields = asyncio.run(upload_project_image(lambda: uploader, Upload(PNG)))
+    thread, head, folder, eager_async = uploader.calls[0]
+    assert thread.startswith("image-upload") and head == PNG[:4]  # stream rewound after the checks
+    assert folder == image_uploads.UPLOAD_FOLDER and eager_async is False
+    assert len(fields["image_variants"]) == len(image_uploads.RESPONSIVE_WIDTHS) * len(image_uploads.VARIANT_FORMATS)
@@ -0,0 +1,41 @@
+import pytest
+from monitoring.metrics import MetricsRegistry, record_cache_lookup, track_llm_call, CACHE_HIT_RATIO, LLM_CALLS
+
+
+def test_histogram_quantiles_and_exposition():
+    registry = MetricsRegistry()
+    hist = registry.histogram("stage_seconds", "Stage latency", ["stage"], buckets=(0.1, 0.5, 1.0))
+    for value in [0.05] * 50 + [0.3] * 45 + [0.8] * 5:
+        hist.observe(value, stage="retrieval")
+
+    assert hist.quantile(0.5, stage="retrieval") == pytest.approx(0.1)
+    assert 0.1 < hist.quantile(0.95, stage="retrieval") <= 0.5
+    assert 0.5 < hist.quantile(0.99, stage="retrieval") <= 1.0
+    assert hist.quantile(0.5, stage="generate") is None
+
+    text = registry.render()
+    assert "# TYPE stage_seconds histogram" in text
+    assert 'stage_seconds_bucket{stage="retrieval",le="0.1"} 50' in text
+    assert 'stage_seconds_bucket{stage="retrieval",le="+Inf"} 100' in text
+    assert 'stage_seconds_count{stage="retrieval"} 100' in text
+
+
+def test_label_mismatch_is_rejected():
+    registry = MetricsRegistry()
+    counter = registry.counter("calls_total", "Calls", ["tier"])
+    with pytest.raises(ValueError):
+        counter.inc(model="x")
+
+
+def test_llm_call_outcomes_and_cache_ratio():
+    with track_llm_call("openrouter", "test/model") as call:
+        call["status"] = "empty"
+    with pytest.raises(RuntimeError):
+        with track_llm_call("openrouter", "test/model"):
+            raise RuntimeError("boom")
+    assert LLM_CALLS.get(provider="openrouter", model="test/model", outcome="empty") == 1
+    assert LLM_CALLS.get(provider="openrouter", model="test/model", outcome="error") == 1
+
+    for hit in (True, False, False, True):
+        record_cache_lookup("test_cache", hit)
+    assert CACHE_HIT_RATIO.get(cache="test_cache") == pytest.approx(0.5)
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+
+from project_catalog import ProjectCatalog
+
+
+class FakeProjects:
+    """Stands in for db.projects: fetch() and the version probe"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.fetches = 0
+        self.down = False
+
+    async def fetch(self):
+        if self.down:
+            raise ConnectionError("mongo down")
+        self.fetches += 1
+        await asyncio.sleep(0)
+        return list(self.docs)
+
+    async def probe(self):
+        if self.down:
+            raise ConnectionError("mongo down")
+        return len(self.docs), max((d.get("timestamp", "") for d in self.docs), default=None)
+
+
+def _catalog(mongo, tmp_path, clock):
+    return ProjectCatalog(mongo.fetch, mongo.probe, files=[tmp_path / "complete.json", tmp_path / "data.json"],
+                          ttl_seconds=60, clock=clock)
+
+
+def test_loaded_once_and_served_preserialized(tmp_path, clock):
+    mongo = FakeProjects([{"_id": "65f0", "id": "p1", "name": "RAG bot", "details": "<p>long</p>", "timestamp": "1"},
+                          {"_id": "65f1", "title": "Legacy"}])
+    catalog = _catalog(mongo, tmp_path, clock)
+
+    async def scenario():
+        first, second = await asyncio.gather(catalog.get(), catalog.get())  # single-flight
+        return first, second, await catalog.get()
+
+    first, second, third = asyncio.run(scenario())
+    assert first is second is third and mongo.fetches == 1
+    assert [p["id"] for p in json.loads(first.body)] == ["p1", "65f1"]
+    assert "details" not in json.loads(first.body)[0]  # list cards only
+    assert json.loads(first.get("p1").body)["details"] == "<p>long</p>"
+    assert first.get("65f0") is first.get("p1")  # reachable by Mongo _id too
+    assert json.loads(first.get("65f1").body)["title"] == "Legacy" and first.get("nope") is None
+
+
+def test_invalidation_and_version_probe(tmp_path, clock):
+    mongo = FakeProjects([{"id": "p1", "name": "A", "timestamp": "1"}])
+    catalog = _catalog(mongo, tmp_path, clock)
+    first = asyncio.run(catalog.get())
+
+    clock.now += 61  # TTL: probe only, unchanged collection is not re-read
+    assert asyncio.run(catalog.get()) is first and mongo.fetches == 1
+
+    mongo.docs.append({"id": "p2", "name": "B", "timestamp": "2"})  # another worker wrote
+    clock.now += 61
+    assert len(asyncio.run(catalog.get_projects())) == 2 and mongo.fetches == 2
+
+    mongo.docs[0] = {"id": "p1", "name": "A2", "timestamp": "1"}
+    catalog.invalidate()  # our own write endpoint: reload at once
+    assert asyncio.run(catalog.get()).get("p1").project["name"] == "A2"
+
+    mongo.down = True
+    clock.now += 61
+    assert asyncio.run(catalog.get()).get("p1").project["name"] == "A2"  # keeps serving
+
+
+def test_json_fallback_is_mtime_watched(tmp_path, clock):
+    complete = tmp_path / "complete.json"
+    complete.write_text(json.dumps({"projects": [{"id": "1", "name": "From file"}]}))
+    (tmp_path / "data.json").write_text(json.dumps({"projects": [{"id": "old", "name": "Older file"}]}))
+    catalog = _catalog(FakeProjects([]), tmp_path, clock)
+
+    snapshot = asyncio.run(catalog.get())
+    assert snapshot.source == "file" and [p["id"] for p in snapshot.projects] == ["1"]
+    assert snapshot.get("old").project["name"] == "Older file"
+    assert asyncio.run(catalog.get()) is snapshot
+
+    complete.write_text(json.dumps({"projects": [{"id": "1", "name": "Edited"}, {"id": "2", "name": "New"}]}))
+    os.utime(complete, ns=(1, 1))
+    assert [p["name"] for p in asyncio.run(catalog.get_projects())] == ["Edited", "New"]
@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import pytest
+
+from project_import import (BatchError, bulk_operations, parse_batch, project_document, rehost_images,
+                            reindex_projects, to_ndjson, validate_batch)
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents  # id -> document text
+        self.upserts = []
+
+    def get(self, ids, include):
+        found = [i for i in ids if i in self.documents]
+        return {"ids": found, "documents": [self.documents[i] for i in found]}
+
+    def upsert(self, ids, documents, metadatas, embeddings):
+        self.upserts.append((ids, metadatas, embeddings))
+        self.documents.update(zip(ids, documents))
+
+
+def test_parses_json_and_ndjson_batches():
+    items = [{"id": "a", "name": "A", "summary": "s"}, {"name": "B", "summary": "s"}]
+    assert parse_batch(json.dumps(items).encode()) == items
+    assert parse_batch(json.dumps({"projects": items}).encode()) == items
+    assert parse_batch(to_ndjson(items).encode()) == items
+    with pytest.raises(BatchError):
+        parse_batch(b"{not json")
+    with pytest.raises(BatchError):
+        parse_batch(b"  ")
+
+
+def test_validates_and_sanitizes_in_one_pass():
+    projects, errors = validate_batch([
+        {"id": "rag-bot", "name": "RAG <script>bot</script>", "summary": "Chat", "technologies": "Python, FastAPI,",
+         "details": "<p>ok</p><script>alert(1)</script>", "project_duration": "3 months"},
+        {"name": "No summary"},
+        {"id": "../etc", "name": "x", "summary": "y"},
+        {"id": "rag-bot", "name": "Again", "summary": "dup"},
+        {"name": "Bad link", "summary": "s", "live_url": "javascript:alert(1)"},
+        "not an object",
+    ])
+    assert [e["index"] for e in errors] == [1, 2, 3, 4, 5]
+    project = projects[0]
+    assert project["name"] == "RAG &lt;script&gt;bot&lt;/script&gt;" and project["technologies"] == ["Python", "FastAPI"]
+    assert "<script>" not in project["details"] and project["duration"] == "3 months"
+    # Partial items only set the fields they carry
+    partial, _ = validate_batch([{"id": "p1", "name": "P", "summary": "s"}])
+    assert set(partial[0]) == {"id", "name", "title", "summary", "description"}
+
+
+def test_one_upsert_per_project():
+    projects, _ = validate_batch([{"id": "a", "name": "A", "summary": "s"}, {"id": "b", "name": "B", "summary": "s"}])
+    operations = bulk_operations(projects)
+    assert [op._filter for op in operations] == [{"id": "a"}, {"id": "b"}]
+    assert all(op._upsert and "timestamp" in op._doc["$set"] for op in operations)
+
+
+def test_reindex_embeds_only_changed_projects_in_one_batch():
+    unchanged = {"id": "a", "name": "A", "summary": "s", "technologies": ["Go"], "details": "d"}
+    changed = {"id": "b", "name": "B", "summary": "new", "technologies": [], "details": "d"}
+    collection = FakeCollection({"a": project_document(unchanged), "b": "old text"})
+    calls = []
+
+    def embed(texts):
+        calls.append(texts)
+        return [[0.1] * 3 for _ in texts]
+
+    assert reindex_projects(collection, [unchanged, changed], embed) == {"upserted": 1, "unchanged": 1}
+    assert len(calls) == 1 and collection.upserts[0][0] == ["b"]
+    assert collection.upserts[0][1][0]["category"] == "project"
+
+
+def test_image_urls_are_rehosted_with_failures_as_warnings():
+    class Uploader:
+        def upload(self, source, folder, eager, eager_async):
+            if "broken" in source:
+                raise IOError("404 fetching image")
+            return {"secure_url": "https://res.cloudinary.com/x/1.png", "width": 500, "eager": []}
+
+    projects = [{"id": "a", "image_url": "https://example.com/a.png"},
+                {"id": "b", "image_url": "https://example.com/broken.png"},
+                {"id": "c", "image_url": "https://res.cloudinary.com/x/c.png"}]
+    warnings = asyncio.run(rehost_images(Uploader, projects))
+    assert projects[0]["image_url"] == "https://res.cloudinary.com/x/1.png" and projects[0]["image_width"] == 500
+    assert projects[1]["image_url"] == "https://example.com/broken.png"
+    assert [w["id"] for w in warnings] == ["b"]
+
+
+def test_bulk_endpoints_fail_closed_without_an_admin_token(monkeypatch):
+    from fastapi import HTTPException
+
+    import server
+
+    class FakeRequest:
+        def __init__(self, token=None):
+            self.headers = {"x-admin-token": token} if token else {}
+
+    def status(request):
+        try:
+            server.check_projects_admin(request)
+        except HTTPException as e:
+            return e.status_code
+        return 200
+
+    monkeypatch.setattr(server, "PROJECTS_ADMIN_TOKEN", None)
+    assert status(FakeRequest()) == 503 and status(FakeRequest("anything")) == 503
+    monkeypatch.setattr(server, "PROJECTS_ADMIN_TOKEN", "s3cret")
+    assert status(FakeRequest()) == 401 and status(FakeRequest("wrong")) == 401
+    assert status(FakeRequest("s3cret")) == 200
@@ -0,0 +1,24 @@
+from response_postprocess import postprocess_reply, strip_model_artifacts
+
+
+def test_layout_and_inline_wording_are_kept():
+    reply = "Here are my projects:\n\n- **A**: x\n- **B**: y\n\nI might add, it seems fine."
+    assert postprocess_reply(reply) == "Here are my projects:\n\n**A**: x\n**B**: y\n\nI might add, it seems fine."
+
+
+def test_artifacts_bot_name_and_blank_lines():
+    raw = "<s>[INST] Hi! I'm Allu Bot. Allu Althaf builds apps.\n\n\n\n  - Terraform\n- EKS</s>"
+    assert postprocess_reply(raw) == "Hi! I'm Assist Bot. Allu Althaf builds apps.\n\nTerraform\nEKS"
+
+
+def test_only_leading_apology_sentences_are_dropped():
+    assert postprocess_reply("I apologize for the confusion. It seems I missed it!\nAlthaf is a developer.") == \
+        "Althaf is a developer."
+    assert postprocess_reply("Althaf is a developer. Sorry, I can't share his phone number.") == \
+        "Althaf is a developer. Sorry, I can't share his phone number."
+    # Nothing but an apology: kept rather than sending an empty reply
+    assert postprocess_reply("Sorry, I don't know.") == "Sorry, I don't know."
+
+
+def test_summary_artifacts_keep_layout():
+    assert strip_model_artifacts("<s>- Problem: x\n- Tech: y</s>") == "- Problem: x\n- Tech: y"
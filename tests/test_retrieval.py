@@ -0,0 +1,82 @@
+from datetime import date
+
+import pytest
+
+from retrieval import RetrievalConfig, hybrid_rerank, plan_query, select_hits
+from benchmarks.retrieval_eval import evaluate_config, parse_config, score_ranking
+
+
+def _results(ids, metas, docs=None):
+    return {"ids": [ids], "metadatas": [metas], "documents": [docs or [f"doc {i}" for i in ids]]}
+
+
+def test_plan_matches_production_limits_and_filters():
+    config = RetrievalConfig()
+    plan = plan_query("latest blog", "blogs", config)
+    assert (plan.n_results, plan.injection_limit, plan.where) == (30, 6, {"category": "blog"})
+
+    plan = plan_query("terraform", "aws_projects", config)
+    assert plan.search_query == "AWS Cloud Infrastructure terraform"
+    assert plan.query_kwargs["n_results"] == 6 and "where" in plan.query_kwargs
+
+    plan = plan_query("skills", "profile", RetrievalConfig(use_filters=False))
+    assert plan.where is None and "where" not in plan.query_kwargs
+
+
+def test_select_hits_groups_passages_and_anchors_today():
+    ids = ["old::c000", "new::c000", "old::c001"]
+    metas = [
+        {"parent_id": "old", "chunk_index": 0, "published_date": "2026-01-01"},
+        {"parent_id": "new", "chunk_index": 0, "published_date": "2026-10-19"},
+        {"parent_id": "old", "chunk_index": 1, "published_date": "2026-01-01"},
+    ]
+    config = RetrievalConfig()
+
+    _, _, grouped = select_hits("blogs about terraform", _results(ids, metas), 6, True, config)
+    assert grouped == ["old", "new"]
+
+    _, _, today = select_hits("what did he post today", _results(ids, metas), 6, True, config,
+                              today=date(2026, 10, 19))
+    assert today == ["new"]
+
+    _, _, latest = select_hits("latest blog", _results(ids, metas), 6, True, config)
+    assert latest == ["new"]
+
+    _, _, clamped = select_hits("blogs", _results(ids, metas), 1, False, config)
+    assert clamped == ["old"]
+
+
+def test_hybrid_rerank_promotes_exact_term_matches():
+    docs = ["General cloud experience", "Trivy container image scanning in CI", "Security scanning tools"]
+    metas = [{"title": "Cloud"}, {"title": "Trivy"}, {}]
+    _, _, ids = hybrid_rerank("trivy scanning", docs, metas, ["a", "b", "c"], rrf_k=1)
+    assert ids == ["b", "a", "c"]
+
+
+def test_score_ranking_and_config_specs():
+    scores = score_ranking(["x", "cert_3", "y"], ["cert_3", "cert_4"], ks=(1, 3))
+    assert scores == {"recall@1": 0.0, "recall@3": 0.5, "mrr": 0.5, "hit": 1.0}
+
+    config = parse_config("try:cand=4,inj=2,hybrid=1,filters=0")
+    assert (config.name, config.candidate_limit, config.injection_limit, config.hybrid, config.use_filters) == \
+        ("try", 4, 2, True, False)
+    assert parse_config("lean").blog_candidate_limit == 12
+    with pytest.raises(SystemExit):
+        parse_config("bad:nope=1")
+
+
+def test_evaluate_config_on_local_snapshot(tmp_path):
+    import chromadb
+    from benchmarks.local_index import build_default_snapshot
+
+    today = date(2026, 10, 19)
+    build_default_snapshot(str(tmp_path), today=today)
+    collection = chromadb.PersistentClient(path=str(tmp_path)).get_collection("portfolio_master")
+    labeled = [
+        {"question": "What blog did he post today?", "intent": "blogs", "relevant": ["synthetic-blog-0"]},
+        {"question": "Scanning Container Images with Trivy", "intent": "blogs", "relevant": ["synthetic-blog-4"]},
+    ]
+    report = evaluate_config(collection, labeled, RetrievalConfig(), route=lambda q: "blogs", today=today)
+    assert report["summary"]["hit_rate"] == 1.0
+    assert report["queries"][0]["retrieved"] == ["synthetic-blog-0"]
+    assert report["summary"]["tokens_mean"] > 0
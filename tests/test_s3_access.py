@@ -0,0 +1,56 @@
+import asyncio
+import io
+import json
+import threading
+import time
+
+import s3_access
+
+
+class FakeS3:
+    def __init__(self, objects):
+        self.objects = objects
+        self.threads = set()
+
+    def get_object(self, Bucket, Key):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(0.01)  # simulated round-trip, so work spreads across the pool
+        if Key not in self.objects:
+            raise KeyError(Key)
+        return {"Body": io.BytesIO(json.dumps(self.objects[Key]).encode("utf-8"))}
+
+
+def test_get_json_many_fetches_in_parallel_and_collects_errors(monkeypatch):
+    fake = FakeS3({f"blogs/posts/{i}.json": {"id": i} for i in range(20)})
+    monkeypatch.setattr(s3_access, "_client", fake)
+    keys = [f"blogs/posts/{i}.json" for i in range(20)] + ["blogs/posts/missing.json"]
+
+    found, errors = s3_access.get_json_many("bucket", keys, max_workers=4)
+    assert len(found) == 20 and found["blogs/posts/7.json"] == {"id": 7}
+    assert list(errors) == ["blogs/posts/missing.json"]
+    assert len(fake.threads) > 1 and all(name.startswith("s3-batch") for name in fake.threads)
+
+
+def test_run_s3_offloads_blocking_calls():
+    def blocking():
+        return threading.current_thread().name
+
+    assert asyncio.run(s3_access.run_s3(blocking)).startswith("s3-io")
+    config = s3_access.s3_config()
+    assert config.max_pool_connections == s3_access.MAX_POOL_CONNECTIONS
+    assert config.retries["max_attempts"] >= 1
+
+
+def test_json_objects_round_trip_gzip_and_plain():
+    data = {"title": "Ünïcode", "tags": ["a", "b"]}
+    zipped = s3_access.json_object(data, compress=True)
+    assert zipped["ContentEncoding"] == "gzip" and zipped["Body"][:2] == s3_access.GZIP_MAGIC
+    assert s3_access.json_object(data, compress=True)["Body"] == zipped["Body"]  # deterministic bytes
+    raw, gz = s3_access.read_body({"Body": io.BytesIO(zipped["Body"]), "ContentEncoding": "gzip"})
+    assert gz == zipped["Body"] and json.loads(raw) == data and b" " not in raw
+
+    plain = s3_access.json_object(data, compress=False)
+    assert "ContentEncoding" not in plain
+    assert s3_access.read_json_body({"Body": io.BytesIO(plain["Body"])}) == data
+    # gzip bytes uploaded without the header are still recognised
+    assert s3_access.read_json_body({"Body": io.BytesIO(zipped["Body"])}) == data
@@ -0,0 +1,58 @@
+from search_index import SearchIndex, tokenize
+
+
+def _blog(blog_id, title, content="", tags=(), created_at="2026-10-01T00:00:00"):
+    return {"id": blog_id, "title": title, "category": "DevOps", "tags": list(tags),
+            "excerpt": f"About {title}", "content": content, "created_at": created_at}
+
+
+def _index(tmp_path):
+    index = SearchIndex(path=str(tmp_path / "search_index.json.gz"))
+    index.upsert_blog(_blog("k8s", "Kubernetes autoscaling in practice", "HPA and KEDA on EKS", tags=["kubernetes"]))
+    index.upsert_blog(_blog("tf", "Terraform state management", "Remote state on S3 with kubernetes notes",
+                            created_at="2026-10-05T00:00:00"))
+    index.replace_projects([{"id": "p1", "name": "Portfolio RAG chatbot", "summary": "FastAPI + ChromaDB",
+                             "technologies": ["Python", "C++"], "details": "<p><strong>Gemini</strong></p>"}])
+    return index
+
+
+def test_ranked_and_filtered_results(tmp_path):
+    index = _index(tmp_path)
+    hits = index.search("kubernetes")["results"]
+    assert [h["id"] for h in hits] == ["k8s", "tf"]  # title/tag match outranks a body mention
+    assert hits[0]["url"] == "/blogs/k8s" and "body" not in hits[0]
+    assert index.search("kubernetes eks")["total"] == 1  # every term must match
+    assert index.search("chromadb", doc_type="blog")["total"] == 0
+    project = index.search("c++")["results"][0]
+    assert project["type"] == "project" and project["url"] == "/projects/p1"
+    assert index.search("strong")["total"] == 0  # HTML markup is not indexed
+    assert index.search("the of")["results"] == []
+
+
+def test_prefix_matching_for_typeahead(tmp_path):
+    index = _index(tmp_path)
+    assert [h["id"] for h in index.search("terra")["results"]] == ["tf"]
+    assert index.search("terra", prefix=False)["total"] == 0
+    assert index.search("remote sta")["total"] == 1
+    assert index.suggest("kub") == ["kubernetes"]
+
+
+def test_incremental_updates_and_persistence(tmp_path):
+    index = _index(tmp_path)
+    index.upsert_blog(_blog("k8s", "Helm charts"))  # republished: old terms are gone
+    assert index.search("autoscaling")["total"] == 0 and index.search("helm")["total"] == 1
+
+    assert index.reconcile_blogs([_blog("tf", "ignored, already indexed"), {"id": "new", "title": "Ansible roles"}])
+    assert index.search("helm")["total"] == 0  # aged out of the active listing
+    assert index.search("terraform")["total"] == 1 and index.search("ansible")["total"] == 1
+    assert not index.reconcile_blogs([{"id": "tf"}, {"id": "new"}])
+
+    index.save()
+    loaded = SearchIndex(path=index.path)
+    assert loaded.load() and loaded.projects_loaded
+    assert loaded.stats() == index.stats()
+    assert loaded.search("remote sta") == index.search("remote sta")
+
+
+def test_tokenizer_keeps_tech_terms():
+    assert tokenize("CI/CD with C# and Node.js on K8s") == ["ci", "cd", "c#", "node", "js", "k8s"]
@@ -0,0 +1,104 @@
+import xml.etree.ElementTree as ET
+
+from sitemap_service import FullBlogIndex, SitemapService, build_url_entries, render_documents
+
+NS = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+
+
+def _listing(*ids):
+    return {"blogs": [{"id": i, "created_at": f"2026-10-{10 + n:02d}T08:00:00"} for n, i in enumerate(ids)]}
+
+
+def _locs(body):
+    return [e.text for e in ET.fromstring(body).iterfind(".//sm:loc", NS)]
+
+
+def test_rebuilds_only_when_the_listing_or_projects_change(clock):
+    service = SitemapService(clock=clock)
+    listing = _listing("a", "b")
+    first = service.get("/sitemap.xml", listing, projects=[{"id": "p1", "timestamp": "2026-09-01T00:00:00"}])
+    assert "https://althafportfolio.site/blogs/a" in _locs(first.body)
+    assert "https://althafportfolio.site/projects/p1" in _locs(first.body)
+    assert service.is_current(listing) and service.get("/sitemap.xml", listing) is first
+    assert service.builds == 1
+
+    published = _listing("a", "b", "c")  # catalog swaps in a new listing object
+    assert not service.is_current(published)
+    second = service.get("/sitemap.xml", published)
+    assert second.etag != first.etag and len(_locs(second.body)) == len(_locs(first.body)) + 1
+
+    # Same content under a new listing object keeps the validators
+    assert service.get("/sitemap.xml", _listing("a", "b", "c")) is second
+
+
+def test_projects_refresh_on_ttl_or_invalidation(clock):
+    service = SitemapService(projects_ttl_seconds=60, clock=clock)
+    assert service.needs_projects()
+    service.get("/sitemap.xml", _listing("a"), projects=[])
+    assert not service.needs_projects()
+    service.invalidate_projects()  # project create/update/delete
+    assert service.needs_projects()
+    service.get("/sitemap.xml", _listing("a"), projects=[{"_id": "p2"}])
+    clock.now += 61
+    assert service.needs_projects()
+
+
+def test_splits_into_an_index_with_children(clock):
+    service = SitemapService(max_urls=4, clock=clock)
+    listing = _listing("a", "b", "c", "d")  # 5 static pages + 4 blogs = 9 URLs
+    index = service.get("/sitemap.xml", listing, projects=[])
+    assert ET.fromstring(index.body).tag == "{%s}sitemapindex" % NS["sm"]
+    assert _locs(index.body) == [f"https://althafportfolio.site/sitemap-{n}.xml" for n in (1, 2, 3)]
+    children = [service.get(f"/sitemap-{n}.xml", listing) for n in (1, 2, 3)]
+    assert sum(len(_locs(c.body)) for c in children) == 9
+    assert service.get("/sitemap-4.xml", listing) is None
+
+    # A new post only changes the child it lands in (and the index)
+    newer = {"blogs": listing["blogs"] + [{"id": "e", "created_at": "2026-10-20T00:00:00"}]}
+    assert service.get("/sitemap-1.xml", newer) is children[0]
+    assert service.get("/sitemap-3.xml", newer).etag != children[2].etag
+
+
+def test_entries_use_content_dates_and_escape_urls():
+    entries = build_url_entries([{"id": "a&b", "created_at": "2026-10-01T00:00:00"}, {"id": "draft", "published": False}],
+                                [{"id": "p", "timestamp": "2026-09-30T12:00:00"}])
+    assert entries[5] == ("https://althafportfolio.site/blogs/a&b", "2026-10-01", "weekly", "0.9")
+    assert entries[-1][1] == "2026-09-30" and len(entries) == 7
+    xml = render_documents(entries)["/sitemap.xml"]
+    assert "blogs/a&amp;b" in xml and _locs(xml.encode())[5].endswith("a&b")
+
+
+class FakeStorage:
+    """read_index_if_changed() as S3BlogStorage answers it: (data, etag), data None on 304"""
+
+    def __init__(self, blogs):
+        self.blogs = blogs
+        self.etag = '"v1"'
+        self.reads = []
+
+    def read_index_if_changed(self, etag=None):
+        self.reads.append(etag)
+        if etag == self.etag:
+            return None, etag
+        return {"blogs": list(self.blogs)}, self.etag
+
+
+def test_full_index_lists_every_post_and_revalidates_by_etag(clock):
+    old_posts = [{"id": f"old-{n}", "created_at": f"2024-01-{n + 1:02d}T00:00:00"} for n in range(40)]
+    storage = FakeStorage(old_posts)
+    full = FullBlogIndex(lambda: storage, ttl_seconds=300, clock=clock)
+    service = SitemapService(clock=clock)
+
+    first = full.get()
+    locs = _locs(service.get("/sitemap.xml", first, projects=[]).body)
+    assert "https://althafportfolio.site/blogs/old-0" in locs and len(locs) == 5 + 40  # nothing aged out
+    assert full.get() is first and storage.reads == [None]  # within the TTL: no S3 call
+
+    clock.now += 301
+    assert full.get() is first and storage.reads[-1] == '"v1"'  # 304 keeps the object: no rebuild
+    assert service.is_current(first)
+
+    storage.blogs.append({"id": "new", "created_at": "2026-10-19T00:00:00"})
+    storage.etag = '"v2"'
+    full.invalidate()  # publish
+    assert len(full.get()["blogs"]) == 41 and not service.is_current(full.get())
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+from lazy_imports import lazy_import, IMPORT_TIMINGS
+from startup_profile import parse_importtime, summarize
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       5000 |   chromadb
+import time:      3000 |       3000 |     chromadb.api
+import time:       500 |       6000 | backend.server
+"""
+
+def test_parse_importtime():
+    records = parse_importtime(SAMPLE)
+    assert [r["module"] for r in records] == ["_io", "chromadb", "chromadb.api", "backend.server"]
+    assert records[2]["depth"] == 2
+    assert records[1]["cumulative_ms"] == 5.0
+
+def test_summarize_groups_by_package():
+    summary = summarize(parse_importtime(SAMPLE), top=2)
+    assert summary["slowest_modules"][0]["module"] == "backend.server"
+    assert summary["packages"][0] == {"package": "chromadb", "self_ms": 5.0}
+
+def test_lazy_import_defers_until_first_use():
+    sys.modules.pop("tabnanny", None)
+    proxy = lazy_import("tabnanny")
+    assert not proxy.is_loaded
+    assert "tabnanny" not in sys.modules
+    assert callable(proxy.check)
+    assert proxy.is_loaded
+    assert "tabnanny" in IMPORT_TIMINGS
+
+def test_server_import_skips_heavy_dependencies():
+    """Cold-start gate: importing the API must not pull in heavy SDKs"""
+    heavy = ["chromadb", "google.genai", "boto3", "cloudinary", "apscheduler", "gradio_client"]
+    code = (
+        "import sys, backend.server; "
+        f"print('HEAVY=' + ','.join(m for m in {heavy!r} if m in sys.modules))"
+    )
+    env = dict(os.environ, WARM_START="false")
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr[-500:]
+    loaded = [l for l in result.stdout.splitlines() if l.startswith("HEAVY=")][-1][len("HEAVY="):]
+    assert loaded == "", f"GATE FAILURE: heavy modules imported at startup: {loaded}"
@@ -0,0 +1,80 @@
+import json
+import time
+
+from analytics.analyze_logs import build_report, import_log_file, refresh_rollups
+from monitoring.metrics import collect_request_stats, record_tier, time_stage, track_llm_call
+from monitoring.telemetry import TelemetryWriter, build_record, connect, record_chat_request
+
+DAY_TS = time.mktime((2026, 10, 19, 12, 0, 0, 0, 0, -1))
+
+
+def test_request_stats_feed_the_record():
+    with collect_request_stats() as stats:
+        with time_stage("retrieval"):
+            pass
+        with track_llm_call("openrouter", "primary"):
+            pass
+        try:
+            with track_llm_call("openrouter", "secondary") as call:
+                call["status"] = "http_429"
+                raise RuntimeError("rate limited")
+        except RuntimeError:
+            pass
+        record_tier("tier1")
+
+    record = build_record(stats, intent="profile", outcome="success", latency_ms=12.5)
+    assert record["model"] == "openrouter:primary"
+    assert (record["llm_calls"], record["llm_errors"], record["tier"]) == (2, 1, "tier1")
+    assert record["retrieval_ms"] is not None and record["generate_ms"] is None
+    assert len(record["day"]) == 10
+
+
+def _seed(writer, n, outcome="success", latency=100.0, model="openrouter:m:free"):
+    stats = {"stages": {"generate": latency / 2}, "tier": "tier1",
+             "llm_calls": [{"provider": model.split(":")[0], "model": model.split(":", 1)[1], "outcome": "success"}]}
+    for i in range(n):
+        record_chat_request(stats if outcome == "success" else None, writer=writer, ts=DAY_TS,
+                            session_id=f"s{i}", intent="profile", outcome=outcome,
+                            cache_hit=int(outcome == "cache_hit"), input_tokens=100, output_tokens=20,
+                            latency_ms=latency + i)
+
+
+def test_rollups_are_incremental_and_report_percentiles(tmp_path):
+    db = tmp_path / "telemetry.db"
+    writer = TelemetryWriter(db)
+    _seed(writer, 100)
+    _seed(writer, 20, outcome="cache_hit", latency=2.0)
+    writer.flush()
+
+    conn = connect(db)
+    assert refresh_rollups(conn) == 120
+    assert refresh_rollups(conn) == 0  # nothing new: no rescan
+
+    _seed(writer, 10, latency=1000.0)
+    writer.flush()
+    assert refresh_rollups(conn) == 10
+
+    report = build_report(conn, days=1, today="2026-10-19")
+    assert report["requests"] == 130
+    assert report["outcomes"] == {"success": 110, "cache_hit": 20}
+    assert report["cache_hit_rate"] == round(20 / 130, 4)
+    p = report["latency_ms"]["request:success"]
+    assert p["count"] == 110
+    assert 140 <= p["p50"] <= 160  # median of 100..199 within bucket resolution
+    assert p["p99"] > 900
+    assert report["models"]["openrouter:m:free"]["requests"] == 110
+    assert report["models"]["openrouter:m:free"]["cost_usd"] == 0.0
+    assert report["intents"] == {"profile": 110}
+
+
+def test_import_log_backfills_once(tmp_path):
+    log = tmp_path / "chatbot.log"
+    line = {"session_id": "a", "timestamp": "2026-10-19T10:00:00", "intent": "blogs",
+            "input_tokens": 10, "output_tokens": 5, "latency_ms": 800}
+    log.write_text(f"2026-10-19 - PortfolioBackend - INFO - {json.dumps(line)}\nnoise line\n", encoding="utf-8")
+
+    conn = connect(tmp_path / "telemetry.db")
+    assert import_log_file(conn, log) == 1
+    assert import_log_file(conn, log) == 0
+    assert refresh_rollups(conn) == 1
+    assert build_report(conn, days=1, today="2026-10-19")["intents"] == {"blogs": 1}
@@ -0,0 +1,50 @@
+import json
+
+from monitoring.metrics import time_stage, track_llm_call
+from monitoring.tracing import TraceWriter, current_span, span, start_trace
+from trace_viewer import load_traces, render_waterfall, slowest
+
+
+def test_spans_nest_and_are_written_async(tmp_path):
+    writer = TraceWriter(path=tmp_path / "traces.jsonl")
+    with start_trace("ask-all-u-bot", writer=writer, session_id="s1") as root:
+        with time_stage("retrieval"):
+            with span("chroma_query", n_results=6) as sp:
+                sp.set(hits=4)
+        with span("llm.tier", tier="tier1") as tier_span:
+            tier_span.event("promoted_to_fallback", model="b")
+            with track_llm_call("openrouter", "model-b"):
+                pass
+        root.set(outcome="success")
+    writer.flush()
+
+    [trace] = list(load_traces(tmp_path / "traces.jsonl"))
+    by_name = {s["name"]: s for s in trace["spans"]}
+    assert trace["attrs"] == {"session_id": "s1", "outcome": "success"}
+    assert by_name["retrieval"]["parent_id"] == trace["root_span_id"]
+    assert by_name["chroma_query"]["parent_id"] == by_name["retrieval"]["span_id"]
+    assert by_name["llm.openrouter"]["parent_id"] == by_name["llm.tier"]["span_id"]
+    assert by_name["llm.openrouter"]["attrs"] == {"model": "model-b", "outcome": "success"}
+    assert by_name["llm.tier"]["events"][0]["name"] == "promoted_to_fallback"
+
+    waterfall = render_waterfall(trace)
+    assert "    chroma_query" in waterfall and "promoted_to_fallback" in waterfall
+
+
+def test_span_outside_trace_is_noop():
+    with span("orphan") as sp:
+        sp.set(x=1)
+    assert current_span().span_id is None
+
+
+def test_rotation_keeps_backups_readable(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    writer = TraceWriter(path=path, max_bytes=300, backup_count=2)
+    for i in range(6):
+        writer.submit({"trace_id": f"t{i}", "name": "x", "duration_ms": i, "started_at": 0, "spans": []})
+        writer.flush()
+    assert (tmp_path / "traces.jsonl.1").exists()
+    ids = [t["trace_id"] for t in load_traces(path)]
+    assert ids == sorted(ids) and "t5" in ids
+    assert slowest(load_traces(path), 1)[0]["trace_id"] == "t5"
+    json.loads((tmp_path / "traces.jsonl").read_text().splitlines()[-1])